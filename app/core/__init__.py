@@ -9,8 +9,14 @@ Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 
 from .exceptions import (
     APIException,
+    ClientClosedRequestException,
+    ConflictException,
     ForbiddenException,
+    GatewayTimeoutException,
     NotFoundException,
+    PayloadTooLargeException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
     UnauthorizedException,
     ValidationException,
     api_exception_handler,
@@ -25,8 +31,14 @@ __all__ = [
     "APIException",
     "NotFoundException",
     "ValidationException",
+    "ConflictException",
+    "PayloadTooLargeException",
     "UnauthorizedException",
     "ForbiddenException",
+    "TooManyRequestsException",
+    "ClientClosedRequestException",
+    "ServiceUnavailableException",
+    "GatewayTimeoutException",
     "api_exception_handler",
     "validation_exception_handler",
     "general_exception_handler",
@@ -7,6 +7,8 @@ Author: Klaus Begnis
 Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 """
 
+import math
+
 from fastapi import Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -24,10 +26,15 @@ class APIException(Exception):  # noqa: N818
         status_code: HTTP status code.
         detail: Error message detail.
         error_code: Machine-readable error code.
+        headers: Extra response headers (e.g. Retry-After).
     """
 
     def __init__(
-        self, status_code: int, detail: str, error_code: str | None = None
+        self,
+        status_code: int,
+        detail: str,
+        error_code: str | None = None,
+        headers: dict[str, str] | None = None,
     ):
         """
         Initialize API exception.
@@ -36,10 +43,12 @@ class APIException(Exception):  # noqa: N818
             status_code: HTTP status code.
             detail: Error message.
             error_code: Optional error code identifier.
+            headers: Optional headers to add to the error response.
         """
         self.status_code = status_code
         self.detail = detail
         self.error_code = error_code or "API_ERROR"
+        self.headers = headers
         super().__init__(self.detail)
 
 
@@ -77,6 +86,40 @@ class ValidationException(APIException):
         )
 
 
+class ConflictException(APIException):
+    """Exception for requests conflicting with the resource state (409)."""
+
+    def __init__(self, detail: str = "Conflict"):
+        """
+        Initialize conflict exception.
+
+        Args:
+            detail: Error message.
+        """
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail,
+            error_code="CONFLICT",
+        )
+
+
+class PayloadTooLargeException(APIException):
+    """Exception for inputs too large for a model's context (413)."""
+
+    def __init__(self, detail: str = "Input too large"):
+        """
+        Initialize payload too large exception.
+
+        Args:
+            detail: Error message.
+        """
+        super().__init__(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=detail,
+            error_code="CONTEXT_WINDOW_EXCEEDED",
+        )
+
+
 class UnauthorizedException(APIException):
     """Exception for authentication errors (401)."""
 
@@ -111,6 +154,96 @@ class ForbiddenException(APIException):
         )
 
 
+class TooManyRequestsException(APIException):
+    """Exception for overload and rate limit errors (429)."""
+
+    def __init__(
+        self,
+        detail: str = "Too many requests",
+        retry_after: float | None = None,
+    ):
+        """
+        Initialize too many requests exception.
+
+        Args:
+            detail: Error message.
+            retry_after: Seconds the client should wait before retrying.
+                Sent as the Retry-After header (rounded up).
+        """
+        headers = None
+        if retry_after is not None:
+            headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            error_code="TOO_MANY_REQUESTS",
+            headers=headers,
+        )
+        self.retry_after = retry_after
+
+
+class ClientClosedRequestException(APIException):
+    """Exception for requests abandoned by their client (499)."""
+
+    def __init__(self, detail: str = "Client closed request"):
+        """
+        Initialize client closed request exception.
+
+        Args:
+            detail: Error message.
+        """
+        super().__init__(
+            status_code=499,
+            detail=detail,
+            error_code="CLIENT_CLOSED_REQUEST",
+        )
+
+
+class ServiceUnavailableException(APIException):
+    """Exception for backends refused by an open circuit breaker (503)."""
+
+    def __init__(
+        self,
+        detail: str = "Service unavailable",
+        retry_after: float | None = None,
+    ):
+        """
+        Initialize service unavailable exception.
+
+        Args:
+            detail: Error message.
+            retry_after: Seconds until the backend is tried again. Sent
+                as the Retry-After header (rounded up).
+        """
+        headers = None
+        if retry_after is not None:
+            headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            error_code="CIRCUIT_OPEN",
+            headers=headers,
+        )
+        self.retry_after = retry_after
+
+
+class GatewayTimeoutException(APIException):
+    """Exception for runs cut off by the request deadline (504)."""
+
+    def __init__(self, detail: str = "Request deadline exceeded"):
+        """
+        Initialize gateway timeout exception.
+
+        Args:
+            detail: Error message.
+        """
+        super().__init__(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=detail,
+            error_code="DEADLINE_EXCEEDED",
+        )
+
+
 # Exception Handlers
 
 
@@ -138,6 +271,7 @@ def api_exception_handler(request: Request, exc: APIException):
             "message": exc.detail,
             "path": str(request.url.path),
         },
+        headers=exc.headers,
     )
 
 
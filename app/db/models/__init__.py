@@ -8,21 +8,45 @@ Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 """
 
 from app.db.models.agent import Agent
-from app.db.models.graph import Graph
+from app.db.models.agent_run import AgentRun
+from app.db.models.checkpoint import (
+    CheckpointBlob,
+    CheckpointRecord,
+    CheckpointWrite,
+)
+from app.db.models.graph import Graph, GraphPlanRecord
+from app.db.models.graph_run import GraphRun, GraphRunStatus
+from app.db.models.job import Job, JobStatus
 from app.db.models.mixins import TimestampMixin
 from app.db.models.permission import Permission, RolePermission
 from app.db.models.prompt import Prompt
+from app.db.models.rate_limit import RateLimitBucket
+from app.db.models.response_cache import ResponseCacheEntry
 from app.db.models.role import Role, UserRole
+from app.db.models.thread import Thread, ThreadMessage
 from app.db.models.tool import Tool
 from app.db.models.user import User
 
 __all__ = [
     "Agent",
+    "AgentRun",
+    "CheckpointBlob",
+    "CheckpointRecord",
+    "CheckpointWrite",
     "Graph",
+    "GraphPlanRecord",
+    "GraphRun",
+    "GraphRunStatus",
+    "Job",
+    "JobStatus",
     "Permission",
     "Prompt",
+    "RateLimitBucket",
+    "ResponseCacheEntry",
     "Role",
     "RolePermission",
+    "Thread",
+    "ThreadMessage",
     "TimestampMixin",
     "Tool",
     "User",
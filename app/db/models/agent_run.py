@@ -0,0 +1,79 @@
+"""
+File: agent_run.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 5:58:36 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class AgentRun(Base):
+    """
+    Metrics of one agent run, written in batches by the runtime.
+
+    Attributes:
+        id: Primary key.
+        agent_id: FK to the agent (None for unsaved agent definitions).
+        agent_name: Agent name at run time.
+        model: Model id from the agent config.
+        status: succeeded or failed.
+        error: Error of a failed run.
+        started_at: When the run started.
+        duration_ms: Wall time of the whole run.
+        steps: Model turns (including turns served from the cache).
+        model_calls: Model requests actually sent.
+        model_latency_ms: Total time spent in model requests.
+        prompt_tokens: Input tokens reported by the model.
+        completion_tokens: Output tokens reported by the model.
+        tool_calls: Tool executions (cache hits excluded).
+        tool_latency_ms: Total time spent in tools.
+        tool_latency: Per tool: {"calls": n, "total_ms": x}.
+        response_cache_hits: Model turns served by the response cache.
+        semantic_cache_hits: 1 if the run was served by the semantic cache.
+        tool_cache_hits: Tool calls served by the tool cache.
+    """
+
+    __tablename__ = "agent_runs"
+    __table_args__ = (
+        Index("ix_agent_runs_agent_id_started_at", "agent_id", "started_at"),
+        Index("ix_agent_runs_started_at", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    agent_id: Mapped[int | None] = mapped_column(
+        ForeignKey("agents.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    agent_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    model: Mapped[str] = mapped_column(String(255), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    duration_ms: Mapped[float] = mapped_column(nullable=False)
+    steps: Mapped[int] = mapped_column(nullable=False, default=0)
+    model_calls: Mapped[int] = mapped_column(nullable=False, default=0)
+    model_latency_ms: Mapped[float] = mapped_column(nullable=False, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(nullable=False, default=0)
+    completion_tokens: Mapped[int] = mapped_column(nullable=False, default=0)
+    tool_calls: Mapped[int] = mapped_column(nullable=False, default=0)
+    tool_latency_ms: Mapped[float] = mapped_column(nullable=False, default=0)
+    tool_latency: Mapped[dict[str, Any]] = mapped_column(
+        JSONB, nullable=False, default=dict
+    )
+    response_cache_hits: Mapped[int] = mapped_column(nullable=False, default=0)
+    semantic_cache_hits: Mapped[int] = mapped_column(nullable=False, default=0)
+    tool_cache_hits: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -0,0 +1,111 @@
+"""
+File: checkpoint.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 9:52:40 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, Index, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CheckpointRecord(Base):
+    """
+    Graph checkpoint after a step, without its channel values.
+
+    Values live in `checkpoint_blobs` (one row per changed channel) and
+    node updates in `checkpoint_writes`; both hold msgpack + zstd bytes.
+
+    Attributes:
+        thread_id: Run the checkpoint belongs to.
+        checkpoint_ns: Namespace ("" for the graph itself).
+        checkpoint_id: Monotonic checkpoint id (uuid6).
+        parent_checkpoint_id: Previous checkpoint of the run.
+        type: Serializer type of `checkpoint` and `meta`.
+        checkpoint: Serialized checkpoint (versions, ids).
+        meta: Serialized checkpoint metadata (step, source).
+        created_at: When the checkpoint was written.
+    """
+
+    __tablename__ = "checkpoints"
+    __table_args__ = (Index("ix_checkpoints_created_at", "created_at"),)
+
+    thread_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    checkpoint_ns: Mapped[str] = mapped_column(
+        String(255), primary_key=True, default=""
+    )
+    checkpoint_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    parent_checkpoint_id: Mapped[str | None] = mapped_column(
+        String(64), nullable=True
+    )
+    type: Mapped[str] = mapped_column(String(32), nullable=False)
+    checkpoint: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    meta: Mapped[bytes] = mapped_column("metadata", LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class CheckpointBlob(Base):
+    """
+    Value of one channel at one version.
+
+    Attributes:
+        thread_id: Run the value belongs to.
+        checkpoint_ns: Namespace ("" for the graph itself).
+        channel: State channel name.
+        version: Channel version the value was written at.
+        type: Serializer type ("empty" for delta channels).
+        blob: Serialized value.
+    """
+
+    __tablename__ = "checkpoint_blobs"
+
+    thread_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    checkpoint_ns: Mapped[str] = mapped_column(String(255), primary_key=True)
+    channel: Mapped[str] = mapped_column(String(255), primary_key=True)
+    version: Mapped[str] = mapped_column(String(64), primary_key=True)
+    type: Mapped[str] = mapped_column(String(32), nullable=False)
+    blob: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class CheckpointWrite(Base):
+    """
+    One write of a finished node (an incremental state update).
+
+    Attributes:
+        thread_id: Run the write belongs to.
+        checkpoint_ns: Namespace ("" for the graph itself).
+        checkpoint_id: Checkpoint the node ran on.
+        task_id: Node task that produced the write.
+        idx: Position of the write within the task.
+        channel: State channel written.
+        type: Serializer type of `blob`.
+        blob: Serialized value.
+        task_path: LangGraph task path.
+    """
+
+    __tablename__ = "checkpoint_writes"
+
+    thread_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    checkpoint_ns: Mapped[str] = mapped_column(String(255), primary_key=True)
+    checkpoint_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    task_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    idx: Mapped[int] = mapped_column(primary_key=True)
+    channel: Mapped[str] = mapped_column(String(255), nullable=False)
+    type: Mapped[str] = mapped_column(String(32), nullable=False)
+    blob: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    task_path: Mapped[str] = mapped_column(
+        String(255), nullable=False, default=""
+    )
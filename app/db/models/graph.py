@@ -11,9 +11,9 @@ from __future__ import annotations
 
 from typing import Any
 
-from sqlalchemy import String
+from sqlalchemy import ForeignKey, String
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 from app.db.models.mixins import TimestampMixin
@@ -28,6 +28,7 @@ class Graph(Base, TimestampMixin):
         name: Human-readable graph name.
         definition: JSON graph structure (nodes, edges, state).
         entry_node: Name of the entry node for execution.
+        plan_record: Execution plan computed when the graph is written.
     """
 
     __tablename__ = "graphs"
@@ -40,3 +41,36 @@ class Graph(Base, TimestampMixin):
         default=dict,
     )
     entry_node: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    plan_record: Mapped[GraphPlanRecord | None] = relationship(
+        "GraphPlanRecord",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    @property
+    def plan(self) -> dict[str, Any] | None:
+        """Stored execution plan (None for graphs saved without one)."""
+        if self.plan_record is None:
+            return None
+        return self.plan_record.plan
+
+
+class GraphPlanRecord(Base):
+    """
+    Execution plan of a graph, in its own table so that databases
+    created before plans existed get it from `create_all`.
+
+    Attributes:
+        graph_id: FK to the graph (primary key).
+        plan: Routers, fan-in joins and cyclicity (GraphPlan).
+    """
+
+    __tablename__ = "graph_plans"
+
+    graph_id: Mapped[int] = mapped_column(
+        ForeignKey("graphs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    plan: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
@@ -0,0 +1,71 @@
+"""
+File: graph_run.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 9:48:12 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.models.mixins import TimestampMixin
+
+
+class GraphRunStatus(StrEnum):
+    """Lifecycle states of a checkpointed graph run."""
+
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class GraphRun(Base, TimestampMixin):
+    """
+    One checkpointed run of a graph; its id is the checkpoint thread id.
+
+    Attributes:
+        id: Primary key.
+        graph_id: FK to the graph that ran.
+        graph_version: `updated_at` of the graph when the run started;
+            a run only resumes on the same version.
+        status: running, succeeded or failed.
+        input: User message of the run.
+        output: Last output and per-node outputs once the run succeeded.
+        error: Error of the last failed attempt.
+        attempts: Number of times the run was started or resumed.
+        finished_at: When the run last succeeded or failed.
+    """
+
+    __tablename__ = "graph_runs"
+    __table_args__ = (
+        Index("ix_graph_runs_graph_id_created_at", "graph_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    graph_id: Mapped[int] = mapped_column(
+        ForeignKey("graphs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    graph_version: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=GraphRunStatus.RUNNING
+    )
+    input: Mapped[str] = mapped_column(Text, nullable=False)
+    output: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(nullable=False, default=1)
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
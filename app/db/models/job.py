@@ -0,0 +1,85 @@
+"""
+File: job.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 11:48:30 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import Any
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.models.mixins import TimestampMixin
+
+
+class JobStatus(StrEnum):
+    """Lifecycle states of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base, TimestampMixin):
+    """
+    Background agent run, claimed and executed by a worker process.
+
+    Attributes:
+        id: Primary key.
+        agent_id: FK to the agent to run.
+        status: queued, running, succeeded or failed.
+        input: User message for the run.
+        result: Agent output once the job succeeded.
+        error: Last error message, if any attempt failed.
+        attempts: Number of times the job was claimed.
+        max_attempts: Attempts allowed before the job is failed.
+        run_after: Earliest time the job may be claimed (retry backoff).
+        locked_by: Id of the worker currently running the job.
+        heartbeat_at: Last heartbeat of that worker; stale jobs are
+            reclaimed by other workers.
+        started_at: When the current attempt started.
+        finished_at: When the job reached a final state.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_run_after", "status", "run_after"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    agent_id: Mapped[int] = mapped_column(
+        ForeignKey("agents.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=JobStatus.QUEUED
+    )
+    input: Mapped[str] = mapped_column(Text, nullable=False)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(nullable=False, default=3)
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        nullable=False,
+    )
+    locked_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
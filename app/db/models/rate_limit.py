@@ -0,0 +1,33 @@
+"""
+File: rate_limit.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 3:04:12 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Shared token bucket of the rate limiter (RATE_LIMIT_STORE=postgres).
+
+    Attributes:
+        key: Scope, id and dimension ("user:alice:tokens").
+        tokens: Allowance left at `updated_at`.
+        updated_at: Epoch seconds of the last charge (refill is computed
+            from it on the next one).
+    """
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[float] = mapped_column(Float, nullable=False)
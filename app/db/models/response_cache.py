@@ -0,0 +1,39 @@
+"""
+File: response_cache.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 1:55:31 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.models.mixins import TimestampMixin
+
+
+class ResponseCacheEntry(Base, TimestampMixin):
+    """
+    Shared (Postgres) tier of the exact-match model response cache.
+
+    Attributes:
+        key: SHA-256 of the canonical model request.
+        value: Serialized model response (messages, structured output).
+        expires_at: When the entry stops being served (None = never).
+    """
+
+    __tablename__ = "response_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
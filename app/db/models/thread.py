@@ -0,0 +1,81 @@
+"""
+File: thread.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 10:52:14 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.models.mixins import TimestampMixin
+
+
+class Thread(Base, TimestampMixin):
+    """
+    Conversation with one agent.
+
+    Attributes:
+        id: Primary key.
+        agent_id: FK to the agent that answers in the thread.
+        title: Optional display title.
+        summary: Rolling summary of messages up to `summary_seq`.
+        summary_seq: Last message folded into the summary (0 = none).
+        last_seq: Seq of the newest message (0 = empty thread).
+    """
+
+    __tablename__ = "threads"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    agent_id: Mapped[int] = mapped_column(
+        ForeignKey("agents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    title: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary_seq: Mapped[int] = mapped_column(nullable=False, default=0)
+    last_seq: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+class ThreadMessage(Base):
+    """
+    One message of a thread, numbered by `seq` within the thread.
+
+    Attributes:
+        id: Primary key.
+        thread_id: FK to the thread.
+        seq: Position in the thread, from 1.
+        role: "user" or "assistant".
+        content: Message text.
+        token_count: Estimated tokens, computed once on write.
+        created_at: When the message was stored.
+    """
+
+    __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_thread_id_seq", "thread_id", "seq", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    thread_id: Mapped[int] = mapped_column(
+        ForeignKey("threads.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    seq: Mapped[int] = mapped_column(nullable=False)
+    role: Mapped[str] = mapped_column(String(20), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    token_count: Mapped[int] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
+        nullable=False,
+    )
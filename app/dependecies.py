@@ -7,16 +7,41 @@ Author: Klaus Begnis
 Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 """
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Callable, Generator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from datetime import datetime
+from functools import partial
+import time
 from typing import Annotated, Any
 
-from fastapi import Depends, Request
+from fastapi import Depends, Header, Request
 from sqlalchemy.orm import Session
 
+from app.config import SettingsDep
+from app.core.exceptions import (
+    ClientClosedRequestException,
+    TooManyRequestsException,
+    ValidationException,
+)
+from app.core.logger import get_logger
 from app.db.session import session_context
+from app.runtime.cancellation import (
+    ClientDisconnectedError,
+    cancel_on_disconnect,
+    deadline_scope,
+)
+from app.runtime.prompt_template import PromptTemplateCache
+from app.runtime.rate_limit import RateLimiter, RateLimitExceededError
+from app.runtime.tokenizer import Tokenizer
+from app.services.agent_runtime import AgentRuntime
 from app.services.database_service import DatabaseService
+from app.services.graph_runtime import GraphRuntime
+from app.services.map_reduce import MapReduceRunner
+from app.services.swarm_runtime import SwarmRuntime
 from app.services.tool_provider import ToolProvider
 
+logger = get_logger(__name__)
+
 
 def get_dependency(request: Request) -> Any:
     """
@@ -43,6 +68,138 @@ def get_tool_provider() -> ToolProvider:
     return ToolProvider()
 
 
+def get_agent_runtime(request: Request) -> AgentRuntime:
+    """Provides the app-scoped AgentRuntime (created in lifespan)."""
+    return request.app.state.agent_runtime
+
+
+def get_graph_runtime(request: Request) -> GraphRuntime:
+    """Provides the app-scoped GraphRuntime (created in lifespan)."""
+    return request.app.state.graph_runtime
+
+
+def get_swarm_runtime(request: Request) -> SwarmRuntime:
+    """Provides the app-scoped SwarmRuntime (created in lifespan)."""
+    return request.app.state.swarm_runtime
+
+
+def get_map_reduce_runner(request: Request) -> MapReduceRunner:
+    """Provides the app-scoped MapReduceRunner (created in lifespan)."""
+    return request.app.state.map_reduce_runner
+
+
+def get_prompt_templates(request: Request) -> PromptTemplateCache:
+    """Provides the app-scoped compiled prompt template cache."""
+    return request.app.state.prompt_templates
+
+
+def get_tokenizer(request: Request) -> Tokenizer:
+    """Provides the app-scoped tokenizer (created in lifespan)."""
+    return request.app.state.tokenizer
+
+
+def get_rate_limiter(request: Request) -> RateLimiter | None:
+    """Provides the app-scoped RateLimiter (None when disabled)."""
+    return getattr(request.app.state, "rate_limiter", None)
+
+
+async def limit_agent_requests(
+    id: int,
+    limiter: Annotated[RateLimiter | None, Depends(get_rate_limiter)],
+) -> None:
+    """
+    Charges one request to the agent in the path.
+
+    Raises:
+        TooManyRequestsException: If the agent is over its request limit
+            (429 with Retry-After).
+    """
+    if limiter is None:
+        return
+    try:
+        await limiter.check_agent(id)
+    except RateLimitExceededError as err:
+        raise TooManyRequestsException(
+            detail=str(err), retry_after=err.retry_after
+        ) from err
+
+
+def _deadline_timeout(deadline: str) -> float:
+    """Seconds until an X-Request-Deadline (epoch seconds or ISO 8601)."""
+    try:
+        at = float(deadline)
+    except ValueError:
+        try:
+            at = datetime.fromisoformat(deadline).timestamp()
+        except ValueError as err:
+            raise ValidationException(
+                detail="X-Request-Deadline must be epoch seconds or ISO 8601"
+            ) from err
+    return at - time.time()
+
+
+def get_run_timeout(
+    settings: SettingsDep,
+    x_request_deadline: Annotated[str | None, Header()] = None,
+    x_request_timeout: Annotated[float | None, Header(gt=0)] = None,
+) -> float | None:
+    """
+    Seconds the runs of a request may take.
+
+    The tighter of the client's X-Request-Deadline (absolute) and
+    X-Request-Timeout (relative), else AGENT_RUN_TIMEOUT, capped at
+    AGENT_MAX_RUN_TIMEOUT. None means unbounded.
+
+    Raises:
+        ValidationException: If X-Request-Deadline cannot be parsed.
+    """
+    candidates = [
+        timeout
+        for timeout in (
+            x_request_timeout,
+            _deadline_timeout(x_request_deadline)
+            if x_request_deadline is not None
+            else None,
+        )
+        if timeout is not None
+    ]
+    if not candidates and settings.AGENT_RUN_TIMEOUT > 0:
+        candidates.append(settings.AGENT_RUN_TIMEOUT)
+    if settings.AGENT_MAX_RUN_TIMEOUT > 0:
+        candidates.append(settings.AGENT_MAX_RUN_TIMEOUT)
+    return min(candidates, default=None)
+
+
+@asynccontextmanager
+async def _guard_run(
+    request: Request, timeout: float | None, interval: float
+) -> AsyncGenerator[None]:
+    """Bound runs by the request deadline; cancel them if the client left."""
+    try:
+        with deadline_scope(timeout):
+            async with cancel_on_disconnect(request.is_disconnected, interval):
+                yield
+    except ClientDisconnectedError as err:
+        logger.info(f"Client left {request.url.path!s}; run cancelled")
+        raise ClientClosedRequestException() from err
+
+
+def get_run_guard(
+    request: Request,
+    settings: SettingsDep,
+    timeout: Annotated[float | None, Depends(get_run_timeout)],
+) -> Callable[[], AbstractAsyncContextManager[None]]:
+    """
+    Provides the guard of a request's agent runs.
+
+    `async with guard():` bounds the block by the request deadline (504
+    once it passes) and cancels it when the client disconnects (499).
+    """
+    return partial(
+        _guard_run, request, timeout, settings.AGENT_DISCONNECT_POLL_INTERVAL
+    )
+
+
 def get_database_service(
     db: Annotated[Session, Depends(get_db)],
 ) -> DatabaseService:
@@ -50,5 +207,17 @@ def get_database_service(
     return DatabaseService(db)
 
 
+AgentRuntimeDep = Annotated[AgentRuntime, Depends(get_agent_runtime)]
 DatabaseServiceDep = Annotated[DatabaseService, Depends(get_database_service)]
+GraphRuntimeDep = Annotated[GraphRuntime, Depends(get_graph_runtime)]
+MapReduceRunnerDep = Annotated[MapReduceRunner, Depends(get_map_reduce_runner)]
+PromptTemplatesDep = Annotated[
+    PromptTemplateCache, Depends(get_prompt_templates)
+]
+TokenizerDep = Annotated[Tokenizer, Depends(get_tokenizer)]
+AgentRateLimit = Depends(limit_agent_requests)
+RunGuardDep = Annotated[
+    Callable[[], AbstractAsyncContextManager[None]], Depends(get_run_guard)
+]
+SwarmRuntimeDep = Annotated[SwarmRuntime, Depends(get_swarm_runtime)]
 ToolProviderDep = Annotated[ToolProvider, Depends(get_tool_provider)]
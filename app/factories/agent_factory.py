@@ -7,15 +7,38 @@ Author: Klaus Begnis
 Copyright (c) 2026 Swarm Nest. See LICENSE for details.
 """
 
-from dataclasses import asdict, dataclass
+import asyncio
+from dataclasses import dataclass, field, fields
 from typing import Any
 
 from langchain.agents import create_agent
+from langchain.agents.middleware import (
+    AgentMiddleware,
+    ModelCallLimitMiddleware,
+)
 from langchain.tools import BaseTool
+from langchain_core.language_models import BaseChatModel
 from pydantic import BaseModel
 
 from app.factories.structured_output_factory import StructuredOutputFactory
-from app.schemas.db.agent import AgentCreate
+from app.runtime.cancellation import DeadlineMiddleware
+from app.runtime.circuit_breaker import (
+    CircuitBreakerRegistry,
+    ToolBreakerMiddleware,
+)
+from app.runtime.fake_chat_model import build_chat_model, is_fake_model
+from app.runtime.model_fallback import (
+    FallbackPolicy,
+    ModelFallbackMiddleware,
+    ModelLatencyTracker,
+)
+from app.runtime.model_registry import ModelRegistry
+from app.runtime.response_cache import ResponseCache, ResponseCacheMiddleware
+from app.runtime.run_metrics import RunMetricsMiddleware
+from app.runtime.tool_cache import ToolCacheMiddleware
+from app.runtime.tool_executor import ToolExecutor
+from app.runtime.traffic import TrafficMiddleware
+from app.schemas.db.agent import AgentBase
 from app.services.tool_provider import ToolProvider
 
 
@@ -26,10 +49,11 @@ class AgentConfig:
     """
 
     name: str
-    model: str
+    model: str | BaseChatModel
     system_prompt: str
     tools: list[BaseTool]
     response_format: type[BaseModel] | None = None
+    middleware: list[AgentMiddleware] = field(default_factory=list)
 
 
 class AgentFactory:
@@ -41,14 +65,42 @@ class AgentFactory:
         self,
         tool_provider: ToolProvider,
         structured_output_factory: StructuredOutputFactory,
+        response_cache: ResponseCache | None = None,
+        tool_executor: ToolExecutor | None = None,
+        model_registry: ModelRegistry | None = None,
+        max_steps: int = 0,
+        latency_tracker: ModelLatencyTracker | None = None,
+        breakers: CircuitBreakerRegistry | None = None,
     ) -> None:
         """
         Initialize the AgentFactory.
+
+        Args:
+            tool_provider: Resolves tool names to tools.
+            structured_output_factory: Builds response format models.
+            response_cache: Shared response cache for agents that opt in
+                (None disables caching).
+            tool_executor: Thread pool that sync tools run in when agents
+                run async (None = the event loop's default executor).
+            model_registry: Shared, pooled chat-model clients (None =
+                a new client per agent).
+            max_steps: Default max model calls per run, for agents
+                without `config["max_steps"]` (0 = unlimited).
+            latency_tracker: Shared per-model latency windows driving
+                hedged requests (a private one by default).
+            breakers: Shared circuit breakers of model providers and
+                tools (None disables them).
         """
         self.structured_output_factory = structured_output_factory
         self.tool_provider = tool_provider
+        self.response_cache = response_cache
+        self.tool_executor = tool_executor
+        self.model_registry = model_registry
+        self.max_steps = max_steps
+        self.latency_tracker = latency_tracker or ModelLatencyTracker()
+        self.breakers = breakers
 
-    def create_agent(self, agent_config: AgentCreate) -> Any:
+    def create_agent(self, agent_config: AgentBase) -> Any:
         """
         Create an agent from DB config.
 
@@ -59,17 +111,20 @@ class AgentFactory:
             The LangChain agent (runnable).
         """
         config = self._config_to_langchain_config(agent_config)
-        agent = create_agent(**asdict(config))
+        # Shallow kwargs: asdict would deep-copy tools and middleware.
+        agent = create_agent(
+            **{f.name: getattr(config, f.name) for f in fields(config)}
+        )
         return agent
 
     def _config_to_langchain_config(
-        self, agent_config: AgentCreate
+        self, agent_config: AgentBase
     ) -> AgentConfig:
         """
-        Convert an AgentCreate schema to an AgentConfig.
+        Convert an agent schema to an AgentConfig.
 
         Args:
-            agent_config: AgentCreate schema.
+            agent_config: AgentBase schema.
 
         Returns:
             AgentConfig: Configuration for the agent.
@@ -93,11 +148,140 @@ class AgentFactory:
         tools: list[BaseTool] = []
         if cfg.get("tools") is not None:
             for tool_name in cfg["tools"]:
-                tools.append(self.tool_provider.get_tool(tool_name))
+                tool = self.tool_provider.get_tool(tool_name)
+                if self.tool_executor is not None:
+                    tool = self.tool_executor.bind(tool)
+                tools.append(tool)
         return AgentConfig(
             name=agent_config.name,
-            model=model,
+            model=self._resolve_model(model, cfg.get("model_options")),
             system_prompt=system_prompt,
             tools=tools,
             response_format=structured_output,
+            middleware=self._build_middleware(agent_config, tools),
         )
+
+    async def aclose(self) -> None:
+        """Release app-scoped resources (tool pool, model clients)."""
+        if self.tool_executor is not None:
+            await asyncio.to_thread(self.tool_executor.shutdown)
+        if self.model_registry is not None:
+            await self.model_registry.aclose()
+
+    def _resolve_model(
+        self, model: str, options: dict[str, Any] | None
+    ) -> str | BaseChatModel:
+        """
+        Resolve the chat model of an agent.
+
+        Args:
+            model: Model id from the config ("provider:model").
+            options: `config["model_options"]`: init_chat_model kwargs
+                such as api_key, base_url or temperature (latency,
+                token rate and scripted tool calls for `fake:` models).
+
+        Returns:
+            str | BaseChatModel: Shared client from the registry, a new
+                client for options or fake models, or the id for
+                create_agent to build.
+        """
+        if self.model_registry is not None:
+            return self.model_registry.get(model, options)
+        if options or is_fake_model(model):
+            return build_chat_model(model, **(options or {}))
+        return model
+
+    def _fallback_models(
+        self, cfg: dict[str, Any]
+    ) -> list[tuple[str, BaseChatModel]]:
+        """
+        Clients of `config["fallbacks"]`: model ids, or dicts with
+        `model` and `model_options`.
+        """
+        models = []
+        for entry in cfg.get("fallbacks") or []:
+            spec = {"model": entry} if isinstance(entry, str) else entry
+            model_id = spec["model"]
+            options = spec.get("model_options")
+            model = self._resolve_model(model_id, options)
+            if isinstance(model, str):
+                model = build_chat_model(model_id)
+            models.append((model_id, model))
+        return models
+
+    def _build_middleware(
+        self, agent_config: AgentBase, tools: list[BaseTool]
+    ) -> list[AgentMiddleware]:
+        """
+        Build the runtime middleware of an agent.
+
+        `config["max_steps"]` caps the model calls of a run (the factory
+        default otherwise); a run reaching it ends with its last answer.
+        `config["response_cache"]` enables the response cache: `true` uses
+        the default TTL, `{"ttl": seconds}` sets the agent's own. Tools
+        with a cache policy always go through their shared memo.
+        `config["fallbacks"]` (models tried in order on errors and
+        `model_timeout`) and `config["hedge"]` (a second request once a
+        call is slower than its model's rolling p95) route model calls
+        through the fallback middleware, under the caches. With circuit
+        breakers, every model call goes through it too, so a provider
+        whose breaker is open is skipped (or fails fast), and tools whose
+        breaker is open answer with an error at once. Model and tool
+        calls are bounded by the request deadline, and run metrics are
+        always recorded. Model and tool steps always pass the traffic
+        middleware, which records or replays them while the runtime has a
+        recorder or a replay active (and does nothing otherwise).
+
+        Args:
+            agent_config: AgentBase schema.
+            tools: Resolved tools of the agent.
+
+        Returns:
+            list[AgentMiddleware]: Middleware, outermost first.
+        """
+        cfg = agent_config.config
+        middleware: list[AgentMiddleware] = []
+        max_steps = cfg.get("max_steps", self.max_steps)
+        if max_steps:
+            middleware.append(
+                ModelCallLimitMiddleware(
+                    run_limit=max_steps, exit_behavior="end"
+                )
+            )
+        cache_cfg = cfg.get("response_cache")
+        if cache_cfg and self.response_cache is not None:
+            ttl = cache_cfg.get("ttl") if isinstance(cache_cfg, dict) else None
+            middleware.append(
+                ResponseCacheMiddleware(
+                    self.response_cache,
+                    agent_name=agent_config.name,
+                    model=cfg["model"],
+                    ttl=ttl,
+                )
+            )
+        memos = {
+            tool.name: memo
+            for tool in tools
+            if (memo := self.tool_provider.get_memo(tool.name)) is not None
+        }
+        if memos:
+            middleware.append(ToolCacheMiddleware(memos))
+        guarded = self.breakers is not None
+        if cfg.get("fallbacks") or cfg.get("hedge") or guarded:
+            middleware.append(
+                ModelFallbackMiddleware(
+                    cfg["model"],
+                    self._fallback_models(cfg),
+                    self.latency_tracker,
+                    FallbackPolicy.from_config(cfg),
+                    breakers=self.breakers,
+                )
+            )
+        if guarded and tools:
+            middleware.append(ToolBreakerMiddleware(self.breakers))
+        middleware.append(DeadlineMiddleware())
+        # Innermost: only model requests and tool executions that were
+        # not served from a cache are timed.
+        middleware.append(RunMetricsMiddleware())
+        middleware.append(TrafficMiddleware())
+        return middleware
@@ -0,0 +1,256 @@
+"""
+File: graph_factory.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 7:26:05 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+import functools
+import json
+from typing import Annotated, Any, TypedDict
+
+from langchain_core.messages import AIMessage, AnyMessage
+from langgraph.channels import DeltaChannel
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.pregel import Pregel
+
+from app.schemas.db.agent import AgentBase
+from app.schemas.db.graph import GraphEdge, GraphNode, GraphPlan, GraphRead
+from app.services.agent_runtime import AgentRuntime
+from app.services.graph_validator import plan_graph
+
+NodeFunc = Callable[["GraphState"], Awaitable[dict[str, Any]]]
+
+
+def merge_outputs(
+    left: dict[str, Any], right: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    State reducer of node outputs by node name.
+
+    Each node writes only its own key, so concurrent nodes never clash;
+    a node that runs again (in a loop) replaces its previous output.
+    """
+    return {**left, **right}
+
+
+def _batched(
+    reducer: Callable[[Any, Any], Any],
+) -> Callable[[Any, list[Any]], Any]:
+    """Fold a batch of writes with a binary reducer (DeltaChannel form)."""
+
+    def fold(state: Any, writes: list[Any]) -> Any:
+        return functools.reduce(reducer, writes, state)
+
+    return fold
+
+
+class GraphState(TypedDict, total=False):
+    """
+    State shared by the nodes of a compiled graph.
+
+    Both keys are delta channels: checkpoints store each node's update,
+    not a copy of the whole conversation per step.
+
+    Attributes:
+        messages: Conversation: the user input, then one named message
+            per finished node.
+        outputs: Output of each finished node, by node name.
+    """
+
+    messages: Annotated[list[AnyMessage], DeltaChannel(_batched(add_messages))]
+    outputs: Annotated[dict[str, Any], DeltaChannel(_batched(merge_outputs))]
+
+
+class GraphFactory:
+    """
+    Factory compiling Graph definitions into LangGraph StateGraphs.
+
+    Agent nodes are compiled once per graph with the AgentFactory and run
+    through the AgentRuntime (concurrency limits, metrics); tool nodes
+    call tools from the ToolProvider. Fan-out edges put independent
+    nodes in the same LangGraph step, where they run concurrently up to
+    the run config's `max_concurrency`.
+    """
+
+    def __init__(
+        self,
+        agent_runtime: AgentRuntime,
+        checkpointer: BaseCheckpointSaver | None = None,
+    ) -> None:
+        """
+        Initialize the GraphFactory.
+
+        Args:
+            agent_runtime: Builds and runs the agents of agent nodes.
+            checkpointer: Saves the state of runs after each step, so a
+                failed run can resume (None = no checkpoints).
+        """
+        self.agent_runtime = agent_runtime
+        self.checkpointer = checkpointer
+
+    def create_graph(
+        self, graph: GraphRead, agents: dict[int, AgentBase]
+    ) -> CompiledStateGraph:
+        """
+        Compile a graph definition.
+
+        Uses the plan stored when the graph was written; graphs saved
+        without one are planned here.
+
+        Args:
+            graph: Graph with definition and entry node.
+            agents: Agents referenced by the graph's agent nodes, by id.
+
+        Returns:
+            CompiledStateGraph: Runnable graph over GraphState.
+
+        Raises:
+            ValueError: If an agent is missing or the definition is
+                invalid (GraphValidationError).
+            KeyError: If a tool node names an unknown tool.
+        """
+        plan = graph.plan or plan_graph(graph.definition, graph.entry_node)
+        builder = StateGraph(GraphState)
+        for node in graph.definition.nodes:
+            builder.add_node(node.name, self._build_node(node, agents))
+        builder.add_edge(START, graph.entry_node)
+        self._add_edges(builder, graph.definition.edges, plan)
+        return builder.compile(checkpointer=self.checkpointer, name=graph.name)
+
+    def _build_node(
+        self, node: GraphNode, agents: dict[int, AgentBase]
+    ) -> NodeFunc:
+        """
+        Build the function of one node.
+
+        Args:
+            node: Node definition.
+            agents: Referenced agents by id.
+
+        Returns:
+            NodeFunc: Async node function returning a state update.
+        """
+        if node.type == "agent":
+            agent = agents.get(node.agent_id)
+            if agent is None:
+                raise ValueError(
+                    f"Node {node.name!r}: agent {node.agent_id!s} not found"
+                )
+            return self._agent_node(node.name, agent)
+        return self._tool_node(node)
+
+    def _agent_node(self, name: str, agent: AgentBase) -> NodeFunc:
+        """Node running an agent on the graph's conversation."""
+        runtime = self.agent_runtime
+        runnable = runtime.agent_factory.create_agent(agent)
+        if isinstance(runnable, Pregel):
+            # The node is the unit of a checkpoint; the agent inside must
+            # not inherit the graph's checkpointer and save its own steps.
+            runnable = runnable.copy(update={"checkpointer": False})
+
+        async def run_agent(state: GraphState) -> dict[str, Any]:
+            result = await runtime.invoke_compiled(
+                runnable, agent, state["messages"]
+            )
+            messages = result.get("messages") or []
+            text = messages[-1].text if messages else ""
+            return {
+                "messages": [AIMessage(content=text, name=name)],
+                "outputs": {name: text},
+            }
+
+        return run_agent
+
+    def _tool_node(self, node: GraphNode) -> NodeFunc:
+        """Node calling a tool with fixed args and the last message."""
+        agent_factory = self.agent_runtime.agent_factory
+        tool = agent_factory.tool_provider.get_tool(node.tool)
+        if agent_factory.tool_executor is not None:
+            tool = agent_factory.tool_executor.bind(tool)
+        name, args, input_arg = node.name, node.args, node.input_arg
+
+        async def run_tool(state: GraphState) -> dict[str, Any]:
+            call_args = dict(args)
+            if input_arg is not None:
+                call_args[input_arg] = state["messages"][-1].text
+            result = await tool.ainvoke(call_args)
+            text = (
+                result
+                if isinstance(result, str)
+                else json.dumps(result, default=str)
+            )
+            return {
+                "messages": [AIMessage(content=text, name=name)],
+                "outputs": {name: result},
+            }
+
+        return run_tool
+
+    @staticmethod
+    def _add_edges(
+        builder: StateGraph, edges: list[GraphEdge], plan: GraphPlan
+    ) -> None:
+        """
+        Add the definition's edges to the builder.
+
+        Routers (nodes with a conditional edge) get a routing function;
+        other nodes fan out to all targets. Join targets of the plan wait
+        for all of their sources (fan-in) before they run.
+
+        Args:
+            builder: Graph builder with all nodes added.
+            edges: Edges of the definition.
+            plan: Precomputed plan of the graph.
+        """
+        by_source: dict[str, list[GraphEdge]] = defaultdict(list)
+        for edge in edges:
+            by_source[edge.source].append(edge)
+        routers = set(plan.routers)
+        for source, outgoing in by_source.items():
+            if source in routers:
+                builder.add_conditional_edges(
+                    source,
+                    _router(source, outgoing),
+                    sorted({edge.target for edge in outgoing} | {END}),
+                )
+                continue
+            for edge in outgoing:
+                if edge.target not in plan.joins:
+                    builder.add_edge(source, edge.target)
+        for target, sources in plan.joins.items():
+            builder.add_edge(sources, target)
+
+
+def _router(
+    source: str, edges: list[GraphEdge]
+) -> Callable[[GraphState], str | list[str]]:
+    """
+    Routing function of a node with conditional edges.
+
+    Args:
+        source: Node name.
+        edges: Outgoing edges of the node, in definition order.
+
+    Returns:
+        Callable: Picks the first matching conditional target, else the
+            unconditional targets, else END.
+    """
+    conditional = [e for e in edges if e.when is not None]
+    default = [e.target for e in edges if e.when is None] or [END]
+
+    def route(state: GraphState) -> str | list[str]:
+        output = str(state.get("outputs", {}).get(source, "")).lower()
+        for edge in conditional:
+            if edge.when.lower() in output:
+                return edge.target
+        return default
+
+    return route
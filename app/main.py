@@ -24,16 +24,26 @@ from .core import (
 )
 from .db import Base, engine
 from .db.ensure_db import ensure_database_exists
-from .factories.agent_factory import AgentFactory
-from .factories.structured_output_factory import StructuredOutputFactory
+from .middleware import RateLimitMiddleware
 from .routers import (
     agent_router,
+    agent_run_router,
+    graph_router,
     health_router,
+    job_router,
     prompt_router,
     role_router,
+    runtime_router,
+    swarm_router,
+    thread_router,
     user_router,
 )
-from .services.tool_provider import ToolProvider
+from .runtime.prompt_template import PromptTemplateCache
+from .runtime.tokenizer import build_tokenizer
+from .services.agent_runtime import build_agent_runtime
+from .services.graph_runtime import build_graph_runtime
+from .services.map_reduce import build_map_reduce_runner
+from .services.swarm_runtime import build_swarm_runtime
 
 logger = get_logger(__name__)
 
@@ -55,15 +65,29 @@ async def lifespan(app: FastAPI):  # noqa: RUF029
     ensure_database_exists(settings.DATABASE_URL)
     Base.metadata.create_all(bind=engine)
     logger.info("Starting factories...")
-    structured_output_factory = StructuredOutputFactory()
-    tool_provider = ToolProvider()
-    agent_factory = AgentFactory(tool_provider, structured_output_factory)
-    app.state.agent_factory = agent_factory
+    agent_runtime = build_agent_runtime(settings)
+    await agent_runtime.start()
+    app.state.agent_factory = agent_runtime.agent_factory
+    app.state.agent_runtime = agent_runtime
+    app.state.rate_limiter = agent_runtime.rate_limiter
+    graph_runtime = build_graph_runtime(settings, agent_runtime)
+    await graph_runtime.start()
+    app.state.graph_runtime = graph_runtime
+    app.state.swarm_runtime = build_swarm_runtime(settings, agent_runtime)
+    app.state.tokenizer = build_tokenizer(settings.TOKENIZER)
+    app.state.map_reduce_runner = build_map_reduce_runner(
+        settings, agent_runtime, app.state.tokenizer
+    )
+    app.state.prompt_templates = PromptTemplateCache(
+        settings.PROMPT_TEMPLATE_CACHE_MAX_ENTRIES
+    )
     logger.info("Agent Factory started - loading models from database...")
     # TODO: Load models from database
     logger.info("Database tables created or already exist")
     yield
     logger.info("Shutting down...")
+    await graph_runtime.aclose()
+    await agent_runtime.aclose()
 
 
 app = FastAPI(
@@ -73,6 +97,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Rate limiting (per caller; added first so CORS wraps its 429s)
+app.add_middleware(RateLimitMiddleware, header=settings.RATE_LIMIT_USER_HEADER)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -90,8 +117,14 @@ app.add_exception_handler(Exception, general_exception_handler)
 # Include routers
 app.include_router(health_router)
 app.include_router(agent_router)
+app.include_router(agent_run_router)
+app.include_router(graph_router)
+app.include_router(job_router)
 app.include_router(prompt_router)
 app.include_router(role_router)
+app.include_router(runtime_router)
+app.include_router(swarm_router)
+app.include_router(thread_router)
 app.include_router(user_router)
 
 
@@ -0,0 +1,88 @@
+"""
+File: middleware.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 3:31:50 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Iterable
+
+from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.exceptions import TooManyRequestsException, api_exception_handler
+from app.runtime.rate_limit import RateLimitExceededError, set_current_caller
+
+# Probes and docs are never rate limited.
+RATE_LIMIT_EXEMPT_PATHS = ("/", "/health", "/docs", "/redoc", "/openapi.json")
+
+
+class RateLimitMiddleware:
+    """
+    Charges every HTTP request to its caller's request bucket.
+
+    The caller is the client address; it is also made the current
+    caller, so the runs a request starts charge that caller's token
+    bucket. Runs without a limiter (`app.state.rate_limiter` unset) pass
+    through.
+
+    A `header` naming the caller (e.g. X-User-Id) is trusted only when
+    one is configured. Any client can send any value, so configure it
+    only behind a proxy or gateway that authenticates the caller and
+    overwrites the header; otherwise a client picks a new id per request
+    and is never limited.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header: str = "",
+        exempt: Iterable[str] = RATE_LIMIT_EXEMPT_PATHS,
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI app.
+            header: Trusted request header identifying the caller (empty
+                uses the client address only).
+            exempt: Paths that are never charged.
+        """
+        self.app = app
+        self.header = header.lower().encode() if header else None
+        self.exempt = frozenset(exempt)
+
+    def _caller(self, scope: Scope) -> str | None:
+        """Caller id from the trusted header, else the client address."""
+        if self.header is not None:
+            for name, value in scope.get("headers", ()):
+                if name == self.header and value:
+                    return value.decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else None
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Charge the caller, or answer 429 with Retry-After."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        caller = self._caller(scope)
+        set_current_caller(caller)
+        limiter = getattr(scope["app"].state, "rate_limiter", None)
+        if limiter is not None and scope["path"] not in self.exempt:
+            try:
+                await limiter.check_caller(caller)
+            except RateLimitExceededError as err:
+                response = api_exception_handler(
+                    Request(scope),
+                    TooManyRequestsException(
+                        detail=str(err), retry_after=err.retry_after
+                    ),
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -8,15 +8,27 @@ Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 """
 
 from .agent import router as agent_router
+from .agent_run import router as agent_run_router
+from .graph import router as graph_router
 from .health import router as health_router
+from .job import router as job_router
 from .prompt import router as prompt_router
 from .role import router as role_router
+from .runtime import router as runtime_router
+from .swarm import router as swarm_router
+from .thread import router as thread_router
 from .user import router as user_router
 
 __all__ = [
     "agent_router",
+    "agent_run_router",
+    "graph_router",
     "health_router",
+    "job_router",
     "prompt_router",
     "role_router",
+    "runtime_router",
+    "swarm_router",
+    "thread_router",
     "user_router",
 ]
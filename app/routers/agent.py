@@ -7,13 +7,42 @@ Author: Klaus Begnis
 Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 """
 
+from collections.abc import AsyncIterator
+import json
+from typing import Any
+
 from fastapi import APIRouter, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from app.core.exceptions import NotFoundException
-from app.dependecies import DatabaseServiceDep
+from app.config import SettingsDep
+from app.core.exceptions import (
+    APIException,
+    ClientClosedRequestException,
+    NotFoundException,
+    ValidationException,
+)
+from app.core.logger import get_logger
+from app.dependecies import (
+    AgentRateLimit,
+    AgentRuntimeDep,
+    DatabaseServiceDep,
+    MapReduceRunnerDep,
+    RunGuardDep,
+)
+from app.schemas.api.agent_run import (
+    AgentBatchRequest,
+    AgentBatchResponse,
+    AgentInvokeRequest,
+    AgentInvokeResponse,
+)
 from app.schemas.api.base import SuccessResponse
+from app.schemas.api.map_reduce import MapReduceRequest, MapReduceResponse
 from app.schemas.db.agent import AgentCreate, AgentRead, AgentUpdate
 from app.schemas.db.base import orm_to_schema
+from app.schemas.db.job import JobCreate, JobRead
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/agents", tags=["agent"])
 
@@ -142,3 +171,280 @@ def delete_agent(
     deleted = db_service.delete_agent(id)
     if not deleted:
         raise NotFoundException(detail="Agent not found")
+
+
+@router.post(
+    "/{id}/invoke",
+    response_model=SuccessResponse[AgentInvokeResponse],
+    dependencies=[AgentRateLimit],
+)
+async def invoke_agent(
+    id: int,
+    data: AgentInvokeRequest,
+    db_service: DatabaseServiceDep,
+    runtime: AgentRuntimeDep,
+    guard: RunGuardDep,
+) -> SuccessResponse[AgentInvokeResponse]:
+    """
+    Invoke an agent with a single user message.
+
+    The run executes on the event loop (ainvoke) under the runtime's
+    concurrency limits; the DB lookup runs in the threadpool. The run is
+    bounded by the X-Request-Deadline / X-Request-Timeout headers and
+    cancelled if the client disconnects.
+
+    Args:
+        id: Agent primary key.
+        data: User input.
+        db_service: Injected database service.
+        runtime: Injected agent runtime.
+        guard: Injected deadline and disconnect guard.
+
+    Returns:
+        SuccessResponse with the agent output.
+
+    Raises:
+        NotFoundException: If agent not found.
+        TooManyRequestsException: If the run queue is full or a rate
+            limit is exceeded (429 with Retry-After).
+        PayloadTooLargeException: If the input does not fit the model's
+            context window (413).
+        GatewayTimeoutException: If the deadline passed (504).
+        ClientClosedRequestException: If the client left (499).
+    """
+    agent = await run_in_threadpool(db_service.get_agent, id)
+    if agent is None:
+        raise NotFoundException(detail="Agent not found")
+    async with guard():
+        state = await runtime.invoke(
+            orm_to_schema(agent, AgentRead), data.input
+        )
+    return SuccessResponse(
+        message="Agent invoked",
+        data=AgentInvokeResponse.from_state(state),
+    )
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/{id}/invoke/stream", dependencies=[AgentRateLimit])
+async def stream_agent(
+    id: int,
+    data: AgentInvokeRequest,
+    db_service: DatabaseServiceDep,
+    runtime: AgentRuntimeDep,
+    guard: RunGuardDep,
+) -> StreamingResponse:
+    """
+    Invoke an agent and stream its reply as server-sent events.
+
+    Emits a `token` event (`{"text"}`) for each text chunk of the model,
+    then `end` with the same body as /invoke, or `error` if the run fails
+    (including a full run queue, an oversized input or a passed
+    deadline). Closing the stream cancels the run.
+
+    Args:
+        id: Agent primary key.
+        data: User input.
+        db_service: Injected database service.
+        runtime: Injected agent runtime.
+        guard: Injected deadline and disconnect guard.
+
+    Returns:
+        StreamingResponse of text/event-stream.
+
+    Raises:
+        NotFoundException: If agent not found.
+    """
+    row = await run_in_threadpool(db_service.get_agent, id)
+    if row is None:
+        raise NotFoundException(detail="Agent not found")
+    agent = orm_to_schema(row, AgentRead)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async with guard():
+                async for kind, payload in runtime.stream(agent, data.input):
+                    if kind == "token":
+                        yield _sse("token", {"text": payload})
+                    else:
+                        response = AgentInvokeResponse.from_state(payload)
+                        yield _sse("end", response.model_dump())
+        except ClientClosedRequestException:
+            return
+        except APIException as err:
+            yield _sse("error", {"detail": err.detail})
+        except Exception as err:
+            logger.error(f"Agent {id!s} stream failed: {err!s}")
+            yield _sse("error", {"detail": f"{type(err).__name__}: {err!s}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post(
+    "/{id}/batch",
+    response_model=SuccessResponse[AgentBatchResponse],
+    dependencies=[AgentRateLimit],
+)
+async def batch_agent(
+    id: int,
+    data: AgentBatchRequest,
+    db_service: DatabaseServiceDep,
+    runtime: AgentRuntimeDep,
+    guard: RunGuardDep,
+) -> SuccessResponse[AgentBatchResponse]:
+    """
+    Invoke an agent over a list of independent inputs.
+
+    One compiled agent serves the whole batch; failures are reported per
+    item and do not fail the request. Runs still going at the deadline
+    fail as items; a client disconnect cancels the whole batch.
+
+    Args:
+        id: Agent primary key.
+        data: Inputs and optional max_concurrency.
+        db_service: Injected database service.
+        runtime: Injected agent runtime.
+        guard: Injected deadline and disconnect guard.
+
+    Returns:
+        SuccessResponse with one result per input, in input order.
+
+    Raises:
+        NotFoundException: If agent not found.
+    """
+    agent = await run_in_threadpool(db_service.get_agent, id)
+    if agent is None:
+        raise NotFoundException(detail="Agent not found")
+    async with guard():
+        results = await runtime.batch(
+            orm_to_schema(agent, AgentRead),
+            data.inputs,
+            max_concurrency=data.max_concurrency,
+        )
+    return SuccessResponse(
+        message="Agent batch completed",
+        data=AgentBatchResponse.from_results(results),
+    )
+
+
+@router.post("/{id}/map-reduce", dependencies=[AgentRateLimit])
+async def map_reduce_agent(
+    id: int,
+    data: MapReduceRequest,
+    db_service: DatabaseServiceDep,
+    runner: MapReduceRunnerDep,
+    guard: RunGuardDep,
+) -> StreamingResponse:
+    """
+    Run an agent over a large input in chunks and reduce the results,
+    streaming progress as server-sent events.
+
+    The input is split into token-bounded chunks, the agent runs over
+    them concurrently (up to `max_concurrency`), and the reducer agent
+    combines the partial results level by level. Emits `plan`
+    (`{"chunks", "chunk_tokens"}`), a `chunk` event as each chunk
+    completes (its output or error), a `reduce` event as each reduce
+    call completes, then `end` with the final output, or `error` if
+    every chunk (any chunk, with `fail_on_chunk_error`) or a reduce
+    fails. Closing the stream cancels the run.
+
+    Args:
+        id: Mapper agent primary key.
+        data: Input, instructions, optional reducer and budgets.
+        db_service: Injected database service.
+        runner: Injected map-reduce runner.
+        guard: Injected deadline and disconnect guard.
+
+    Returns:
+        StreamingResponse of text/event-stream.
+
+    Raises:
+        NotFoundException: If the agent or the reducer is not found.
+        ValidationException: If the input is blank.
+    """
+    if not data.input.strip():
+        raise ValidationException(detail="Input is blank")
+    row = await run_in_threadpool(db_service.get_agent, id)
+    if row is None:
+        raise NotFoundException(detail="Agent not found")
+    agent = orm_to_schema(row, AgentRead)
+    reducer = None
+    if data.reducer_agent_id is not None:
+        row = await run_in_threadpool(
+            db_service.get_agent, data.reducer_agent_id
+        )
+        if row is None:
+            raise NotFoundException(detail="Reducer agent not found")
+        reducer = orm_to_schema(row, AgentRead)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async with guard():
+                async for kind, payload in runner.run(
+                    agent,
+                    data.input,
+                    reducer=reducer,
+                    instructions=data.instructions,
+                    chunk_tokens=data.chunk_tokens,
+                    max_concurrency=data.max_concurrency,
+                    fail_on_chunk_error=data.fail_on_chunk_error,
+                ):
+                    if kind == "end":
+                        response = MapReduceResponse.from_result(payload)
+                        yield _sse("end", response.model_dump())
+                    else:
+                        yield _sse(kind, payload)
+        except ClientClosedRequestException:
+            return
+        except APIException as err:
+            yield _sse("error", {"detail": err.detail})
+        except Exception as err:
+            logger.error(f"Agent {id!s} map-reduce failed: {err!s}")
+            yield _sse("error", {"detail": f"{type(err).__name__}: {err!s}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post(
+    "/{id}/jobs",
+    response_model=SuccessResponse[JobRead],
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[AgentRateLimit],
+)
+def enqueue_agent_job(
+    id: int,
+    data: JobCreate,
+    db_service: DatabaseServiceDep,
+    settings: SettingsDep,
+) -> SuccessResponse[JobRead]:
+    """
+    Enqueue a background run of an agent.
+
+    The job is picked up by a worker process (worker.py); poll
+    GET /jobs/{job_id} for its status and result.
+
+    Args:
+        id: Agent primary key.
+        data: Input and optional max_attempts.
+        db_service: Injected database service.
+        settings: Injected settings (default max attempts).
+
+    Returns:
+        SuccessResponse with the queued job.
+
+    Raises:
+        NotFoundException: If agent not found.
+    """
+    if db_service.get_agent(id) is None:
+        raise NotFoundException(detail="Agent not found")
+    job = db_service.create_job(
+        id, data, default_max_attempts=settings.JOB_MAX_ATTEMPTS
+    )
+    return SuccessResponse(
+        message="Job queued",
+        data=orm_to_schema(job, JobRead),
+    )
@@ -0,0 +1,76 @@
+"""
+File: agent_run.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 6:52:19 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from datetime import datetime
+
+from fastapi import APIRouter
+
+from app.dependecies import DatabaseServiceDep
+from app.schemas.api.agent_run import AgentRunStatsByAgent, AgentRunStatsByDay
+from app.schemas.api.base import SuccessResponse
+
+router = APIRouter(prefix="/agent-runs", tags=["agent-run"])
+
+
+@router.get(
+    "/stats/agents",
+    response_model=SuccessResponse[list[AgentRunStatsByAgent]],
+)
+def get_agent_run_stats_by_agent(
+    db_service: DatabaseServiceDep,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> SuccessResponse[list[AgentRunStatsByAgent]]:
+    """
+    p50/p95 latency and token totals per agent.
+
+    Args:
+        db_service: Injected database service.
+        since: Only runs started at or after this time.
+        until: Only runs started before this time.
+
+    Returns:
+        SuccessResponse with one entry per agent, most tokens first.
+    """
+    rows = db_service.agent_run_stats_by_agent(since=since, until=until)
+    return SuccessResponse(
+        message="Agent run stats per agent",
+        data=[AgentRunStatsByAgent.model_validate(row) for row in rows],
+    )
+
+
+@router.get(
+    "/stats/daily",
+    response_model=SuccessResponse[list[AgentRunStatsByDay]],
+)
+def get_agent_run_stats_by_day(
+    db_service: DatabaseServiceDep,
+    agent_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> SuccessResponse[list[AgentRunStatsByDay]]:
+    """
+    p50/p95 latency and token totals per UTC day.
+
+    Args:
+        db_service: Injected database service.
+        agent_id: Only runs of this agent.
+        since: Only runs started at or after this time.
+        until: Only runs started before this time.
+
+    Returns:
+        SuccessResponse with one entry per day, oldest first.
+    """
+    rows = db_service.agent_run_stats_by_day(
+        agent_id=agent_id, since=since, until=until
+    )
+    return SuccessResponse(
+        message="Agent run stats per day",
+        data=[AgentRunStatsByDay.model_validate(row) for row in rows],
+    )
@@ -0,0 +1,552 @@
+"""
+File: graph.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 8:03:40 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable
+import json
+from typing import Any
+
+from fastapi import APIRouter, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.core.exceptions import (
+    APIException,
+    ConflictException,
+    NotFoundException,
+    ValidationException,
+)
+from app.core.logger import get_logger
+from app.db.models.graph_run import GraphRunStatus
+from app.dependecies import (
+    DatabaseServiceDep,
+    GraphRuntimeDep,
+    ToolProviderDep,
+)
+from app.schemas.api.base import SuccessResponse
+from app.schemas.api.graph_run import GraphRunRequest, GraphRunResponse
+from app.schemas.db.agent import AgentRead
+from app.schemas.db.base import orm_to_schema
+from app.schemas.db.graph import (
+    GraphCreate,
+    GraphDefinition,
+    GraphPlan,
+    GraphRead,
+    GraphUpdate,
+)
+from app.schemas.db.graph_run import GraphRunRead
+from app.services.database_service import DatabaseService
+from app.services.graph_runtime import GraphRuntime
+from app.services.graph_validator import GraphValidationError, plan_graph
+from app.services.tool_provider import ToolProvider
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/graphs", tags=["graph"])
+
+RUN_ID_HEADER = "X-Graph-Run-Id"
+
+
+def _plan_graph(
+    definition: GraphDefinition,
+    entry_node: str,
+    db_service: DatabaseService,
+    tool_provider: ToolProvider,
+) -> GraphPlan:
+    """
+    Validate a definition against the DB and tools and plan it.
+
+    Args:
+        definition: Graph definition.
+        entry_node: Name of the entry node.
+        db_service: Database service (agent lookup).
+        tool_provider: Registered tools.
+
+    Returns:
+        GraphPlan: Execution plan to store with the graph.
+
+    Raises:
+        ValidationException: Listing every problem found.
+    """
+    agents = db_service.get_agents(definition.agent_ids())
+    try:
+        return plan_graph(
+            definition,
+            entry_node,
+            agent_ids=set(agents),
+            tool_names=set(tool_provider.tools),
+        )
+    except GraphValidationError as err:
+        raise ValidationException(detail=f"Invalid graph: {err!s}") from err
+
+
+@router.post(
+    "/",
+    response_model=SuccessResponse[GraphRead],
+    status_code=status.HTTP_201_CREATED,
+)
+def create_graph(
+    data: GraphCreate,
+    db_service: DatabaseServiceDep,
+    tool_provider: ToolProviderDep,
+) -> SuccessResponse[GraphRead]:
+    """
+    Create a new graph.
+
+    The definition is validated and its execution plan is stored with
+    it, so runs do no analysis.
+
+    Args:
+        data: Graph name, definition, and entry node.
+        db_service: Injected database service.
+        tool_provider: Injected tool provider.
+
+    Returns:
+        SuccessResponse with the created graph (GraphRead).
+
+    Raises:
+        ValidationException: If the definition is invalid.
+    """
+    plan = _plan_graph(
+        data.definition, data.entry_node, db_service, tool_provider
+    )
+    graph = db_service.create_graph(data, plan)
+    return SuccessResponse(
+        message="Graph created",
+        data=orm_to_schema(graph, GraphRead),
+    )
+
+
+@router.get("/", response_model=SuccessResponse[list[GraphRead]])
+def list_graphs(
+    db_service: DatabaseServiceDep,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+) -> SuccessResponse[list[GraphRead]]:
+    """
+    List graphs with optional pagination.
+
+    Args:
+        db_service: Injected database service.
+        skip: Number of records to skip.
+        limit: Max records to return.
+
+    Returns:
+        SuccessResponse with list of graphs.
+    """
+    graphs = db_service.list_graphs(skip=skip, limit=limit)
+    return SuccessResponse(
+        message="Graphs listed",
+        data=[orm_to_schema(g, GraphRead) for g in graphs],
+    )
+
+
+@router.get("/{id}", response_model=SuccessResponse[GraphRead])
+def get_graph(
+    id: int,
+    db_service: DatabaseServiceDep,
+) -> SuccessResponse[GraphRead]:
+    """
+    Get a graph by id.
+
+    Args:
+        id: Graph primary key.
+        db_service: Injected database service.
+
+    Returns:
+        SuccessResponse with the graph.
+
+    Raises:
+        NotFoundException: If graph not found.
+    """
+    graph = db_service.get_graph(id)
+    if graph is None:
+        raise NotFoundException(detail="Graph not found")
+    return SuccessResponse(
+        message="Graph found",
+        data=orm_to_schema(graph, GraphRead),
+    )
+
+
+@router.patch("/{id}", response_model=SuccessResponse[GraphRead])
+def update_graph(
+    id: int,
+    data: GraphUpdate,
+    db_service: DatabaseServiceDep,
+    tool_provider: ToolProviderDep,
+) -> SuccessResponse[GraphRead]:
+    """
+    Update a graph by id (partial update).
+
+    A new definition or entry node is validated together with the
+    stored fields, and the plan is recomputed.
+
+    Args:
+        id: Graph primary key.
+        data: Fields to update.
+        db_service: Injected database service.
+        tool_provider: Injected tool provider.
+
+    Returns:
+        SuccessResponse with the updated graph.
+
+    Raises:
+        NotFoundException: If graph not found.
+        ValidationException: If the resulting definition is invalid.
+    """
+    current = db_service.get_graph(id)
+    if current is None:
+        raise NotFoundException(detail="Graph not found")
+    plan = None
+    if data.definition is not None or data.entry_node is not None:
+        plan = _plan_graph(
+            data.definition
+            or GraphDefinition.model_validate(current.definition),
+            data.entry_node or current.entry_node,
+            db_service,
+            tool_provider,
+        )
+    graph = db_service.update_graph(id, data, plan)
+    if graph is None:
+        raise NotFoundException(detail="Graph not found")
+    return SuccessResponse(
+        message="Graph updated",
+        data=orm_to_schema(graph, GraphRead),
+    )
+
+
+@router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_graph(
+    id: int,
+    db_service: DatabaseServiceDep,
+) -> None:
+    """
+    Delete a graph by id.
+
+    Args:
+        id: Graph primary key.
+        db_service: Injected database service.
+
+    Raises:
+        NotFoundException: If graph not found.
+    """
+    deleted = db_service.delete_graph(id)
+    if not deleted:
+        raise NotFoundException(detail="Graph not found")
+
+
+def _load_graph(
+    db_service: DatabaseService, id: int
+) -> tuple[GraphRead, dict[int, AgentRead]]:
+    """
+    Load a graph and the agents its nodes reference.
+
+    Args:
+        db_service: Database service.
+        id: Graph primary key.
+
+    Returns:
+        tuple: The graph and its agents by id.
+
+    Raises:
+        NotFoundException: If graph not found.
+    """
+    graph = db_service.get_graph(id)
+    if graph is None:
+        raise NotFoundException(detail="Graph not found")
+    schema = orm_to_schema(graph, GraphRead)
+    agents = db_service.get_agents(schema.definition.agent_ids())
+    return schema, {
+        agent_id: orm_to_schema(agent, AgentRead)
+        for agent_id, agent in agents.items()
+    }
+
+
+async def _start_run(
+    runtime: GraphRuntime, graph: GraphRead, user_input: str
+) -> int | None:
+    """Record a checkpointed run (None if checkpoints are off)."""
+    if runtime.runs is None:
+        return None
+    return await asyncio.to_thread(runtime.runs.create, graph, user_input)
+
+
+def _run_failed(run_id: int, err: Exception) -> APIException:
+    """Error of a failed run, naming the run to resume."""
+    if isinstance(err, APIException):
+        err.headers = {**(err.headers or {}), RUN_ID_HEADER: str(run_id)}
+        return err
+    return APIException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=(
+            f"Graph run {run_id!s} failed: {type(err).__name__}: {err!s}. "
+            f"Resume it with POST /graphs/runs/{run_id!s}/resume"
+        ),
+        error_code="GRAPH_RUN_FAILED",
+        headers={RUN_ID_HEADER: str(run_id)},
+    )
+
+
+async def _interrupted(runtime: GraphRuntime, run_id: int | None) -> None:
+    """
+    Mark a run that stopped without an error (the request was cancelled
+    or the stream closed) as failed, so it can be resumed instead of
+    staying running. The update runs in a thread, so it completes even
+    if the awaiting task is cancelled again.
+    """
+    if run_id is None:
+        return
+    logger.warning(f"Graph run {run_id!s} interrupted")
+    await asyncio.to_thread(
+        runtime.runs.fail, run_id, "Interrupted: the request was cancelled"
+    )
+
+
+async def _tracked(
+    runtime: GraphRuntime,
+    run_id: int | None,
+    execution: Awaitable[dict[str, Any]],
+) -> GraphRunResponse:
+    """
+    Await a run and record how it ended.
+
+    Args:
+        runtime: Graph runtime (holds the run store).
+        run_id: Recorded run, or None if checkpoints are off.
+        execution: The run.
+
+    Returns:
+        GraphRunResponse: Outputs of the run.
+
+    Raises:
+        APIException: If the run fails; a recorded run's id is sent in
+            the X-Graph-Run-Id header.
+    """
+    try:
+        state = await execution
+    except Exception as err:
+        if run_id is None:
+            raise
+        logger.error(f"Graph run {run_id!s} failed: {err!s}")
+        await asyncio.to_thread(
+            runtime.runs.fail, run_id, f"{type(err).__name__}: {err!s}"
+        )
+        raise _run_failed(run_id, err) from err
+    except BaseException:
+        await _interrupted(runtime, run_id)
+        raise
+    result = GraphRunResponse.from_state(state, run_id)
+    if run_id is not None:
+        await asyncio.to_thread(
+            runtime.runs.succeed, run_id, result.model_dump(mode="json")
+        )
+    return result
+
+
+@router.post("/{id}/run", response_model=SuccessResponse[GraphRunResponse])
+async def run_graph(
+    id: int,
+    data: GraphRunRequest,
+    db_service: DatabaseServiceDep,
+    runtime: GraphRuntimeDep,
+) -> SuccessResponse[GraphRunResponse]:
+    """
+    Run a graph with a single user message.
+
+    The compiled graph is reused until the graph or one of its agents
+    changes; the DB lookup runs in the threadpool. With checkpoints on,
+    the run is recorded and its state saved after each step: a failed
+    run answers with its id (X-Graph-Run-Id) and can be resumed.
+
+    Args:
+        id: Graph primary key.
+        data: User input.
+        db_service: Injected database service.
+        runtime: Injected graph runtime.
+
+    Returns:
+        SuccessResponse with the last output and every node's output.
+
+    Raises:
+        NotFoundException: If graph not found.
+        ValidationException: If the graph does not compile.
+    """
+    graph, agents = await run_in_threadpool(_load_graph, db_service, id)
+    runtime.get_compiled(graph, agents)
+    run_id = await _start_run(runtime, graph, data.input)
+    result = await _tracked(
+        runtime, run_id, runtime.invoke(graph, agents, data.input, run_id)
+    )
+    return SuccessResponse(message="Graph run completed", data=result)
+
+
+def _get_run(runtime: GraphRuntime, run_id: int) -> GraphRunRead:
+    """
+    Fetch a recorded run.
+
+    Raises:
+        NotFoundException: If checkpoints are off or the run is unknown.
+    """
+    run = runtime.runs.get(run_id) if runtime.runs is not None else None
+    if run is None:
+        raise NotFoundException(detail="Graph run not found")
+    return run
+
+
+@router.get("/runs/{run_id}", response_model=SuccessResponse[GraphRunRead])
+async def get_graph_run(
+    run_id: int,
+    runtime: GraphRuntimeDep,
+) -> SuccessResponse[GraphRunRead]:
+    """
+    Get a recorded graph run.
+
+    Args:
+        run_id: Run id.
+        runtime: Injected graph runtime.
+
+    Returns:
+        SuccessResponse with the run (status, output or error).
+
+    Raises:
+        NotFoundException: If the run is unknown.
+    """
+    run = await run_in_threadpool(_get_run, runtime, run_id)
+    return SuccessResponse(message="Graph run found", data=run)
+
+
+@router.post(
+    "/runs/{run_id}/resume",
+    response_model=SuccessResponse[GraphRunResponse],
+)
+async def resume_graph_run(
+    run_id: int,
+    db_service: DatabaseServiceDep,
+    runtime: GraphRuntimeDep,
+) -> SuccessResponse[GraphRunResponse]:
+    """
+    Resume a failed run from its last checkpoint.
+
+    Nodes that finished before the failure are restored, not run again
+    (no repeated model calls). The graph must not have been edited since
+    the run started.
+
+    Args:
+        run_id: Id of the failed run.
+        db_service: Injected database service.
+        runtime: Injected graph runtime.
+
+    Returns:
+        SuccessResponse with the last output and every node's output.
+
+    Raises:
+        NotFoundException: If the run or its graph is not found.
+        ConflictException: If the run did not fail, another resume of
+            it is in progress, its graph changed, or its checkpoints were
+            already collected.
+    """
+    run = await run_in_threadpool(_get_run, runtime, run_id)
+    if run.status != GraphRunStatus.FAILED:
+        raise ConflictException(
+            detail=(
+                f"Run {run_id!s} has status {run.status!s}; "
+                "only failed runs resume"
+            )
+        )
+    graph, agents = await run_in_threadpool(
+        _load_graph, db_service, run.graph_id
+    )
+    if graph.updated_at != run.graph_version:
+        raise ConflictException(
+            detail=f"Graph {graph.id!s} changed since run {run_id!s} started"
+        )
+    if not await asyncio.to_thread(runtime.runs.restart, run_id):
+        raise ConflictException(
+            detail=f"Run {run_id!s} is already being resumed"
+        )
+    result = await _tracked(
+        runtime, run_id, runtime.resume(graph, agents, run_id)
+    )
+    return SuccessResponse(message="Graph run resumed", data=result)
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/{id}/run/stream")
+async def stream_graph(
+    id: int,
+    data: GraphRunRequest,
+    db_service: DatabaseServiceDep,
+    runtime: GraphRuntimeDep,
+) -> StreamingResponse:
+    """
+    Run a graph and stream node events as server-sent events.
+
+    Emits a `node` event (`{"node", "output"}`) as each node finishes,
+    then `end` with the last output, or `error` if the run fails. Both
+    carry the `run_id` of a recorded run. A run whose client disconnects
+    is marked failed, so it can be resumed. Compile errors are raised
+    before the stream starts.
+
+    Args:
+        id: Graph primary key.
+        data: User input.
+        db_service: Injected database service.
+        runtime: Injected graph runtime.
+
+    Returns:
+        StreamingResponse of text/event-stream.
+
+    Raises:
+        NotFoundException: If graph not found.
+        ValidationException: If the graph does not compile.
+    """
+    graph, agents = await run_in_threadpool(_load_graph, db_service, id)
+    runtime.get_compiled(graph, agents)
+    run_id = await _start_run(runtime, graph, data.input)
+
+    async def fail(detail: str) -> str:
+        if run_id is not None:
+            await asyncio.to_thread(runtime.runs.fail, run_id, detail)
+        return _sse("error", {"detail": detail, "run_id": run_id})
+
+    async def events() -> AsyncIterator[str]:
+        output = None
+        outputs: dict[str, Any] = {}
+        try:
+            async for event in runtime.stream(
+                graph, agents, data.input, run_id
+            ):
+                output = event["output"]
+                outputs[event["node"]] = output
+                yield _sse("node", event)
+        except APIException as err:
+            yield await fail(err.detail)
+            return
+        except Exception as err:
+            logger.error(f"Graph {id!s} run failed: {err!s}")
+            yield await fail(f"{type(err).__name__}: {err!s}")
+            return
+        except BaseException:
+            # The client disconnected (the stream was closed or cancelled).
+            await _interrupted(runtime, run_id)
+            raise
+        if run_id is not None:
+            result = GraphRunResponse(
+                output=str(output or ""), outputs=outputs, run_id=run_id
+            )
+            await asyncio.to_thread(
+                runtime.runs.succeed, run_id, result.model_dump(mode="json")
+            )
+        yield _sse("end", {"output": output, "run_id": run_id})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
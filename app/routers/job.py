@@ -0,0 +1,45 @@
+"""
+File: job.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 1:06:50 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from fastapi import APIRouter
+
+from app.core.exceptions import NotFoundException
+from app.dependecies import DatabaseServiceDep
+from app.schemas.api.base import SuccessResponse
+from app.schemas.db.base import orm_to_schema
+from app.schemas.db.job import JobRead
+
+router = APIRouter(prefix="/jobs", tags=["job"])
+
+
+@router.get("/{id}", response_model=SuccessResponse[JobRead])
+def get_job(
+    id: int,
+    db_service: DatabaseServiceDep,
+) -> SuccessResponse[JobRead]:
+    """
+    Get a background job by id (status, attempts and result).
+
+    Args:
+        id: Job primary key.
+        db_service: Injected database service.
+
+    Returns:
+        SuccessResponse with the job.
+
+    Raises:
+        NotFoundException: If job not found.
+    """
+    job = db_service.get_job(id)
+    if job is None:
+        raise NotFoundException(detail="Job not found")
+    return SuccessResponse(
+        message="Job found",
+        data=orm_to_schema(job, JobRead),
+    )
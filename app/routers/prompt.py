@@ -9,15 +9,60 @@ Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 
 from fastapi import APIRouter, Query, status
 
-from app.core.exceptions import NotFoundException
-from app.dependecies import DatabaseServiceDep
+from app.core.exceptions import NotFoundException, ValidationException
+from app.dependecies import DatabaseServiceDep, PromptTemplatesDep
+from app.runtime.prompt_template import (
+    PromptTemplate,
+    PromptTemplateCache,
+    TemplateError,
+)
 from app.schemas.api.base import SuccessResponse
+from app.schemas.api.prompt import (
+    PromptRenderBatchItem,
+    PromptRenderBatchRequest,
+    PromptRenderBatchResponse,
+    PromptRenderRequest,
+    PromptRenderResponse,
+)
 from app.schemas.db.base import orm_to_schema
 from app.schemas.db.prompt import PromptCreate, PromptRead, PromptUpdate
+from app.services.database_service import DatabaseService
 
 router = APIRouter(prefix="/prompts", tags=["prompt"])
 
 
+def _validate_template(content: str, variables: list[str] | None) -> None:
+    """
+    Reject a template that does not use exactly its declared variables.
+
+    Raises:
+        ValidationException: If the template is invalid.
+    """
+    try:
+        PromptTemplate.compile(content, variables)
+    except TemplateError as err:
+        raise ValidationException(detail=str(err)) from err
+
+
+def _compiled(
+    id: int, db_service: DatabaseService, templates: PromptTemplateCache
+) -> PromptTemplate:
+    """
+    Compiled template of a prompt, from the cache when it is current.
+
+    Raises:
+        NotFoundException: If prompt not found.
+        ValidationException: If the stored template is invalid.
+    """
+    prompt = db_service.get_prompt(id)
+    if prompt is None:
+        raise NotFoundException(detail="Prompt not found")
+    try:
+        return templates.get(prompt)
+    except TemplateError as err:
+        raise ValidationException(detail=str(err)) from err
+
+
 @router.post(
     "/",
     response_model=SuccessResponse[PromptRead],
@@ -36,7 +81,12 @@ def create_prompt(
 
     Returns:
         SuccessResponse with the created prompt (PromptRead).
+
+    Raises:
+        ValidationException: If the content does not use exactly the
+            declared variables.
     """
+    _validate_template(data.content, data.variables)
     prompt = db_service.create_prompt(data)
     return SuccessResponse(
         message="Prompt created",
@@ -114,7 +164,19 @@ def update_prompt(
 
     Raises:
         NotFoundException: If prompt not found.
+        ValidationException: If the resulting content does not use exactly
+            the declared variables.
     """
+    if data.content is not None or "variables" in data.model_fields_set:
+        current = db_service.get_prompt(id)
+        if current is None:
+            raise NotFoundException(detail="Prompt not found")
+        _validate_template(
+            data.content if data.content is not None else current.content,
+            data.variables
+            if "variables" in data.model_fields_set
+            else current.variables,
+        )
     prompt = db_service.update_prompt(id, data)
     if prompt is None:
         raise NotFoundException(detail="Prompt not found")
@@ -142,3 +204,91 @@ def delete_prompt(
     deleted = db_service.delete_prompt(id)
     if not deleted:
         raise NotFoundException(detail="Prompt not found")
+
+
+@router.post(
+    "/{id}/render", response_model=SuccessResponse[PromptRenderResponse]
+)
+def render_prompt(
+    id: int,
+    data: PromptRenderRequest,
+    db_service: DatabaseServiceDep,
+    templates: PromptTemplatesDep,
+) -> SuccessResponse[PromptRenderResponse]:
+    """
+    Render a prompt with one set of variables.
+
+    The template is compiled once per prompt version and cached by
+    `(id, updated_at)`.
+
+    Args:
+        id: Prompt primary key.
+        data: Value of each declared variable.
+        db_service: Injected database service.
+        templates: Injected compiled template cache.
+
+    Returns:
+        SuccessResponse with the rendered content.
+
+    Raises:
+        NotFoundException: If prompt not found.
+        ValidationException: If the template is invalid, or a variable is
+            missing or unknown.
+    """
+    template = _compiled(id, db_service, templates)
+    try:
+        content = template.render(data.variables)
+    except TemplateError as err:
+        raise ValidationException(detail=str(err)) from err
+    return SuccessResponse(
+        message="Prompt rendered",
+        data=PromptRenderResponse(content=content),
+    )
+
+
+@router.post(
+    "/{id}/render/batch",
+    response_model=SuccessResponse[PromptRenderBatchResponse],
+)
+def render_prompt_batch(
+    id: int,
+    data: PromptRenderBatchRequest,
+    db_service: DatabaseServiceDep,
+    templates: PromptTemplatesDep,
+) -> SuccessResponse[PromptRenderBatchResponse]:
+    """
+    Render a prompt with many variable sets against one compiled template.
+
+    Variable errors are reported per item and do not fail the request.
+
+    Args:
+        id: Prompt primary key.
+        data: Variable sets.
+        db_service: Injected database service.
+        templates: Injected compiled template cache.
+
+    Returns:
+        SuccessResponse with one result per variable set, in input order.
+
+    Raises:
+        NotFoundException: If prompt not found.
+        ValidationException: If the template is invalid.
+    """
+    template = _compiled(id, db_service, templates)
+    items: list[PromptRenderBatchItem] = []
+    for index, variables in enumerate(data.items):
+        try:
+            items.append(
+                PromptRenderBatchItem(
+                    index=index, content=template.render(variables)
+                )
+            )
+        except TemplateError as err:
+            items.append(PromptRenderBatchItem(index=index, error=str(err)))
+    failed = sum(1 for item in items if item.error is not None)
+    return SuccessResponse(
+        message="Prompt batch rendered",
+        data=PromptRenderBatchResponse(
+            items=items, succeeded=len(items) - failed, failed=failed
+        ),
+    )
@@ -0,0 +1,86 @@
+"""
+File: runtime.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 10:02:18 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.core.exceptions import NotFoundException
+from app.dependecies import AgentRuntimeDep
+from app.schemas.api.base import SuccessResponse
+
+router = APIRouter(prefix="/runtime", tags=["runtime"])
+
+
+@router.get("/metrics", response_model=SuccessResponse[dict[str, Any]])
+def get_runtime_metrics(
+    runtime: AgentRuntimeDep,
+) -> SuccessResponse[dict[str, Any]]:
+    """
+    Agent runtime metrics (in-flight runs, queue depth, wait times).
+
+    Args:
+        runtime: Injected agent runtime.
+
+    Returns:
+        SuccessResponse with metrics grouped by component.
+    """
+    return SuccessResponse(message="Runtime metrics", data=runtime.stats())
+
+
+@router.get(
+    "/breakers", response_model=SuccessResponse[dict[str, dict[str, Any]]]
+)
+def get_circuit_breakers(
+    runtime: AgentRuntimeDep,
+) -> SuccessResponse[dict[str, dict[str, Any]]]:
+    """
+    State of the circuit breakers of model providers and tools.
+
+    Args:
+        runtime: Injected agent runtime.
+
+    Returns:
+        SuccessResponse with each breaker's state and rolling window, by
+            key ("model:<provider>", "tool:<name>").
+    """
+    breakers = runtime.agent_factory.breakers
+    return SuccessResponse(
+        message="Circuit breakers",
+        data=breakers.snapshot() if breakers is not None else {},
+    )
+
+
+@router.post(
+    "/breakers/{key}/reset",
+    response_model=SuccessResponse[dict[str, Any]],
+)
+def reset_circuit_breaker(
+    key: str,
+    runtime: AgentRuntimeDep,
+) -> SuccessResponse[dict[str, Any]]:
+    """
+    Force a circuit breaker closed (e.g. once a provider has recovered).
+
+    Args:
+        key: Breaker key ("model:openai", "tool:web_search").
+        runtime: Injected agent runtime.
+
+    Returns:
+        SuccessResponse with the breaker's new state.
+
+    Raises:
+        NotFoundException: If no breaker has that key.
+    """
+    breakers = runtime.agent_factory.breakers
+    if breakers is None or not breakers.reset(key):
+        raise NotFoundException(detail="Circuit breaker not found")
+    return SuccessResponse(
+        message="Circuit breaker reset", data=breakers.get(key).snapshot()
+    )
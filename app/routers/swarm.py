@@ -0,0 +1,99 @@
+"""
+File: swarm.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 7:15:52 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.exceptions import NotFoundException
+from app.dependecies import DatabaseServiceDep, RunGuardDep, SwarmRuntimeDep
+from app.schemas.api.base import SuccessResponse
+from app.schemas.api.swarm import SwarmRunRequest, SwarmRunResponse
+from app.schemas.db.agent import AgentRead
+from app.schemas.db.base import orm_to_schema
+from app.services.database_service import DatabaseService
+from app.services.swarm_runtime import Subtask
+
+router = APIRouter(prefix="/swarms", tags=["swarm"])
+
+
+def _load_agents(
+    db_service: DatabaseService, ids: set[int]
+) -> dict[int, AgentRead]:
+    """
+    Load every agent of a swarm in one query.
+
+    Raises:
+        NotFoundException: Naming the agents that do not exist.
+    """
+    agents = db_service.get_agents(ids)
+    missing = sorted(ids - agents.keys())
+    if missing:
+        raise NotFoundException(
+            detail=f"Agents not found: {', '.join(map(str, missing))}"
+        )
+    return {
+        agent_id: orm_to_schema(agent, AgentRead)
+        for agent_id, agent in agents.items()
+    }
+
+
+@router.post("/run", response_model=SuccessResponse[SwarmRunResponse])
+async def run_swarm(
+    data: SwarmRunRequest,
+    db_service: DatabaseServiceDep,
+    runtime: SwarmRuntimeDep,
+    guard: RunGuardDep,
+) -> SuccessResponse[SwarmRunResponse]:
+    """
+    Fan a task out to many agents and collect their results.
+
+    Subtasks run concurrently (up to `max_concurrency`), each under the
+    agent runtime's limits; failures are reported per subtask and do not
+    fail the request. With `supervisor_agent_id`, that agent combines the
+    results into `output`. The run is bounded by the X-Request-Deadline /
+    X-Request-Timeout headers and cancelled if the client disconnects.
+
+    Args:
+        data: Task, subtasks, optional supervisor and max_concurrency.
+        db_service: Injected database service.
+        runtime: Injected swarm runtime.
+        guard: Injected deadline and disconnect guard.
+
+    Returns:
+        SuccessResponse with each subtask's result, in request order, and
+            the supervisor's answer.
+
+    Raises:
+        NotFoundException: If an agent is not found.
+        TooManyRequestsException: If the supervisor's run is rejected by
+            the run queue or a rate limit (429 with Retry-After).
+        GatewayTimeoutException: If the deadline passed (504).
+        ClientClosedRequestException: If the client left (499).
+    """
+    agents = await run_in_threadpool(_load_agents, db_service, data.agent_ids())
+    subtasks = [
+        Subtask(agents[subtask.agent_id], subtask.input)
+        for subtask in data.subtasks
+    ]
+    supervisor = (
+        agents[data.supervisor_agent_id]
+        if data.supervisor_agent_id is not None
+        else None
+    )
+    async with guard():
+        result = await runtime.run(
+            data.task,
+            subtasks,
+            supervisor=supervisor,
+            max_workers=data.max_concurrency,
+        )
+    return SuccessResponse(
+        message="Swarm run completed",
+        data=SwarmRunResponse.from_result(result),
+    )
@@ -0,0 +1,343 @@
+"""
+File: thread.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 11:08:19 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Sequence
+
+from fastapi import APIRouter, Query, status
+from fastapi.concurrency import run_in_threadpool
+from langchain_core.messages import HumanMessage
+
+from app.config import SettingsDep
+from app.config.settings import Settings
+from app.core.exceptions import NotFoundException, ValidationException
+from app.dependecies import (
+    AgentRuntimeDep,
+    DatabaseServiceDep,
+    TokenizerDep,
+)
+from app.runtime.context_window import (
+    ContextPolicy,
+    ContextStrategy,
+    StoredMessage,
+    clip_summary,
+    estimate_tokens,
+    summary_request,
+    to_chat_messages,
+)
+from app.schemas.api.agent_run import AgentInvokeResponse
+from app.schemas.api.base import SuccessResponse
+from app.schemas.api.thread import ThreadMessageRequest, ThreadTurnResponse
+from app.schemas.db.agent import AgentBase, AgentRead
+from app.schemas.db.base import orm_to_schema
+from app.schemas.db.thread import ThreadCreate, ThreadMessageRead, ThreadRead
+from app.services.agent_runtime import AgentRuntime
+from app.services.database_service import DatabaseService
+
+router = APIRouter(prefix="/threads", tags=["thread"])
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation. Merge the new "
+    "messages into the current summary. Keep facts, decisions, names and "
+    "open questions; drop small talk. Reply with the summary only."
+)
+
+
+def _policy(agent: AgentRead, settings: Settings) -> ContextPolicy:
+    """
+    Context policy of an agent: `config["context"]` over the defaults.
+
+    Raises:
+        ValidationException: If the agent's context config is invalid.
+    """
+    defaults = ContextPolicy(
+        strategy=ContextStrategy(settings.THREAD_CONTEXT_STRATEGY),
+        max_messages=settings.THREAD_CONTEXT_MAX_MESSAGES,
+        max_tokens=settings.THREAD_CONTEXT_MAX_TOKENS,
+        summary_max_tokens=settings.THREAD_SUMMARY_MAX_TOKENS,
+    )
+    try:
+        return ContextPolicy.from_config(agent.config.get("context"), defaults)
+    except (TypeError, ValueError) as err:
+        raise ValidationException(
+            detail=f"Invalid context config of agent {agent.id}: {err}"
+        ) from err
+
+
+async def _summarize(
+    runtime: AgentRuntime,
+    agent: AgentRead,
+    summary: str | None,
+    messages: Sequence[StoredMessage],
+    policy: ContextPolicy,
+) -> str:
+    """
+    Fold messages into a thread's rolling summary.
+
+    The summarizer runs on the agent's model, without its tools.
+    """
+    summarizer = AgentBase(
+        name=f"{agent.name} (summary)",
+        config={
+            "model": agent.config["model"],
+            "model_options": agent.config.get("model_options"),
+            "system_prompt": SUMMARY_SYSTEM_PROMPT,
+        },
+    )
+    state = await runtime.invoke(
+        summarizer,
+        summary_request(summary, messages, policy.summary_max_tokens),
+    )
+    reply = AgentInvokeResponse.from_state(state).output
+    return clip_summary(reply, policy.summary_max_tokens)
+
+
+async def _fold_backlog(
+    runtime: AgentRuntime,
+    db_service: DatabaseService,
+    agent: AgentRead,
+    thread: ThreadRead,
+    policy: ContextPolicy,
+    before_seq: int,
+) -> tuple[str | None, int]:
+    """
+    Fold every unsummarized message older than the tail into the summary.
+
+    Messages are read oldest first in pages of the tail's size, and the
+    summary is stored after each page, so a failure keeps the progress
+    made and `summary_seq` never passes a message that was not folded.
+
+    Returns:
+        tuple: The summary and the number of messages folded.
+    """
+    summary, summary_seq, folded = thread.summary, thread.summary_seq, 0
+    while True:
+        page = await run_in_threadpool(
+            db_service.list_thread_messages_after,
+            thread.id,
+            after_seq=summary_seq,
+            before_seq=before_seq,
+            limit=policy.max_messages * 2,
+        )
+        if not page:
+            return summary, folded
+        summary = await _summarize(runtime, agent, summary, page, policy)
+        summary_seq = page[-1].seq
+        folded += len(page)
+        await run_in_threadpool(
+            db_service.update_thread_summary, thread.id, summary, summary_seq
+        )
+
+
+@router.post(
+    "/",
+    response_model=SuccessResponse[ThreadRead],
+    status_code=status.HTTP_201_CREATED,
+)
+def create_thread(
+    data: ThreadCreate,
+    db_service: DatabaseServiceDep,
+) -> SuccessResponse[ThreadRead]:
+    """
+    Open a conversation thread with an agent.
+
+    Args:
+        data: Agent id and optional title.
+        db_service: Injected database service.
+
+    Returns:
+        SuccessResponse with the created thread.
+
+    Raises:
+        NotFoundException: If agent not found.
+    """
+    if db_service.get_agent(data.agent_id) is None:
+        raise NotFoundException(detail="Agent not found")
+    thread = db_service.create_thread(data)
+    return SuccessResponse(
+        message="Thread created",
+        data=orm_to_schema(thread, ThreadRead),
+    )
+
+
+@router.get("/{id}", response_model=SuccessResponse[ThreadRead])
+def get_thread(
+    id: int,
+    db_service: DatabaseServiceDep,
+) -> SuccessResponse[ThreadRead]:
+    """
+    Get a thread by id (agent, summary and message count).
+
+    Args:
+        id: Thread primary key.
+        db_service: Injected database service.
+
+    Returns:
+        SuccessResponse with the thread.
+
+    Raises:
+        NotFoundException: If thread not found.
+    """
+    thread = db_service.get_thread(id)
+    if thread is None:
+        raise NotFoundException(detail="Thread not found")
+    return SuccessResponse(
+        message="Thread found",
+        data=orm_to_schema(thread, ThreadRead),
+    )
+
+
+@router.get(
+    "/{id}/messages",
+    response_model=SuccessResponse[list[ThreadMessageRead]],
+)
+def list_thread_messages(
+    id: int,
+    db_service: DatabaseServiceDep,
+    after_seq: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+) -> SuccessResponse[list[ThreadMessageRead]]:
+    """
+    List the newest messages of a thread, oldest first.
+
+    Args:
+        id: Thread primary key.
+        db_service: Injected database service.
+        after_seq: Only messages with a greater seq.
+        limit: Max messages to return.
+
+    Returns:
+        SuccessResponse with the messages.
+
+    Raises:
+        NotFoundException: If thread not found.
+    """
+    if db_service.get_thread(id) is None:
+        raise NotFoundException(detail="Thread not found")
+    messages = db_service.list_thread_messages(
+        id, after_seq=after_seq, limit=limit
+    )
+    return SuccessResponse(
+        message="Messages listed",
+        data=[orm_to_schema(m, ThreadMessageRead) for m in messages],
+    )
+
+
+@router.post(
+    "/{id}/messages",
+    response_model=SuccessResponse[ThreadTurnResponse],
+)
+async def post_thread_message(
+    id: int,
+    data: ThreadMessageRequest,
+    db_service: DatabaseServiceDep,
+    runtime: AgentRuntimeDep,
+    tokenizer: TokenizerDep,
+    settings: SettingsDep,
+) -> SuccessResponse[ThreadTurnResponse]:
+    """
+    Send a user message to a thread and get the bound agent's reply.
+
+    Only the thread's tail is read (through the (thread_id, seq) index)
+    and cut down by the agent's context strategy, so a turn's input stays
+    bounded however long the thread grows. With the `summary` strategy,
+    messages that fall out of the window are folded into the thread's
+    rolling summary first, and so is any older message the tail did not
+    reach.
+
+    Args:
+        id: Thread primary key.
+        data: User message.
+        db_service: Injected database service.
+        runtime: Injected agent runtime.
+        tokenizer: Injected tokenizer (message token counts).
+        settings: Injected settings (context defaults).
+
+    Returns:
+        SuccessResponse with the reply and the size of the context sent.
+
+    Raises:
+        NotFoundException: If thread or agent not found.
+        ValidationException: If the agent's context config is invalid.
+        TooManyRequestsException: If the run queue is full (429 with
+            Retry-After).
+    """
+    row = await run_in_threadpool(db_service.get_thread, id)
+    if row is None:
+        raise NotFoundException(detail="Thread not found")
+    thread = orm_to_schema(row, ThreadRead)
+    agent_row = await run_in_threadpool(db_service.get_agent, thread.agent_id)
+    if agent_row is None:
+        raise NotFoundException(detail="Agent not found")
+    agent = orm_to_schema(agent_row, AgentRead)
+    policy = _policy(agent, settings)
+
+    summarizing = policy.strategy == ContextStrategy.SUMMARY
+    summary = thread.summary if summarizing else None
+    history = await run_in_threadpool(
+        db_service.list_thread_messages,
+        id,
+        after_seq=thread.summary_seq if summarizing else 0,
+        limit=policy.max_messages * 2 if summarizing else policy.max_messages,
+    )
+    input_tokens = estimate_tokens(data.input, tokenizer)
+    window = policy.select(
+        history,
+        input_tokens,
+        estimate_tokens(summary, tokenizer) if summary else 0,
+    )
+    summarized = 0
+    # Seqs are contiguous: a gap before the tail holds messages that were
+    # never folded (e.g. the thread grew before it used `summary`).
+    if summarizing and history and history[0].seq > thread.summary_seq + 1:
+        summary, summarized = await _fold_backlog(
+            runtime, db_service, agent, thread, policy, history[0].seq
+        )
+    if summarizing and window.evicted:
+        summary = await _summarize(
+            runtime, agent, summary, window.evicted, policy
+        )
+        summarized += len(window.evicted)
+        await run_in_threadpool(
+            db_service.update_thread_summary,
+            id,
+            summary,
+            window.evicted[-1].seq,
+        )
+    if summarized:
+        window = policy.select(
+            window.messages, input_tokens, estimate_tokens(summary, tokenizer)
+        )
+
+    messages = to_chat_messages(window.messages, summary)
+    messages.append(HumanMessage(content=data.input))
+    state = await runtime.invoke(agent, messages)
+    reply = AgentInvokeResponse.from_state(state)
+    stored = await run_in_threadpool(
+        db_service.append_thread_messages,
+        id,
+        [
+            ("user", data.input, input_tokens),
+            (
+                "assistant",
+                reply.output,
+                estimate_tokens(reply.output, tokenizer),
+            ),
+        ],
+    )
+    return SuccessResponse(
+        message="Message answered",
+        data=ThreadTurnResponse(
+            seq=stored[-1].seq,
+            output=reply.output,
+            structured_response=reply.structured_response,
+            context_messages=len(window.messages),
+            context_tokens=window.tokens,
+            summarized=summarized,
+        ),
+    )
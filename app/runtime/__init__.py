@@ -0,0 +1,177 @@
+"""
+File: __init__.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 9:10:12 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from .cancellation import (
+    ClientDisconnectedError,
+    DeadlineExceededError,
+    DeadlineMiddleware,
+    cancel_on_disconnect,
+    deadline_scope,
+    remaining,
+)
+from .checkpoint import PostgresCheckpointer, ZstdSerializer
+from .chunking import split_text
+from .circuit_breaker import (
+    BreakerPolicy,
+    BreakerState,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    ToolBreakerMiddleware,
+    is_transient,
+)
+from .concurrency import ConcurrencyLimiter, QueueFullError
+from .context_window import (
+    ContextPolicy,
+    ContextStrategy,
+    ContextWindow,
+    estimate_tokens,
+)
+from .embeddings import (
+    Embedder,
+    HashingEmbedder,
+    LangChainEmbedder,
+    build_embedder,
+)
+from .fake_chat_model import FakeChatModel, build_chat_model
+from .model_fallback import (
+    FallbackPolicy,
+    ModelFallbackMiddleware,
+    ModelLatencyTracker,
+)
+from .model_registry import ModelRegistry
+from .preflight import (
+    ContextWindowExceededError,
+    Preflight,
+    PreflightMode,
+)
+from .prompt_template import (
+    PromptTemplate,
+    PromptTemplateCache,
+    TemplateError,
+)
+from .rate_limit import (
+    MemoryBucketStore,
+    PostgresBucketStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceededError,
+    RateLimitScope,
+)
+from .response_cache import (
+    PostgresResponseCacheStore,
+    ResponseCache,
+    ResponseCacheMiddleware,
+)
+from .run_metrics import (
+    RunMetricsMiddleware,
+    RunRecord,
+    current_run,
+    record_cache_hit,
+    track_run,
+)
+from .semantic_cache import SemanticCache, SemanticIndex, SemanticLookup
+from .single_flight import SingleFlight
+from .stats import LatencyWindow
+from .tokenizer import (
+    HeuristicTokenizer,
+    TiktokenTokenizer,
+    Tokenizer,
+    build_tokenizer,
+)
+from .tool_cache import ToolCacheMiddleware, ToolCachePolicy, ToolMemo
+from .tool_executor import ToolExecutor
+from .traffic import (
+    PIIMasker,
+    Recording,
+    ReplayMissError,
+    TrafficMiddleware,
+    TrafficMode,
+    TrafficRecorder,
+    TrafficReplay,
+    read_recordings,
+)
+from .ttl_cache import TTLCache
+
+__all__ = [
+    "BreakerPolicy",
+    "BreakerState",
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "CircuitOpenError",
+    "ClientDisconnectedError",
+    "ConcurrencyLimiter",
+    "ContextPolicy",
+    "ContextStrategy",
+    "ContextWindow",
+    "ContextWindowExceededError",
+    "DeadlineExceededError",
+    "DeadlineMiddleware",
+    "Embedder",
+    "FakeChatModel",
+    "FallbackPolicy",
+    "HashingEmbedder",
+    "HeuristicTokenizer",
+    "LangChainEmbedder",
+    "LatencyWindow",
+    "MemoryBucketStore",
+    "ModelFallbackMiddleware",
+    "ModelLatencyTracker",
+    "ModelRegistry",
+    "PIIMasker",
+    "PostgresBucketStore",
+    "PostgresCheckpointer",
+    "PostgresResponseCacheStore",
+    "Preflight",
+    "PreflightMode",
+    "PromptTemplate",
+    "PromptTemplateCache",
+    "QueueFullError",
+    "RateLimit",
+    "RateLimitExceededError",
+    "RateLimitScope",
+    "RateLimiter",
+    "Recording",
+    "ReplayMissError",
+    "ResponseCache",
+    "ResponseCacheMiddleware",
+    "RunMetricsMiddleware",
+    "RunRecord",
+    "SemanticCache",
+    "SemanticIndex",
+    "SemanticLookup",
+    "SingleFlight",
+    "TTLCache",
+    "TemplateError",
+    "TiktokenTokenizer",
+    "Tokenizer",
+    "ToolBreakerMiddleware",
+    "ToolCacheMiddleware",
+    "ToolCachePolicy",
+    "ToolExecutor",
+    "ToolMemo",
+    "TrafficMiddleware",
+    "TrafficMode",
+    "TrafficRecorder",
+    "TrafficReplay",
+    "ZstdSerializer",
+    "build_chat_model",
+    "build_embedder",
+    "build_tokenizer",
+    "cancel_on_disconnect",
+    "current_run",
+    "deadline_scope",
+    "estimate_tokens",
+    "is_transient",
+    "read_recordings",
+    "record_cache_hit",
+    "remaining",
+    "split_text",
+    "track_run",
+]
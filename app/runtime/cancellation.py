@@ -0,0 +1,219 @@
+"""
+File: cancellation.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 4:41:27 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+)
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+import time
+
+from langchain.agents.middleware import (
+    AgentMiddleware,
+    ModelRequest,
+    ModelResponse,
+    ToolCallRequest,
+)
+from langchain_core.messages import ToolMessage
+from langgraph.types import Command
+
+
+class DeadlineExceededError(TimeoutError):
+    """The deadline of the request serving a run has passed."""
+
+    def __init__(self, stage: str) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            stage: What was stopped ("run", "model call", "tool call").
+        """
+        super().__init__(f"Request deadline exceeded before the {stage} ended")
+        self.stage = stage
+
+
+class ClientDisconnectedError(Exception):
+    """The client of a request went away while it was being served."""
+
+
+# Absolute deadline (time.monotonic) of the request being served.
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(timeout: float | None) -> Generator[None]:
+    """
+    Bound the work started in the block to `timeout` seconds from now.
+
+    Scopes nest: an inner scope can only tighten the deadline. Graph
+    tasks and tool threads copy the context, so model and tool calls
+    anywhere inside the run see the same deadline.
+
+    Args:
+        timeout: Seconds left (None keeps the current deadline).
+    """
+    current = _deadline.get()
+    if timeout is None:
+        yield
+        return
+    deadline = time.monotonic() + timeout
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def without_deadline() -> Generator[None]:
+    """
+    Run the block with no deadline.
+
+    For work shared by several requests (coalesced runs): it must not be
+    bound by the deadline of whichever request started it, so each
+    request enforces its own deadline while it waits instead.
+    """
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds until the current deadline (None if there is none)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(stage: str) -> None:
+    """
+    Fail fast if the current deadline has passed.
+
+    Raises:
+        DeadlineExceededError: If no time is left.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError(stage)
+
+
+@asynccontextmanager
+async def enforce_deadline(stage: str = "run") -> AsyncGenerator[None]:
+    """
+    Cancel the block when the current deadline passes.
+
+    Raises:
+        DeadlineExceededError: If the block was cut off.
+    """
+    check_deadline(stage)
+    try:
+        async with asyncio.timeout(remaining()):
+            yield
+    except TimeoutError as err:
+        if isinstance(err, DeadlineExceededError):
+            raise
+        raise DeadlineExceededError(stage) from err
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(
+    is_disconnected: Callable[[], Awaitable[bool]],
+    interval: float = 0.5,
+) -> AsyncGenerator[None]:
+    """
+    Cancel the block when the client goes away.
+
+    A watcher polls `is_disconnected` every `interval` seconds and cancels
+    the current task once it reports True, so the model and tool calls in
+    flight are abandoned instead of finishing for nobody.
+
+    Args:
+        is_disconnected: Whether the client has disconnected
+            (`Request.is_disconnected`).
+        interval: Seconds between polls.
+
+    Raises:
+        ClientDisconnectedError: If the block was cancelled because the
+            client disconnected.
+    """
+    task = asyncio.current_task()
+    disconnected = False
+
+    async def watch() -> None:
+        nonlocal disconnected
+        while not await is_disconnected():
+            await asyncio.sleep(interval)
+        disconnected = True
+        task.cancel()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        yield
+    except asyncio.CancelledError:
+        if disconnected and task.uncancel() == 0:
+            raise ClientDisconnectedError("Client disconnected") from None
+        raise
+    finally:
+        watcher.cancel()
+
+
+class DeadlineMiddleware(AgentMiddleware):
+    """
+    Agent middleware bounding model and tool calls by the deadline.
+
+    A call starting after the deadline fails at once; an async call still
+    running at the deadline is cancelled. Sync calls can only be checked
+    before they start (tools that honour the deadline read `remaining`).
+    Outside a deadline scope it passes everything through.
+    """
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        """Call the model if time is left."""
+        check_deadline("model call")
+        return handler(request)
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Call the model, cancelled at the deadline."""
+        async with enforce_deadline("model call"):
+            return await handler(request)
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Run the tool if time is left."""
+        check_deadline("tool call")
+        return handler(request)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """Run the tool, cancelled at the deadline."""
+        async with enforce_deadline("tool call"):
+            return await handler(request)
@@ -0,0 +1,496 @@
+"""
+File: checkpoint.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 10:04:19 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from contextlib import AbstractContextManager
+from datetime import datetime
+import random
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+import zstandard
+
+from app.db.models.checkpoint import (
+    CheckpointBlob,
+    CheckpointRecord,
+    CheckpointWrite,
+)
+from app.db.session import session_context
+
+ZSTD_SUFFIX = "+zstd"
+
+
+class ZstdSerializer(SerializerProtocol):
+    """
+    msgpack serializer (LangGraph's JsonPlusSerializer) with zstd on top.
+
+    Empty payloads (sentinels of delta channels) are stored as is.
+    """
+
+    def __init__(
+        self, level: int = 3, inner: SerializerProtocol | None = None
+    ) -> None:
+        """
+        Initialize the serializer.
+
+        Args:
+            level: zstd compression level.
+            inner: Serializer producing the uncompressed bytes.
+        """
+        self.inner = inner or JsonPlusSerializer()
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        """Serialize and compress an object."""
+        type_, data = self.inner.dumps_typed(obj)
+        if not data:
+            return type_, data
+        return type_ + ZSTD_SUFFIX, self._compressor.compress(data)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        """Decompress and deserialize an object."""
+        type_, payload = data
+        if type_.endswith(ZSTD_SUFFIX):
+            type_ = type_.removesuffix(ZSTD_SUFFIX)
+            payload = self._decompressor.decompress(payload)
+        return self.inner.loads_typed((type_, payload))
+
+
+def _thread(config: RunnableConfig) -> tuple[str, str]:
+    """Thread id and namespace of a config."""
+    configurable = config["configurable"]
+    return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+
+class PostgresCheckpointer(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpoint saver backed by the application database.
+
+    A checkpoint row holds versions and metadata only. Channel values
+    are written once per new version (delta channels write an empty
+    sentinel and are rebuilt from node writes), and each node's update
+    is stored as its own write, so a step costs what it changed rather
+    than a copy of the whole state. Async methods run the sync session
+    in a thread.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractContextManager[Session]
+        ] = session_context,
+        serde: SerializerProtocol | None = None,
+    ) -> None:
+        """
+        Initialize the checkpointer.
+
+        Args:
+            session_factory: Context manager yielding a transactional
+                session (commits on success).
+            serde: Serializer (default: msgpack + zstd).
+        """
+        super().__init__(serde=serde or ZstdSerializer())
+        self._session_factory = session_factory
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        """Next channel version: zero-padded counter plus a random tail."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def _load_tuple(
+        self, session: Session, record: CheckpointRecord
+    ) -> CheckpointTuple:
+        """Build a checkpoint tuple from its row, blobs and writes."""
+        checkpoint: Checkpoint = self.serde.loads_typed(
+            (record.type, record.checkpoint)
+        )
+        versions = checkpoint["channel_versions"]
+        blobs = session.scalars(
+            select(CheckpointBlob).where(
+                CheckpointBlob.thread_id == record.thread_id,
+                CheckpointBlob.checkpoint_ns == record.checkpoint_ns,
+                tuple_(CheckpointBlob.channel, CheckpointBlob.version).in_(
+                    [(k, str(v)) for k, v in versions.items()]
+                ),
+            )
+        ).all()
+        writes = session.scalars(
+            select(CheckpointWrite)
+            .where(
+                CheckpointWrite.thread_id == record.thread_id,
+                CheckpointWrite.checkpoint_ns == record.checkpoint_ns,
+                CheckpointWrite.checkpoint_id == record.checkpoint_id,
+            )
+            .order_by(
+                CheckpointWrite.task_path,
+                CheckpointWrite.task_id,
+                CheckpointWrite.idx,
+            )
+        ).all()
+        configurable = {
+            "thread_id": record.thread_id,
+            "checkpoint_ns": record.checkpoint_ns,
+        }
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    **configurable,
+                    "checkpoint_id": record.checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": {
+                    blob.channel: self.serde.loads_typed((blob.type, blob.blob))
+                    for blob in blobs
+                    if blob.type != "empty"
+                },
+            },
+            metadata=self.serde.loads_typed((record.type, record.meta)),
+            pending_writes=[
+                (w.task_id, w.channel, self.serde.loads_typed((w.type, w.blob)))
+                for w in writes
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        **configurable,
+                        "checkpoint_id": record.parent_checkpoint_id,
+                    }
+                }
+                if record.parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """
+        Get a checkpoint tuple, the latest one unless the config names one.
+
+        Args:
+            config: Config with `thread_id` (and optional `checkpoint_id`).
+
+        Returns:
+            CheckpointTuple | None: The checkpoint, or None if missing.
+        """
+        thread_id, checkpoint_ns = _thread(config)
+        stmt = select(CheckpointRecord).where(
+            CheckpointRecord.thread_id == thread_id,
+            CheckpointRecord.checkpoint_ns == checkpoint_ns,
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            stmt = stmt.where(CheckpointRecord.checkpoint_id == checkpoint_id)
+        stmt = stmt.order_by(CheckpointRecord.checkpoint_id.desc()).limit(1)
+        with self._session_factory() as session:
+            record = session.scalars(stmt).first()
+            if record is None:
+                return None
+            return self._load_tuple(session, record)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        List checkpoints, newest first.
+
+        Args:
+            config: Config with `thread_id` (None = all threads).
+            filter: Metadata key/values the checkpoints must match.
+            before: Only checkpoints older than this one.
+            limit: Max checkpoints returned.
+
+        Yields:
+            CheckpointTuple: Matching checkpoints.
+        """
+        stmt = select(CheckpointRecord)
+        if config is not None:
+            thread_id, checkpoint_ns = _thread(config)
+            stmt = stmt.where(
+                CheckpointRecord.thread_id == thread_id,
+                CheckpointRecord.checkpoint_ns == checkpoint_ns,
+            )
+            if checkpoint_id := get_checkpoint_id(config):
+                stmt = stmt.where(
+                    CheckpointRecord.checkpoint_id == checkpoint_id
+                )
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            stmt = stmt.where(CheckpointRecord.checkpoint_id < before_id)
+        stmt = stmt.order_by(CheckpointRecord.checkpoint_id.desc())
+        with self._session_factory() as session:
+            tuples = []
+            for record in session.scalars(stmt):
+                if limit is not None and len(tuples) >= limit:
+                    break
+                found = self._load_tuple(session, record)
+                if filter and any(
+                    found.metadata.get(key) != value
+                    for key, value in filter.items()
+                ):
+                    continue
+                tuples.append(found)
+        yield from tuples
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Store a checkpoint and the values of the channels it changed.
+
+        Args:
+            config: Config of the parent checkpoint.
+            checkpoint: Checkpoint to store.
+            metadata: Checkpoint metadata.
+            new_versions: Channels changed since the parent, by version.
+
+        Returns:
+            RunnableConfig: Config pointing at the stored checkpoint.
+        """
+        thread_id, checkpoint_ns = _thread(config)
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+        blobs = []
+        for channel, version in new_versions.items():
+            type_, blob = (
+                self.serde.dumps_typed(values[channel])
+                if channel in values
+                else ("empty", b"")
+            )
+            blobs.append(
+                {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "channel": channel,
+                    "version": str(version),
+                    "type": type_,
+                    "blob": blob,
+                }
+            )
+        # Checkpoint and metadata are both dicts: one serializer type.
+        type_, data = self.serde.dumps_typed(stored)
+        _, meta = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        row = {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+            "type": type_,
+            "checkpoint": data,
+            "meta": meta,
+        }
+        with self._session_factory() as session:
+            if blobs:
+                session.execute(
+                    insert(CheckpointBlob)
+                    .values(blobs)
+                    .on_conflict_do_nothing()
+                )
+            stmt = insert(CheckpointRecord).values(**row)
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[
+                        CheckpointRecord.thread_id,
+                        CheckpointRecord.checkpoint_ns,
+                        CheckpointRecord.checkpoint_id,
+                    ],
+                    set_={"checkpoint": data, "metadata": meta},
+                )
+            )
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Store the writes of a finished node.
+
+        Args:
+            config: Config of the checkpoint the node ran on.
+            writes: (channel, value) pairs.
+            task_id: Node task id.
+            task_path: LangGraph task path.
+        """
+        thread_id, checkpoint_ns = _thread(config)
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append(
+                {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": config["configurable"]["checkpoint_id"],
+                    "task_id": task_id,
+                    "idx": WRITES_IDX_MAP.get(channel, idx),
+                    "channel": channel,
+                    "type": type_,
+                    "blob": blob,
+                    "task_path": task_path,
+                }
+            )
+        if not rows:
+            return
+        stmt = insert(CheckpointWrite).values(rows)
+        # Special writes (errors, interrupts) replace earlier ones; node
+        # writes are idempotent.
+        if all(channel in WRITES_IDX_MAP for channel, _ in writes):
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    CheckpointWrite.thread_id,
+                    CheckpointWrite.checkpoint_ns,
+                    CheckpointWrite.checkpoint_id,
+                    CheckpointWrite.task_id,
+                    CheckpointWrite.idx,
+                ],
+                set_={
+                    "channel": stmt.excluded.channel,
+                    "type": stmt.excluded.type,
+                    "blob": stmt.excluded.blob,
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing()
+        with self._session_factory() as session:
+            session.execute(stmt)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete every checkpoint, value and write of a run.
+
+        Args:
+            thread_id: Run whose checkpoints are deleted.
+        """
+        self.delete_threads([thread_id])
+
+    def delete_threads(self, thread_ids: Sequence[str]) -> None:
+        """
+        Delete every checkpoint, value and write of several runs.
+
+        Args:
+            thread_ids: Runs whose checkpoints are deleted.
+        """
+        if not thread_ids:
+            return
+        with self._session_factory() as session:
+            for model in (CheckpointWrite, CheckpointBlob, CheckpointRecord):
+                session.execute(
+                    delete(model).where(model.thread_id.in_(thread_ids))
+                )
+
+    def purge_older_than(self, cutoff: datetime) -> int:
+        """
+        Delete runs whose latest checkpoint is older than `cutoff`.
+
+        Args:
+            cutoff: Runs idle since before this time are deleted.
+
+        Returns:
+            int: Number of runs deleted.
+        """
+        stmt = (
+            select(CheckpointRecord.thread_id)
+            .group_by(CheckpointRecord.thread_id)
+            .having(func.max(CheckpointRecord.created_at) < cutoff)
+        )
+        with self._session_factory() as session:
+            thread_ids = list(session.scalars(stmt).all())
+        self.delete_threads(thread_ids)
+        return len(thread_ids)
+
+    async def aget_tuple(
+        self, config: RunnableConfig
+    ) -> CheckpointTuple | None:
+        """Async `get_tuple` (runs in a thread)."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async `list` (runs in a thread)."""
+        tuples = await asyncio.to_thread(
+            lambda: list(
+                self.list(config, filter=filter, before=before, limit=limit)
+            )
+        )
+        for found in tuples:
+            yield found
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async `put` (runs in a thread)."""
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async `put_writes` (runs in a thread)."""
+        await asyncio.to_thread(
+            self.put_writes, config, writes, task_id, task_path
+        )
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async `delete_thread` (runs in a thread)."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
@@ -0,0 +1,95 @@
+"""
+File: chunking.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 7:48:13 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from app.runtime.tokenizer import Tokenizer
+
+# Natural boundaries, coarsest first: paragraphs, lines, sentences, words.
+SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def split_text(
+    text: str,
+    tokenizer: Tokenizer,
+    max_tokens: int,
+    separators: tuple[str, ...] = SEPARATORS,
+) -> list[str]:
+    """
+    Split a text into chunks of at most `max_tokens` tokens.
+
+    The text is split on the coarsest separator first and the pieces are
+    packed greedily into chunks; a piece that is too large on its own is
+    split again on the next separator, and a run of text without any
+    separator is cut by length. Piece counts are summed rather than
+    recounted per chunk, which slightly overestimates a chunk's tokens,
+    so chunks stay within the bound. Blank chunks are dropped.
+
+    Args:
+        text: Text to split.
+        tokenizer: Counts tokens.
+        max_tokens: Max tokens of a chunk.
+        separators: Boundaries to split on, coarsest first.
+
+    Returns:
+        list[str]: Chunks in text order.
+
+    Raises:
+        ValueError: If `max_tokens` is below 1.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+    chunks = _split(text, tokenizer, max_tokens, separators)
+    return [chunk.strip() for chunk in chunks if chunk.strip()]
+
+
+def _split(
+    text: str,
+    tokenizer: Tokenizer,
+    max_tokens: int,
+    separators: tuple[str, ...],
+) -> list[str]:
+    """Split `text` on the first separator, recursing into large pieces."""
+    if tokenizer.count(text) <= max_tokens:
+        return [text]
+    if not separators:
+        return _cut(text, tokenizer, max_tokens)
+    separator, rest = separators[0], separators[1:]
+    separator_tokens = tokenizer.count(separator)
+    chunks: list[str] = []
+    current: list[str] = []
+    tokens = 0
+    for piece in text.split(separator):
+        size = tokenizer.count(piece)
+        if size > max_tokens:
+            if current:
+                chunks.append(separator.join(current))
+                current, tokens = [], 0
+            chunks.extend(_split(piece, tokenizer, max_tokens, rest))
+            continue
+        if current and tokens + separator_tokens + size > max_tokens:
+            chunks.append(separator.join(current))
+            current, tokens = [], 0
+        tokens += size + (separator_tokens if current else 0)
+        current.append(piece)
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def _cut(text: str, tokenizer: Tokenizer, max_tokens: int) -> list[str]:
+    """Cut text without separators into consecutive bounded slices."""
+    chunks: list[str] = []
+    while text:
+        head = text
+        tokens = tokenizer.count(head)
+        while tokens > max_tokens and len(head) > 1:
+            head = head[: max(1, int(len(head) * max_tokens / tokens * 0.98))]
+            tokens = tokenizer.count(head)
+        chunks.append(head)
+        text = text[len(head) :]
+    return chunks
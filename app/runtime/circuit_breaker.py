@@ -0,0 +1,521 @@
+"""
+File: circuit_breaker.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 5:58:12 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections import deque
+from collections.abc import Awaitable, Callable, Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+import threading
+import time
+from typing import Any
+
+from langchain.agents.middleware import AgentMiddleware, ToolCallRequest
+from langchain_core.messages import ToolMessage
+from langgraph.errors import GraphBubbleUp
+from langgraph.prebuilt.tool_node import TOOL_INVOCATION_ERROR_TEMPLATE
+from langgraph.types import Command
+
+from app.runtime.cancellation import DeadlineExceededError
+from app.runtime.model_registry import parse_model
+
+# Errors that say nothing about the health of the called backend.
+_NEUTRAL = (GraphBubbleUp, DeadlineExceededError)
+# Error class names of clients' network failures (httpx, openai, ...).
+_TRANSIENT_NAMES = ("Timeout", "Connect", "Network", "Transport")
+# Start of the error message ToolNode answers calls with invalid
+# arguments with: the model's mistake, not the tool's.
+_INVALID_CALL = TOOL_INVOCATION_ERROR_TEMPLATE.split("{", 1)[0]
+
+
+def _status_code(err: BaseException) -> int | None:
+    """HTTP status of a client error (`status_code` or its response's)."""
+    status = getattr(err, "status_code", None)
+    if status is None:
+        status = getattr(getattr(err, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient(err: BaseException) -> bool:
+    """
+    Whether an error says the backend is unhealthy.
+
+    Errors with an HTTP status are transient on 408, 429 and 5xx; other
+    4xx are the caller's fault (bad request, auth, unknown model) and
+    the backend answered. Errors without a status are transient when
+    they are timeouts or connection failures.
+
+    Args:
+        err: Raised error.
+
+    Returns:
+        bool: True if the error should count against the backend.
+    """
+    status = _status_code(err)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    if isinstance(err, (TimeoutError, ConnectionError)):
+        return True
+    return any(
+        marker in cls.__name__
+        for cls in type(err).__mro__
+        for marker in _TRANSIENT_NAMES
+    )
+
+
+class BreakerState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    A call was refused because its backend's breaker is open.
+
+    Attributes:
+        key: Breaker that refused the call (e.g. "model:openai").
+        retry_after: Seconds until the breaker lets a trial call through.
+    """
+
+    def __init__(self, key: str, retry_after: float) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            key: Breaker that refused the call.
+            retry_after: Seconds until the breaker half-opens.
+        """
+        super().__init__(f"Circuit of {key} is open")
+        self.key = key
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class BreakerPolicy:
+    """
+    When a breaker opens and how it recovers.
+
+    Attributes:
+        window: Outcomes of the most recent calls kept per breaker.
+        min_calls: Calls in the window before the breaker may open.
+        error_rate: Share of failed calls that opens it (0 = never).
+        slow_call: Seconds above which a call counts as slow (0 = none).
+        slow_rate: Share of slow calls that opens it.
+        open_seconds: Seconds an open breaker refuses calls before it
+            half-opens.
+        half_open_calls: Trial calls a half-open breaker lets through;
+            it closes once they all succeed in time.
+    """
+
+    window: int = 20
+    min_calls: int = 10
+    error_rate: float = 0.5
+    slow_call: float = 0.0
+    slow_rate: float = 1.0
+    open_seconds: float = 30.0
+    half_open_calls: int = 1
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a rolling window of calls.
+
+    While closed, calls pass and their outcomes fill the window; once it
+    holds `min_calls` outcomes and the failed or slow share reaches the
+    policy's threshold, the breaker opens. An open breaker refuses calls
+    for `open_seconds`, then half-opens and lets `half_open_calls` trial
+    calls through: if they all succeed in time it closes with an empty
+    window, and any failed or slow trial opens it again. Only transient
+    errors (see `is_transient`) are failures: a call rejected as the
+    caller's fault still reached a healthy backend. Calls cut off by a
+    deadline or a cancellation are not outcomes of the backend and are
+    forgotten.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        policy: BreakerPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize a closed breaker.
+
+        Args:
+            key: Backend the breaker guards ("model:openai", "tool:search").
+            policy: Thresholds and timings (defaults otherwise).
+            clock: Monotonic clock of the open period.
+        """
+        self.key = key
+        self.policy = policy or BreakerPolicy()
+        self.clock = clock
+        self._state = BreakerState.CLOSED
+        # (failed, slow) per call, most recent last.
+        self._outcomes: deque[tuple[bool, bool]] = deque(
+            maxlen=self.policy.window
+        )
+        self._failures = 0
+        self._slow = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self._opened = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        """Current state (an expired open period reads as half-open)."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> BreakerState:
+        """Current state, half-opening an expired open breaker."""
+        if (
+            self._state == BreakerState.OPEN
+            and self.clock() - self._opened_at >= self.policy.open_seconds
+        ):
+            self._state = BreakerState.HALF_OPEN
+            self._trials = 0
+            self._trial_successes = 0
+        return self._state
+
+    def _retry_after(self) -> float:
+        """Seconds until an open breaker half-opens."""
+        return max(
+            0.0, self._opened_at + self.policy.open_seconds - self.clock()
+        )
+
+    def acquire(self) -> None:
+        """
+        Admit a call (a trial slot while half-open).
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with
+                every trial slot taken.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == BreakerState.CLOSED:
+                return
+            if (
+                state == BreakerState.HALF_OPEN
+                and self._trials < self.policy.half_open_calls
+            ):
+                self._trials += 1
+                return
+            self._rejected += 1
+            raise CircuitOpenError(self.key, self._retry_after())
+
+    def release(self) -> None:
+        """Forget an admitted call that ended without an outcome."""
+        with self._lock:
+            if self._state == BreakerState.HALF_OPEN and self._trials:
+                self._trials -= 1
+
+    def record(self, ok: bool, seconds: float) -> None:
+        """
+        Record the outcome of an admitted call.
+
+        Args:
+            ok: Whether the call succeeded.
+            seconds: How long it took.
+        """
+        policy = self.policy
+        slow = bool(policy.slow_call) and seconds > policy.slow_call
+        with self._lock:
+            state = self._current_state()
+            if state == BreakerState.OPEN:
+                # A call admitted before the breaker opened.
+                return
+            if state == BreakerState.HALF_OPEN:
+                if not ok or slow:
+                    self._open()
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= policy.half_open_calls:
+                    self._close()
+                return
+            if len(self._outcomes) == self._outcomes.maxlen:
+                failed_out, slow_out = self._outcomes[0]
+                self._failures -= failed_out
+                self._slow -= slow_out
+            self._outcomes.append((not ok, slow))
+            self._failures += not ok
+            self._slow += slow
+            calls = len(self._outcomes)
+            if calls < policy.min_calls:
+                return
+            if (
+                policy.error_rate > 0
+                and self._failures / calls >= policy.error_rate
+            ) or (policy.slow_call and self._slow / calls >= policy.slow_rate):
+                self._open()
+
+    def _open(self) -> None:
+        """Start an open period."""
+        self._state = BreakerState.OPEN
+        self._opened_at = self.clock()
+        self._opened += 1
+
+    def _close(self) -> None:
+        """Close with an empty window."""
+        self._state = BreakerState.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        self._slow = 0
+
+    def reset(self) -> None:
+        """Force the breaker closed (admin override)."""
+        with self._lock:
+            self._close()
+
+    @contextmanager
+    def guard(self) -> Generator[None]:
+        """
+        Admit the call of the block and record how it ended: a
+        transient error (or a failed tool result) is a failure, any
+        other error a call the backend answered, and a cancellation or
+        deadline no outcome.
+
+        Raises:
+            CircuitOpenError: If the breaker refuses the call.
+        """
+        self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        except _NEUTRAL:
+            self.release()
+            raise
+        except Exception as err:
+            failed = isinstance(err, _ToolFailedError) or is_transient(err)
+            self.record(not failed, time.perf_counter() - started)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record(True, time.perf_counter() - started)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        State of the breaker for the admin endpoint.
+
+        Returns:
+            dict[str, Any]: State, window counts and rates, times opened,
+                refused calls and seconds until it half-opens.
+        """
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            return {
+                "state": str(state),
+                "calls": calls,
+                "failures": self._failures,
+                "slow": self._slow,
+                "error_rate": self._failures / calls if calls else 0.0,
+                "slow_rate": self._slow / calls if calls else 0.0,
+                "opened": self._opened,
+                "rejected": self._rejected,
+                "retry_after": (
+                    self._retry_after() if state == BreakerState.OPEN else 0.0
+                ),
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    App-scoped breakers, one per model provider and one per tool.
+
+    Breakers are created on first use with the policy of their key in
+    `overrides`, else of their kind ("model" or "tool"), else the default.
+    """
+
+    def __init__(
+        self,
+        policy: BreakerPolicy | None = None,
+        overrides: dict[str, BreakerPolicy] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            policy: Default policy.
+            overrides: Policies of kinds ("tool") or single keys
+                ("model:openai", "tool:web_search").
+            clock: Monotonic clock shared by the breakers.
+        """
+        self.policy = policy or BreakerPolicy()
+        self.overrides = dict(overrides or {})
+        self.clock = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CircuitBreaker:
+        """Breaker of `key` ("<kind>:<name>"), created if needed."""
+        breaker = self._breakers.get(key)
+        if breaker is not None:
+            return breaker
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                kind = key.split(":", 1)[0]
+                policy = self.overrides.get(
+                    key, self.overrides.get(kind, self.policy)
+                )
+                breaker = CircuitBreaker(key, policy, self.clock)
+                self._breakers[key] = breaker
+            return breaker
+
+    def model(self, model: str) -> CircuitBreaker:
+        """Breaker of the provider of a model id ("provider:model")."""
+        provider, _ = parse_model(model)
+        return self.get(f"model:{provider or model}")
+
+    def tool(self, name: str) -> CircuitBreaker:
+        """Breaker of a tool, by its ToolProvider name."""
+        return self.get(f"tool:{name}")
+
+    def reset(self, key: str) -> bool:
+        """
+        Force a breaker closed.
+
+        Returns:
+            bool: False if no breaker has that key.
+        """
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            return False
+        breaker.reset()
+        return True
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """State of every breaker, by key."""
+        return {
+            key: breaker.snapshot()
+            for key, breaker in sorted(self._breakers.items())
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Breaker metrics for the runtime metrics endpoint.
+
+        Returns:
+            dict[str, Any]: Breakers per state and the keys not closed.
+        """
+        states = {key: b.state for key, b in self._breakers.items()}
+        counts = {str(state): 0 for state in BreakerState}
+        for state in states.values():
+            counts[str(state)] += 1
+        return {
+            **counts,
+            "tripped": sorted(
+                key
+                for key, state in states.items()
+                if state != BreakerState.CLOSED
+            ),
+        }
+
+
+class _ToolFailedError(Exception):
+    """Carries an error tool message out of a breaker guard."""
+
+    def __init__(self, result: ToolMessage) -> None:
+        """Wrap the error message."""
+        super().__init__(result.content)
+        self.result = result
+
+
+class ToolBreakerMiddleware(AgentMiddleware):
+    """
+    Agent middleware guarding tool calls with per-tool breakers.
+
+    A tool whose breaker is open is not called: the model gets an error
+    tool message at once and can carry on without it. Transient
+    exceptions and error messages of the tool itself count as failures;
+    calls the model made with invalid arguments do not.
+    """
+
+    def __init__(self, breakers: CircuitBreakerRegistry) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            breakers: Shared breakers.
+        """
+        super().__init__()
+        self.breakers = breakers
+
+    @staticmethod
+    def _refused(
+        request: ToolCallRequest, err: CircuitOpenError
+    ) -> ToolMessage:
+        """Error message standing in for a refused tool call."""
+        call = request.tool_call
+        return ToolMessage(
+            content=(
+                f"Tool {call['name']!r} is unavailable, retry in "
+                f"{err.retry_after:.0f}s or continue without it."
+            ),
+            tool_call_id=call["id"],
+            name=call["name"],
+            status="error",
+        )
+
+    @staticmethod
+    def _failed(result: ToolMessage | Command) -> bool:
+        """
+        Whether a tool result reports a failure of the tool (not invalid
+        arguments from the model).
+        """
+        return (
+            isinstance(result, ToolMessage)
+            and result.status == "error"
+            and not result.text.startswith(_INVALID_CALL)
+        )
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Run the tool unless its breaker is open."""
+        breaker = self.breakers.tool(request.tool_call["name"])
+        try:
+            with breaker.guard():
+                result = handler(request)
+                if self._failed(result):
+                    raise _ToolFailedError(result)
+        except CircuitOpenError as err:
+            return self._refused(request, err)
+        except _ToolFailedError as err:
+            return err.result
+        return result
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """Run the tool unless its breaker is open."""
+        breaker = self.breakers.tool(request.tool_call["name"])
+        try:
+            with breaker.guard():
+                result = await handler(request)
+                if self._failed(result):
+                    raise _ToolFailedError(result)
+        except CircuitOpenError as err:
+            return self._refused(request, err)
+        except _ToolFailedError as err:
+            return err.result
+        return result
@@ -0,0 +1,186 @@
+"""
+File: concurrency.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 9:20:05 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+import time
+from typing import Any
+
+from app.runtime.stats import LatencyWindow
+
+
+class QueueFullError(Exception):
+    """
+    Raised when an agent run cannot get a concurrency slot.
+
+    Attributes:
+        retry_after: Estimated seconds until a slot frees up.
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            message: Human-readable reason.
+            retry_after: Estimated seconds until a slot frees up.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    Global and per-model concurrency limits with a bounded wait queue.
+
+    A run first takes its model slot, then a global slot (always in this
+    order, so two runs can never hold each other's slots). At most
+    `max_queue_size` runs may wait; further runs are rejected right away
+    with QueueFullError instead of piling up on the event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        default_model_concurrency: int,
+        model_concurrency: dict[str, int] | None = None,
+        max_queue_size: int = 100,
+        queue_timeout: float = 30.0,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrency: Max runs in flight across all models.
+            default_model_concurrency: Max runs in flight per model when
+                the model has no explicit limit.
+            model_concurrency: Explicit per-model limits (model -> limit).
+            max_queue_size: Max runs waiting for a slot.
+            queue_timeout: Max seconds a run may wait for a slot.
+        """
+        self._max_concurrency = max_concurrency
+        self._default_model_concurrency = default_model_concurrency
+        self._model_limits = dict(model_concurrency or {})
+        self._max_queue_size = max_queue_size
+        self._queue_timeout = queue_timeout
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._models: dict[str, asyncio.Semaphore] = {}
+        self._waiting = 0
+        self._in_flight = 0
+        self._model_waiting: Counter[str] = Counter()
+        self._model_in_flight: Counter[str] = Counter()
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_times = LatencyWindow()
+        self._run_times = LatencyWindow()
+
+    def _model_limit(self, model: str) -> int:
+        """Concurrency limit for a model."""
+        return self._model_limits.get(model, self._default_model_concurrency)
+
+    def _model_semaphore(self, model: str) -> asyncio.Semaphore:
+        """Get (or lazily create) the semaphore for a model."""
+        if model not in self._models:
+            self._models[model] = asyncio.Semaphore(self._model_limit(model))
+        return self._models[model]
+
+    def retry_after(self) -> float:
+        """
+        Estimate seconds until a newly arriving run would get a slot.
+
+        Uses the mean run duration and the number of runs ahead in the
+        queue spread over the global capacity.
+
+        Returns:
+            float: Estimated wait in seconds (at least 1).
+        """
+        mean_run = self._run_times.mean() or 1.0
+        ahead = self._waiting + 1
+        return max(1.0, mean_run * ahead / self._max_concurrency)
+
+    @asynccontextmanager
+    async def acquire(self, model: str) -> AsyncGenerator[None]:
+        """
+        Hold a model slot and a global slot for the duration of the block.
+
+        Args:
+            model: Model identifier the run will call.
+
+        Raises:
+            QueueFullError: If the wait queue is full or the wait exceeds
+                the queue timeout.
+        """
+        if self._waiting >= self._max_queue_size:
+            self._rejected += 1
+            raise QueueFullError(
+                "Agent run queue is full", retry_after=self.retry_after()
+            )
+        model_sem = self._model_semaphore(model)
+        self._waiting += 1
+        self._model_waiting[model] += 1
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self._queue_timeout):
+                await model_sem.acquire()
+                try:
+                    await self._global.acquire()
+                except BaseException:
+                    model_sem.release()
+                    raise
+        except TimeoutError:
+            self._timed_out += 1
+            raise QueueFullError(
+                "Timed out waiting for an agent run slot",
+                retry_after=self.retry_after(),
+            ) from None
+        finally:
+            self._waiting -= 1
+            self._model_waiting[model] -= 1
+
+        self._wait_times.add(time.perf_counter() - start)
+        self._in_flight += 1
+        self._model_in_flight[model] += 1
+        run_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._run_times.add(time.perf_counter() - run_start)
+            self._in_flight -= 1
+            self._model_in_flight[model] -= 1
+            self._global.release()
+            model_sem.release()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Current limiter state and wait-time metrics.
+
+        Returns:
+            dict[str, Any]: Limits, in-flight runs, queue depth, rejection
+                counters, wait/run time summaries and per-model state.
+        """
+        return {
+            "max_concurrency": self._max_concurrency,
+            "in_flight": self._in_flight,
+            "queue_depth": self._waiting,
+            "max_queue_size": self._max_queue_size,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "wait_time": self._wait_times.snapshot(),
+            "run_time": self._run_times.snapshot(),
+            "models": {
+                model: {
+                    "limit": self._model_limit(model),
+                    "in_flight": self._model_in_flight[model],
+                    "queue_depth": self._model_waiting[model],
+                }
+                for model in self._models
+            },
+        }
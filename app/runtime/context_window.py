@@ -0,0 +1,279 @@
+"""
+File: context_window.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 10:58:36 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Protocol
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
+
+from app.runtime.tokenizer import (
+    MESSAGE_OVERHEAD_TOKENS,
+    HeuristicTokenizer,
+    Tokenizer,
+)
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+_HEURISTIC = HeuristicTokenizer()
+
+
+def estimate_tokens(text: str, tokenizer: Tokenizer | None = None) -> int:
+    """
+    Token count of one message, including the per-message overhead.
+
+    Args:
+        text: Message content.
+        tokenizer: Tokenizer to count with (None = heuristic).
+
+    Returns:
+        int: Tokens of the message.
+    """
+    return (tokenizer or _HEURISTIC).count(text) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ContextStrategy(StrEnum):
+    """How a thread's history is cut down to one turn's input."""
+
+    LAST_N = "last_n"
+    TOKEN_BUDGET = "token_budget"
+    SUMMARY = "summary"
+
+
+class StoredMessage(Protocol):
+    """A persisted thread message (ORM row or schema)."""
+
+    seq: int
+    role: str
+    content: str
+    token_count: int
+
+
+@dataclass(frozen=True)
+class ContextWindow:
+    """
+    Messages selected for one turn.
+
+    Attributes:
+        messages: Kept history, oldest first.
+        evicted: Unsummarized history that fell out of the window, oldest
+            first; the summary strategy folds it into the thread summary.
+        tokens: Estimated tokens of the kept history, summary and input.
+    """
+
+    messages: list[StoredMessage]
+    evicted: list[StoredMessage] = field(default_factory=list)
+    tokens: int = 0
+
+
+@dataclass(frozen=True)
+class ContextPolicy:
+    """
+    Context strategy of an agent (`config["context"]`).
+
+    `last_n` keeps the last `max_messages` messages; `token_budget` keeps
+    the newest messages whose tokens, with the new input, fit in
+    `max_tokens`; `summary` applies both limits and folds what falls out
+    into a rolling summary of at most `summary_max_tokens`. Every strategy
+    is capped at `max_messages`, so a turn's input stays bounded.
+
+    Attributes:
+        strategy: Strategy name.
+        max_messages: Max history messages per turn.
+        max_tokens: Token budget of history, summary and input.
+        summary_max_tokens: Token cap of the rolling summary.
+    """
+
+    strategy: ContextStrategy = ContextStrategy.TOKEN_BUDGET
+    max_messages: int = 50
+    max_tokens: int = 4000
+    summary_max_tokens: int = 512
+
+    @classmethod
+    def from_config(
+        cls, config: dict[str, Any] | str | None, defaults: "ContextPolicy"
+    ) -> "ContextPolicy":
+        """
+        Build the policy of an agent from its `context` config.
+
+        Args:
+            config: Strategy name, or a dict with `strategy` and limits
+                (None uses the defaults).
+            defaults: Policy used for missing keys.
+
+        Returns:
+            ContextPolicy: Policy with the agent's overrides applied.
+
+        Raises:
+            ValueError: If the strategy is unknown or a limit is not
+                positive.
+        """
+        if config is None:
+            return defaults
+        if isinstance(config, str):
+            config = {"strategy": config}
+        policy = cls(
+            strategy=ContextStrategy(config.get("strategy", defaults.strategy)),
+            max_messages=int(config.get("max_messages", defaults.max_messages)),
+            max_tokens=int(config.get("max_tokens", defaults.max_tokens)),
+            summary_max_tokens=int(
+                config.get("summary_max_tokens", defaults.summary_max_tokens)
+            ),
+        )
+        if (
+            min(
+                policy.max_messages,
+                policy.max_tokens,
+                policy.summary_max_tokens,
+            )
+            < 1
+        ):
+            raise ValueError("Context limits must be positive")
+        return policy
+
+    def select(
+        self,
+        history: Sequence[StoredMessage],
+        input_tokens: int,
+        summary_tokens: int = 0,
+    ) -> ContextWindow:
+        """
+        Pick the history messages that go with the next input.
+
+        When the summary strategy evicts messages, the window shrinks to
+        half its limits, so the summarizer runs about once every half
+        window of turns rather than on every turn.
+
+        Args:
+            history: Unsummarized messages, oldest first.
+            input_tokens: Estimated tokens of the new user message.
+            summary_tokens: Estimated tokens of the current summary.
+
+        Returns:
+            ContextWindow: Kept messages, evicted messages and tokens.
+        """
+        if self.strategy == ContextStrategy.LAST_N:
+            return _fit(history, self.max_messages, None, input_tokens)
+        used = input_tokens + summary_tokens
+        window = _fit(history, self.max_messages, self.max_tokens - used, used)
+        if self.strategy == ContextStrategy.SUMMARY and window.evicted:
+            window = _fit(
+                history,
+                max(1, self.max_messages // 2),
+                (self.max_tokens - used) // 2,
+                used,
+            )
+        return window
+
+
+def _fit(
+    history: Sequence[StoredMessage],
+    max_messages: int,
+    budget: int | None,
+    base_tokens: int,
+) -> ContextWindow:
+    """
+    Keep the newest messages within a message count and token budget.
+
+    The window never starts with an assistant message, so every turn
+    opens with the user message it answered.
+
+    Args:
+        history: Messages, oldest first.
+        max_messages: Max messages kept.
+        budget: Max tokens of the kept messages (None = no limit).
+        base_tokens: Tokens of the input (and summary) around the window.
+
+    Returns:
+        ContextWindow: Kept and evicted messages, and total tokens.
+    """
+    used = 0
+    start = len(history)
+    for index in range(len(history) - 1, -1, -1):
+        cost = history[index].token_count
+        if len(history) - index > max_messages or (
+            budget is not None and used + cost > budget
+        ):
+            break
+        used += cost
+        start = index
+    while start < len(history) and history[start].role != "user":
+        used -= history[start].token_count
+        start += 1
+    return ContextWindow(
+        messages=list(history[start:]),
+        evicted=list(history[:start]),
+        tokens=base_tokens + used,
+    )
+
+
+def to_chat_messages(
+    messages: Sequence[StoredMessage], summary: str | None = None
+) -> list[AnyMessage]:
+    """
+    Convert stored messages to chat messages for the agent.
+
+    The summary goes first as a user message: providers reject system
+    messages after the agent's own system prompt.
+
+    Args:
+        messages: Kept history, oldest first.
+        summary: Rolling summary of older messages, if any.
+
+    Returns:
+        list[AnyMessage]: Chat messages, oldest first.
+    """
+    chat: list[AnyMessage] = []
+    if summary:
+        chat.append(HumanMessage(content=SUMMARY_PREFIX + summary))
+    for message in messages:
+        if message.role == "user":
+            chat.append(HumanMessage(content=message.content))
+        else:
+            chat.append(AIMessage(content=message.content))
+    return chat
+
+
+def summary_request(
+    summary: str | None, evicted: Sequence[StoredMessage], max_tokens: int
+) -> str:
+    """
+    Input for the summarizer: the current summary plus evicted messages.
+
+    Args:
+        summary: Current rolling summary, if any.
+        evicted: Messages to fold in, oldest first.
+        max_tokens: Token cap of the new summary.
+
+    Returns:
+        str: Summarizer input.
+    """
+    lines = [f"{message.role}: {message.content}" for message in evicted]
+    previous = summary or "(none)"
+    return (
+        f"Current summary:\n{previous}\n\n"
+        f"New messages:\n" + "\n".join(lines) + "\n\n"
+        f"Write the updated summary in at most {max_tokens * 3 // 4} words."
+    )
+
+
+def clip_summary(summary: str, max_tokens: int) -> str:
+    """
+    Cut a summary to its token cap, whatever the model returned.
+
+    Args:
+        summary: Summary produced by the model.
+        max_tokens: Token cap of the summary.
+
+    Returns:
+        str: Summary of at most `max_tokens` estimated tokens.
+    """
+    max_chars = max(0, max_tokens - MESSAGE_OVERHEAD_TOKENS) * 4
+    return summary.strip()[:max_chars]
@@ -0,0 +1,198 @@
+"""
+File: embeddings.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 2:48:20 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import itertools
+import math
+import re
+from typing import Protocol
+import zlib
+
+from langchain.embeddings import init_embeddings
+from langchain_core.embeddings import Embeddings
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+")
+_STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "can",
+        "could",
+        "did",
+        "do",
+        "does",
+        "for",
+        "how",
+        "i",
+        "in",
+        "is",
+        "it",
+        "its",
+        "me",
+        "my",
+        "of",
+        "on",
+        "or",
+        "our",
+        "please",
+        "should",
+        "that",
+        "the",
+        "there",
+        "this",
+        "to",
+        "was",
+        "we",
+        "were",
+        "what",
+        "when",
+        "where",
+        "which",
+        "who",
+        "why",
+        "will",
+        "with",
+        "would",
+        "you",
+        "your",
+    }
+)
+_STOP_WEIGHT = 0.2
+_TRIGRAM_WEIGHT = 0.5
+
+
+class Embedder(Protocol):
+    """Turns text into an L2-normalized float32 vector."""
+
+    async def aembed(self, text: str) -> np.ndarray:
+        """
+        Embed one text.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            np.ndarray: 1-D unit vector.
+        """
+        ...
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    """Scale a vector to unit length (zero vectors are returned as is)."""
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class HashingEmbedder:
+    """
+    Local, dependency-free TF-IDF style embedder for offline use.
+
+    Word unigrams, word bigrams and character trigrams of content words
+    are hashed into a fixed number of signed buckets and weighted with
+    sublinear term frequency (1 + log tf). A static stop-word list stands
+    in for corpus IDF: function words get a low weight, so paraphrases
+    ("how do I" / "how can I") stay close while a changed content word
+    ("Paris" / "Berlin") moves the vector away. No model download or API
+    call is needed.
+    """
+
+    def __init__(self, dimensions: int = 512) -> None:
+        """
+        Initialize the embedder.
+
+        Args:
+            dimensions: Vector size (number of hash buckets).
+        """
+        self.dimensions = dimensions
+
+    @staticmethod
+    def _features(text: str) -> dict[str, tuple[int, float]]:
+        """Hashed features of a text with their count and IDF weight."""
+        words = _WORD_RE.findall(text.lower())
+        features: dict[str, tuple[int, float]] = {}
+
+        def add(feature: str, weight: float) -> None:
+            count, _ = features.get(feature, (0, weight))
+            features[feature] = (count + 1, weight)
+
+        for word in words:
+            add(word, _STOP_WEIGHT if word in _STOP_WORDS else 1.0)
+        for first, second in itertools.pairwise(words):
+            stop = first in _STOP_WORDS and second in _STOP_WORDS
+            add(f"{first} {second}", _STOP_WEIGHT if stop else 1.0)
+        for word in words:
+            if word in _STOP_WORDS:
+                continue
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                add(f"#3:{padded[i : i + 3]}", _TRIGRAM_WEIGHT)
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed one text.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            np.ndarray: Unit vector of size `dimensions`.
+        """
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, (count, weight) in self._features(text).items():
+            digest = zlib.crc32(feature.encode())
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dimensions] += (
+                sign * weight * (1.0 + math.log(count))
+            )
+        return _normalize(vector)
+
+    async def aembed(self, text: str) -> np.ndarray:
+        """Async wrapper; hashing is cheap enough to run inline."""
+        return self.embed(text)
+
+
+class LangChainEmbedder:
+    """Adapter for any LangChain `Embeddings` (OpenAI, Ollama, ...)."""
+
+    def __init__(self, embeddings: Embeddings) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            embeddings: LangChain embeddings model.
+        """
+        self.embeddings = embeddings
+
+    async def aembed(self, text: str) -> np.ndarray:
+        """Embed one text with the wrapped model."""
+        vector = await self.embeddings.aembed_query(text)
+        return _normalize(np.asarray(vector, dtype=np.float32))
+
+
+def build_embedder(name: str, dimensions: int = 512) -> Embedder:
+    """
+    Build an embedder from its settings name.
+
+    Args:
+        name: "hashing" for the local embedder, otherwise a LangChain
+            embeddings id such as "openai:text-embedding-3-small".
+        dimensions: Vector size of the hashing embedder.
+
+    Returns:
+        Embedder: The embedder.
+    """
+    if name == "hashing":
+        return HashingEmbedder(dimensions)
+    return LangChainEmbedder(init_embeddings(name))
@@ -0,0 +1,290 @@
+"""
+File: fake_chat_model.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 1:06:18 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator, Sequence
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, Literal
+import uuid
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import (
+    ChatGeneration,
+    ChatGenerationChunk,
+    ChatResult,
+)
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field, PrivateAttr
+
+FAKE_PROVIDER = "fake"
+
+LatencyDistribution = Literal["fixed", "uniform", "normal", "lognormal"]
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Local, deterministic chat model for load tests (`fake:<mode>`).
+
+    `echo` answers with the last user message; `tool-caller` first calls
+    the scripted tools (or the first bound tool), then answers with their
+    results. Each call waits a time-to-first-token drawn from the latency
+    distribution, then emits its output at `tokens_per_second`; streaming
+    yields one chunk per word on that schedule. Token usage is reported
+    with the chars/4 heuristic, so run metrics look like a real provider.
+    A fixed `seed` makes the latencies reproducible.
+    """
+
+    mode: Literal["echo", "tool-caller"] = "echo"
+    latency_ms: float = 50.0
+    latency_jitter_ms: float = 0.0
+    latency_distribution: LatencyDistribution = "fixed"
+    tokens_per_second: float | None = None
+    tool_calls: list[dict[str, Any]] = Field(default_factory=list)
+    response: str | None = None
+    seed: int | None = None
+
+    _rng: random.Random = PrivateAttr()
+    _rng_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, context: Any) -> None:
+        """Seed the latency generator."""
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        """Model type identifier."""
+        return f"{FAKE_PROVIDER}-{self.mode}"
+
+    def bind_tools(
+        self, tools: Sequence[Any], **kwargs: Any
+    ) -> Runnable[Any, AIMessage]:
+        """Accept tools like a provider; tool-caller mode calls them."""
+        return self.bind(
+            tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs
+        )
+
+    def first_token_delay(self) -> float:
+        """
+        Seconds before the first token, drawn from the distribution.
+
+        `uniform` spreads over latency ± jitter, `normal` uses jitter as
+        the standard deviation, `lognormal` keeps the median at
+        `latency_ms` with a long tail of width jitter/latency.
+        """
+        mean, jitter = self.latency_ms, self.latency_jitter_ms
+        with self._rng_lock:
+            if self.latency_distribution == "uniform":
+                value = self._rng.uniform(mean - jitter, mean + jitter)
+            elif self.latency_distribution == "normal":
+                value = self._rng.gauss(mean, jitter)
+            elif self.latency_distribution == "lognormal" and mean > 0:
+                value = self._rng.lognormvariate(math.log(mean), jitter / mean)
+            else:
+                value = mean
+        return max(0.0, value) / 1000
+
+    def _reply(
+        self, messages: list[BaseMessage], tools: list[dict[str, Any]]
+    ) -> AIMessage:
+        """Answer of one model turn (without timing)."""
+        last_user = next(
+            (m.text for m in reversed(messages) if isinstance(m, HumanMessage)),
+            "",
+        )
+        results = []
+        for message in reversed(messages):
+            if not isinstance(message, ToolMessage):
+                break
+            results.insert(0, message.text)
+        if self.mode == "tool-caller" and not results:
+            calls = self.tool_calls or (
+                [{"name": tools[0]["function"]["name"], "args": {}}]
+                if tools
+                else []
+            )
+            if calls:
+                return AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": call["name"],
+                            "args": call.get("args", {}),
+                            "id": f"call_{uuid.uuid4().hex[:12]}",
+                            "type": "tool_call",
+                        }
+                        for call in calls
+                    ],
+                )
+        if self.response is not None:
+            text = self.response.format(input=last_user)
+        elif results:
+            text = "tool results: " + "; ".join(results)
+        else:
+            text = f"echo: {last_user}"
+        return AIMessage(content=text)
+
+    def _usage(
+        self, messages: list[BaseMessage], reply: AIMessage
+    ) -> dict[str, int]:
+        """Heuristic token usage (about 4 characters a token)."""
+        prompt = sum(math.ceil(len(m.text) / 4) for m in messages)
+        output = math.ceil(len(reply.text) / 4)
+        output += sum(
+            math.ceil(len(json.dumps(call["args"])) / 4)
+            for call in reply.tool_calls
+        )
+        return {
+            "input_tokens": prompt,
+            "output_tokens": output,
+            "total_tokens": prompt + output,
+        }
+
+    def _output_delay(self, tokens: int) -> float:
+        """Seconds to emit `tokens` at the configured rate."""
+        if not self.tokens_per_second:
+            return 0.0
+        return tokens / self.tokens_per_second
+
+    def _turn(
+        self, messages: list[BaseMessage], kwargs: dict[str, Any]
+    ) -> tuple[AIMessage, float]:
+        """Reply with usage, and the total seconds it takes."""
+        reply = self._reply(messages, kwargs.get("tools") or [])
+        usage = self._usage(messages, reply)
+        reply.usage_metadata = usage
+        delay = self.first_token_delay() + self._output_delay(
+            usage["output_tokens"]
+        )
+        return reply, delay
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Sleep (blocking) for the turn's latency and reply."""
+        reply, delay = self._turn(messages, kwargs)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Sleep (non-blocking) for the turn's latency and reply."""
+        reply, delay = self._turn(messages, kwargs)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+    def _chunks(
+        self, messages: list[BaseMessage], kwargs: dict[str, Any]
+    ) -> Iterator[tuple[float, ChatGenerationChunk]]:
+        """Chunks of a reply with the delay before each."""
+        reply = self._reply(messages, kwargs.get("tools") or [])
+        usage = self._usage(messages, reply)
+        if reply.tool_calls:
+            pieces = [""]
+        else:
+            words = reply.text.split(" ")
+            pieces = [w if i == 0 else f" {w}" for i, w in enumerate(words)]
+        first = self.first_token_delay()
+        for index, piece in enumerate(pieces):
+            last = index == len(pieces) - 1
+            chunk = AIMessageChunk(
+                content=piece,
+                tool_call_chunks=(
+                    [
+                        {
+                            "name": call["name"],
+                            "args": json.dumps(call["args"]),
+                            "id": call["id"],
+                            "index": i,
+                            "type": "tool_call_chunk",
+                        }
+                        for i, call in enumerate(reply.tool_calls)
+                    ]
+                    if reply.tool_calls
+                    else []
+                ),
+                usage_metadata=usage if last else None,
+                chunk_position="last" if last else None,
+            )
+            delay = first if index == 0 else 0.0
+            delay += self._output_delay(math.ceil(len(piece) / 4))
+            yield delay, ChatGenerationChunk(message=chunk)
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """Stream one chunk per word (blocking sleeps)."""
+        for delay, chunk in self._chunks(messages, kwargs):
+            time.sleep(delay)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Stream one chunk per word (non-blocking sleeps)."""
+        for delay, chunk in self._chunks(messages, kwargs):
+            await asyncio.sleep(delay)
+            yield chunk
+
+
+def is_fake_model(model: str) -> bool:
+    """Whether a model id selects the local fake provider."""
+    return model.startswith(f"{FAKE_PROVIDER}:")
+
+
+def build_chat_model(model: str, **options: Any) -> BaseChatModel:
+    """
+    Build a chat model, serving `fake:<mode>` ids locally.
+
+    Args:
+        model: Model id ("provider:model").
+        **options: init_chat_model kwargs, or FakeChatModel fields for
+            `fake:` ids.
+
+    Returns:
+        BaseChatModel: The chat model.
+
+    Raises:
+        ValueError: If a fake model id has no mode.
+    """
+    if not is_fake_model(model):
+        return init_chat_model(model, **options)
+    mode = model.partition(":")[2]
+    if not mode:
+        raise ValueError("Fake model id must be fake:<mode>")
+    return FakeChatModel(mode=mode, **options)
@@ -0,0 +1,337 @@
+"""
+File: model_fallback.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 5:20:44 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any
+
+from langchain.agents.middleware import (
+    AgentMiddleware,
+    ModelRequest,
+    ModelResponse,
+)
+from langchain_core.language_models import BaseChatModel
+from langgraph.errors import GraphBubbleUp
+
+from app.runtime.cancellation import DeadlineExceededError
+from app.runtime.circuit_breaker import CircuitBreakerRegistry
+from app.runtime.stats import LatencyWindow
+
+# Errors that end a model call for every model of the chain.
+_FATAL = (GraphBubbleUp, DeadlineExceededError)
+
+
+class ModelLatencyTracker:
+    """
+    App-scoped rolling latency windows of model calls, per model id.
+
+    A model's hedge delay is a percentile of its window, recomputed every
+    `refresh` samples so a hedge decision does not sort the window. Models
+    with fewer than `min_samples` calls are never hedged: their tail is
+    not known yet.
+    """
+
+    def __init__(
+        self,
+        window: int = 1000,
+        min_samples: int = 20,
+        percentile: float = 95.0,
+        refresh: int = 16,
+    ) -> None:
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Samples kept per model.
+            min_samples: Samples a model needs before it is hedged.
+            percentile: Default hedge percentile.
+            refresh: Samples between recomputations of a hedge delay.
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.refresh = refresh
+        self._windows: dict[str, LatencyWindow] = {}
+        self._delays: dict[tuple[str, float], tuple[int, float | None]] = {}
+        self._events: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        """Add the latency of a call of `model`."""
+        with self._lock:
+            window = self._windows.get(model)
+            if window is None:
+                window = self._windows[model] = LatencyWindow(self.window)
+            window.add(seconds)
+
+    def hedge_delay(self, model: str, percentile: float) -> float | None:
+        """Seconds after which a call of `model` is hedged (None = never)."""
+        with self._lock:
+            window = self._windows.get(model)
+            if window is None or window.count < self.min_samples:
+                return None
+            key = (model, percentile)
+            computed_at, delay = self._delays.get(key, (-self.refresh, None))
+            if window.count - computed_at >= self.refresh:
+                delay = window.percentile(percentile)
+                self._delays[key] = (window.count, delay)
+            return delay
+
+    def count(self, event: str) -> None:
+        """Count a 'fallback', 'hedge' or 'hedge_win'."""
+        with self._lock:
+            self._events[event] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Latency and failover metrics.
+
+        Returns:
+            dict[str, Any]: Fallback and hedge counts, and a latency
+                snapshot per model.
+        """
+        with self._lock:
+            return {
+                "fallbacks": self._events["fallback"],
+                "hedges": self._events["hedge"],
+                "hedge_wins": self._events["hedge_win"],
+                "models": {
+                    model: window.snapshot()
+                    for model, window in self._windows.items()
+                },
+            }
+
+
+@dataclass(frozen=True)
+class FallbackPolicy:
+    """
+    How a model call fails over and hedges.
+
+    Attributes:
+        timeout: Seconds an attempt may take before the next model is
+            tried (None = the client's own timeout).
+        hedge: Send a second request when the first is slower than the
+            model's `hedge_percentile` latency.
+        hedge_percentile: Percentile of the rolling window used as the
+            hedge delay (None = the tracker's default).
+    """
+
+    timeout: float | None = None
+    hedge: bool = False
+    hedge_percentile: float | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "FallbackPolicy":
+        """
+        Policy of an agent config.
+
+        `config["hedge"]` is `true` or `{"percentile": 99}`;
+        `config["model_timeout"]` bounds each attempt.
+        """
+        hedge = config.get("hedge") or False
+        options = hedge if isinstance(hedge, dict) else {}
+        return cls(
+            timeout=config.get("model_timeout"),
+            hedge=bool(hedge),
+            hedge_percentile=options.get("percentile"),
+        )
+
+
+class ModelFallbackMiddleware(AgentMiddleware):
+    """
+    Agent middleware failing model calls over along a chain of models.
+
+    The agent's own model is tried first, then each fallback in order,
+    on errors and attempt time-outs. With hedging, an attempt still
+    running after its model's rolling p95 gets a second request (to the
+    next model of the chain, or the same model at the end of it); the
+    first answer wins and the loser is cancelled. With breakers, each
+    attempt goes through its provider's breaker: a model whose provider
+    is open is skipped at once, and the call fails with CircuitOpenError
+    when the whole chain is. Deadline overruns and graph interrupts are
+    never failed over.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        fallbacks: list[tuple[str, BaseChatModel]],
+        tracker: ModelLatencyTracker,
+        policy: FallbackPolicy | None = None,
+        breakers: CircuitBreakerRegistry | None = None,
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            model: Model id of the agent's own model.
+            fallbacks: Model ids and clients, in failover order.
+            tracker: Shared latency windows.
+            policy: Attempt timeout and hedging (default: neither).
+            breakers: Shared per-provider breakers (None = unguarded).
+        """
+        super().__init__()
+        self.model = model
+        self.fallbacks = fallbacks
+        self.tracker = tracker
+        self.policy = policy or FallbackPolicy()
+        self.breakers = breakers
+
+    def _chain(self) -> list[tuple[str, BaseChatModel | None]]:
+        """Models to try in order (None = the request's own model)."""
+        return [(self.model, None), *self.fallbacks]
+
+    @staticmethod
+    def _request(
+        request: ModelRequest, model: BaseChatModel | None
+    ) -> ModelRequest:
+        """The request, sent to `model`."""
+        return request if model is None else request.override(model=model)
+
+    def _guard(self, model_id: str) -> AbstractContextManager[None]:
+        """Breaker guard of one attempt of `model_id`."""
+        if self.breakers is None:
+            return nullcontext()
+        return self.breakers.model(model_id).guard()
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        """Try the chain in order (no attempt timeout or hedging)."""
+        error: Exception | None = None
+        for index, (model_id, model) in enumerate(self._chain()):
+            if index:
+                self.tracker.count("fallback")
+            started = time.perf_counter()
+            try:
+                with self._guard(model_id):
+                    response = handler(self._request(request, model))
+            except _FATAL:
+                raise
+            except Exception as err:
+                error = err
+                continue
+            self.tracker.record(model_id, time.perf_counter() - started)
+            return response
+        raise error
+
+    async def _attempt(
+        self,
+        model_id: str,
+        model: BaseChatModel | None,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """One call of one model, bounded by the attempt timeout."""
+        with self._guard(model_id):
+            started = time.perf_counter()
+            async with asyncio.timeout(self.policy.timeout):
+                response = await handler(self._request(request, model))
+        self.tracker.record(model_id, time.perf_counter() - started)
+        return response
+
+    async def _failover(
+        self,
+        chain: list[tuple[str, BaseChatModel | None]],
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Try the chain in order, in the caller's task (no hedging)."""
+        error: Exception | None = None
+        for index, (model_id, model) in enumerate(chain):
+            if index:
+                self.tracker.count("fallback")
+            try:
+                return await self._attempt(model_id, model, request, handler)
+            except _FATAL:
+                raise
+            except Exception as err:
+                error = err
+        raise error
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Try the chain, failing over on errors and hedging slow calls."""
+        chain = self._chain()
+        if not self.policy.hedge:
+            return await self._failover(chain, request, handler)
+        # Task -> (is a hedge, model id, start time).
+        pending: dict[asyncio.Task[ModelResponse], tuple[bool, str, float]] = {}
+        error: BaseException | None = None
+        winner = False
+
+        def launch(index: int, hedge: bool) -> None:
+            model_id, model = chain[index]
+            task = asyncio.create_task(
+                self._attempt(model_id, model, request, handler)
+            )
+            pending[task] = (hedge, model_id, time.perf_counter())
+
+        launch(0, hedge=False)
+        next_index = 1
+        hedged = False
+        try:
+            while pending:
+                delay = None
+                if self.policy.hedge and not hedged and len(pending) == 1:
+                    delay = self.tracker.hedge_delay(
+                        chain[next_index - 1][0],
+                        self.policy.hedge_percentile or self.tracker.percentile,
+                    )
+                done, _ = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Slower than the model's tail: race a second request.
+                    hedged = True
+                    self.tracker.count("hedge")
+                    if next_index < len(chain):
+                        launch(next_index, hedge=True)
+                        next_index += 1
+                    else:
+                        launch(next_index - 1, hedge=True)
+                    continue
+                for task in done:
+                    hedge, _, _ = pending.pop(task)
+                    err = task.exception()
+                    if err is None:
+                        if hedge:
+                            self.tracker.count("hedge_win")
+                        winner = True
+                        return task.result()
+                    if isinstance(err, _FATAL):
+                        raise err
+                    error = err
+                if not pending and next_index < len(chain):
+                    self.tracker.count("fallback")
+                    launch(next_index, hedge=False)
+                    next_index += 1
+            raise error
+        finally:
+            now = time.perf_counter()
+            for task, (_, model_id, started) in pending.items():
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()
+                    continue
+                task.cancel()
+                if winner:
+                    # The loser's time so far is a lower bound of its
+                    # latency; dropping it would hide the slow tail.
+                    self.tracker.record(model_id, now - started)
@@ -0,0 +1,283 @@
+"""
+File: model_registry.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 5:14:02 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Callable
+import hashlib
+import importlib.util
+import json
+import threading
+from typing import Any
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+
+from app.core.logger import get_logger
+from app.runtime.fake_chat_model import build_chat_model
+
+logger = get_logger(__name__)
+
+# Providers whose LangChain integration accepts injected httpx clients.
+HTTPX_CLIENT_PROVIDERS = frozenset({"openai", "azure_openai"})
+
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+class _ConnectionCounter:
+    """Counts requests and newly opened connections of a shared pool."""
+
+    def __init__(self) -> None:
+        """Start from zero."""
+        self.requests = 0
+        self.connections = 0
+
+    def trace(self, event: str, info: dict[str, Any]) -> None:
+        """httpcore trace hook: count completed TCP connects."""
+        if event == "connection.connect_tcp.complete":
+            self.connections += 1
+
+    async def atrace(self, event: str, info: dict[str, Any]) -> None:
+        """Async variant of the trace hook."""
+        self.trace(event, info)
+
+    def stats(self) -> dict[str, int]:
+        """Requests, opened connections and requests on reused ones."""
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections,
+            "connections_reused": max(0, self.requests - self.connections),
+        }
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    """Sync transport that reports connection reuse."""
+
+    def __init__(self, counter: _ConnectionCounter, **kwargs: Any) -> None:
+        """Wrap the default transport with a counter."""
+        super().__init__(**kwargs)
+        self.counter = counter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Count the request and trace connection setup."""
+        self.counter.requests += 1
+        request.extensions = {**request.extensions, "trace": self.counter.trace}
+        return super().handle_request(request)
+
+
+class _CountingAsyncTransport(httpx.AsyncHTTPTransport):
+    """Async transport that reports connection reuse."""
+
+    def __init__(self, counter: _ConnectionCounter, **kwargs: Any) -> None:
+        """Wrap the default transport with a counter."""
+        super().__init__(**kwargs)
+        self.counter = counter
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        """Count the request and trace connection setup."""
+        self.counter.requests += 1
+        request.extensions = {
+            **request.extensions,
+            "trace": self.counter.atrace,
+        }
+        return await super().handle_async_request(request)
+
+
+class _ProviderPool:
+    """Keep-alive httpx clients (sync and async) shared by one provider."""
+
+    def __init__(self, limits: httpx.Limits, timeout: float) -> None:
+        """
+        Create the clients.
+
+        Args:
+            limits: Connection pool limits.
+            timeout: Request timeout in seconds.
+        """
+        self.counter = _ConnectionCounter()
+        self.client = httpx.Client(
+            transport=_CountingTransport(
+                self.counter, limits=limits, http2=_HTTP2
+            ),
+            timeout=timeout,
+        )
+        self.async_client = httpx.AsyncClient(
+            transport=_CountingAsyncTransport(
+                self.counter, limits=limits, http2=_HTTP2
+            ),
+            timeout=timeout,
+        )
+
+    async def aclose(self) -> None:
+        """Close both clients and their connections."""
+        self.client.close()
+        await self.async_client.aclose()
+
+
+def parse_model(model: str) -> tuple[str, str]:
+    """
+    Split a model id into provider and model name.
+
+    Args:
+        model: "provider:model" or a bare model name.
+
+    Returns:
+        tuple[str, str]: Provider ("" if inferred by LangChain) and name.
+    """
+    provider, sep, name = model.partition(":")
+    return (provider, name) if sep else ("", model)
+
+
+class ModelRegistry:
+    """
+    App-scoped registry of chat-model clients.
+
+    Agents with the same provider, model and options (credentials, base
+    URL, temperature, ...) share one client instance instead of building
+    their own per agent run. Providers that accept injected httpx clients
+    also share one keep-alive pool (HTTP/2 when `h2` is installed).
+    Created in the lifespan and closed on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 120.0,
+        builder: Callable[..., BaseChatModel] = build_chat_model,
+        context_limits: dict[str, int] | None = None,
+        default_context_limit: int = 128000,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Max open connections per provider pool.
+            max_keepalive_connections: Idle connections kept per pool.
+            keepalive_expiry: Seconds an idle connection is kept.
+            timeout: Request timeout in seconds.
+            builder: Builds a chat model from a model id and options
+                (init_chat_model, with `fake:` ids served locally).
+            context_limits: Max input tokens by model id, overriding the
+                model's profile.
+            default_context_limit: Max input tokens of models without an
+                override or a profile.
+        """
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = timeout
+        self._builder = builder
+        self._models: dict[tuple[str, str, str], BaseChatModel] = {}
+        self._pools: dict[str, _ProviderPool] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+        self._context_limits = dict(context_limits or {})
+        self._default_context_limit = default_context_limit
+        self._limit_cache: dict[str, int] = {}
+
+    @staticmethod
+    def _fingerprint(options: dict[str, Any]) -> str:
+        """Stable hash of model options, so secrets never sit in keys."""
+        raw = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+    def get(
+        self, model: str, options: dict[str, Any] | None = None
+    ) -> BaseChatModel:
+        """
+        Get the shared client for a model, creating it on first use.
+
+        Args:
+            model: Model id ("provider:model").
+            options: Extra init_chat_model kwargs (api_key, base_url, ...).
+
+        Returns:
+            BaseChatModel: Shared chat model.
+        """
+        options = options or {}
+        provider, name = parse_model(model)
+        key = (provider, name, self._fingerprint(options))
+        with self._lock:
+            client = self._models.get(key)
+            if client is not None:
+                self._reused += 1
+                return client
+            kwargs = dict(options)
+            if provider in HTTPX_CLIENT_PROVIDERS:
+                pool = self._pools.get(provider)
+                if pool is None:
+                    pool = _ProviderPool(self._limits, self._timeout)
+                    self._pools[provider] = pool
+                kwargs.setdefault("http_client", pool.client)
+                kwargs.setdefault("http_async_client", pool.async_client)
+            client = self._builder(model, **kwargs)
+            self._models[key] = client
+            self._created += 1
+            logger.info(f"Model client created: {model!s}")
+            return client
+
+    def context_limit(
+        self, model: str, options: dict[str, Any] | None = None
+    ) -> int:
+        """
+        Max input tokens of a model, resolved once and cached per model id.
+
+        Configured overrides win; otherwise the client's LangChain profile
+        (`max_input_tokens`) is read, falling back to the default.
+
+        Args:
+            model: Model id ("provider:model").
+            options: init_chat_model kwargs, if the client must be built.
+
+        Returns:
+            int: Context window of the model in tokens.
+        """
+        limit = self._limit_cache.get(model)
+        if limit is not None:
+            return limit
+        limit = self._context_limits.get(model)
+        if limit is None:
+            profile = getattr(self.get(model, options), "profile", None) or {}
+            limit = profile.get("max_input_tokens") or (
+                self._default_context_limit
+            )
+        self._limit_cache[model] = limit
+        return limit
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Reuse metrics.
+
+        Returns:
+            dict[str, Any]: Clients created and reused, and request and
+                connection counts of each provider pool.
+        """
+        return {
+            "clients": len(self._models),
+            "created": self._created,
+            "reused": self._reused,
+            "http2": _HTTP2,
+            "context_limits": dict(self._limit_cache),
+            "pools": {
+                provider: pool.counter.stats()
+                for provider, pool in self._pools.items()
+            },
+        }
+
+    async def aclose(self) -> None:
+        """Close every provider pool and drop the clients."""
+        for pool in self._pools.values():
+            await pool.aclose()
+        self._pools.clear()
+        self._models.clear()
@@ -0,0 +1,242 @@
+"""
+File: preflight.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 12:31:52 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Callable, Sequence
+from enum import StrEnum
+from typing import Any
+
+from langchain_core.messages import AnyMessage
+
+from app.runtime.tokenizer import (
+    MESSAGE_OVERHEAD_TOKENS,
+    Tokenizer,
+    count_message_tokens,
+)
+from app.runtime.ttl_cache import TTLCache
+
+# A single user message, or a message history.
+PreflightInput = str | Sequence[AnyMessage]
+
+
+def _texts(messages: list[Any]) -> list[str]:
+    """Text of each message of an input."""
+    return [m if isinstance(m, str) else m.text for m in messages]
+
+
+class PreflightMode(StrEnum):
+    """What to do with an input that does not fit the context window."""
+
+    REJECT = "reject"
+    TRUNCATE = "truncate"
+    OFF = "off"
+
+
+class ContextWindowExceededError(Exception):
+    """An input does not fit in the model's context window."""
+
+    def __init__(self, tokens: int, budget: int, model: str) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            tokens: Estimated input tokens.
+            budget: Input tokens the model can take for this agent.
+            model: Model id.
+        """
+        super().__init__(
+            f"Input of ~{tokens} tokens exceeds the {budget} tokens "
+            f"available for {model}"
+        )
+        self.tokens = tokens
+        self.budget = budget
+
+
+class Preflight:
+    """
+    Checks that an agent's input fits its model's context window before
+    the request is sent, so an oversized input never costs a round trip.
+
+    The budget is the model's context limit minus the system prompt
+    (counted on first use and cached by its text) and the tokens
+    reserved for the reply (`model_options.max_tokens`, or the default
+    reserve). Agents choose the mode with `config["preflight"]`.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        context_limit: Callable[[str, dict[str, Any] | None], int],
+        mode: PreflightMode = PreflightMode.REJECT,
+        output_reserve: int = 1024,
+        max_cached_prompts: int = 1024,
+    ) -> None:
+        """
+        Initialize the preflight check.
+
+        Args:
+            tokenizer: Counts input tokens.
+            context_limit: Max input tokens of a model id (and options).
+            mode: Default mode for agents that do not set one.
+            output_reserve: Tokens kept free for the reply when the agent
+                does not set `model_options.max_tokens`.
+            max_cached_prompts: System prompt token counts kept in memory.
+        """
+        self.tokenizer = tokenizer
+        self.context_limit = context_limit
+        self.mode = mode
+        self.output_reserve = output_reserve
+        self._system_tokens: TTLCache[int] = TTLCache(max_cached_prompts)
+        self.rejected = 0
+        self.truncated = 0
+
+    def system_tokens(self, config: dict[str, Any]) -> int:
+        """
+        Tokens of an agent's system prompt, counted once per prompt text.
+
+        Args:
+            config: Agent config (system_prompt).
+
+        Returns:
+            int: Tokens of the system prompt (0 if it has none).
+        """
+        prompt = config.get("system_prompt") or ""
+        if not prompt:
+            return 0
+        tokens = self._system_tokens.get(prompt)
+        if tokens is None:
+            tokens = self.tokenizer.count(prompt)
+            self._system_tokens.set(prompt, tokens)
+        return tokens
+
+    def budget(self, config: dict[str, Any]) -> int:
+        """
+        Input tokens available to an agent's messages.
+
+        Args:
+            config: Agent config (model, system_prompt, model_options).
+
+        Returns:
+            int: Context limit minus system prompt and reply reserve.
+        """
+        options = config.get("model_options") or {}
+        limit = self.context_limit(config["model"], options or None)
+        reserve = options.get("max_tokens") or self.output_reserve
+        return (
+            limit
+            - self.system_tokens(config)
+            - MESSAGE_OVERHEAD_TOKENS
+            - reserve
+        )
+
+    def check(
+        self,
+        config: dict[str, Any],
+        user_input: PreflightInput,
+    ) -> PreflightInput:
+        """
+        Pass, truncate or reject an input before it is sent.
+
+        Truncation keeps the start of a single message; for a history it
+        drops the oldest messages first, then cuts the last one.
+
+        Args:
+            config: Agent config (model, system_prompt, preflight, ...).
+            user_input: User message, or a message history.
+
+        Returns:
+            PreflightInput: The input, truncated if needed.
+
+        Raises:
+            ContextWindowExceededError: If the input does not fit and the
+                agent rejects oversized inputs (or it cannot be cut).
+            ValueError: If the agent's preflight mode is unknown.
+        """
+        mode = PreflightMode(config.get("preflight", self.mode))
+        if mode == PreflightMode.OFF:
+            return user_input
+        messages = (
+            [user_input] if isinstance(user_input, str) else list(user_input)
+        )
+        texts = _texts(messages)
+        tokens = count_message_tokens(self.tokenizer, texts)
+        budget = self.budget(config)
+        if tokens <= budget:
+            return user_input
+        truncated = None
+        if mode == PreflightMode.TRUNCATE and budget > MESSAGE_OVERHEAD_TOKENS:
+            truncated = self._truncate(messages, texts, tokens, budget)
+        if truncated is None:
+            self.rejected += 1
+            raise ContextWindowExceededError(tokens, budget, config["model"])
+        self.truncated += 1
+        return truncated
+
+    def estimate(
+        self, config: dict[str, Any], user_input: PreflightInput
+    ) -> int:
+        """
+        Tokens a run is expected to consume: its input plus the reply
+        reserve (what rate limits charge before the run starts).
+
+        Args:
+            config: Agent config (model_options.max_tokens).
+            user_input: User message, or a message history.
+
+        Returns:
+            int: Estimated input and output tokens.
+        """
+        messages = (
+            [user_input] if isinstance(user_input, str) else list(user_input)
+        )
+        options = config.get("model_options") or {}
+        reserve = options.get("max_tokens") or self.output_reserve
+        return count_message_tokens(self.tokenizer, _texts(messages)) + reserve
+
+    def _truncate(
+        self,
+        messages: list[Any],
+        texts: list[str],
+        tokens: int,
+        budget: int,
+    ) -> PreflightInput | None:
+        """Cut an input down to `budget` (None if it cannot be cut)."""
+        if isinstance(messages[0], str):
+            return self._cut(messages[0], budget - MESSAGE_OVERHEAD_TOKENS)
+        while len(messages) > 1 and tokens > budget:
+            tokens -= count_message_tokens(self.tokenizer, [texts.pop(0)])
+            messages.pop(0)
+        if tokens > budget:
+            last = messages[-1]
+            if not isinstance(last.content, str):
+                return None
+            content = self._cut(last.content, budget - MESSAGE_OVERHEAD_TOKENS)
+            messages[-1] = last.model_copy(update={"content": content})
+        return messages
+
+    def _cut(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of `text` within `max_tokens` (approximately)."""
+        tokens = self.tokenizer.count(text)
+        while tokens > max_tokens and text:
+            text = text[: int(len(text) * max_tokens / tokens * 0.98)]
+            tokens = self.tokenizer.count(text)
+        return text
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Preflight metrics.
+
+        Returns:
+            dict[str, Any]: Tokenizer, rejected and truncated inputs.
+        """
+        return {
+            "tokenizer": self.tokenizer.name,
+            "mode": str(self.mode),
+            "rejected": self.rejected,
+            "truncated": self.truncated,
+        }
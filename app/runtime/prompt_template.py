@@ -0,0 +1,184 @@
+"""
+File: prompt_template.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 11:41:26 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime
+from string import Formatter
+from typing import Any, Protocol
+
+from app.runtime.ttl_cache import TTLCache
+
+
+class TemplateError(ValueError):
+    """A template does not parse, or its variables do not match."""
+
+
+class StoredPrompt(Protocol):
+    """A persisted prompt (ORM row or schema)."""
+
+    id: int
+    content: str
+    variables: list[str] | None
+    updated_at: datetime
+
+
+class PromptTemplate:
+    """
+    Prompt content parsed once into literal text and variable slots.
+
+    Templates use `{name}` placeholders (`{{` and `}}` for literal
+    braces). Rendering joins the parts, so it never parses the content
+    again.
+    """
+
+    def __init__(self, parts: Sequence[str], slots: Sequence[int]) -> None:
+        """
+        Initialize a compiled template (use `compile`).
+
+        Args:
+            parts: Literal text and variable names, in order.
+            slots: Positions in `parts` that hold variable names.
+        """
+        self._parts = list(parts)
+        self._slots = [(index, parts[index]) for index in slots]
+        self.variables = frozenset(parts[index] for index in slots)
+
+    @classmethod
+    def compile(
+        cls, content: str, variables: Iterable[str] | None
+    ) -> "PromptTemplate":
+        """
+        Parse a template and check it uses exactly the declared variables.
+
+        Args:
+            content: Template text.
+            variables: Declared variable names (None = no variables).
+
+        Returns:
+            PromptTemplate: The compiled template.
+
+        Raises:
+            TemplateError: If the content does not parse, a placeholder is
+                not a plain name, or the used and declared variables
+                differ.
+        """
+        parts: list[str] = []
+        slots: list[int] = []
+        try:
+            parsed = list(Formatter().parse(content))
+        except ValueError as err:
+            raise TemplateError(f"Invalid template: {err}") from err
+        for literal, name, spec, conversion in parsed:
+            if literal:
+                parts.append(literal)
+            if name is None:
+                continue
+            if not name.isidentifier() or spec or conversion:
+                raise TemplateError(
+                    f"Invalid placeholder {{{name}}}: use plain {{name}}"
+                )
+            slots.append(len(parts))
+            parts.append(name)
+        template = cls(parts, slots)
+        declared = set(variables or ())
+        missing = sorted(template.variables - declared)
+        unused = sorted(declared - template.variables)
+        if missing or unused:
+            problems = []
+            if missing:
+                problems.append(f"undeclared variables {missing}")
+            if unused:
+                problems.append(f"unused variables {unused}")
+            raise TemplateError(f"Template has {' and '.join(problems)}")
+        return template
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """
+        Fill the template.
+
+        Args:
+            values: Value of every variable (converted with `str`).
+
+        Returns:
+            str: Rendered text.
+
+        Raises:
+            TemplateError: If a variable is missing or an unknown one is
+                given.
+        """
+        if values.keys() != self.variables:
+            missing = sorted(self.variables - values.keys())
+            unknown = sorted(values.keys() - self.variables)
+            problems = []
+            if missing:
+                problems.append(f"missing variables {missing}")
+            if unknown:
+                problems.append(f"unknown variables {unknown}")
+            raise TemplateError(f"Cannot render: {' and '.join(problems)}")
+        parts = self._parts.copy()
+        for index, name in self._slots:
+            parts[index] = str(values[name])
+        return "".join(parts)
+
+
+class PromptTemplateCache:
+    """
+    Compiled templates by `(prompt.id, updated_at)`.
+
+    Any prompt update changes `updated_at` and therefore the key, so a
+    stale template is never served; old versions age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Compiled templates kept in memory.
+        """
+        self._templates: TTLCache[PromptTemplate] = TTLCache(max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, prompt: StoredPrompt) -> PromptTemplate:
+        """
+        Get the compiled template of a prompt, compiling it on a miss.
+
+        Args:
+            prompt: Prompt to compile.
+
+        Returns:
+            PromptTemplate: The compiled template.
+
+        Raises:
+            TemplateError: If the prompt's template is invalid.
+        """
+        key = f"{prompt.id}:{prompt.updated_at.isoformat()}"
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            return template
+        self.misses += 1
+        template = PromptTemplate.compile(prompt.content, prompt.variables)
+        self._templates.set(key, template)
+        return template
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Cache metrics.
+
+        Returns:
+            dict[str, Any]: Cached templates, hits and misses.
+        """
+        return {
+            "compiled": len(self._templates),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self._templates.evictions,
+        }
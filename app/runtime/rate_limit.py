@@ -0,0 +1,417 @@
+"""
+File: rate_limit.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 3:05:36 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable
+from contextlib import AbstractContextManager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import StrEnum
+import threading
+import time
+from typing import Any, Protocol
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.logger import get_logger
+from app.db.models.rate_limit import RateLimitBucket
+from app.db.session import session_context
+
+logger = get_logger(__name__)
+
+
+class RateLimitScope(StrEnum):
+    """What a bucket is keyed by."""
+
+    USER = "user"
+    AGENT = "agent"
+    MODEL = "model"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Requests and estimated tokens allowed per minute (0 = unlimited).
+
+    A bucket holds one minute of allowance, so a quiet caller may burst
+    up to the full minute at once.
+    """
+
+    rpm: float = 0.0
+    tpm: float = 0.0
+
+
+class RateLimitExceededError(Exception):
+    """
+    A bucket does not hold enough allowance for a request.
+
+    Attributes:
+        key: Bucket that rejected the request (e.g. "user:alice:tokens").
+        retry_after: Seconds until every rejecting bucket has refilled
+            enough for the request.
+    """
+
+    def __init__(self, key: str, retry_after: float) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            key: Bucket that rejected the request.
+            retry_after: Seconds until the request would be admitted.
+        """
+        super().__init__(f"Rate limit of {key} exceeded")
+        self.key = key
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class Charge:
+    """Allowance a request takes from one bucket."""
+
+    key: str
+    cost: float
+    capacity: float
+
+    @property
+    def rate(self) -> float:
+        """Refill per second."""
+        return self.capacity / 60
+
+
+class BucketStore(Protocol):
+    """Token bucket state (in memory, or shared through Postgres)."""
+
+    blocking: bool
+
+    def take(self, charge: Charge, now: float) -> float:
+        """Take `charge.cost`; 0 if taken, else seconds until it fits."""
+        ...
+
+    def refund(self, charge: Charge, now: float) -> None:
+        """Give back an allowance taken for a rejected request."""
+        ...
+
+
+def _refill(tokens: float, updated: float, now: float, charge: Charge) -> float:
+    """Allowance of a bucket at `now`."""
+    return min(charge.capacity, tokens + (now - updated) * charge.rate)
+
+
+class MemoryBucketStore:
+    """
+    Buckets of one process, kept in an LRU.
+
+    An idle bucket refills to full capacity, which is also the state of
+    a new one, so evicting the least recently used buckets is lossless
+    for any bucket idle for more than a minute.
+    """
+
+    blocking = False
+
+    def __init__(self, max_buckets: int = 100_000) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            max_buckets: Buckets kept in memory.
+        """
+        self.max_buckets = max_buckets
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, charge: Charge, now: float) -> float:
+        """Take `charge.cost`; 0 if taken, else seconds until it fits."""
+        with self._lock:
+            tokens, updated = self._buckets.get(
+                charge.key, (charge.capacity, now)
+            )
+            available = _refill(tokens, updated, now, charge)
+            wait = 0.0
+            if available < charge.cost:
+                wait = (charge.cost - available) / charge.rate
+            else:
+                available -= charge.cost
+            self._buckets[charge.key] = (available, now)
+            self._buckets.move_to_end(charge.key)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def refund(self, charge: Charge, now: float) -> None:
+        """Give back an allowance taken for a rejected request."""
+        with self._lock:
+            bucket = self._buckets.get(charge.key)
+            if bucket is not None:
+                available = _refill(*bucket, now, charge)
+                self._buckets[charge.key] = (
+                    min(charge.capacity, available + charge.cost),
+                    now,
+                )
+
+    def __len__(self) -> int:
+        """Buckets in memory."""
+        return len(self._buckets)
+
+
+class PostgresBucketStore:
+    """
+    Buckets shared by every API and worker process through Postgres.
+
+    A take is one atomic upsert that refills the bucket and charges it
+    only if the refilled allowance covers the cost, so concurrent workers
+    never overdraw a bucket. Database errors are logged and the request
+    is admitted: a database hiccup must not take the API down with it.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractContextManager[Session]
+        ] = session_context,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            session_factory: Context manager yielding a transactional
+                session (commits on success).
+        """
+        self._session_factory = session_factory
+
+    def take(self, charge: Charge, now: float) -> float:
+        """Take `charge.cost`; 0 if taken, else seconds until it fits."""
+        refilled = func.least(
+            charge.capacity,
+            RateLimitBucket.tokens
+            + (now - RateLimitBucket.updated_at) * charge.rate,
+        )
+        stmt = (
+            insert(RateLimitBucket)
+            .values(
+                key=charge.key,
+                tokens=charge.capacity - charge.cost,
+                updated_at=now,
+            )
+            .on_conflict_do_update(
+                index_elements=[RateLimitBucket.key],
+                set_={"tokens": refilled - charge.cost, "updated_at": now},
+                where=refilled >= charge.cost,
+            )
+            .returning(RateLimitBucket.tokens)
+        )
+        try:
+            with self._session_factory() as session:
+                if session.execute(stmt).first() is not None:
+                    return 0.0
+                row = session.execute(
+                    select(
+                        RateLimitBucket.tokens, RateLimitBucket.updated_at
+                    ).where(RateLimitBucket.key == charge.key)
+                ).one()
+        except Exception as err:
+            logger.warning(f"Rate limit bucket read failed: {err!s}")
+            return 0.0
+        available = _refill(row.tokens, row.updated_at, now, charge)
+        return max(0.0, charge.cost - available) / charge.rate
+
+    def refund(self, charge: Charge, now: float) -> None:
+        """Give back an allowance taken for a rejected request."""
+        stmt = (
+            update(RateLimitBucket)
+            .where(RateLimitBucket.key == charge.key)
+            .values(
+                tokens=func.least(
+                    charge.capacity, RateLimitBucket.tokens + charge.cost
+                )
+            )
+        )
+        try:
+            with self._session_factory() as session:
+                session.execute(stmt)
+        except Exception as err:
+            logger.warning(f"Rate limit refund failed: {err!s}")
+
+
+_current_caller: ContextVar[str | None] = ContextVar(
+    "current_caller", default=None
+)
+
+
+def set_current_caller(caller: str | None) -> None:
+    """Set the caller whose user buckets this request's runs charge."""
+    _current_caller.set(caller)
+
+
+def current_caller() -> str | None:
+    """Caller of the request being served, if any."""
+    return _current_caller.get()
+
+
+class RateLimiter:
+    """
+    Token-bucket limits on requests and estimated tokens, keyed by user,
+    agent and model.
+
+    Checks happen where the key is first known, so a rejected request
+    costs as little as possible: the HTTP middleware charges the caller's
+    request bucket, the agent dependency the agent's request bucket, and
+    the runtime (which knows the model and the input) the model request
+    bucket and the token buckets of all three. A request rejected by one
+    bucket gives back what it took from the others.
+    """
+
+    def __init__(
+        self,
+        store: BucketStore,
+        defaults: dict[RateLimitScope, RateLimit] | None = None,
+        overrides: dict[str, RateLimit] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            store: Bucket state.
+            defaults: Limit of every key of a scope.
+            overrides: Limits of single keys ("user:alice", "agent:3",
+                "model:openai:gpt-4o").
+            clock: Wall clock (shared by all processes with Postgres).
+        """
+        self.store = store
+        self.defaults = dict(defaults or {})
+        self.overrides = dict(overrides or {})
+        self.clock = clock
+        self._admitted = 0
+        self._rejected: Counter[str] = Counter()
+
+    def limit(self, scope: RateLimitScope, id: Any) -> RateLimit:
+        """Limit of one key: its override, else its scope's default."""
+        return self.overrides.get(
+            f"{scope}:{id}", self.defaults.get(scope, RateLimit())
+        )
+
+    def _charges(
+        self,
+        scope: RateLimitScope,
+        id: Any,
+        requests: int = 0,
+        tokens: int = 0,
+    ) -> Iterable[Charge]:
+        """Charges of one key (none for unlimited dimensions)."""
+        if id is None:
+            return
+        limit = self.limit(scope, id)
+        # A request larger than a whole bucket waits for a full one.
+        if requests and limit.rpm > 0:
+            cost = min(requests, limit.rpm)
+            yield Charge(f"{scope}:{id}:requests", cost, limit.rpm)
+        if tokens and limit.tpm > 0:
+            cost = min(tokens, limit.tpm)
+            yield Charge(f"{scope}:{id}:tokens", cost, limit.tpm)
+
+    def _apply(self, charges: list[Charge]) -> None:
+        """
+        Take every charge, or none of them.
+
+        Raises:
+            RateLimitExceededError: With the longest wait of the buckets
+                that rejected the request.
+        """
+        now = self.clock()
+        taken: list[Charge] = []
+        denied: list[tuple[float, str]] = []
+        for charge in charges:
+            wait = self.store.take(charge, now)
+            if wait > 0:
+                denied.append((wait, charge.key))
+            else:
+                taken.append(charge)
+        if not denied:
+            self._admitted += 1
+            return
+        for charge in taken:
+            self.store.refund(charge, now)
+        wait, key = max(denied)
+        self._rejected[key.split(":", 1)[0]] += 1
+        raise RateLimitExceededError(key, wait)
+
+    async def _acharge(self, charges: list[Charge]) -> None:
+        """Apply charges, off the event loop for a blocking store."""
+        if not charges:
+            return
+        if self.store.blocking:
+            await asyncio.to_thread(self._apply, charges)
+        else:
+            self._apply(charges)
+
+    async def check_caller(self, caller: str | None) -> None:
+        """
+        Charge one request to a caller (HTTP middleware).
+
+        Raises:
+            RateLimitExceededError: If the caller is over its limit.
+        """
+        await self._acharge(
+            list(self._charges(RateLimitScope.USER, caller, requests=1))
+        )
+
+    async def check_agent(self, agent_id: int) -> None:
+        """
+        Charge one request to an agent (route dependency).
+
+        Raises:
+            RateLimitExceededError: If the agent is over its limit.
+        """
+        await self._acharge(
+            list(self._charges(RateLimitScope.AGENT, agent_id, requests=1))
+        )
+
+    async def check_run(
+        self,
+        caller: str | None,
+        agent_id: int | None,
+        model: str,
+        tokens: int,
+    ) -> None:
+        """
+        Charge one agent run: a model request and its estimated tokens to
+        the caller, the agent and the model.
+
+        Raises:
+            RateLimitExceededError: If any of the buckets is over its
+                limit.
+        """
+        charges = [
+            *self._charges(RateLimitScope.MODEL, model, 1, tokens),
+            *self._charges(RateLimitScope.AGENT, agent_id, tokens=tokens),
+            *self._charges(RateLimitScope.USER, caller, tokens=tokens),
+        ]
+        await self._acharge(charges)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Limiter metrics.
+
+        Returns:
+            dict[str, Any]: Store kind, admitted checks and rejections by
+                scope.
+        """
+        stats: dict[str, Any] = {
+            "store": "postgres" if self.store.blocking else "memory",
+            "admitted": self._admitted,
+            "rejected": dict(self._rejected),
+        }
+        if isinstance(self.store, MemoryBucketStore):
+            stats["buckets"] = len(self.store)
+        return stats
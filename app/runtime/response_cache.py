@@ -0,0 +1,469 @@
+"""
+File: response_cache.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 2:03:47 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+import contextlib
+from contextlib import AbstractContextManager
+from datetime import UTC, datetime, timedelta
+import hashlib
+import json
+from typing import Any
+
+from langchain.agents.middleware import (
+    AgentMiddleware,
+    ModelRequest,
+    ModelResponse,
+)
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    ToolMessage,
+    messages_from_dict,
+    messages_to_dict,
+)
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.logger import get_logger
+from app.db.models.response_cache import ResponseCacheEntry
+from app.db.session import session_context
+from app.runtime.run_metrics import record_cache_hit
+from app.runtime.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+
+def _canonical_message(message: BaseMessage) -> dict[str, Any]:
+    """
+    Stable representation of a message for hashing.
+
+    Message ids are random per run and are left out; tool call ids are
+    kept because later turns reference them.
+    """
+    data: dict[str, Any] = {"type": message.type, "content": message.content}
+    if message.name:
+        data["name"] = message.name
+    if isinstance(message, AIMessage) and message.tool_calls:
+        data["tool_calls"] = [
+            {"name": c["name"], "args": c["args"], "id": c.get("id")}
+            for c in message.tool_calls
+        ]
+    if isinstance(message, ToolMessage):
+        data["tool_call_id"] = message.tool_call_id
+    return data
+
+
+def _schema_of(response_format: Any) -> Any:
+    """Schema class or dict behind a response format strategy."""
+    return getattr(response_format, "schema", response_format)
+
+
+def _canonical_schema(response_format: Any) -> Any:
+    """JSON-serializable form of a response format."""
+    if response_format is None:
+        return None
+    schema = _schema_of(response_format)
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return schema.model_json_schema()
+    return schema
+
+
+def response_cache_key(model: str, request: ModelRequest) -> str:
+    """
+    Canonical SHA-256 key of a model request.
+
+    Covers the model, its settings, the system prompt, the messages, the
+    tool schemas, tool_choice and the response format.
+
+    Args:
+        model: Model identifier from the agent config.
+        request: Model request about to be sent.
+
+    Returns:
+        str: Hex digest identifying the request.
+    """
+    payload = {
+        "model": model,
+        "model_settings": request.model_settings,
+        "system_prompt": request.system_prompt,
+        "messages": [_canonical_message(m) for m in request.messages],
+        "tools": [
+            t if isinstance(t, dict) else convert_to_openai_tool(t)
+            for t in request.tools
+        ],
+        "tool_choice": request.tool_choice,
+        "response_format": _canonical_schema(request.response_format),
+    }
+    raw = json.dumps(
+        payload, sort_keys=True, default=str, separators=(",", ":")
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def serialize_response(response: ModelResponse) -> dict[str, Any]:
+    """
+    JSON-serializable form of a model response (both cache tiers).
+
+    Args:
+        response: Model response to cache.
+
+    Returns:
+        dict[str, Any]: Messages and structured response.
+    """
+    structured = response.structured_response
+    if isinstance(structured, BaseModel):
+        structured = structured.model_dump(mode="json")
+    return {
+        "messages": messages_to_dict(response.result),
+        "structured_response": structured,
+    }
+
+
+def deserialize_response(
+    value: dict[str, Any], request: ModelRequest
+) -> ModelResponse:
+    """
+    Rebuild a model response from its cached form.
+
+    Args:
+        value: Cached form produced by serialize_response.
+        request: Current request (its response format rebuilds the
+            structured response model).
+
+    Returns:
+        ModelResponse: Fresh message objects for this run.
+    """
+    structured = value.get("structured_response")
+    schema = _schema_of(request.response_format)
+    if (
+        structured is not None
+        and isinstance(schema, type)
+        and issubclass(schema, BaseModel)
+    ):
+        structured = schema.model_validate(structured)
+    return ModelResponse(
+        result=messages_from_dict(value["messages"]),
+        structured_response=structured,
+    )
+
+
+class PostgresResponseCacheStore:
+    """
+    Postgres tier of the response cache, shared by all API and worker
+    processes. Errors are logged and treated as misses so a database
+    hiccup never fails an agent run.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractContextManager[Session]
+        ] = session_context,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            session_factory: Context manager yielding a transactional
+                session (commits on success).
+        """
+        self._session_factory = session_factory
+
+    def get(self, key: str) -> tuple[dict[str, Any], float | None] | None:
+        """
+        Get a live entry.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            tuple[dict[str, Any], float | None] | None: Cached value and
+                its remaining TTL in seconds (None = no expiry), or None
+                if missing/expired.
+        """
+        try:
+            with self._session_factory() as session:
+                entry = session.get(ResponseCacheEntry, key)
+                if entry is None:
+                    return None
+                if entry.expires_at is None:
+                    return entry.value, None
+                remaining = (
+                    entry.expires_at - datetime.now(UTC)
+                ).total_seconds()
+                if remaining <= 0:
+                    session.delete(entry)
+                    return None
+                return entry.value, remaining
+        except Exception as err:
+            logger.warning(f"Response cache read failed: {err!s}")
+            return None
+
+    def set(self, key: str, value: dict[str, Any], ttl: float | None) -> None:
+        """
+        Insert or replace an entry.
+
+        Args:
+            key: Cache key.
+            value: Serialized response.
+            ttl: Seconds the entry lives (None = no expiry).
+        """
+        expires_at = None
+        if ttl is not None:
+            expires_at = datetime.now(UTC) + timedelta(seconds=ttl)
+        stmt = insert(ResponseCacheEntry).values(
+            key=key, value=value, expires_at=expires_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ResponseCacheEntry.key],
+            set_={"value": value, "expires_at": expires_at},
+        )
+        try:
+            with self._session_factory() as session:
+                session.execute(stmt)
+        except Exception as err:
+            logger.warning(f"Response cache write failed: {err!s}")
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries.
+
+        Returns:
+            int: Number of deleted entries.
+        """
+        with self._session_factory() as session:
+            result = session.execute(
+                delete(ResponseCacheEntry).where(
+                    ResponseCacheEntry.expires_at <= datetime.now(UTC)
+                )
+            )
+            return result.rowcount or 0
+
+
+class ResponseCache:
+    """
+    App-scoped exact-match response cache: an in-process LRU tier in
+    front of an optional Postgres tier, plus hit-rate metrics. Once
+    started, expired rows of the Postgres tier are purged on interval.
+    """
+
+    def __init__(
+        self,
+        memory: TTLCache[dict[str, Any]],
+        store: PostgresResponseCacheStore | None = None,
+        default_ttl: float | None = None,
+        purge_interval: float = 600.0,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            memory: In-process LRU tier.
+            store: Shared Postgres tier (None = memory only).
+            default_ttl: TTL used when an agent does not set one.
+            purge_interval: Seconds between deletions of expired rows of
+                the Postgres tier.
+        """
+        self.memory = memory
+        self.store = store
+        self.default_ttl = default_ttl
+        self.purge_interval = purge_interval
+        self._purge_task: asyncio.Task[None] | None = None
+        self._purged = 0
+        self._hits: Counter[str] = Counter()
+        self._misses = 0
+        self._agents: dict[str, Counter[str]] = {}
+
+    def _record(self, agent: str, outcome: str) -> None:
+        """Count a hit ('memory'/'db') or a miss for an agent."""
+        if outcome == "miss":
+            self._misses += 1
+        else:
+            self._hits[outcome] += 1
+        self._agents.setdefault(agent, Counter())[outcome] += 1
+
+    def lookup(self, key: str, agent: str) -> dict[str, Any] | None:
+        """
+        Look up a key in memory, then in Postgres (sync).
+
+        Args:
+            key: Cache key.
+            agent: Agent name (metrics).
+
+        Returns:
+            dict[str, Any] | None: Cached value or None.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self._record(agent, "memory")
+            return value
+        if self.store is not None:
+            found = self.store.get(key)
+            if found is not None:
+                value, ttl = found
+                # Expire the memory copy with the row, not after the
+                # memory tier's default TTL.
+                self.memory.set(key, value, ttl)
+                self._record(agent, "db")
+                return value
+        self._record(agent, "miss")
+        return None
+
+    async def alookup(self, key: str, agent: str) -> dict[str, Any] | None:
+        """Async lookup: the Postgres tier is read in a thread."""
+        value = self.memory.get(key)
+        if value is not None:
+            self._record(agent, "memory")
+            return value
+        if self.store is not None:
+            found = await asyncio.to_thread(self.store.get, key)
+            if found is not None:
+                value, ttl = found
+                self.memory.set(key, value, ttl)
+                self._record(agent, "db")
+                return value
+        self._record(agent, "miss")
+        return None
+
+    def save(self, key: str, value: dict[str, Any], ttl: float | None) -> None:
+        """
+        Store a value in every tier (sync).
+
+        Args:
+            key: Cache key.
+            value: Serialized response.
+            ttl: Seconds the entry lives.
+        """
+        self.memory.set(key, value, ttl)
+        if self.store is not None:
+            self.store.set(key, value, ttl)
+
+    async def asave(
+        self, key: str, value: dict[str, Any], ttl: float | None
+    ) -> None:
+        """Async save: the Postgres tier is written in a thread."""
+        self.memory.set(key, value, ttl)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, key, value, ttl)
+
+    async def _purge_loop(self) -> None:
+        """Purge expired rows of the store on interval, until cancelled."""
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            try:
+                deleted = await asyncio.to_thread(self.store.purge_expired)
+            except Exception as err:
+                logger.error(f"Response cache purge failed: {err!s}")
+                continue
+            self._purged += deleted
+            if deleted:
+                logger.info(f"Purged {deleted!s} expired cached responses")
+
+    async def start(self) -> None:
+        """Start purging expired rows of the Postgres tier, if any."""
+        if self._purge_task is None and self.store is not None:
+            self._purge_task = asyncio.create_task(self._purge_loop())
+
+    async def aclose(self) -> None:
+        """Stop the purge task."""
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._purge_task
+            self._purge_task = None
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Hit-rate metrics.
+
+        Returns:
+            dict[str, Any]: Hits per tier, misses, hit rate, memory size,
+                purged rows and per-agent counters.
+        """
+        hits = sum(self._hits.values())
+        lookups = hits + self._misses
+        return {
+            "hits": {"memory": self._hits["memory"], "db": self._hits["db"]},
+            "misses": self._misses,
+            "hit_rate": hits / lookups if lookups else None,
+            "memory_entries": len(self.memory),
+            "memory_evictions": self.memory.evictions,
+            "purged": self._purged,
+            "agents": {
+                name: dict(counts) for name, counts in self._agents.items()
+            },
+        }
+
+
+class ResponseCacheMiddleware(AgentMiddleware):
+    """
+    Agent middleware that serves repeated model requests from the cache.
+
+    On a hit the model is not called at all; on a miss the response is
+    stored with the agent's TTL.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        agent_name: str,
+        model: str,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            cache: App-scoped response cache.
+            agent_name: Agent name (metrics).
+            model: Model identifier from the agent config (cache key).
+            ttl: Entry TTL in seconds (default: the cache default).
+        """
+        super().__init__()
+        self.cache = cache
+        self.agent_name = agent_name
+        self.model = model
+        self.ttl = cache.default_ttl if ttl is None else ttl
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        """Serve the request from the cache or call the model and store."""
+        key = response_cache_key(self.model, request)
+        cached = self.cache.lookup(key, self.agent_name)
+        if cached is not None:
+            record_cache_hit("response")
+            return deserialize_response(cached, request)
+        response = handler(request)
+        if isinstance(response, ModelResponse):
+            self.cache.save(key, serialize_response(response), self.ttl)
+        return response
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Async version of wrap_model_call."""
+        key = response_cache_key(self.model, request)
+        cached = await self.cache.alookup(key, self.agent_name)
+        if cached is not None:
+            record_cache_hit("response")
+            return deserialize_response(cached, request)
+        response = await handler(request)
+        if isinstance(response, ModelResponse):
+            await self.cache.asave(key, serialize_response(response), self.ttl)
+        return response
@@ -0,0 +1,221 @@
+"""
+File: run_metrics.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 6:07:13 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections import Counter
+from collections.abc import Awaitable, Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import threading
+import time
+from typing import Any
+
+from langchain.agents.middleware import (
+    AgentMiddleware,
+    ModelRequest,
+    ModelResponse,
+    ToolCallRequest,
+)
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.types import Command
+
+
+@dataclass
+class RunRecord:
+    """
+    Metrics of one agent run, filled in while the run executes.
+
+    Model and tool timings are added by RunMetricsMiddleware; caches
+    report their hits through `record_cache_hit`.
+    """
+
+    agent_id: int | None
+    agent_name: str
+    model: str
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    status: str = "succeeded"
+    error: str | None = None
+    duration_ms: float = 0.0
+    model_calls: int = 0
+    model_latency_ms: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tool_calls: int = 0
+    tool_latency: dict[str, dict[str, float]] = field(default_factory=dict)
+    cache_hits: Counter[str] = field(default_factory=Counter)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def add_model_call(self, latency_ms: float, response: Any) -> None:
+        """Count a model request and the tokens it reported."""
+        with self._lock:
+            self.model_calls += 1
+            self.model_latency_ms += latency_ms
+            messages = getattr(response, "result", [])
+            for message in messages:
+                usage = getattr(message, "usage_metadata", None)
+                if isinstance(message, AIMessage) and usage:
+                    self.prompt_tokens += usage.get("input_tokens", 0)
+                    self.completion_tokens += usage.get("output_tokens", 0)
+
+    def add_tool_call(self, name: str, latency_ms: float) -> None:
+        """Count a tool execution (tools of a turn may run in threads)."""
+        with self._lock:
+            self.tool_calls += 1
+            entry = self.tool_latency.setdefault(
+                name, {"calls": 0, "total_ms": 0.0}
+            )
+            entry["calls"] += 1
+            entry["total_ms"] += latency_ms
+
+    def add_cache_hit(self, kind: str) -> None:
+        """Count a hit of the 'response', 'semantic' or 'tool' cache."""
+        with self._lock:
+            self.cache_hits[kind] += 1
+
+    def as_row(self) -> dict[str, Any]:
+        """
+        Column values for the agent_runs table.
+
+        Returns:
+            dict[str, Any]: AgentRun column -> value.
+        """
+        return {
+            "agent_id": self.agent_id,
+            "agent_name": self.agent_name,
+            "model": self.model,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "steps": self.model_calls + self.cache_hits["response"],
+            "model_calls": self.model_calls,
+            "model_latency_ms": self.model_latency_ms,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tool_calls": self.tool_calls,
+            "tool_latency_ms": sum(
+                t["total_ms"] for t in self.tool_latency.values()
+            ),
+            "tool_latency": self.tool_latency,
+            "response_cache_hits": self.cache_hits["response"],
+            "semantic_cache_hits": self.cache_hits["semantic"],
+            "tool_cache_hits": self.cache_hits["tool"],
+        }
+
+
+_current_run: ContextVar[RunRecord | None] = ContextVar(
+    "current_run", default=None
+)
+
+
+@contextmanager
+def track_run(record: RunRecord) -> Generator[RunRecord]:
+    """
+    Make `record` the current run while the block executes.
+
+    Graph tasks and tool threads copy the context, so middleware running
+    anywhere inside the run reports into the same record.
+
+    Args:
+        record: Record of the run.
+
+    Yields:
+        RunRecord: The same record.
+    """
+    token = _current_run.set(record)
+    try:
+        yield record
+    finally:
+        _current_run.reset(token)
+
+
+def current_run() -> RunRecord | None:
+    """Record of the run executing in this context, if any."""
+    return _current_run.get()
+
+
+def record_cache_hit(kind: str) -> None:
+    """Count a cache hit on the current run (no-op outside a run)."""
+    record = _current_run.get()
+    if record is not None:
+        record.add_cache_hit(kind)
+
+
+class RunMetricsMiddleware(AgentMiddleware):
+    """
+    Agent middleware timing model requests and tool executions.
+
+    Added innermost, so cache hits (served by outer middleware) are not
+    timed or counted as tokens.
+    """
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        """Time the model request and record its token usage."""
+        started = time.perf_counter()
+        response = handler(request)
+        self._model_done(started, response)
+        return response
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Async version of wrap_model_call."""
+        started = time.perf_counter()
+        response = await handler(request)
+        self._model_done(started, response)
+        return response
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Time the tool execution."""
+        started = time.perf_counter()
+        try:
+            return handler(request)
+        finally:
+            self._tool_done(started, request)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """Async version of wrap_tool_call."""
+        started = time.perf_counter()
+        try:
+            return await handler(request)
+        finally:
+            self._tool_done(started, request)
+
+    @staticmethod
+    def _model_done(started: float, response: Any) -> None:
+        """Add a finished model request to the current run."""
+        record = _current_run.get()
+        if record is not None:
+            elapsed = (time.perf_counter() - started) * 1000
+            record.add_model_call(elapsed, response)
+
+    @staticmethod
+    def _tool_done(started: float, request: ToolCallRequest) -> None:
+        """Add a finished tool execution to the current run."""
+        record = _current_run.get()
+        if record is not None:
+            elapsed = (time.perf_counter() - started) * 1000
+            record.add_tool_call(request.tool_call["name"], elapsed)
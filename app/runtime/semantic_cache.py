@@ -0,0 +1,300 @@
+"""
+File: semantic_cache.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 3:06:55 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+import numpy as np
+
+from app.runtime.embeddings import Embedder
+
+
+@dataclass
+class _Entry:
+    """Cached agent output and what it cost to produce."""
+
+    messages: list[dict[str, Any]]
+    structured_response: Any
+    duration: float
+
+
+@dataclass
+class SemanticLookup:
+    """
+    Result of a semantic cache lookup.
+
+    Attributes:
+        vector: Embedding of the input (reused to store a miss).
+        state: Cached final agent state, or None on a miss.
+        score: Cosine similarity of the best match, if any.
+    """
+
+    vector: np.ndarray
+    state: dict[str, Any] | None = None
+    score: float | None = None
+
+
+class SemanticIndex:
+    """
+    Fixed-capacity cosine-similarity index over unit vectors.
+
+    Vectors live in one preallocated NumPy matrix, so a search is a single
+    matrix-vector product masked by scope and expiry. Entries are evicted
+    by age (TTL) and, when full, oldest first. Scopes are interned as ids
+    while any slot holds one of their entries, so there are never more
+    than `max_entries` of them.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            max_entries: Max vectors kept; the matrix is allocated on the
+                first insert, once the embedding size is known.
+        """
+        self.max_entries = max_entries
+        self._vectors: np.ndarray | None = None
+        self._scopes = np.full(max_entries, -1, dtype=np.int64)
+        self._created = np.zeros(max_entries, dtype=np.float64)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._values: list[Any] = [None] * max_entries
+        self._scope_ids: dict[str, int] = {}
+        self._scope_names: dict[int, str] = {}
+        self._scope_slots: Counter[int] = Counter()
+        self._next_scope = 0
+        self._lock = threading.Lock()
+        self.evictions: Counter[str] = Counter()
+
+    def _intern(self, scope: str) -> int:
+        """Id of a scope, counting the slot that will hold it."""
+        scope_id = self._scope_ids.get(scope)
+        if scope_id is None:
+            scope_id = self._next_scope
+            self._next_scope += 1
+            self._scope_ids[scope] = scope_id
+            self._scope_names[scope_id] = scope
+        self._scope_slots[scope_id] += 1
+        return scope_id
+
+    def _release(self, scope_id: int) -> None:
+        """Uncount a slot of a scope; forget the scope with its last."""
+        self._scope_slots[scope_id] -= 1
+        if self._scope_slots[scope_id] <= 0:
+            del self._scope_slots[scope_id]
+            del self._scope_ids[self._scope_names.pop(scope_id)]
+
+    def _live(self, now: float) -> np.ndarray:
+        """Mask of used, unexpired slots."""
+        return (self._scopes >= 0) & (self._expires > now)
+
+    def search(
+        self, scope: str, vector: np.ndarray, threshold: float
+    ) -> tuple[Any, float] | None:
+        """
+        Find the most similar live entry of a scope.
+
+        Args:
+            scope: Entries are only matched within the same scope.
+            vector: Unit query vector.
+            threshold: Minimum cosine similarity for a match.
+
+        Returns:
+            tuple[Any, float] | None: Stored value and similarity, or None.
+        """
+        with self._lock:
+            scope_id = self._scope_ids.get(scope)
+            if self._vectors is None or scope_id is None:
+                return None
+            mask = self._live(time.monotonic()) & (self._scopes == scope_id)
+            if not mask.any():
+                return None
+            scores = np.where(mask, self._vectors @ vector, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] < threshold:
+                return None
+            return self._values[best], float(scores[best])
+
+    def add(
+        self, scope: str, vector: np.ndarray, value: Any, ttl: float | None
+    ) -> None:
+        """
+        Insert an entry, reusing an expired slot or evicting the oldest.
+
+        Args:
+            scope: Scope of the entry.
+            vector: Unit vector.
+            value: Value returned on a match.
+            ttl: Seconds the entry lives (None = until evicted by size).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32
+                )
+            free = np.flatnonzero(~self._live(now))
+            if free.size:
+                slot = int(free[0])
+                if self._scopes[slot] >= 0:
+                    self.evictions["age"] += 1
+            else:
+                slot = int(np.argmin(self._created))
+                self.evictions["size"] += 1
+            if self._scopes[slot] >= 0:
+                self._release(int(self._scopes[slot]))
+            scope_id = self._intern(scope)
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope_id
+            self._created[slot] = now
+            self._expires[slot] = np.inf if ttl is None else now + ttl
+            self._values[slot] = value
+
+    @property
+    def scopes(self) -> int:
+        """Number of scopes with an entry in some slot."""
+        return len(self._scope_ids)
+
+    def __len__(self) -> int:
+        """Number of live entries."""
+        return int(self._live(time.monotonic()).sum())
+
+
+class SemanticCache:
+    """
+    Cache of final agent outputs matched by input similarity.
+
+    Paraphrased inputs to the same agent (same scope) within the
+    similarity threshold get the stored output without running the agent.
+    Tracks hit rate, similarity of hits and the latency they saved.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        index: SemanticIndex,
+        threshold: float,
+        default_ttl: float | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            embedder: Embeds agent inputs.
+            index: Vector index holding the entries.
+            threshold: Default minimum cosine similarity for a hit.
+            default_ttl: Default entry TTL in seconds.
+        """
+        self.embedder = embedder
+        self.index = index
+        self.threshold = threshold
+        self.default_ttl = default_ttl
+        self._hits = 0
+        self._misses = 0
+        self._saved = 0.0
+        self._similarity = 0.0
+        self._agents: dict[str, Counter[str]] = {}
+
+    async def lookup(
+        self,
+        scope: str,
+        agent: str,
+        text: str,
+        threshold: float | None = None,
+    ) -> SemanticLookup:
+        """
+        Look up the output of a similar earlier input.
+
+        Args:
+            scope: Cache scope (one per agent configuration).
+            agent: Agent name (metrics).
+            text: User input.
+            threshold: Agent-specific similarity threshold.
+
+        Returns:
+            SemanticLookup: Query vector and, on a hit, a fresh copy of
+                the cached state.
+        """
+        started = time.perf_counter()
+        vector = await self.embedder.aembed(text)
+        match = self.index.search(
+            scope, vector, self.threshold if threshold is None else threshold
+        )
+        counts = self._agents.setdefault(agent, Counter())
+        if match is None:
+            self._misses += 1
+            counts["miss"] += 1
+            return SemanticLookup(vector=vector)
+        entry, score = match
+        self._hits += 1
+        self._similarity += score
+        self._saved += max(0.0, entry.duration - time.perf_counter() + started)
+        counts["hit"] += 1
+        state = {
+            "messages": messages_from_dict(entry.messages),
+            "structured_response": entry.structured_response,
+        }
+        return SemanticLookup(vector=vector, state=state, score=score)
+
+    def store(
+        self,
+        scope: str,
+        vector: np.ndarray,
+        state: dict[str, Any],
+        duration: float,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Store the final state of a run.
+
+        Args:
+            scope: Cache scope.
+            vector: Input embedding from the lookup.
+            state: Final agent state.
+            duration: Seconds the run took (reported as saved on hits).
+            ttl: Agent-specific TTL in seconds.
+        """
+        entry = _Entry(
+            messages=messages_to_dict(state["messages"]),
+            structured_response=state.get("structured_response"),
+            duration=duration,
+        )
+        self.index.add(
+            scope, vector, entry, self.default_ttl if ttl is None else ttl
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Hit-rate and latency metrics.
+
+        Returns:
+            dict[str, Any]: Hits, misses, hit rate, mean similarity of
+                hits, seconds saved, entries, scopes, evictions and
+                per-agent counters.
+        """
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else None,
+            "mean_similarity": (
+                self._similarity / self._hits if self._hits else None
+            ),
+            "latency_saved_seconds": self._saved,
+            "entries": len(self.index),
+            "scopes": self.index.scopes,
+            "evictions": dict(self.index.evictions),
+            "agents": {
+                name: dict(counts) for name, counts in self._agents.items()
+            },
+        }
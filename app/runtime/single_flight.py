@@ -0,0 +1,194 @@
+"""
+File: single_flight.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 4:02:18 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+
+class _Flight:
+    """
+    One in-flight execution and the events it has produced so far.
+
+    A call publishes a single event (its result); a stream publishes each
+    item it yields. Subscribers read the events from the start, so one
+    joining late still sees the whole stream.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty flight."""
+        self.events: list[Any] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.subscribers = 0
+        self.task: asyncio.Task[None] | None = None
+        self._changed = asyncio.Event()
+
+    def publish(self, event: Any) -> None:
+        """Append an event and wake the subscribers."""
+        self.events.append(event)
+        self._wake()
+
+    def finish(self, error: BaseException | None = None) -> None:
+        """End the flight (with the error subscribers re-raise, if any)."""
+        self.done = True
+        self.error = error
+        self._wake()
+
+    def _wake(self) -> None:
+        """Release waiting subscribers; later waits block again."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def events_from(self, start: int = 0) -> AsyncIterator[Any]:
+        """Every event from `start`, waiting for new ones until done."""
+        index = start
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent executions into one.
+
+    The first caller of a key starts the execution in its own task;
+    callers arriving with the same key while it runs subscribe to it
+    instead of starting another. The task runs in (a copy of) the first
+    caller's context, so `fn` should drop anything specific to that
+    caller, such as its deadline; it is only cancelled when every
+    subscriber has left, so one caller giving up does not fail the
+    others. A key is forgotten as soon
+    as its execution ends: results are shared, never cached.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no flights."""
+        self._flights: dict[str, _Flight] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def _join(
+        self, key: str, start: Callable[[_Flight], Awaitable[None]]
+    ) -> _Flight:
+        """Subscribe to the flight of `key`, starting it if needed."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._fly(key, flight, start))
+            self._leaders += 1
+        else:
+            self._coalesced += 1
+        flight.subscribers += 1
+        return flight
+
+    async def _fly(
+        self,
+        key: str,
+        flight: _Flight,
+        start: Callable[[_Flight], Awaitable[None]],
+    ) -> None:
+        """Run a flight and publish how it ended."""
+        try:
+            await start(flight)
+        except BaseException as err:
+            flight.finish(err)
+            if not isinstance(err, Exception):
+                raise
+        else:
+            flight.finish()
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def _leave(self, key: str, flight: _Flight) -> None:
+        """Unsubscribe; the last subscriber cancels an unfinished flight."""
+        flight.subscribers -= 1
+        if flight.subscribers == 0 and not flight.done:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.task.cancel()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn()`, or the in-flight call of the same key.
+
+        Args:
+            key: Canonical key of the call.
+            fn: Starts the call (only called by the first caller).
+
+        Returns:
+            Any: The shared result.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+
+        async def start(flight: _Flight) -> None:
+            flight.publish(await fn())
+
+        flight = self._join(key, start)
+        try:
+            async for result in flight.events_from():
+                return result
+            raise RuntimeError(f"Single-flight call {key} returned nothing")
+        finally:
+            self._leave(key, flight)
+
+    async def stream(
+        self, key: str, fn: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate `fn()`, or subscribe to the in-flight stream of the key.
+
+        Every subscriber receives every item, including those produced
+        before it joined.
+
+        Args:
+            key: Canonical key of the stream.
+            fn: Opens the stream (only called by the first caller).
+
+        Yields:
+            Any: The shared items.
+
+        Raises:
+            Exception: Whatever the shared stream raised.
+        """
+
+        async def start(flight: _Flight) -> None:
+            async for item in fn():
+                flight.publish(item)
+
+        flight = self._join(key, start)
+        try:
+            async for item in flight.events_from():
+                yield item
+        finally:
+            self._leave(key, flight)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Coalescing metrics.
+
+        Returns:
+            dict[str, int]: Flights in flight, executions started and
+                callers served by another caller's execution.
+        """
+        return {
+            "in_flight": len(self._flights),
+            "executions": self._leaders,
+            "coalesced": self._coalesced,
+        }
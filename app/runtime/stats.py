@@ -0,0 +1,89 @@
+"""
+File: stats.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 9:12:40 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections import deque
+import math
+from typing import Any
+
+
+class LatencyWindow:
+    """
+    Rolling window of latency samples (seconds) with percentile queries.
+
+    Keeps only the most recent `size` samples so memory stays bounded and
+    percentiles follow the current load instead of the whole process life.
+    """
+
+    def __init__(self, size: int = 1000) -> None:
+        """
+        Initialize the window.
+
+        Args:
+            size: Max number of samples kept.
+        """
+        self._samples: deque[float] = deque(maxlen=size)
+        self._count = 0
+        self._total = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Record a sample.
+
+        Args:
+            value: Latency in seconds.
+        """
+        self._samples.append(value)
+        self._count += 1
+        self._total += value
+
+    @property
+    def count(self) -> int:
+        """Total number of samples recorded (not only the window)."""
+        return self._count
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Nearest-rank percentile over the current window.
+
+        Args:
+            q: Percentile in [0, 100].
+
+        Returns:
+            float | None: The percentile, or None if there are no samples.
+        """
+        samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(q / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def mean(self) -> float | None:
+        """Mean over the current window, or None if empty."""
+        samples = list(self._samples)
+        if not samples:
+            return None
+        return sum(samples) / len(samples)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Summary of the window for metrics endpoints.
+
+        Returns:
+            dict[str, Any]: count, total, mean, p50, p95, p99 and max.
+        """
+        samples = list(self._samples)
+        return {
+            "count": self._count,
+            "total": round(self._total, 6),
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(samples) if samples else None,
+        }
@@ -0,0 +1,108 @@
+"""
+File: tokenizer.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 12:14:37 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Iterable
+import math
+from typing import Protocol
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Per-message overhead of role markers and separators in chat formats.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class Tokenizer(Protocol):
+    """Counts the tokens of a text locally (no provider round trip)."""
+
+    name: str
+
+    def count(self, text: str) -> int:
+        """Number of tokens in `text`."""
+        ...
+
+
+class HeuristicTokenizer:
+    """
+    Fast estimate of about 4 characters a token.
+
+    Close enough for English text on current BPE vocabularies; used when
+    no exact tokenizer is configured or installed.
+    """
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        """Estimated tokens in `text`."""
+        return math.ceil(len(text) / 4)
+
+
+class TiktokenTokenizer:
+    """Exact counts for OpenAI-style BPE encodings (needs `tiktoken`)."""
+
+    def __init__(self, encoding: str) -> None:
+        """
+        Load the encoding.
+
+        Args:
+            encoding: tiktoken encoding name, e.g. "o200k_base".
+
+        Raises:
+            ImportError: If tiktoken is not installed.
+            ValueError: If the encoding is unknown.
+        """
+        import tiktoken
+
+        self._encoding = tiktoken.get_encoding(encoding)
+        self.name = f"tiktoken:{encoding}"
+
+    def count(self, text: str) -> int:
+        """Tokens in `text`."""
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def build_tokenizer(name: str) -> Tokenizer:
+    """
+    Build a tokenizer from its settings name.
+
+    Args:
+        name: "heuristic", or "tiktoken:<encoding>". An exact tokenizer
+            that cannot be loaded falls back to the heuristic.
+
+    Returns:
+        Tokenizer: The tokenizer.
+    """
+    kind, _, encoding = name.partition(":")
+    if kind == "tiktoken":
+        try:
+            return TiktokenTokenizer(encoding or "o200k_base")
+        except (ImportError, ValueError) as err:
+            logger.warning(
+                f"Tokenizer {name!s} unavailable ({err!s}); using heuristic"
+            )
+    elif kind != "heuristic":
+        logger.warning(f"Unknown tokenizer {name!s}; using heuristic")
+    return HeuristicTokenizer()
+
+
+def count_message_tokens(tokenizer: Tokenizer, texts: Iterable[str]) -> int:
+    """
+    Tokens of a list of chat messages, with per-message overhead.
+
+    Args:
+        tokenizer: Tokenizer to count with.
+        texts: Text of each message.
+
+    Returns:
+        int: Total tokens.
+    """
+    return sum(
+        tokenizer.count(text) + MESSAGE_OVERHEAD_TOKENS for text in texts
+    )
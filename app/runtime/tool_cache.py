@@ -0,0 +1,272 @@
+"""
+File: tool_cache.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 3:52:10 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+import json
+import threading
+from typing import Any
+
+from langchain.agents.middleware import AgentMiddleware, ToolCallRequest
+from langchain_core.messages import ToolMessage
+from langgraph.types import Command
+
+from app.runtime.cancellation import DeadlineExceededError
+from app.runtime.run_metrics import record_cache_hit
+from app.runtime.ttl_cache import TTLCache
+
+# Settles the future of a leader that gave up: its waiters claim again.
+_RETRY = object()
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """
+    Cacheability of a tool, declared next to the tool in app.tools.
+
+    Attributes:
+        ttl: Seconds a result stays valid (None = until evicted).
+        key_fields: Arguments that identify a call (None = all).
+        max_entries: Max results kept for the tool (LRU beyond).
+    """
+
+    ttl: float | None
+    key_fields: tuple[str, ...] | None = None
+    max_entries: int = 1024
+
+
+class ToolMemo:
+    """
+    Memoized results of one tool, shared by every agent using it.
+
+    Results are kept in an LRU+TTL cache; concurrent identical calls are
+    coalesced into one execution (single-flight) whether they come from
+    the event loop or from threadpool threads. Errors are not cached.
+    Tool errors are shared with the waiting callers, but a leader that
+    is cancelled or out of time releases them to claim the call again,
+    so one of them leads instead of failing with the leader's request.
+    """
+
+    def __init__(self, name: str, policy: ToolCachePolicy) -> None:
+        """
+        Initialize the memo.
+
+        Args:
+            name: Tool name.
+            policy: Cache policy of the tool.
+        """
+        self.name = name
+        self.policy = policy
+        self.cache: TTLCache[ToolMessage] = TTLCache(
+            policy.max_entries, policy.ttl
+        )
+        self._inflight: dict[str, Future[ToolMessage]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    def key(self, args: dict[str, Any]) -> str:
+        """
+        Cache key of a call from its key fields.
+
+        Args:
+            args: Tool call arguments.
+
+        Returns:
+            str: Canonical JSON of the identifying arguments.
+        """
+        fields = self.policy.key_fields
+        if fields is not None:
+            args = {field: args.get(field) for field in fields}
+        return json.dumps(args, sort_keys=True, default=str)
+
+    def _claim(self, key: str) -> tuple[ToolMessage | None, Future, bool]:
+        """
+        Check the cache and in-flight calls under the lock.
+
+        Returns:
+            tuple: Cached result (or None), the call's future, and whether
+                this caller leads (must execute the tool).
+        """
+        with self._lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._hits += 1
+                return cached, Future(), False
+            future = self._inflight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return None, future, False
+            self._misses += 1
+            future = Future()
+            self._inflight[key] = future
+            return None, future, True
+
+    def _settle(
+        self, key: str, future: Future, result: Any, error: BaseException | None
+    ) -> None:
+        """
+        Cache a successful result and release waiting callers (to claim
+        again, if the leader's request ended rather than the tool call).
+        """
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None and _cacheable(result):
+                self.cache.set(key, result)
+        if error is None:
+            future.set_result(result)
+        elif _abandoned(error):
+            future.set_result(_RETRY)
+        else:
+            future.set_exception(error)
+
+    def call(
+        self, args: dict[str, Any], execute: Callable[[], Any]
+    ) -> ToolMessage | Any:
+        """
+        Return a cached result or execute the tool once (sync callers).
+
+        Args:
+            args: Tool call arguments.
+            execute: Runs the tool and returns its message.
+
+        Returns:
+            ToolMessage | Any: Tool result.
+        """
+        key = self.key(args)
+        while True:
+            cached, future, leader = self._claim(key)
+            if leader:
+                break
+            result = cached if cached is not None else future.result()
+            if result is not _RETRY:
+                record_cache_hit("tool")
+                return result
+        try:
+            result = execute()
+        except BaseException as err:
+            self._settle(key, future, None, err)
+            raise
+        self._settle(key, future, result, None)
+        return result
+
+    async def acall(
+        self, args: dict[str, Any], execute: Callable[[], Awaitable[Any]]
+    ) -> ToolMessage | Any:
+        """
+        Async version of call; waiters do not block the event loop, and a
+        waiter being cancelled leaves the shared call running.
+        """
+        key = self.key(args)
+        while True:
+            cached, future, leader = self._claim(key)
+            if leader:
+                break
+            result = (
+                cached
+                if cached is not None
+                else await asyncio.shield(asyncio.wrap_future(future))
+            )
+            if result is not _RETRY:
+                record_cache_hit("tool")
+                return result
+        try:
+            result = await execute()
+        except BaseException as err:
+            self._settle(key, future, None, err)
+            raise
+        self._settle(key, future, result, None)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Per-tool metrics.
+
+        Returns:
+            dict[str, Any]: Hits, misses, coalesced calls, hit rate,
+                entries and evictions.
+        """
+        lookups = self._hits + self._misses + self._coalesced
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "hit_rate": (
+                (self._hits + self._coalesced) / lookups if lookups else None
+            ),
+            "entries": len(self.cache),
+            "evictions": self.cache.evictions,
+        }
+
+
+def _abandoned(error: BaseException) -> bool:
+    """
+    Whether an error ended the leader's request rather than the tool call
+    (cancellation, its deadline): such errors are not shared.
+    """
+    return not isinstance(error, Exception) or isinstance(
+        error, DeadlineExceededError
+    )
+
+
+def _cacheable(result: Any) -> bool:
+    """Only successful tool messages are cached (not errors or commands)."""
+    return isinstance(result, ToolMessage) and result.status != "error"
+
+
+def _for_call(result: Any, request: ToolCallRequest) -> Any:
+    """Copy of a (possibly shared) tool message for this tool call."""
+    if not isinstance(result, ToolMessage):
+        return result
+    return result.model_copy(
+        update={"tool_call_id": request.tool_call["id"], "id": None}
+    )
+
+
+class ToolCacheMiddleware(AgentMiddleware):
+    """Agent middleware routing calls of cacheable tools through memos."""
+
+    def __init__(self, memos: dict[str, ToolMemo]) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            memos: Tool name -> memo, for the agent's cacheable tools.
+        """
+        super().__init__()
+        self.memos = memos
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Serve the call from the tool's memo, if it has one."""
+        memo = self.memos.get(request.tool_call["name"])
+        if memo is None:
+            return handler(request)
+        result = memo.call(request.tool_call["args"], lambda: handler(request))
+        return _for_call(result, request)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """Async version of wrap_tool_call."""
+        memo = self.memos.get(request.tool_call["name"])
+        if memo is None:
+            return await handler(request)
+        result = await memo.acall(
+            request.tool_call["args"], lambda: handler(request)
+        )
+        return _for_call(result, request)
@@ -0,0 +1,125 @@
+"""
+File: tool_executor.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 4:31:44 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import functools
+import threading
+from typing import Any
+
+from langchain.tools import BaseTool
+from langchain_core.tools import StructuredTool
+
+
+class ToolExecutor:
+    """
+    Bounded thread pool for sync tools.
+
+    Agents run on the event loop; tool calls of one model turn run as
+    concurrent tasks. Async tools are awaited directly, sync tools are
+    bound to this pool so that blocking tools neither block the loop nor
+    compete with DB calls for the loop's default executor.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Max sync tool calls running at once.
+        """
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tool"
+        )
+        self._lock = threading.Lock()
+        self._running = 0
+        self._completed = 0
+
+    def bind(self, tool: BaseTool) -> BaseTool:
+        """
+        Give a sync-only tool an async path that runs in this pool.
+
+        Args:
+            tool: Registered tool.
+
+        Returns:
+            BaseTool: A copy with a pool-backed coroutine, or the tool
+                itself if it is already async or not a function tool.
+        """
+        if (
+            not isinstance(tool, StructuredTool)
+            or tool.func is None
+            or tool.coroutine is not None
+        ):
+            return tool
+        func = tool.func
+
+        # wraps keeps func's signature, so injected config/callbacks
+        # parameters are still detected on the async path.
+        @functools.wraps(func)
+        async def coroutine(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(func, *args, **kwargs)
+
+        return tool.model_copy(update={"coroutine": coroutine})
+
+    async def run(
+        self, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Run a sync function in the pool, keeping the caller's context.
+
+        Args:
+            func: Function to run.
+            *args: Positional arguments.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            Any: The function's result.
+        """
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, func, args, kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool, call
+        )
+
+    def _call(
+        self,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        """Run func in a worker thread and count it."""
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def shutdown(self) -> None:
+        """Wait for running calls and stop the pool."""
+        self._pool.shutdown(wait=True)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Pool metrics.
+
+        Returns:
+            dict[str, Any]: Pool size, running and completed calls.
+        """
+        return {
+            "max_workers": self.max_workers,
+            "running": self._running,
+            "completed": self._completed,
+        }
@@ -0,0 +1,653 @@
+"""
+File: traffic.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 2:02:47 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+)
+import contextlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from enum import StrEnum
+import hashlib
+import io
+import json
+from pathlib import Path
+import random
+import re
+import threading
+import time
+from typing import Any
+
+from langchain.agents.middleware import (
+    AgentMiddleware,
+    ModelRequest,
+    ModelResponse,
+    ToolCallRequest,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, ToolMessage, messages_to_dict
+from langgraph.types import Command
+import zstandard
+
+from app.core.logger import get_logger
+from app.runtime.fake_chat_model import FakeChatModel
+from app.runtime.response_cache import deserialize_response, serialize_response
+
+logger = get_logger(__name__)
+
+MASK = "[masked]"
+
+
+class TrafficMode(StrEnum):
+    """What the runtime does with agent traffic."""
+
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class ReplayMissError(LookupError):
+    """A replayed run asked for a response that was never recorded."""
+
+
+class PIIMasker:
+    """
+    Masks personal data before a recording leaves the process.
+
+    Values under any of `fields` (case-insensitive keys, at any depth)
+    are replaced whole; every string is also scrubbed with `patterns`.
+    Strings holding a JSON object or array (tool results) are masked
+    field by field. Masking is idempotent, so masked inputs replay under
+    the same key.
+    """
+
+    def __init__(
+        self, fields: Iterable[str] = (), patterns: Iterable[str] = ()
+    ) -> None:
+        """
+        Initialize the masker.
+
+        Args:
+            fields: Keys whose values are masked.
+            patterns: Regular expressions masked inside strings.
+        """
+        self.fields = frozenset(name.lower() for name in fields)
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+
+    def mask(self, value: Any) -> Any:
+        """
+        Masked copy of a JSON-like value.
+
+        Args:
+            value: Dict, list, string or scalar.
+
+        Returns:
+            Any: The value with masked fields and patterns.
+        """
+        if isinstance(value, dict):
+            return {
+                key: MASK
+                if str(key).lower() in self.fields and item is not None
+                else self.mask(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list | tuple):
+            return [self.mask(item) for item in value]
+        if isinstance(value, str):
+            return self.mask_text(value)
+        return value
+
+    def mask_text(self, text: str) -> str:
+        """Scrub patterns from a string (field by field if it is JSON)."""
+        if self.fields and text[:1] in ("{", "["):
+            try:
+                parsed = json.loads(text)
+            except ValueError:
+                pass
+            else:
+                return json.dumps(self.mask(parsed))
+        for pattern in self.patterns:
+            text = pattern.sub(MASK, text)
+        return text
+
+
+def traffic_key(agent_name: str, user_input: Any) -> str:
+    """
+    Replay key of a run: its agent and (masked) input.
+
+    Args:
+        agent_name: Agent name.
+        user_input: Masked user message, or masked message dicts.
+
+    Returns:
+        str: Hex digest.
+    """
+    raw = json.dumps([agent_name, user_input], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@dataclass
+class Recording:
+    """
+    One recorded agent run: input, each model and tool step with its
+    latency, and the arrival time relative to the start of recording.
+    """
+
+    agent_name: str
+    config: dict[str, Any]
+    input: Any
+    key: str
+    offset_ms: float
+    duration_ms: float = 0.0
+    status: str = "succeeded"
+    steps: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Recording":
+        """Rebuild a recording from its file form."""
+        return cls(**data)
+
+    def model_steps(self) -> list[dict[str, Any]]:
+        """Model steps in call order."""
+        return [step for step in self.steps if step["kind"] == "model"]
+
+    def tool_steps(self) -> dict[str, dict[str, Any]]:
+        """Tool steps by tool call id."""
+        return {
+            step["call_id"]: step
+            for step in self.steps
+            if step["kind"] == "tool"
+        }
+
+
+class _Capture:
+    """Steps of a run being recorded (tools may finish in threads)."""
+
+    def __init__(self, recording: Recording, masker: PIIMasker) -> None:
+        """Record into `recording`, masking every payload."""
+        self.recording = recording
+        self.masker = masker
+        self._lock = threading.Lock()
+
+    def add_model(self, latency_ms: float, response: Any) -> None:
+        """Record a model response."""
+        if not isinstance(response, ModelResponse):
+            return
+        step = {
+            "kind": "model",
+            "latency_ms": round(latency_ms, 3),
+            "response": self.masker.mask(serialize_response(response)),
+        }
+        with self._lock:
+            self.recording.steps.append(step)
+
+    def add_tool(
+        self, request: ToolCallRequest, latency_ms: float, result: Any
+    ) -> None:
+        """Record a tool result."""
+        if not isinstance(result, ToolMessage):
+            return
+        step = {
+            "kind": "tool",
+            "call_id": request.tool_call["id"],
+            "name": request.tool_call["name"],
+            "latency_ms": round(latency_ms, 3),
+            "content": self.masker.mask(result.content),
+            "status": result.status,
+        }
+        with self._lock:
+            self.recording.steps.append(step)
+
+
+class _ReplayCursor:
+    """Position of a replayed run in its recording."""
+
+    def __init__(self, recording: Recording, speed: float) -> None:
+        """Serve `recording`'s steps, `speed` times faster."""
+        self.recording = recording
+        self.speed = speed
+        self._models = deque(recording.model_steps())
+        self._tools = recording.tool_steps()
+
+    def delay(self, step: dict[str, Any]) -> float:
+        """Seconds to wait before serving a step."""
+        return step["latency_ms"] / 1000 / self.speed
+
+    def next_model(self) -> dict[str, Any]:
+        """
+        Next recorded model step.
+
+        Raises:
+            ReplayMissError: If the run makes more model calls than the
+                recording.
+        """
+        if not self._models:
+            raise ReplayMissError(
+                f"Run of {self.recording.agent_name!s} made more model "
+                "calls than were recorded"
+            )
+        return self._models.popleft()
+
+    def tool(self, request: ToolCallRequest) -> tuple[ToolMessage, float]:
+        """
+        Recorded result of a tool call, and the seconds to wait for it.
+
+        Raises:
+            ReplayMissError: If the call was never recorded.
+        """
+        call = request.tool_call
+        step = self._tools.get(call["id"])
+        if step is None:
+            raise ReplayMissError(
+                f"Tool call {call['name']!s} ({call['id']!s}) was not recorded"
+            )
+        message = ToolMessage(
+            content=step["content"],
+            tool_call_id=call["id"],
+            name=call["name"],
+            status=step["status"],
+        )
+        return message, self.delay(step)
+
+
+_current_traffic: ContextVar[_Capture | _ReplayCursor | None] = ContextVar(
+    "current_traffic", default=None
+)
+
+
+def _masked_input(masker: PIIMasker, user_input: Any) -> Any:
+    """File form of a run input: a string, or message dicts."""
+    if isinstance(user_input, str):
+        return masker.mask_text(user_input)
+    messages = list(user_input)
+    if all(isinstance(m, BaseMessage) for m in messages):
+        messages = messages_to_dict(messages)
+    return masker.mask(messages)
+
+
+def _recorded_config(config: dict[str, Any]) -> dict[str, Any]:
+    """Agent config without model options (credentials, base URLs)."""
+    return {k: v for k, v in config.items() if k != "model_options"}
+
+
+def read_recordings(path: str | Path) -> Iterator[Recording]:
+    """
+    Read a recording file written by TrafficRecorder.
+
+    Args:
+        path: zstd-compressed JSON-lines file.
+
+    Yields:
+        Recording: Each recorded run, in arrival order per flush.
+    """
+    with open(path, "rb") as raw:
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True
+        )
+        for line in io.TextIOWrapper(reader, encoding="utf-8"):
+            if line.strip():
+                yield Recording.from_dict(json.loads(line))
+
+
+class TrafficRecorder:
+    """
+    Samples agent runs and writes them to a compact local file.
+
+    A sampled run records its masked input, every model response and tool
+    result with its latency, and its arrival time. Finished recordings
+    are buffered and appended in the background, one zstd frame of JSON
+    lines per flush, so recording never blocks a run; when the disk
+    falls behind, the oldest buffered runs are dropped.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        sample_rate: float = 1.0,
+        masker: PIIMasker | None = None,
+        flush_interval: float = 2.0,
+        max_buffer: int = 10_000,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            path: File recordings are appended to.
+            sample_rate: Fraction of runs recorded, in [0, 1].
+            masker: Masks personal data (None masks nothing).
+            flush_interval: Max seconds a recording waits in the buffer.
+            max_buffer: Recordings kept in memory before the oldest are
+                dropped.
+            seed: Seed of the sampling decisions.
+        """
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        self.masker = masker or PIIMasker()
+        self.flush_interval = flush_interval
+        self._buffer: deque[Recording] = deque(maxlen=max_buffer)
+        self._random = random.Random(seed)
+        self._started = time.perf_counter()
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._task: asyncio.Task[None] | None = None
+        self._sampled = 0
+        self._skipped = 0
+        self._written = 0
+        self._dropped = 0
+
+    @contextmanager
+    def track(
+        self, agent_name: str, config: dict[str, Any], user_input: Any
+    ) -> Generator[None]:
+        """
+        Record the run executing in the block, if it is sampled.
+
+        Args:
+            agent_name: Agent name.
+            config: Agent config (model options are not recorded).
+            user_input: User message, or a message history.
+        """
+        if self._random.random() >= self.sample_rate:
+            self._skipped += 1
+            yield
+            return
+        self._sampled += 1
+        masked = _masked_input(self.masker, user_input)
+        started = time.perf_counter()
+        recording = Recording(
+            agent_name=agent_name,
+            config=self.masker.mask(_recorded_config(config)),
+            input=masked,
+            key=traffic_key(agent_name, masked),
+            offset_ms=round((started - self._started) * 1000, 3),
+        )
+        token = _current_traffic.set(_Capture(recording, self.masker))
+        try:
+            yield
+        except BaseException:
+            recording.status = "failed"
+            raise
+        finally:
+            _current_traffic.reset(token)
+            recording.duration_ms = round(
+                (time.perf_counter() - started) * 1000, 3
+            )
+            if len(self._buffer) == self._buffer.maxlen:
+                self._dropped += 1
+            self._buffer.append(recording)
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def aclose(self) -> None:
+        """Stop the flush task and write what is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Append the buffered recordings to the file."""
+        batch = [self._buffer.popleft() for _ in range(len(self._buffer))]
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except Exception as err:
+            self._dropped += len(batch)
+            logger.error(f"Writing {len(batch)!s} recordings failed: {err!s}")
+            return
+        self._written += len(batch)
+
+    def _write(self, batch: list[Recording]) -> None:
+        """Append one compressed frame of JSON lines (runs in a thread)."""
+        lines = "".join(
+            json.dumps(asdict(recording), default=str) + "\n"
+            for recording in batch
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as out:
+            out.write(self._compressor.compress(lines.encode()))
+
+    async def _flush_loop(self) -> None:
+        """Flush on interval, until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Recorder metrics.
+
+        Returns:
+            dict[str, Any]: Sampled, skipped, buffered, written and
+                dropped runs.
+        """
+        return {
+            "mode": str(TrafficMode.RECORD),
+            "path": str(self.path),
+            "sampled": self._sampled,
+            "skipped": self._skipped,
+            "buffered": len(self._buffer),
+            "written": self._written,
+            "dropped": self._dropped,
+        }
+
+
+class TrafficReplay:
+    """
+    Serves recorded model and tool responses instead of calling them.
+
+    A run is matched to a recording by agent and masked input; runs with
+    the same key take their recordings in turn. Each model and tool step
+    waits its recorded latency (divided by `speed`) and returns the
+    recorded response, so replayed load has production's shape without
+    a provider or tool backend.
+    """
+
+    def __init__(
+        self,
+        recordings: Iterable[Recording],
+        speed: float = 1.0,
+        masker: PIIMasker | None = None,
+    ) -> None:
+        """
+        Initialize the replay.
+
+        Args:
+            recordings: Recorded runs.
+            speed: Latency divisor (2.0 replays twice as fast).
+            masker: Masker the recordings were made with, so unmasked
+                inputs find their recording.
+        """
+        self.speed = speed
+        self.masker = masker or PIIMasker()
+        self._recordings: dict[str, deque[Recording]] = {}
+        for recording in recordings:
+            self._recordings.setdefault(recording.key, deque()).append(
+                recording
+            )
+        self._lock = threading.Lock()
+        self._served = 0
+        self._misses = 0
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path,
+        speed: float = 1.0,
+        masker: PIIMasker | None = None,
+    ) -> "TrafficReplay":
+        """Replay the recordings of a file."""
+        return cls(read_recordings(path), speed=speed, masker=masker)
+
+    def _take(self, key: str) -> Recording | None:
+        """Next recording of a key (round robin)."""
+        with self._lock:
+            queue = self._recordings.get(key)
+            if not queue:
+                return None
+            recording = queue[0]
+            queue.rotate(-1)
+            return recording
+
+    @contextmanager
+    def track(
+        self, agent_name: str, config: dict[str, Any], user_input: Any
+    ) -> Generator[None]:
+        """
+        Serve the run executing in the block from its recording.
+
+        Args:
+            agent_name: Agent name.
+            config: Agent config (unused; matching is by input).
+            user_input: User message, or a message history.
+
+        Raises:
+            ReplayMissError: If no run with this input was recorded.
+        """
+        key = traffic_key(agent_name, _masked_input(self.masker, user_input))
+        recording = self._take(key)
+        if recording is None:
+            self._misses += 1
+            raise ReplayMissError(
+                f"No recorded run of {agent_name!s} for this input"
+            )
+        self._served += 1
+        token = _current_traffic.set(_ReplayCursor(recording, self.speed))
+        try:
+            yield
+        finally:
+            _current_traffic.reset(token)
+
+    async def start(self) -> None:
+        """Nothing to start (recordings are loaded up front)."""
+
+    async def aclose(self) -> None:
+        """Nothing to release."""
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Replay metrics.
+
+        Returns:
+            dict[str, Any]: Recorded inputs, served runs and misses.
+        """
+        return {
+            "mode": str(TrafficMode.REPLAY),
+            "keys": len(self._recordings),
+            "recordings": sum(len(q) for q in self._recordings.values()),
+            "served": self._served,
+            "misses": self._misses,
+        }
+
+
+class TrafficMiddleware(AgentMiddleware):
+    """
+    Agent middleware recording or replaying model and tool steps.
+
+    Innermost, like the metrics middleware it sits under: a recorded run
+    captures only real model and tool calls, and a replayed run is timed
+    by the metrics as if the recorded latencies were real. Outside a
+    recorded or replayed run it passes everything through.
+    """
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        """Record the model response, or serve the recorded one."""
+        traffic = _current_traffic.get()
+        if isinstance(traffic, _ReplayCursor):
+            step = traffic.next_model()
+            time.sleep(traffic.delay(step))
+            return deserialize_response(step["response"], request)
+        started = time.perf_counter()
+        response = handler(request)
+        if traffic is not None:
+            traffic.add_model(_elapsed_ms(started), response)
+        return response
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Async version of wrap_model_call."""
+        traffic = _current_traffic.get()
+        if isinstance(traffic, _ReplayCursor):
+            step = traffic.next_model()
+            await asyncio.sleep(traffic.delay(step))
+            return deserialize_response(step["response"], request)
+        started = time.perf_counter()
+        response = await handler(request)
+        if traffic is not None:
+            traffic.add_model(_elapsed_ms(started), response)
+        return response
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Record the tool result, or serve the recorded one."""
+        traffic = _current_traffic.get()
+        if isinstance(traffic, _ReplayCursor):
+            message, delay = traffic.tool(request)
+            time.sleep(delay)
+            return message
+        started = time.perf_counter()
+        result = handler(request)
+        if traffic is not None:
+            traffic.add_tool(request, _elapsed_ms(started), result)
+        return result
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """Async version of wrap_tool_call."""
+        traffic = _current_traffic.get()
+        if isinstance(traffic, _ReplayCursor):
+            message, delay = traffic.tool(request)
+            await asyncio.sleep(delay)
+            return message
+        started = time.perf_counter()
+        result = await handler(request)
+        if traffic is not None:
+            traffic.add_tool(request, _elapsed_ms(started), result)
+        return result
+
+
+def replay_model(model: str, **options: Any) -> BaseChatModel:
+    """
+    Model client of a replaying runtime (a ModelRegistry builder).
+
+    Replayed runs never reach the provider, so agents get a local stand-in
+    instead of a client that needs credentials.
+    """
+    return FakeChatModel(latency_ms=0)
+
+
+def _elapsed_ms(started: float) -> float:
+    """Milliseconds since `started` (perf_counter)."""
+    return (time.perf_counter() - started) * 1000
@@ -0,0 +1,92 @@
+"""
+File: ttl_cache.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 1:42:08 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class TTLCache[V]:
+    """
+    In-process LRU cache with per-entry time-to-live.
+
+    Bounded by `max_entries` (least recently used entries are evicted
+    first); expired entries are dropped when read. Thread-safe, so sync
+    tools running in the threadpool can share it with the event loop.
+    """
+
+    def __init__(
+        self, max_entries: int, default_ttl: float | None = None
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Max entries kept in memory.
+            default_ttl: Seconds an entry lives when `set` gets no ttl
+                (None = no expiry).
+        """
+        self._max_entries = max_entries
+        self._default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float | None, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> V | None:
+        """
+        Get a live entry and mark it as recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            V | None: The cached value, or None if missing or expired.
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: V, ttl: float | None = None) -> None:
+        """
+        Store an entry, evicting the least recently used if full.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            ttl: Seconds the entry lives (default: the cache default).
+        """
+        ttl = self._default_ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Number of entries (including not yet dropped expired ones)."""
+        return len(self._entries)
@@ -0,0 +1,122 @@
+"""
+File: work_stealing.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 6:37:05 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any
+
+
+class WorkStealingScheduler:
+    """
+    Runs a list of items over a bounded set of asyncio workers.
+
+    Items are dealt to per-worker deques up front, by `affinity` key when
+    given (so items of the same agent share a worker and its warm
+    state), else round-robin. A worker takes from the front of its own
+    deque; once it is empty, it steals from the back of the longest
+    other deque, so one slow item does not hold back the work queued
+    behind it. At most `workers` items are in flight at once.
+    """
+
+    def __init__(self, workers: int) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            workers: Max items in flight (workers per `map`).
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self._executed = 0
+        self._steals = 0
+
+    @staticmethod
+    def _deal(
+        count: int,
+        workers: int,
+        keys: Sequence[Hashable] | None,
+    ) -> list[deque[int]]:
+        """Item indices of each worker's deque."""
+        queues: list[deque[int]] = [deque() for _ in range(workers)]
+        if keys is None:
+            for index in range(count):
+                queues[index % workers].append(index)
+            return queues
+        slots: dict[Hashable, int] = {}
+        for index, key in enumerate(keys):
+            # Keys get workers in order of first appearance, so distinct
+            # keys spread evenly instead of colliding by hash.
+            slot = slots.setdefault(key, len(slots) % workers)
+            queues[slot].append(index)
+        return queues
+
+    async def map[T, R](
+        self,
+        fn: Callable[[T], Awaitable[R]],
+        items: Sequence[T],
+        affinity: Callable[[T], Hashable] | None = None,
+        workers: int | None = None,
+    ) -> list[R | Exception]:
+        """
+        Apply `fn` to every item.
+
+        Args:
+            fn: Coroutine function run once per item.
+            items: Items to process.
+            affinity: Key of an item's preferred worker (None spreads
+                items round-robin).
+            workers: Max items in flight for this call (capped at the
+                scheduler's `workers`).
+
+        Returns:
+            list[R | Exception]: Result or raised exception of each item,
+                in item order.
+        """
+        count = len(items)
+        if not count:
+            return []
+        size = min(workers or self.workers, self.workers, count)
+        keys = [affinity(item) for item in items] if affinity else None
+        queues = self._deal(count, size, keys)
+        results: list[Any] = [None] * count
+
+        async def work(own: deque[int]) -> None:
+            while True:
+                if own:
+                    index = own.popleft()
+                else:
+                    victim = max(queues, key=len)
+                    if not victim:
+                        return
+                    index = victim.pop()
+                    self._steals += 1
+                try:
+                    results[index] = await fn(items[index])
+                except Exception as err:
+                    results[index] = err
+                self._executed += 1
+
+        await asyncio.gather(*(work(queue) for queue in queues))
+        return results
+
+    def stats(self) -> dict[str, int]:
+        """
+        Scheduling metrics.
+
+        Returns:
+            dict[str, int]: Worker bound, items executed and items stolen
+                from another worker's deque.
+        """
+        return {
+            "workers": self.workers,
+            "executed": self._executed,
+            "steals": self._steals,
+        }
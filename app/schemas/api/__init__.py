@@ -7,11 +7,61 @@ Author: Klaus Begnis
 Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 """
 
+from .agent_run import (
+    AgentBatchItem,
+    AgentBatchRequest,
+    AgentBatchResponse,
+    AgentInvokeRequest,
+    AgentInvokeResponse,
+    AgentRunStats,
+    AgentRunStatsByAgent,
+    AgentRunStatsByDay,
+)
+from .graph_run import GraphRunRequest, GraphRunResponse
 from .base import ErrorResponse, PaginatedResponse, SuccessResponse
 from .health import HealthResponse
+from .map_reduce import MapReduceChunk, MapReduceRequest, MapReduceResponse
+from .prompt import (
+    PromptRenderBatchItem,
+    PromptRenderBatchRequest,
+    PromptRenderBatchResponse,
+    PromptRenderRequest,
+    PromptRenderResponse,
+)
+from .swarm import (
+    SwarmRunRequest,
+    SwarmRunResponse,
+    SwarmSubtask,
+    SwarmSubtaskResult,
+)
+from .thread import ThreadMessageRequest, ThreadTurnResponse
 
 __all__ = [
+    "AgentBatchItem",
+    "AgentBatchRequest",
+    "AgentBatchResponse",
+    "AgentInvokeRequest",
+    "AgentInvokeResponse",
+    "AgentRunStats",
+    "AgentRunStatsByAgent",
+    "AgentRunStatsByDay",
+    "GraphRunRequest",
+    "GraphRunResponse",
     "HealthResponse",
+    "MapReduceChunk",
+    "MapReduceRequest",
+    "MapReduceResponse",
+    "PromptRenderBatchItem",
+    "PromptRenderBatchRequest",
+    "PromptRenderBatchResponse",
+    "PromptRenderRequest",
+    "PromptRenderResponse",
+    "SwarmRunRequest",
+    "SwarmRunResponse",
+    "SwarmSubtask",
+    "SwarmSubtaskResult",
+    "ThreadMessageRequest",
+    "ThreadTurnResponse",
     "SuccessResponse",
     "ErrorResponse",
     "PaginatedResponse",
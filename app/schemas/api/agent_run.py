@@ -0,0 +1,190 @@
+"""
+File: agent_run.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 9:41:27 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from datetime import date
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+
+
+class AgentInvokeRequest(BaseModel):
+    """
+    Body for invoking an agent.
+
+    Attributes:
+        input: User message sent to the agent.
+    """
+
+    input: str
+
+
+class AgentInvokeResponse(BaseModel):
+    """
+    Result of an agent invocation.
+
+    Attributes:
+        output: Text of the last message produced by the agent.
+        structured_response: Structured output, when the agent declares
+            `structured_output` in its config.
+    """
+
+    output: str
+    structured_response: dict[str, Any] | None = None
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> "AgentInvokeResponse":
+        """
+        Build the response from the final agent state.
+
+        Args:
+            state: State returned by the compiled agent (messages and
+                optional structured_response).
+
+        Returns:
+            AgentInvokeResponse: Output text and structured response.
+        """
+        messages = state.get("messages") or []
+        output = messages[-1].text if messages else ""
+        structured = state.get("structured_response")
+        if isinstance(structured, BaseModel):
+            structured = structured.model_dump()
+        return cls(output=output, structured_response=structured)
+
+
+class AgentBatchRequest(BaseModel):
+    """
+    Body for a batch invocation of one agent.
+
+    Attributes:
+        inputs: Independent user messages, one run each.
+        max_concurrency: Max runs in flight for this batch. Defaults to
+            (and is capped at) AGENT_BATCH_MAX_CONCURRENCY.
+    """
+
+    inputs: list[str] = Field(
+        ..., min_length=1, max_length=settings.AGENT_BATCH_MAX_SIZE
+    )
+    max_concurrency: int | None = Field(None, ge=1)
+
+
+class AgentBatchItem(BaseModel):
+    """
+    Result of one input of a batch.
+
+    Attributes:
+        index: Position of the input in the request.
+        output: Text of the last message, if the run succeeded.
+        structured_response: Structured output, if any.
+        error: Error message, if the run failed.
+    """
+
+    index: int
+    output: str | None = None
+    structured_response: dict[str, Any] | None = None
+    error: str | None = None
+
+
+class AgentBatchResponse(BaseModel):
+    """
+    Results of a batch invocation, in input order.
+
+    Attributes:
+        items: One result per input, in input order.
+        succeeded: Number of successful runs.
+        failed: Number of failed runs.
+    """
+
+    items: list[AgentBatchItem]
+    succeeded: int
+    failed: int
+
+    @classmethod
+    def from_results(
+        cls, results: list[dict[str, Any] | Exception]
+    ) -> "AgentBatchResponse":
+        """
+        Build the response from per-input final states or errors.
+
+        Args:
+            results: Final state or exception for each input, in order.
+
+        Returns:
+            AgentBatchResponse: Items in input order and counters.
+        """
+        items: list[AgentBatchItem] = []
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                items.append(
+                    AgentBatchItem(
+                        index=index,
+                        error=f"{type(result).__name__}: {result!s}",
+                    )
+                )
+                continue
+            response = AgentInvokeResponse.from_state(result)
+            items.append(AgentBatchItem(index=index, **response.model_dump()))
+        failed = sum(1 for item in items if item.error is not None)
+        return cls(items=items, succeeded=len(items) - failed, failed=failed)
+
+
+class AgentRunStats(BaseModel):
+    """
+    Aggregated metrics of a group of agent runs.
+
+    Attributes:
+        runs: Number of runs.
+        failed: Runs that raised.
+        p50_ms: Median run duration.
+        p95_ms: 95th percentile run duration.
+        model_p50_ms: Median time spent in model requests per run.
+        model_p95_ms: 95th percentile time spent in model requests.
+        prompt_tokens: Total input tokens.
+        completion_tokens: Total output tokens.
+        total_tokens: Input plus output tokens.
+        tool_calls: Total tool executions.
+        cache_hits: Response, semantic and tool cache hits.
+    """
+
+    runs: int
+    failed: int
+    p50_ms: float | None
+    p95_ms: float | None
+    model_p50_ms: float | None
+    model_p95_ms: float | None
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    tool_calls: int
+    cache_hits: int
+
+
+class AgentRunStatsByAgent(AgentRunStats):
+    """
+    Run metrics of one agent.
+
+    Attributes:
+        agent_id: Agent primary key (None for unsaved definitions).
+        agent_name: Agent name.
+    """
+
+    agent_id: int | None
+    agent_name: str
+
+
+class AgentRunStatsByDay(AgentRunStats):
+    """
+    Run metrics of one UTC day.
+
+    Attributes:
+        day: UTC date of the runs.
+    """
+
+    day: date
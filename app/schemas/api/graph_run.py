@@ -0,0 +1,58 @@
+"""
+File: graph_run.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 7:58:12 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class GraphRunRequest(BaseModel):
+    """
+    Body for running a graph.
+
+    Attributes:
+        input: User message the entry node receives.
+    """
+
+    input: str
+
+
+class GraphRunResponse(BaseModel):
+    """
+    Result of a graph run.
+
+    Attributes:
+        output: Text of the last message produced by a node.
+        outputs: Output of each node that ran, by node name.
+        run_id: Id of the checkpointed run (None if checkpoints are off).
+    """
+
+    output: str
+    outputs: dict[str, Any]
+    run_id: int | None = None
+
+    @classmethod
+    def from_state(
+        cls, state: dict[str, Any], run_id: int | None = None
+    ) -> "GraphRunResponse":
+        """
+        Build the response from the final graph state.
+
+        Args:
+            state: State returned by the compiled graph.
+            run_id: Id of the checkpointed run, if any.
+
+        Returns:
+            GraphRunResponse: Last output text and per-node outputs.
+        """
+        messages = state.get("messages") or []
+        output = messages[-1].text if messages else ""
+        return cls(
+            output=output, outputs=state.get("outputs") or {}, run_id=run_id
+        )
@@ -0,0 +1,118 @@
+"""
+File: map_reduce.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 8:19:54 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.schemas.api.agent_run import AgentInvokeResponse
+
+if TYPE_CHECKING:
+    from app.services.map_reduce import MapReduceResult
+
+
+class MapReduceRequest(BaseModel):
+    """
+    Body for a map-reduce run of an agent over a large input.
+
+    Attributes:
+        input: Document to split into chunks.
+        instructions: Task sent with every chunk and reduce call (None
+            leaves the task to the agents' system prompts).
+        reducer_agent_id: Agent combining the partial results (None uses
+            the mapper agent).
+        chunk_tokens: Token budget of a chunk and of a reduce group.
+            Defaults to MAP_REDUCE_CHUNK_TOKENS.
+        max_concurrency: Agent calls in flight. Defaults to (and is capped
+            at) MAP_REDUCE_MAX_CONCURRENCY.
+        fail_on_chunk_error: Fail the run when any chunk fails, instead
+            of reducing the chunks that succeeded.
+    """
+
+    input: str = Field(
+        ..., min_length=1, max_length=settings.MAP_REDUCE_MAX_INPUT_CHARS
+    )
+    instructions: str | None = None
+    reducer_agent_id: int | None = None
+    chunk_tokens: int | None = Field(None, ge=64)
+    max_concurrency: int | None = Field(None, ge=1)
+    fail_on_chunk_error: bool = False
+
+
+class MapReduceChunk(BaseModel):
+    """
+    How the map step of one chunk ended.
+
+    Attributes:
+        index: Position of the chunk in the input.
+        tokens: Tokens of the chunk.
+        error: Error message, if the run failed.
+        duration_ms: Run duration.
+    """
+
+    index: int
+    tokens: int
+    error: str | None = None
+    duration_ms: float
+
+
+class MapReduceResponse(BaseModel):
+    """
+    Result of a map-reduce run.
+
+    Attributes:
+        output: Text of the final reduce (or of the only chunk).
+        structured_response: Structured output of the final reduce, if
+            any.
+        chunks: One entry per chunk, in input order.
+        failed: Number of chunks whose map step failed (left out of the
+            reduce).
+        levels: Reduce levels of the tree.
+        duration_ms: Wall-clock of the whole run.
+    """
+
+    output: str
+    structured_response: dict[str, Any] | None = None
+    chunks: list[MapReduceChunk]
+    failed: int
+    levels: int
+    duration_ms: float
+
+    @classmethod
+    def from_result(cls, result: "MapReduceResult") -> "MapReduceResponse":
+        """
+        Build the response from a map-reduce result.
+
+        Args:
+            result: Chunk results and the final reduce state.
+
+        Returns:
+            MapReduceResponse: Final output, chunks and counters.
+        """
+        chunks = [
+            MapReduceChunk(
+                index=chunk.index,
+                tokens=chunk.tokens,
+                error=(
+                    f"{type(chunk.error).__name__}: {chunk.error!s}"
+                    if chunk.error is not None
+                    else None
+                ),
+                duration_ms=chunk.seconds * 1000,
+            )
+            for chunk in result.chunks
+        ]
+        return cls(
+            **AgentInvokeResponse.from_state(result.state).model_dump(),
+            chunks=chunks,
+            failed=sum(1 for chunk in chunks if chunk.error is not None),
+            levels=result.levels,
+            duration_ms=result.seconds * 1000,
+        )
@@ -0,0 +1,79 @@
+"""
+File: prompt.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 11:50:33 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+
+
+class PromptRenderRequest(BaseModel):
+    """
+    Body for rendering a prompt.
+
+    Attributes:
+        variables: Value of each declared variable.
+    """
+
+    variables: dict[str, Any] = Field(default_factory=dict)
+
+
+class PromptRenderResponse(BaseModel):
+    """
+    A rendered prompt.
+
+    Attributes:
+        content: Prompt content with the variables filled in.
+    """
+
+    content: str
+
+
+class PromptRenderBatchRequest(BaseModel):
+    """
+    Body for rendering one prompt with many variable sets.
+
+    Attributes:
+        items: Variable sets, one rendering each.
+    """
+
+    items: list[dict[str, Any]] = Field(
+        ..., min_length=1, max_length=settings.PROMPT_RENDER_BATCH_MAX_SIZE
+    )
+
+
+class PromptRenderBatchItem(BaseModel):
+    """
+    Result of one variable set of a batch.
+
+    Attributes:
+        index: Position of the variable set in the request.
+        content: Rendered content, if the variables matched.
+        error: Error message, if they did not.
+    """
+
+    index: int
+    content: str | None = None
+    error: str | None = None
+
+
+class PromptRenderBatchResponse(BaseModel):
+    """
+    Results of a batch render, in input order.
+
+    Attributes:
+        items: One result per variable set, in input order.
+        succeeded: Number of rendered items.
+        failed: Number of items that failed.
+    """
+
+    items: list[PromptRenderBatchItem]
+    succeeded: int
+    failed: int
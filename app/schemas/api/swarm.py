@@ -0,0 +1,137 @@
+"""
+File: swarm.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 7:04:18 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.schemas.api.agent_run import AgentInvokeResponse
+
+if TYPE_CHECKING:
+    from app.services.swarm_runtime import SwarmResult
+
+
+class SwarmSubtask(BaseModel):
+    """
+    One subtask of a swarm run.
+
+    Attributes:
+        agent_id: Agent that runs the subtask.
+        input: The agent's part of the task (None sends the task itself).
+    """
+
+    agent_id: int
+    input: str | None = None
+
+
+class SwarmRunRequest(BaseModel):
+    """
+    Body for a swarm run.
+
+    Attributes:
+        task: Overall task.
+        subtasks: Subtasks fanned out to agents, run concurrently.
+        supervisor_agent_id: Agent that combines the subtask results into
+            one answer (None returns the results only).
+        max_concurrency: Subtasks in flight. Defaults to (and is capped
+            at) SWARM_MAX_WORKERS.
+    """
+
+    task: str = Field(..., min_length=1)
+    subtasks: list[SwarmSubtask] = Field(
+        ..., min_length=1, max_length=settings.SWARM_MAX_SUBTASKS
+    )
+    supervisor_agent_id: int | None = None
+    max_concurrency: int | None = Field(None, ge=1)
+
+    def agent_ids(self) -> set[int]:
+        """Every agent the run needs."""
+        ids = {subtask.agent_id for subtask in self.subtasks}
+        if self.supervisor_agent_id is not None:
+            ids.add(self.supervisor_agent_id)
+        return ids
+
+
+class SwarmSubtaskResult(BaseModel):
+    """
+    Result of one subtask.
+
+    Attributes:
+        index: Position of the subtask in the request.
+        agent_id: Agent that ran it.
+        output: Text of the agent's last message, if the run succeeded.
+        structured_response: Structured output, if any.
+        error: Error message, if the run failed.
+        duration_ms: Run duration.
+    """
+
+    index: int
+    agent_id: int
+    output: str | None = None
+    structured_response: dict[str, Any] | None = None
+    error: str | None = None
+    duration_ms: float
+
+
+class SwarmRunResponse(BaseModel):
+    """
+    Results of a swarm run.
+
+    Attributes:
+        output: The supervisor's combined answer (None without one).
+        results: One result per subtask, in request order.
+        succeeded: Number of successful subtasks.
+        failed: Number of failed subtasks.
+        duration_ms: Wall-clock of the whole run.
+    """
+
+    output: str | None = None
+    results: list[SwarmSubtaskResult]
+    succeeded: int
+    failed: int
+    duration_ms: float
+
+    @classmethod
+    def from_result(cls, result: "SwarmResult") -> "SwarmRunResponse":
+        """
+        Build the response from a swarm result.
+
+        Args:
+            result: Subtask results and the supervisor's final state.
+
+        Returns:
+            SwarmRunResponse: Results in request order and counters.
+        """
+        items: list[SwarmSubtaskResult] = []
+        for index, item in enumerate(result.results):
+            fields: dict[str, Any] = {}
+            if item.error is not None:
+                fields["error"] = f"{type(item.error).__name__}: {item.error!s}"
+            else:
+                fields = AgentInvokeResponse.from_state(item.state).model_dump()
+            items.append(
+                SwarmSubtaskResult(
+                    index=index,
+                    agent_id=item.subtask.agent.id,
+                    duration_ms=item.seconds * 1000,
+                    **fields,
+                )
+            )
+        output = None
+        if result.state is not None:
+            output = AgentInvokeResponse.from_state(result.state).output
+        failed = sum(1 for item in items if item.error is not None)
+        return cls(
+            output=output,
+            results=items,
+            succeeded=len(items) - failed,
+            failed=failed,
+            duration_ms=result.seconds * 1000,
+        )
@@ -0,0 +1,49 @@
+"""
+File: thread.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 11:02:47 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+
+
+class ThreadMessageRequest(BaseModel):
+    """
+    Body for posting a user message to a thread.
+
+    Attributes:
+        input: User message; capped at THREAD_MESSAGE_MAX_CHARS so one
+            turn's input stays bounded.
+    """
+
+    input: str = Field(
+        ..., min_length=1, max_length=settings.THREAD_MESSAGE_MAX_CHARS
+    )
+
+
+class ThreadTurnResponse(BaseModel):
+    """
+    Result of one thread turn.
+
+    Attributes:
+        seq: Seq of the stored assistant message.
+        output: Text of the agent's reply.
+        structured_response: Structured output, if the agent has one.
+        context_messages: History messages sent with the input.
+        context_tokens: Estimated tokens of history, summary and input.
+        summarized: Messages folded into the summary this turn.
+    """
+
+    seq: int
+    output: str
+    structured_response: dict[str, Any] | None = None
+    context_messages: int
+    context_tokens: int
+    summarized: int = 0
@@ -8,15 +8,41 @@ Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 """
 
 from app.schemas.db.agent import AgentCreate, AgentRead, AgentUpdate
+from app.schemas.db.graph import (
+    GraphCreate,
+    GraphDefinition,
+    GraphEdge,
+    GraphNode,
+    GraphPlan,
+    GraphRead,
+    GraphUpdate,
+)
+from app.schemas.db.graph_run import GraphRunRead
+from app.schemas.db.job import JobCreate, JobRead
 from app.schemas.db.permission import PermissionCreate, PermissionRead
 from app.schemas.db.prompt import PromptCreate, PromptRead, PromptUpdate
 from app.schemas.db.role import RoleCreate, RoleRead, RoleUpdate
+from app.schemas.db.thread import (
+    ThreadCreate,
+    ThreadMessageRead,
+    ThreadRead,
+)
 from app.schemas.db.user import UserCreate, UserRead, UserUpdate
 
 __all__ = [
     "AgentCreate",
     "AgentRead",
     "AgentUpdate",
+    "GraphCreate",
+    "GraphDefinition",
+    "GraphEdge",
+    "GraphNode",
+    "GraphPlan",
+    "GraphRead",
+    "GraphRunRead",
+    "GraphUpdate",
+    "JobCreate",
+    "JobRead",
     "PermissionCreate",
     "PermissionRead",
     "PromptCreate",
@@ -25,6 +51,9 @@ __all__ = [
     "RoleCreate",
     "RoleRead",
     "RoleUpdate",
+    "ThreadCreate",
+    "ThreadMessageRead",
+    "ThreadRead",
     "UserCreate",
     "UserRead",
     "UserUpdate",
@@ -0,0 +1,135 @@
+"""
+File: graph.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 7:12:48 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import Any, Literal
+
+from pydantic import ConfigDict, Field, model_validator
+
+from app.schemas.db.base import DBBaseSchema, TimestampSchema
+
+# Edge target that finishes the run.
+END_NODE = "__end__"
+
+
+class GraphNode(DBBaseSchema):
+    """
+    Node of a graph definition.
+
+    Attributes:
+        name: Unique node name.
+        type: "agent" runs an Agent row, "tool" calls a registered tool.
+        agent_id: Agent primary key (agent nodes).
+        tool: Tool name in the ToolProvider (tool nodes).
+        args: Fixed tool arguments (tool nodes).
+        input_arg: Tool argument that receives the text of the last
+            message (tool nodes).
+    """
+
+    name: str = Field(..., min_length=1)
+    type: Literal["agent", "tool"]
+    agent_id: int | None = None
+    tool: str | None = None
+    args: dict[str, Any] = Field(default_factory=dict)
+    input_arg: str | None = None
+
+    @model_validator(mode="after")
+    def _check_reference(self) -> "GraphNode":
+        """Agent nodes need agent_id, tool nodes need tool."""
+        if self.type == "agent" and self.agent_id is None:
+            raise ValueError(f"Agent node {self.name!r} needs 'agent_id'")
+        if self.type == "tool" and not self.tool:
+            raise ValueError(f"Tool node {self.name!r} needs 'tool'")
+        return self
+
+
+class GraphEdge(DBBaseSchema):
+    """
+    Edge of a graph definition.
+
+    A node with only unconditional edges fans out to all targets. If any
+    outgoing edge of a node has `when`, the node routes instead: the first
+    edge whose `when` occurs in the node's output (case-insensitive) is
+    taken, else its unconditional edges, else the run ends.
+
+    Attributes:
+        source: Source node name.
+        target: Target node name, or "__end__".
+        when: Text the source output must contain to follow the edge.
+    """
+
+    source: str
+    target: str
+    when: str | None = Field(None, min_length=1)
+
+
+class GraphDefinition(DBBaseSchema):
+    """
+    Structure of a graph: nodes and edges.
+
+    Attributes:
+        nodes: Graph nodes.
+        edges: Directed edges between nodes.
+        max_concurrency: Max nodes of one run executing at once (None =
+            GRAPH_MAX_CONCURRENCY).
+    """
+
+    nodes: list[GraphNode] = Field(..., min_length=1)
+    edges: list[GraphEdge] = Field(default_factory=list)
+    max_concurrency: int | None = Field(None, ge=1)
+
+    def agent_ids(self) -> set[int]:
+        """Primary keys of the agents referenced by agent nodes."""
+        return {n.agent_id for n in self.nodes if n.agent_id is not None}
+
+
+class GraphPlan(DBBaseSchema):
+    """
+    Execution plan of a graph, computed when the graph is written.
+
+    Attributes:
+        routers: Nodes with conditional edges.
+        joins: Fan-in targets -> the sources they wait for.
+        cyclic: Whether the graph loops (bounded by exit conditions).
+    """
+
+    # Plans stored by earlier versions may carry fields since dropped.
+    model_config = ConfigDict(extra="ignore")
+
+    routers: list[str] = Field(default_factory=list)
+    joins: dict[str, list[str]] = Field(default_factory=dict)
+    cyclic: bool = False
+
+
+class GraphBase(DBBaseSchema):
+    """Shared fields for Graph."""
+
+    name: str
+    definition: GraphDefinition
+    entry_node: str
+
+
+class GraphCreate(GraphBase):
+    """Schema for creating a graph."""
+
+    pass
+
+
+class GraphUpdate(DBBaseSchema):
+    """Schema for partial graph update."""
+
+    name: str | None = None
+    definition: GraphDefinition | None = None
+    entry_node: str | None = None
+
+
+class GraphRead(GraphBase, TimestampSchema):
+    """Schema for reading a graph."""
+
+    id: int
+    plan: GraphPlan | None = None
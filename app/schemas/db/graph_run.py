@@ -0,0 +1,27 @@
+"""
+File: graph_run.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 10:31:05 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from app.schemas.db.base import DBBaseSchema, TimestampSchema
+
+
+class GraphRunRead(DBBaseSchema, TimestampSchema):
+    """Schema for reading a checkpointed graph run."""
+
+    id: int
+    graph_id: int
+    graph_version: datetime
+    status: str
+    input: str
+    output: dict[str, Any] | None = None
+    error: str | None = None
+    attempts: int
+    finished_at: datetime | None = None
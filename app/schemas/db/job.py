@@ -0,0 +1,38 @@
+"""
+File: job.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 11:57:02 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import Field
+
+from app.schemas.db.base import DBBaseSchema, TimestampSchema
+
+
+class JobCreate(DBBaseSchema):
+    """Schema for enqueuing an agent run (agent_id comes from the path)."""
+
+    input: str
+    max_attempts: int | None = Field(None, ge=1, le=20)
+
+
+class JobRead(DBBaseSchema, TimestampSchema):
+    """Schema for reading a job."""
+
+    id: int
+    agent_id: int
+    status: str
+    input: str
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -0,0 +1,42 @@
+"""
+File: thread.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 10:55:02 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from datetime import datetime
+
+from pydantic import Field
+
+from app.schemas.db.base import DBBaseSchema, TimestampSchema
+
+
+class ThreadCreate(DBBaseSchema):
+    """Schema for opening a thread with an agent."""
+
+    agent_id: int
+    title: str | None = Field(None, max_length=255)
+
+
+class ThreadRead(DBBaseSchema, TimestampSchema):
+    """Schema for reading a thread."""
+
+    id: int
+    agent_id: int
+    title: str | None = None
+    summary: str | None = None
+    summary_seq: int
+    last_seq: int
+
+
+class ThreadMessageRead(DBBaseSchema):
+    """Schema for reading a thread message."""
+
+    seq: int
+    role: str
+    content: str
+    token_count: int
+    created_at: datetime
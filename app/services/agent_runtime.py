@@ -0,0 +1,867 @@
+"""
+File: agent_runtime.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 9:35:51 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import AsyncIterator, Generator, Sequence
+from contextlib import contextmanager, nullcontext
+from dataclasses import replace
+import hashlib
+import json
+import time
+from typing import Any
+
+from langchain_core.messages import (
+    AIMessageChunk,
+    AnyMessage,
+    messages_to_dict,
+)
+from langchain_core.runnables import RunnableLambda
+
+from app.config.settings import Settings
+from app.core.exceptions import (
+    GatewayTimeoutException,
+    PayloadTooLargeException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
+)
+from app.core.logger import get_logger
+from app.factories.agent_factory import AgentFactory
+from app.factories.structured_output_factory import StructuredOutputFactory
+from app.runtime.cancellation import (
+    DeadlineExceededError,
+    enforce_deadline,
+    without_deadline,
+)
+from app.runtime.circuit_breaker import (
+    BreakerPolicy,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from app.runtime.concurrency import ConcurrencyLimiter, QueueFullError
+from app.runtime.embeddings import build_embedder
+from app.runtime.fake_chat_model import build_chat_model
+from app.runtime.model_fallback import ModelLatencyTracker
+from app.runtime.model_registry import ModelRegistry
+from app.runtime.preflight import (
+    ContextWindowExceededError,
+    Preflight,
+    PreflightMode,
+)
+from app.runtime.rate_limit import (
+    MemoryBucketStore,
+    PostgresBucketStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceededError,
+    RateLimitScope,
+    current_caller,
+)
+from app.runtime.response_cache import (
+    PostgresResponseCacheStore,
+    ResponseCache,
+)
+from app.runtime.run_metrics import RunRecord, record_cache_hit, track_run
+from app.runtime.semantic_cache import SemanticCache, SemanticIndex
+from app.runtime.single_flight import SingleFlight
+from app.runtime.tokenizer import build_tokenizer
+from app.runtime.tool_executor import ToolExecutor
+from app.runtime.traffic import (
+    PIIMasker,
+    TrafficMode,
+    TrafficRecorder,
+    TrafficReplay,
+    replay_model,
+)
+from app.runtime.ttl_cache import TTLCache
+from app.schemas.db.agent import AgentBase
+from app.services.run_metrics_writer import RunMetricsWriter
+from app.services.tool_provider import ToolProvider
+
+logger = get_logger(__name__)
+
+# A single user message, or a message history (graph nodes).
+AgentInput = str | Sequence[AnyMessage]
+
+
+class AgentRuntime:
+    """
+    Runs agents built by AgentFactory on the event loop.
+
+    Every run goes through `ainvoke` (never the sync threadpool) and holds
+    a slot of the ConcurrencyLimiter for its model while it runs. Saved
+    agents are compiled once per version and the compiled graph is
+    shared by every run of it.
+    """
+
+    def __init__(
+        self,
+        agent_factory: AgentFactory,
+        limiter: ConcurrencyLimiter,
+        batch_max_concurrency: int = 16,
+        semantic_cache: SemanticCache | None = None,
+        max_parallel_tools: int = 8,
+        run_metrics: RunMetricsWriter | None = None,
+        preflight: Preflight | None = None,
+        traffic: TrafficRecorder | TrafficReplay | None = None,
+        rate_limiter: RateLimiter | None = None,
+        single_flight: SingleFlight | None = None,
+        max_compiled: int = 256,
+    ) -> None:
+        """
+        Initialize the AgentRuntime.
+
+        Args:
+            agent_factory: Factory that builds LangChain agents from config.
+            limiter: Global and per-model concurrency limiter.
+            batch_max_concurrency: Default and cap for runs in flight per
+                batch.
+            semantic_cache: Cache of outputs for similar inputs, used by
+                agents that opt in (None disables it).
+            max_parallel_tools: Default max tool calls of one model turn
+                running at once (`config["max_parallel_tools"]` per agent).
+            run_metrics: Write-behind writer of per-run metrics (None
+                disables recording).
+            preflight: Context-window check run before each model call
+                (None disables it).
+            traffic: Recorder of sampled runs, or a replay serving
+                recorded model and tool responses (None = live traffic).
+            rate_limiter: Request and token buckets charged by every run
+                before it takes a limiter slot (None disables them).
+            single_flight: Coalescer of identical concurrent runs of
+                agents that opt in with `config["coalesce"]` (a private
+                one by default).
+            max_compiled: Compiled agents of saved Agent rows kept for
+                reuse (LRU beyond).
+        """
+        self.agent_factory = agent_factory
+        self.limiter = limiter
+        self.batch_max_concurrency = batch_max_concurrency
+        self.semantic_cache = semantic_cache
+        self.max_parallel_tools = max_parallel_tools
+        self.run_metrics = run_metrics
+        self.preflight = preflight
+        self.traffic = traffic
+        self.rate_limiter = rate_limiter
+        self.single_flight = single_flight or SingleFlight()
+        self._compiled: TTLCache[Any] = TTLCache(max_compiled)
+        self._compiled_hits = 0
+        self._compiled_misses = 0
+
+    @staticmethod
+    def _build_input(user_input: AgentInput) -> dict[str, Any]:
+        """
+        Build the agent input state.
+
+        Args:
+            user_input: User message, or a message history.
+
+        Returns:
+            dict[str, Any]: Input state with the messages.
+        """
+        if isinstance(user_input, str):
+            return {"messages": [{"role": "user", "content": user_input}]}
+        return {"messages": list(user_input)}
+
+    async def invoke(
+        self, agent: AgentBase, user_input: AgentInput
+    ) -> dict[str, Any]:
+        """
+        Run an agent once and return its final state.
+
+        Args:
+            agent: Agent definition (name and config).
+            user_input: User message, or a message history (threads).
+
+        Returns:
+            dict[str, Any]: Final agent state (messages, structured_response).
+
+        Raises:
+            TooManyRequestsException: If no concurrency slot is available.
+        """
+        runnable = self.get_compiled(agent)
+        return await self.invoke_compiled(runnable, agent, user_input)
+
+    def get_compiled(self, agent: AgentBase) -> Any:
+        """
+        Compiled agent, reused across runs of the same agent version.
+
+        Saved agents (with an id) are cached by `(id, updated_at)`, so an
+        edit compiles again; unsaved definitions compile per call.
+
+        Args:
+            agent: Agent definition.
+
+        Returns:
+            The compiled LangChain agent.
+        """
+        updated_at = getattr(agent, "updated_at", None)
+        agent_id = getattr(agent, "id", None)
+        if agent_id is None or updated_at is None:
+            return self.agent_factory.create_agent(agent)
+        key = f"{agent_id}@{updated_at.isoformat()}"
+        runnable = self._compiled.get(key)
+        if runnable is not None:
+            self._compiled_hits += 1
+            return runnable
+        self._compiled_misses += 1
+        runnable = self.agent_factory.create_agent(agent)
+        self._compiled.set(key, runnable)
+        return runnable
+
+    async def invoke_compiled(
+        self, runnable: Any, agent: AgentBase, user_input: AgentInput
+    ) -> dict[str, Any]:
+        """
+        Run an already compiled agent once and return its final state.
+
+        Used by callers that compile agents ahead of time (graph nodes);
+        the run is limited and recorded like `invoke`.
+
+        Args:
+            runnable: Agent compiled by the factory from `agent`.
+            agent: Agent definition (name and config).
+            user_input: User message, or a message history.
+
+        Returns:
+            dict[str, Any]: Final agent state (messages, structured_response).
+
+        Raises:
+            TooManyRequestsException: If no concurrency slot is available.
+            PayloadTooLargeException: If the input does not fit the
+                model's context window and the agent rejects it.
+            GatewayTimeoutException: If the request deadline passed
+                before the run ended.
+        """
+        with _api_errors(agent.config["model"]):
+            return await self._run(runnable, agent, user_input)
+
+    async def stream(
+        self, agent: AgentBase, user_input: AgentInput
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Run an agent once and yield its reply as the model generates it.
+
+        The run is checked, limited and recorded like `invoke`; the
+        semantic cache is skipped, since a cached state has no tokens to
+        stream. Identical concurrent streams of a coalescing agent share
+        one run, and every subscriber receives all of its events until
+        its own deadline passes.
+
+        Args:
+            agent: Agent definition (name and config).
+            user_input: User message, or a message history.
+
+        Yields:
+            tuple[str, Any]: `("token", text)` for each text chunk of the
+                model, then `("state", final_state)` once.
+
+        Raises:
+            TooManyRequestsException: If no concurrency slot is available.
+            PayloadTooLargeException: If the input does not fit the
+                model's context window and the agent rejects it.
+            GatewayTimeoutException: If the request deadline passed
+                before the run ended.
+        """
+        with _api_errors(agent.config["model"]):
+            user_input = self._preflight(agent, user_input)
+            key = self._coalesce_key("stream", agent, user_input)
+            if key is None:
+                async for event in self._stream_once(agent, user_input):
+                    yield event
+                return
+
+            async def shared() -> AsyncIterator[tuple[str, Any]]:
+                with without_deadline():
+                    async for event in self._stream_once(agent, user_input):
+                        yield event
+
+            async with enforce_deadline():
+                async for event in self.single_flight.stream(key, shared):
+                    yield event
+
+    async def _stream_once(
+        self, agent: AgentBase, user_input: AgentInput
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Stream one run of a checked input (see `stream`)."""
+        runnable = self.get_compiled(agent)
+        model = agent.config["model"]
+        state: dict[str, Any] = {}
+        await self._charge(agent, user_input)
+        with self._recorded(agent, user_input):
+            async with enforce_deadline(), self.limiter.acquire(model):
+                async for mode, chunk in runnable.astream(
+                    self._build_input(user_input),
+                    config=self._config(agent),
+                    stream_mode=["messages", "values"],
+                ):
+                    if mode == "values":
+                        state = chunk
+                        continue
+                    message, _ = chunk
+                    if isinstance(message, AIMessageChunk) and message.text:
+                        yield "token", message.text
+        yield "state", state
+
+    async def batch(
+        self,
+        agent: AgentBase,
+        user_inputs: list[str],
+        max_concurrency: int | None = None,
+    ) -> list[dict[str, Any] | Exception]:
+        """
+        Run an agent over many independent inputs.
+
+        The agent is compiled once, so the whole batch shares one compiled
+        graph and one model client. Inputs go through `abatch` with
+        `max_concurrency`, and each run still takes a limiter slot, so a
+        batch cannot starve interactive traffic of the same model.
+
+        Args:
+            agent: Agent definition (name and config).
+            user_inputs: User messages, one run each.
+            max_concurrency: Max runs in flight; defaults to and is capped
+                at `batch_max_concurrency`.
+
+        Returns:
+            list[dict[str, Any] | Exception]: Final state or the raised
+                exception for each input, in input order.
+        """
+        runnable = self.get_compiled(agent)
+        concurrency = min(
+            max_concurrency or self.batch_max_concurrency,
+            self.batch_max_concurrency,
+        )
+
+        async def run_one(user_input: str) -> dict[str, Any]:
+            return await self._run(runnable, agent, user_input)
+
+        return await RunnableLambda(run_one).abatch(
+            user_inputs,
+            config={"max_concurrency": concurrency},
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    def _cache_scope(agent: AgentBase) -> str:
+        """
+        Semantic cache scope of an agent: its name and full config, so
+        any config change starts from an empty scope.
+        """
+        raw = json.dumps(
+            {"name": agent.name, "config": agent.config},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def _run(
+        self, runnable: Any, agent: AgentBase, user_input: AgentInput
+    ) -> dict[str, Any]:
+        """
+        Run a compiled agent once and record the run's metrics.
+
+        The input passes the context-window preflight first, so an
+        oversized input is truncated or rejected before any model call,
+        then the rate limits are charged its estimated tokens. The run,
+        including its wait for a limiter slot, is cancelled when the
+        deadline of the request serving it passes. Identical
+        concurrent runs of an agent with `config["coalesce"]` share one
+        execution (charged and recorded once) and its final state; the
+        shared execution has no deadline of its own, each caller waits
+        for it until its own deadline, and it is cancelled once every
+        caller has left.
+        Tokens, model and tool latencies, steps and cache hits are
+        collected while the run executes and handed to the write-behind
+        metrics writer when it ends.
+
+        Args:
+            runnable: Compiled agent.
+            agent: Agent definition.
+            user_input: User message, or a message history.
+
+        Returns:
+            dict[str, Any]: Final agent state.
+
+        Raises:
+            QueueFullError: If no concurrency slot is available.
+            ContextWindowExceededError: If the input does not fit the
+                model's context window.
+            RateLimitExceededError: If the caller, the agent or the model
+                is over its rate limit.
+            DeadlineExceededError: If the request deadline passed.
+        """
+        user_input = self._preflight(agent, user_input)
+        key = self._coalesce_key("invoke", agent, user_input)
+        if key is None:
+            return await self._run_once(runnable, agent, user_input)
+
+        async def shared() -> dict[str, Any]:
+            with without_deadline():
+                return await self._run_once(runnable, agent, user_input)
+
+        async with enforce_deadline():
+            return await self.single_flight.do(key, shared)
+
+    async def _run_once(
+        self, runnable: Any, agent: AgentBase, user_input: AgentInput
+    ) -> dict[str, Any]:
+        """Charge, record and execute one run of a checked input."""
+        await self._charge(agent, user_input)
+        with self._recorded(agent, user_input):
+            async with enforce_deadline():
+                return await self._run_cached(runnable, agent, user_input)
+
+    def _coalesce_key(
+        self, kind: str, agent: AgentBase, user_input: AgentInput
+    ) -> str | None:
+        """
+        Canonical key of a run for coalescing: the agent's cache scope
+        and the exact input (None if the agent does not coalesce).
+        """
+        if not agent.config.get("coalesce"):
+            return None
+        payload = (
+            user_input
+            if isinstance(user_input, str)
+            else messages_to_dict(list(user_input))
+        )
+        raw = json.dumps(
+            {"agent": getattr(agent, "id", None), "input": payload},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(raw.encode()).hexdigest()
+        return f"{kind}:{self._cache_scope(agent)}:{digest}"
+
+    def _preflight(
+        self, agent: AgentBase, user_input: AgentInput
+    ) -> AgentInput:
+        """Pass an input through the context-window preflight, if any."""
+        if self.preflight is None:
+            return user_input
+        return self.preflight.check(agent.config, user_input)
+
+    async def _charge(self, agent: AgentBase, user_input: AgentInput) -> None:
+        """Charge a run to the rate limits of its caller, agent and model."""
+        if self.rate_limiter is None:
+            return
+        tokens = (
+            self.preflight.estimate(agent.config, user_input)
+            if self.preflight is not None
+            else 0
+        )
+        await self.rate_limiter.check_run(
+            current_caller(),
+            getattr(agent, "id", None),
+            agent.config["model"],
+            tokens,
+        )
+
+    @contextmanager
+    def _recorded(
+        self, agent: AgentBase, user_input: AgentInput
+    ) -> Generator[RunRecord]:
+        """
+        Track a run of `agent` and hand its record to the writer; the run
+        is also recorded or replayed when traffic capture is on.
+        """
+        record = RunRecord(
+            agent_id=getattr(agent, "id", None),
+            agent_name=agent.name,
+            model=agent.config["model"],
+        )
+        traffic = (
+            self.traffic.track(agent.name, agent.config, user_input)
+            if self.traffic is not None
+            else nullcontext()
+        )
+        started = time.perf_counter()
+        try:
+            with track_run(record), traffic:
+                yield record
+        except BaseException as err:
+            record.status = "failed"
+            record.error = f"{type(err).__name__}: {err!s}"
+            raise
+        finally:
+            record.duration_ms = (time.perf_counter() - started) * 1000
+            if self.run_metrics is not None:
+                self.run_metrics.add(record)
+
+    async def _run_cached(
+        self, runnable: Any, agent: AgentBase, user_input: AgentInput
+    ) -> dict[str, Any]:
+        """
+        Run a compiled agent once, through the semantic cache if the agent
+        opted in with `config["semantic_cache"]` (`true`, or a dict with
+        `threshold` and/or `ttl`). Message histories are never cached.
+
+        Args:
+            runnable: Compiled agent.
+            agent: Agent definition.
+            user_input: User message, or a message history.
+
+        Returns:
+            dict[str, Any]: Final agent state.
+
+        Raises:
+            QueueFullError: If no concurrency slot is available.
+        """
+        cache_cfg = agent.config.get("semantic_cache")
+        if (
+            not cache_cfg
+            or self.semantic_cache is None
+            or not isinstance(user_input, str)
+        ):
+            return await self._execute(runnable, agent, user_input)
+        options = cache_cfg if isinstance(cache_cfg, dict) else {}
+        scope = self._cache_scope(agent)
+        lookup = await self.semantic_cache.lookup(
+            scope, agent.name, user_input, options.get("threshold")
+        )
+        if lookup.state is not None:
+            record_cache_hit("semantic")
+            return lookup.state
+        started = time.perf_counter()
+        state = await self._execute(runnable, agent, user_input)
+        self.semantic_cache.store(
+            scope,
+            lookup.vector,
+            state,
+            duration=time.perf_counter() - started,
+            ttl=options.get("ttl"),
+        )
+        return state
+
+    async def _execute(
+        self, runnable: Any, agent: AgentBase, user_input: AgentInput
+    ) -> dict[str, Any]:
+        """
+        Run a compiled agent once while holding a limiter slot.
+
+        Tool calls of one model turn run as concurrent graph tasks (async
+        tools on the loop, sync tools in the tool thread pool), at most
+        `max_parallel_tools` at once; their messages keep call order.
+
+        Args:
+            runnable: Compiled agent.
+            agent: Agent definition (model is the limiter key).
+            user_input: User message, or a message history.
+
+        Returns:
+            dict[str, Any]: Final agent state.
+
+        Raises:
+            QueueFullError: If no concurrency slot is available.
+        """
+        async with self.limiter.acquire(agent.config["model"]):
+            return await runnable.ainvoke(
+                self._build_input(user_input), config=self._config(agent)
+            )
+
+    def _config(self, agent: AgentBase) -> dict[str, Any]:
+        """Run config of an agent (parallel tool calls per model turn)."""
+        return {
+            "max_concurrency": agent.config.get(
+                "max_parallel_tools", self.max_parallel_tools
+            )
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Runtime metrics for the metrics endpoint.
+
+        Returns:
+            dict[str, Any]: Metrics grouped by component.
+        """
+        stats: dict[str, Any] = {
+            "concurrency": self.limiter.stats(),
+            "compiled_agents": {
+                "compiled": len(self._compiled),
+                "hits": self._compiled_hits,
+                "misses": self._compiled_misses,
+                "evictions": self._compiled.evictions,
+            },
+            "tool_cache": self.agent_factory.tool_provider.cache_stats(),
+        }
+        response_cache = self.agent_factory.response_cache
+        if response_cache is not None:
+            stats["response_cache"] = response_cache.stats()
+        if self.semantic_cache is not None:
+            stats["semantic_cache"] = self.semantic_cache.stats()
+        model_registry = self.agent_factory.model_registry
+        if model_registry is not None:
+            stats["models"] = model_registry.stats()
+        stats["model_latency"] = self.agent_factory.latency_tracker.stats()
+        breakers = self.agent_factory.breakers
+        if breakers is not None:
+            stats["circuit_breakers"] = breakers.stats()
+        tool_executor = self.agent_factory.tool_executor
+        if tool_executor is not None:
+            stats["tool_executor"] = tool_executor.stats()
+        if self.run_metrics is not None:
+            stats["run_metrics"] = self.run_metrics.stats()
+        if self.preflight is not None:
+            stats["preflight"] = self.preflight.stats()
+        if self.traffic is not None:
+            stats["traffic"] = self.traffic.stats()
+        if self.rate_limiter is not None:
+            stats["rate_limit"] = self.rate_limiter.stats()
+        stats["single_flight"] = self.single_flight.stats()
+        return stats
+
+    async def start(self) -> None:
+        """
+        Start background tasks (metrics and recording flushing, response
+        cache purging).
+        """
+        if self.run_metrics is not None:
+            await self.run_metrics.start()
+        if self.traffic is not None:
+            await self.traffic.start()
+        if self.agent_factory.response_cache is not None:
+            await self.agent_factory.response_cache.start()
+
+    async def aclose(self) -> None:
+        """Flush metrics and release app-scoped resources on shutdown."""
+        if self.run_metrics is not None:
+            await self.run_metrics.aclose()
+        if self.traffic is not None:
+            await self.traffic.aclose()
+        if self.agent_factory.response_cache is not None:
+            await self.agent_factory.response_cache.aclose()
+        await self.agent_factory.aclose()
+
+
+@contextmanager
+def _api_errors(model: str) -> Generator[None]:
+    """Map runtime rejections of a run to API exceptions."""
+    try:
+        yield
+    except QueueFullError as err:
+        logger.warning(f"Agent run rejected ({model!s}): {err!s}")
+        raise TooManyRequestsException(
+            detail=str(err), retry_after=err.retry_after
+        ) from err
+    except RateLimitExceededError as err:
+        raise TooManyRequestsException(
+            detail=str(err), retry_after=err.retry_after
+        ) from err
+    except ContextWindowExceededError as err:
+        raise PayloadTooLargeException(detail=str(err)) from err
+    except DeadlineExceededError as err:
+        logger.warning(f"Agent run cut off ({model!s}): {err!s}")
+        raise GatewayTimeoutException(detail=str(err)) from err
+    except CircuitOpenError as err:
+        logger.warning(f"Agent run refused ({model!s}): {err!s}")
+        raise ServiceUnavailableException(
+            detail=str(err), retry_after=err.retry_after
+        ) from err
+
+
+def build_traffic(
+    settings: Settings,
+) -> TrafficRecorder | TrafficReplay | None:
+    """
+    Build the traffic recorder or replay selected by TRAFFIC_MODE.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        TrafficRecorder | TrafficReplay | None: None for live traffic.
+    """
+    mode = TrafficMode(settings.TRAFFIC_MODE)
+    masker = PIIMasker(
+        settings.TRAFFIC_MASK_FIELDS, settings.TRAFFIC_MASK_PATTERNS
+    )
+    if mode == TrafficMode.RECORD:
+        return TrafficRecorder(
+            settings.TRAFFIC_PATH,
+            sample_rate=settings.TRAFFIC_SAMPLE_RATE,
+            masker=masker,
+            flush_interval=settings.TRAFFIC_FLUSH_INTERVAL,
+        )
+    if mode == TrafficMode.REPLAY:
+        return TrafficReplay.load(
+            settings.TRAFFIC_PATH,
+            speed=settings.TRAFFIC_REPLAY_SPEED,
+            masker=masker,
+        )
+    return None
+
+
+def build_rate_limiter(settings: Settings) -> RateLimiter | None:
+    """
+    Build the rate limiter from the RATE_LIMIT_* settings.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        RateLimiter | None: None if rate limiting is disabled.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    store = (
+        PostgresBucketStore()
+        if settings.RATE_LIMIT_STORE == "postgres"
+        else MemoryBucketStore(settings.RATE_LIMIT_MAX_BUCKETS)
+    )
+    return RateLimiter(
+        store,
+        defaults={
+            RateLimitScope.USER: RateLimit(
+                settings.RATE_LIMIT_USER_RPM, settings.RATE_LIMIT_USER_TPM
+            ),
+            RateLimitScope.AGENT: RateLimit(
+                settings.RATE_LIMIT_AGENT_RPM, settings.RATE_LIMIT_AGENT_TPM
+            ),
+            RateLimitScope.MODEL: RateLimit(
+                settings.RATE_LIMIT_MODEL_RPM, settings.RATE_LIMIT_MODEL_TPM
+            ),
+        },
+        overrides={
+            key: RateLimit(**limit)
+            for key, limit in settings.RATE_LIMIT_OVERRIDES.items()
+        },
+    )
+
+
+def build_circuit_breakers(
+    settings: Settings,
+) -> CircuitBreakerRegistry | None:
+    """
+    Build the circuit breakers from the CIRCUIT_BREAKER_* settings.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        CircuitBreakerRegistry | None: None if breakers are disabled.
+    """
+    if not settings.CIRCUIT_BREAKER_ENABLED:
+        return None
+    policy = BreakerPolicy(
+        window=settings.CIRCUIT_BREAKER_WINDOW,
+        min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+        error_rate=settings.CIRCUIT_BREAKER_ERROR_RATE,
+        slow_call=settings.CIRCUIT_BREAKER_SLOW_CALL,
+        slow_rate=settings.CIRCUIT_BREAKER_SLOW_RATE,
+        open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+        half_open_calls=settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+    )
+    return CircuitBreakerRegistry(
+        policy,
+        overrides={
+            key: replace(
+                policy,
+                # Settings values are floats; keep the counts integers.
+                **{
+                    name: type(getattr(policy, name))(value)
+                    for name, value in override.items()
+                },
+            )
+            for key, override in settings.CIRCUIT_BREAKER_OVERRIDES.items()
+        },
+    )
+
+
+def build_agent_runtime(settings: Settings) -> AgentRuntime:
+    """
+    Build the agent runtime and its factories from settings.
+
+    Shared by the API lifespan and the worker entry point so both run
+    agents with the same configuration.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        AgentRuntime: Runtime with its factory and concurrency limiter.
+    """
+    structured_output_factory = StructuredOutputFactory()
+    tool_provider = ToolProvider(cache_results=settings.TOOL_CACHE_ENABLED)
+    response_cache = ResponseCache(
+        memory=TTLCache(settings.RESPONSE_CACHE_MAX_ENTRIES),
+        store=(
+            PostgresResponseCacheStore()
+            if settings.RESPONSE_CACHE_PERSIST
+            else None
+        ),
+        default_ttl=settings.RESPONSE_CACHE_DEFAULT_TTL,
+        purge_interval=settings.RESPONSE_CACHE_PURGE_INTERVAL,
+    )
+    model_registry = ModelRegistry(
+        max_connections=settings.MODEL_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.MODEL_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=settings.MODEL_POOL_KEEPALIVE_EXPIRY,
+        timeout=settings.MODEL_REQUEST_TIMEOUT,
+        context_limits=settings.MODEL_CONTEXT_LIMITS,
+        default_context_limit=settings.MODEL_DEFAULT_CONTEXT_LIMIT,
+        builder=(
+            replay_model
+            if settings.TRAFFIC_MODE == TrafficMode.REPLAY
+            else build_chat_model
+        ),
+    )
+    agent_factory = AgentFactory(
+        tool_provider,
+        structured_output_factory,
+        response_cache,
+        tool_executor=ToolExecutor(settings.TOOL_THREAD_POOL_SIZE),
+        model_registry=model_registry,
+        max_steps=settings.AGENT_MAX_STEPS,
+        latency_tracker=ModelLatencyTracker(
+            window=settings.MODEL_LATENCY_WINDOW,
+            min_samples=settings.MODEL_HEDGE_MIN_SAMPLES,
+            percentile=settings.MODEL_HEDGE_PERCENTILE,
+        ),
+        breakers=build_circuit_breakers(settings),
+    )
+    limiter = ConcurrencyLimiter(
+        max_concurrency=settings.AGENT_MAX_CONCURRENCY,
+        default_model_concurrency=settings.AGENT_DEFAULT_MODEL_CONCURRENCY,
+        model_concurrency=settings.AGENT_MODEL_CONCURRENCY,
+        max_queue_size=settings.AGENT_QUEUE_MAX_SIZE,
+        queue_timeout=settings.AGENT_QUEUE_TIMEOUT,
+    )
+    semantic_cache = SemanticCache(
+        embedder=build_embedder(
+            settings.SEMANTIC_CACHE_EMBEDDER,
+            settings.SEMANTIC_CACHE_DIMENSIONS,
+        ),
+        index=SemanticIndex(settings.SEMANTIC_CACHE_MAX_ENTRIES),
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        default_ttl=settings.SEMANTIC_CACHE_DEFAULT_TTL,
+    )
+    return AgentRuntime(
+        agent_factory,
+        limiter,
+        batch_max_concurrency=settings.AGENT_BATCH_MAX_CONCURRENCY,
+        max_compiled=settings.AGENT_CACHE_MAX_ENTRIES,
+        semantic_cache=semantic_cache,
+        max_parallel_tools=settings.TOOL_MAX_PARALLELISM,
+        run_metrics=(
+            RunMetricsWriter(
+                batch_size=settings.RUN_METRICS_BATCH_SIZE,
+                flush_interval=settings.RUN_METRICS_FLUSH_INTERVAL,
+                max_buffer=settings.RUN_METRICS_MAX_BUFFER,
+            )
+            if settings.RUN_METRICS_ENABLED
+            else None
+        ),
+        preflight=Preflight(
+            build_tokenizer(settings.TOKENIZER),
+            model_registry.context_limit,
+            mode=PreflightMode(settings.AGENT_PREFLIGHT),
+            output_reserve=settings.AGENT_PREFLIGHT_OUTPUT_RESERVE,
+        ),
+        traffic=build_traffic(settings),
+        rate_limiter=build_rate_limiter(settings),
+    )
@@ -7,19 +7,27 @@ Author: Klaus Begnis
 Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 """
 
-from typing import TypeVar
+from datetime import datetime
+from typing import Any, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
 
 from app.db.models.agent import Agent
+from app.db.models.agent_run import AgentRun
+from app.db.models.graph import Graph, GraphPlanRecord
+from app.db.models.job import Job
 from app.db.models.prompt import Prompt
 from app.db.models.role import Role
+from app.db.models.thread import Thread, ThreadMessage
 from app.db.models.user import User
 from app.schemas.db.agent import AgentCreate, AgentUpdate
+from app.schemas.db.graph import GraphCreate, GraphPlan, GraphUpdate
+from app.schemas.db.job import JobCreate
 from app.schemas.db.prompt import PromptCreate, PromptUpdate
 from app.schemas.db.role import RoleCreate, RoleUpdate
+from app.schemas.db.thread import ThreadCreate
 from app.schemas.db.user import UserCreate, UserUpdate
 from app.utils.password import hash_password
 
@@ -86,6 +94,20 @@ class DatabaseService:
         """
         return self._session.get(Agent, id)
 
+    def get_agents(self, ids: set[int]) -> dict[int, Agent]:
+        """Fetch several agents by primary key in one query.
+
+        Args:
+            ids (set[int]): Agent primary keys.
+
+        Returns:
+            dict[int, Agent]: Found agents by id (missing ids are absent).
+        """
+        if not ids:
+            return {}
+        stmt = select(Agent).where(Agent.id.in_(ids))
+        return {agent.id: agent for agent in self._session.scalars(stmt)}
+
     def list_agents(self, *, skip: int = 0, limit: int = 100) -> list[Agent]:
         """List agents with optional pagination.
 
@@ -206,6 +228,354 @@ class DatabaseService:
         self._session.delete(prompt)
         return True
 
+    # --- Graphs ---
+    def create_graph(self, data: GraphCreate, plan: GraphPlan) -> Graph:
+        """Create and persist a new graph.
+
+        Args:
+            data (GraphCreate): Name, definition, and entry node.
+            plan (GraphPlan): Execution plan of the validated definition.
+
+        Returns:
+            Graph: The created graph with id and timestamps.
+        """
+        graph = Graph(
+            name=data.name,
+            definition=data.definition.model_dump(),
+            entry_node=data.entry_node,
+            plan_record=GraphPlanRecord(plan=plan.model_dump()),
+        )
+        self._session.add(graph)
+        self._session.flush()
+        return graph
+
+    def get_graph(self, id: int) -> Graph | None:
+        """Fetch a graph by primary key.
+
+        Args:
+            id (int): Graph primary key.
+
+        Returns:
+            Graph | None: The graph if found, else None.
+        """
+        return self._session.get(Graph, id)
+
+    def list_graphs(self, *, skip: int = 0, limit: int = 100) -> list[Graph]:
+        """List graphs with optional pagination.
+
+        Args:
+            skip (int): Number of records to skip. Defaults to 0.
+            limit (int): Max records to return. Defaults to 100.
+
+        Returns:
+            list[Graph]: List of graphs ordered by id.
+        """
+        stmt = select(Graph).offset(skip).limit(limit).order_by(Graph.id)
+        return list(self._session.scalars(stmt).all())
+
+    def update_graph(
+        self, id: int, data: GraphUpdate, plan: GraphPlan | None = None
+    ) -> Graph | None:
+        """Update a graph by id with only the provided fields.
+
+        Args:
+            id (int): Graph primary key.
+            data (GraphUpdate): Fields to update (only set fields applied).
+            plan (GraphPlan | None): New execution plan, when the
+                definition or entry node changed.
+
+        Returns:
+            Graph | None: The updated graph if found, else None.
+        """
+        graph = self.get_graph(id)
+        if graph is None:
+            return None
+        self._update_object(graph, data)
+        if plan is not None and graph.plan_record is None:
+            graph.plan_record = GraphPlanRecord(plan=plan.model_dump())
+        elif plan is not None:
+            graph.plan_record.plan = plan.model_dump()
+        self._session.flush()
+        return graph
+
+    def delete_graph(self, id: int) -> bool:
+        """Delete a graph by id.
+
+        Args:
+            id (int): Graph primary key.
+
+        Returns:
+            bool: True if deleted, False if not found.
+        """
+        graph = self.get_graph(id)
+        if graph is None:
+            return False
+        self._session.delete(graph)
+        return True
+
+    # --- Jobs ---
+    def create_job(
+        self, agent_id: int, data: JobCreate, *, default_max_attempts: int
+    ) -> Job:
+        """Enqueue a background run of an agent.
+
+        Args:
+            agent_id (int): Agent to run.
+            data (JobCreate): Input and optional max_attempts.
+            default_max_attempts (int): Used when data has no max_attempts.
+
+        Returns:
+            Job: The queued job with id and timestamps.
+        """
+        job = Job(
+            agent_id=agent_id,
+            input=data.input,
+            max_attempts=data.max_attempts or default_max_attempts,
+        )
+        self._session.add(job)
+        self._session.flush()
+        return job
+
+    def get_job(self, id: int) -> Job | None:
+        """Fetch a job by primary key.
+
+        Args:
+            id (int): Job primary key.
+
+        Returns:
+            Job | None: The job if found, else None.
+        """
+        return self._session.get(Job, id)
+
+    # --- Threads ---
+    def create_thread(self, data: ThreadCreate) -> Thread:
+        """Open a thread with an agent.
+
+        Args:
+            data (ThreadCreate): Agent id and optional title.
+
+        Returns:
+            Thread: The created thread with id and timestamps.
+        """
+        thread = Thread(agent_id=data.agent_id, title=data.title)
+        self._session.add(thread)
+        self._session.flush()
+        return thread
+
+    def get_thread(self, id: int) -> Thread | None:
+        """Fetch a thread by primary key.
+
+        Args:
+            id (int): Thread primary key.
+
+        Returns:
+            Thread | None: The thread if found, else None.
+        """
+        return self._session.get(Thread, id)
+
+    def list_thread_messages(
+        self, thread_id: int, *, after_seq: int = 0, limit: int = 100
+    ) -> list[ThreadMessage]:
+        """Newest messages of a thread, returned oldest first.
+
+        Reads the tail through the (thread_id, seq) index, so the cost
+        does not grow with the length of the thread.
+
+        Args:
+            thread_id (int): Thread primary key.
+            after_seq (int): Only messages with a greater seq.
+            limit (int): Max messages to return.
+
+        Returns:
+            list[ThreadMessage]: Up to `limit` newest messages, by seq.
+        """
+        stmt = (
+            select(ThreadMessage)
+            .where(
+                ThreadMessage.thread_id == thread_id,
+                ThreadMessage.seq > after_seq,
+            )
+            .order_by(ThreadMessage.seq.desc())
+            .limit(limit)
+        )
+        return list(reversed(self._session.scalars(stmt).all()))
+
+    def list_thread_messages_after(
+        self, thread_id: int, *, after_seq: int, before_seq: int, limit: int
+    ) -> list[ThreadMessage]:
+        """Oldest messages of a thread between two seqs, oldest first.
+
+        Pages through a thread from the front, e.g. to fold messages
+        into its summary in order.
+
+        Args:
+            thread_id (int): Thread primary key.
+            after_seq (int): Only messages with a greater seq.
+            before_seq (int): Only messages with a smaller seq.
+            limit (int): Max messages to return.
+
+        Returns:
+            list[ThreadMessage]: Up to `limit` oldest messages, by seq.
+        """
+        stmt = (
+            select(ThreadMessage)
+            .where(
+                ThreadMessage.thread_id == thread_id,
+                ThreadMessage.seq > after_seq,
+                ThreadMessage.seq < before_seq,
+            )
+            .order_by(ThreadMessage.seq)
+            .limit(limit)
+        )
+        return list(self._session.scalars(stmt).all())
+
+    def append_thread_messages(
+        self, thread_id: int, messages: list[tuple[str, str, int]]
+    ) -> list[ThreadMessage]:
+        """Append messages to a thread with the next seq numbers.
+
+        The thread row is locked while seqs are assigned, so concurrent
+        turns on one thread get distinct, ordered seqs.
+
+        Args:
+            thread_id (int): Thread primary key.
+            messages (list[tuple[str, str, int]]): Role, content and token
+                count of each message, in order.
+
+        Returns:
+            list[ThreadMessage]: The stored messages.
+        """
+        stmt = select(Thread).where(Thread.id == thread_id).with_for_update()
+        thread = self._session.scalars(stmt).one()
+        rows = []
+        for role, content, token_count in messages:
+            thread.last_seq += 1
+            rows.append(
+                ThreadMessage(
+                    thread_id=thread_id,
+                    seq=thread.last_seq,
+                    role=role,
+                    content=content,
+                    token_count=token_count,
+                )
+            )
+        self._session.add_all(rows)
+        self._session.flush()
+        return rows
+
+    def update_thread_summary(
+        self, thread_id: int, summary: str, summary_seq: int
+    ) -> None:
+        """Store a new rolling summary covering messages up to a seq.
+
+        Args:
+            thread_id (int): Thread primary key.
+            summary (str): Summary of the messages up to `summary_seq`.
+            summary_seq (int): Last message folded into the summary.
+        """
+        thread = self.get_thread(thread_id)
+        if thread is None or summary_seq <= thread.summary_seq:
+            return
+        thread.summary = summary
+        thread.summary_seq = summary_seq
+        self._session.flush()
+
+    # --- Agent runs ---
+    @staticmethod
+    def _agent_run_aggregates() -> list[Any]:
+        """Aggregate columns shared by the agent run stats queries."""
+
+        def percentile(q: float, column: Any) -> Any:
+            return func.percentile_cont(q).within_group(column)
+
+        prompt = func.coalesce(func.sum(AgentRun.prompt_tokens), 0)
+        completion = func.coalesce(func.sum(AgentRun.completion_tokens), 0)
+        return [
+            func.count().label("runs"),
+            func.count().filter(AgentRun.status == "failed").label("failed"),
+            percentile(0.5, AgentRun.duration_ms).label("p50_ms"),
+            percentile(0.95, AgentRun.duration_ms).label("p95_ms"),
+            percentile(0.5, AgentRun.model_latency_ms).label("model_p50_ms"),
+            percentile(0.95, AgentRun.model_latency_ms).label("model_p95_ms"),
+            prompt.label("prompt_tokens"),
+            completion.label("completion_tokens"),
+            (prompt + completion).label("total_tokens"),
+            func.coalesce(func.sum(AgentRun.tool_calls), 0).label("tool_calls"),
+            func.coalesce(
+                func.sum(
+                    AgentRun.response_cache_hits
+                    + AgentRun.semantic_cache_hits
+                    + AgentRun.tool_cache_hits
+                ),
+                0,
+            ).label("cache_hits"),
+        ]
+
+    @staticmethod
+    def _filter_agent_runs(
+        stmt: Select,
+        since: datetime | None,
+        until: datetime | None,
+        agent_id: int | None = None,
+    ) -> Select:
+        """Restrict an agent run query to a time range and agent."""
+        if since is not None:
+            stmt = stmt.where(AgentRun.started_at >= since)
+        if until is not None:
+            stmt = stmt.where(AgentRun.started_at < until)
+        if agent_id is not None:
+            stmt = stmt.where(AgentRun.agent_id == agent_id)
+        return stmt
+
+    def agent_run_stats_by_agent(
+        self,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Latency percentiles and token totals per agent.
+
+        Args:
+            since (datetime | None): Only runs started at or after this.
+            until (datetime | None): Only runs started before this.
+
+        Returns:
+            list[dict[str, Any]]: One row per agent, most tokens first.
+        """
+        stmt = select(
+            AgentRun.agent_id,
+            AgentRun.agent_name,
+            *self._agent_run_aggregates(),
+        ).group_by(AgentRun.agent_id, AgentRun.agent_name)
+        stmt = self._filter_agent_runs(stmt, since, until)
+        stmt = stmt.order_by(
+            func.sum(AgentRun.prompt_tokens + AgentRun.completion_tokens).desc()
+        )
+        return [dict(row) for row in self._session.execute(stmt).mappings()]
+
+    def agent_run_stats_by_day(
+        self,
+        *,
+        agent_id: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Latency percentiles and token totals per UTC day.
+
+        Args:
+            agent_id (int | None): Only runs of this agent.
+            since (datetime | None): Only runs started at or after this.
+            until (datetime | None): Only runs started before this.
+
+        Returns:
+            list[dict[str, Any]]: One row per day, oldest first.
+        """
+        day = func.date(func.timezone("UTC", AgentRun.started_at)).label("day")
+        stmt = select(day, *self._agent_run_aggregates()).group_by(day)
+        stmt = self._filter_agent_runs(stmt, since, until, agent_id)
+        stmt = stmt.order_by(day)
+        return [dict(row) for row in self._session.execute(stmt).mappings()]
+
     # --- Users ---
     def create_user(self, data: UserCreate) -> User:
         """Create and persist a new user (password is hashed).
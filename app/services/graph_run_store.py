@@ -0,0 +1,146 @@
+"""
+File: graph_run_store.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 10:36:52 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db.models.graph_run import GraphRun, GraphRunStatus
+from app.db.session import session_context
+from app.schemas.db.base import orm_to_schema
+from app.schemas.db.graph import GraphRead
+from app.schemas.db.graph_run import GraphRunRead
+
+
+class GraphRunStore:
+    """
+    Status of checkpointed graph runs.
+
+    Every operation runs in its own short transaction, so the status of
+    a failed run is committed even though the request that ran it fails.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractContextManager[Session]
+        ] = session_context,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            session_factory: Context manager yielding a transactional
+                session (commits on success).
+        """
+        self._session_factory = session_factory
+
+    def create(self, graph: GraphRead, user_input: str) -> int:
+        """
+        Record a run that is starting.
+
+        Args:
+            graph: Graph being run (its `updated_at` is the version).
+            user_input: User message of the run.
+
+        Returns:
+            int: Run id (also the checkpoint thread id).
+        """
+        run = GraphRun(
+            graph_id=graph.id,
+            graph_version=graph.updated_at,
+            input=user_input,
+        )
+        with self._session_factory() as session:
+            session.add(run)
+            session.flush()
+            return run.id
+
+    def get(self, id: int) -> GraphRunRead | None:
+        """
+        Fetch a run.
+
+        Args:
+            id: Run id.
+
+        Returns:
+            GraphRunRead | None: The run if found, else None.
+        """
+        with self._session_factory() as session:
+            run = session.get(GraphRun, id)
+            return orm_to_schema(run, GraphRunRead) if run else None
+
+    def _set(self, id: int, *where: Any, **values: Any) -> int:
+        """Update columns of one run; returns the number of rows updated."""
+        with self._session_factory() as session:
+            result = session.execute(
+                update(GraphRun)
+                .where(GraphRun.id == id, *where)
+                .values(**values)
+            )
+            return result.rowcount or 0
+
+    def restart(self, id: int) -> bool:
+        """
+        Mark a failed run as running again (one more attempt).
+
+        The status is checked in the UPDATE itself, so of two concurrent
+        resumes of the same run only one restarts it.
+
+        Args:
+            id: Run id.
+
+        Returns:
+            bool: True if the run was failed and is now running, False if
+                it was not failed (e.g. another resume got it first).
+        """
+        return (
+            self._set(
+                id,
+                GraphRun.status == GraphRunStatus.FAILED,
+                status=GraphRunStatus.RUNNING,
+                error=None,
+                attempts=GraphRun.attempts + 1,
+            )
+            > 0
+        )
+
+    def succeed(self, id: int, output: dict[str, Any]) -> None:
+        """
+        Mark a run as succeeded.
+
+        Args:
+            id: Run id.
+            output: Last output and per-node outputs.
+        """
+        self._set(
+            id,
+            status=GraphRunStatus.SUCCEEDED,
+            output=output,
+            finished_at=datetime.now(UTC),
+        )
+
+    def fail(self, id: int, error: str) -> None:
+        """
+        Mark a run as failed (resumable while its checkpoints are kept).
+
+        Args:
+            id: Run id.
+            error: Error of the attempt.
+        """
+        self._set(
+            id,
+            status=GraphRunStatus.FAILED,
+            error=error,
+            finished_at=datetime.now(UTC),
+        )
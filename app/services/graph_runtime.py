@@ -0,0 +1,348 @@
+"""
+File: graph_runtime.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 7:44:31 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+import contextlib
+from datetime import UTC, datetime, timedelta
+from typing import Any
+import uuid
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph.state import CompiledStateGraph
+
+from app.config.settings import Settings
+from app.core.exceptions import ConflictException, ValidationException
+from app.core.logger import get_logger
+from app.factories.graph_factory import GraphFactory
+from app.runtime.checkpoint import PostgresCheckpointer, ZstdSerializer
+from app.runtime.ttl_cache import TTLCache
+from app.schemas.db.agent import AgentRead
+from app.schemas.db.graph import GraphRead
+from app.services.agent_runtime import AgentRuntime
+from app.services.graph_run_store import GraphRunStore
+
+logger = get_logger(__name__)
+
+
+def _thread_id(run_id: int | None) -> str:
+    """Checkpoint thread of a run (a throwaway one for untracked runs)."""
+    return str(run_id) if run_id is not None else uuid.uuid4().hex
+
+
+class GraphRuntime:
+    """
+    Compiles and runs Graph definitions.
+
+    Compiled graphs are cached by `(graph.id, updated_at)`, together with
+    the `updated_at` of the agents they reference, so a run only compiles
+    again after the graph or one of its agents was edited.
+
+    With a checkpointer (on the factory), runs save their state after
+    each step under their run id; a failed run resumes from there, and
+    its checkpoints are deleted once it succeeds. `runs` records the
+    status of those runs.
+    """
+
+    def __init__(
+        self,
+        graph_factory: GraphFactory,
+        max_compiled: int = 256,
+        recursion_limit: int = 25,
+        max_concurrency: int = 8,
+        checkpoint_retention: float = 86400.0,
+        checkpoint_gc_interval: float = 600.0,
+        runs: GraphRunStore | None = None,
+    ) -> None:
+        """
+        Initialize the GraphRuntime.
+
+        Args:
+            graph_factory: Compiles graph definitions.
+            max_compiled: Compiled graphs kept (LRU beyond).
+            recursion_limit: Max node executions (supersteps) per run.
+            max_concurrency: Default max nodes of a run executing at once
+                (`definition.max_concurrency` per graph).
+            checkpoint_retention: Seconds the checkpoints of an unfinished
+                run are kept for resuming.
+            checkpoint_gc_interval: Seconds between deletions of expired
+                checkpoints.
+            runs: Status store of checkpointed runs (None = runs are not
+                recorded).
+        """
+        self.graph_factory = graph_factory
+        self.recursion_limit = recursion_limit
+        self.max_concurrency = max_concurrency
+        self.checkpoint_retention = checkpoint_retention
+        self.checkpoint_gc_interval = checkpoint_gc_interval
+        self.runs = runs
+        self._gc_task: asyncio.Task[None] | None = None
+        self._compiled: TTLCache[CompiledStateGraph] = TTLCache(max_compiled)
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _cache_key(graph: GraphRead, agents: dict[int, AgentRead]) -> str:
+        """Key of a compiled graph: graph and agent versions."""
+        versions = ",".join(
+            f"{id}@{agents[id].updated_at.isoformat()}" for id in sorted(agents)
+        )
+        return f"{graph.id}@{graph.updated_at.isoformat()}|{versions}"
+
+    def get_compiled(
+        self, graph: GraphRead, agents: dict[int, AgentRead]
+    ) -> CompiledStateGraph:
+        """
+        Get the compiled graph, compiling it on first use.
+
+        Args:
+            graph: Graph definition.
+            agents: Agents referenced by the graph, by id.
+
+        Returns:
+            CompiledStateGraph: Runnable graph.
+
+        Raises:
+            ValidationException: If the definition cannot be compiled
+                (missing agent or tool, unknown node).
+        """
+        key = self._cache_key(graph, agents)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self._hits += 1
+            return compiled
+        self._misses += 1
+        try:
+            compiled = self.graph_factory.create_graph(graph, agents)
+        except (KeyError, ValueError) as err:
+            message = err.args[0] if err.args else str(err)
+            logger.warning(f"Graph {graph.id!s} does not compile: {message!s}")
+            raise ValidationException(
+                detail=f"Invalid graph: {message!s}"
+            ) from err
+        self._compiled.set(key, compiled)
+        return compiled
+
+    @property
+    def checkpointer(self) -> BaseCheckpointSaver | None:
+        """Checkpointer of graph runs (None = runs are not resumable)."""
+        return self.graph_factory.checkpointer
+
+    def _config(self, graph: GraphRead, thread_id: str) -> dict[str, Any]:
+        """Run config: step limit, concurrency cap and checkpoint thread."""
+        return {
+            "recursion_limit": self.recursion_limit,
+            "max_concurrency": (
+                graph.definition.max_concurrency or self.max_concurrency
+            ),
+            "configurable": {"thread_id": thread_id},
+        }
+
+    async def _finish(self, thread_id: str) -> None:
+        """Delete the checkpoints of a run that succeeded."""
+        if self.checkpointer is None:
+            return
+        try:
+            await self.checkpointer.adelete_thread(thread_id)
+        except Exception as err:
+            logger.warning(
+                f"Deleting checkpoints of run {thread_id!s} failed: {err!s}"
+            )
+
+    @staticmethod
+    def _build_input(user_input: str) -> dict[str, Any]:
+        """Input state of a graph run."""
+        return {
+            "messages": [{"role": "user", "content": user_input}],
+            "outputs": {},
+        }
+
+    async def invoke(
+        self,
+        graph: GraphRead,
+        agents: dict[int, AgentRead],
+        user_input: str,
+        run_id: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Run a graph once and return its final state.
+
+        Args:
+            graph: Graph definition.
+            agents: Agents referenced by the graph, by id.
+            user_input: User message.
+            run_id: Recorded run whose id is the checkpoint thread, so
+                it can resume after a failure (None = throwaway thread).
+
+        Returns:
+            dict[str, Any]: Final state (messages and node outputs).
+        """
+        compiled = self.get_compiled(graph, agents)
+        thread_id = _thread_id(run_id)
+        state = await compiled.ainvoke(
+            self._build_input(user_input),
+            config=self._config(graph, thread_id),
+        )
+        await self._finish(thread_id)
+        return state
+
+    async def resume(
+        self,
+        graph: GraphRead,
+        agents: dict[int, AgentRead],
+        run_id: int,
+    ) -> dict[str, Any]:
+        """
+        Continue a failed run from its last checkpoint.
+
+        Steps that finished before the failure are not run again.
+
+        Args:
+            graph: Graph definition (same version as the failed run).
+            agents: Agents referenced by the graph, by id.
+            run_id: Id of the failed run.
+
+        Returns:
+            dict[str, Any]: Final state (messages and node outputs).
+
+        Raises:
+            ConflictException: If checkpointing is off or the run has no
+                checkpoint left.
+        """
+        if self.checkpointer is None:
+            raise ConflictException(detail="Graph checkpoints are disabled")
+        compiled = self.get_compiled(graph, agents)
+        thread_id = _thread_id(run_id)
+        config = self._config(graph, thread_id)
+        if await self.checkpointer.aget_tuple(config) is None:
+            raise ConflictException(
+                detail=f"Run {run_id!s} has no checkpoint to resume from"
+            )
+        state = await compiled.ainvoke(None, config=config)
+        await self._finish(thread_id)
+        return state
+
+    async def stream(
+        self,
+        graph: GraphRead,
+        agents: dict[int, AgentRead],
+        user_input: str,
+        run_id: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Run a graph and yield an event as each node finishes.
+
+        Args:
+            graph: Graph definition.
+            agents: Agents referenced by the graph, by id.
+            user_input: User message.
+            run_id: Recorded run whose id is the checkpoint thread.
+
+        Yields:
+            dict[str, Any]: `{"node": name, "output": output}` per
+                finished node, in completion order.
+        """
+        compiled = self.get_compiled(graph, agents)
+        thread_id = _thread_id(run_id)
+        async for chunk in compiled.astream(
+            self._build_input(user_input),
+            config=self._config(graph, thread_id),
+            stream_mode="updates",
+        ):
+            for node, update in chunk.items():
+                outputs = (update or {}).get("outputs", {})
+                yield {"node": node, "output": outputs.get(node)}
+        await self._finish(thread_id)
+
+    async def collect_checkpoints(self) -> int:
+        """
+        Delete checkpoints of runs idle for longer than the retention.
+
+        Returns:
+            int: Number of runs whose checkpoints were deleted.
+        """
+        if not isinstance(self.checkpointer, PostgresCheckpointer):
+            return 0
+        cutoff = datetime.now(UTC) - timedelta(
+            seconds=self.checkpoint_retention
+        )
+        return await asyncio.to_thread(
+            self.checkpointer.purge_older_than, cutoff
+        )
+
+    async def _gc_loop(self) -> None:
+        """Collect expired checkpoints on interval, until cancelled."""
+        while True:
+            await asyncio.sleep(self.checkpoint_gc_interval)
+            try:
+                deleted = await self.collect_checkpoints()
+            except Exception as err:
+                logger.error(f"Checkpoint collection failed: {err!s}")
+                continue
+            if deleted:
+                logger.info(f"Deleted checkpoints of {deleted!s} graph runs")
+
+    async def start(self) -> None:
+        """Start the checkpoint collection task."""
+        if self._gc_task is None and isinstance(
+            self.checkpointer, PostgresCheckpointer
+        ):
+            self._gc_task = asyncio.create_task(self._gc_loop())
+
+    async def aclose(self) -> None:
+        """Stop the checkpoint collection task."""
+        if self._gc_task is not None:
+            self._gc_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._gc_task
+            self._gc_task = None
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Compiled graph cache metrics.
+
+        Returns:
+            dict[str, Any]: Cached graphs, hits and misses.
+        """
+        return {
+            "compiled": len(self._compiled),
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._compiled.evictions,
+        }
+
+
+def build_graph_runtime(
+    settings: Settings, agent_runtime: AgentRuntime
+) -> GraphRuntime:
+    """
+    Build the graph runtime on top of the agent runtime.
+
+    Args:
+        settings: Application settings.
+        agent_runtime: Runtime that runs the agents of agent nodes.
+
+    Returns:
+        GraphRuntime: Runtime with its factory and compiled graph cache.
+    """
+    checkpointer = runs = None
+    if settings.GRAPH_CHECKPOINTS_ENABLED:
+        checkpointer = PostgresCheckpointer(
+            serde=ZstdSerializer(level=settings.GRAPH_CHECKPOINT_ZSTD_LEVEL)
+        )
+        runs = GraphRunStore()
+    return GraphRuntime(
+        GraphFactory(agent_runtime, checkpointer=checkpointer),
+        max_compiled=settings.GRAPH_CACHE_MAX_ENTRIES,
+        recursion_limit=settings.GRAPH_RECURSION_LIMIT,
+        max_concurrency=settings.GRAPH_MAX_CONCURRENCY,
+        checkpoint_retention=settings.GRAPH_CHECKPOINT_RETENTION,
+        checkpoint_gc_interval=settings.GRAPH_CHECKPOINT_GC_INTERVAL,
+        runs=runs,
+    )
@@ -0,0 +1,327 @@
+"""
+File: graph_validator.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 8:31:17 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections import Counter, defaultdict, deque
+
+from app.schemas.db.graph import END_NODE, GraphDefinition, GraphPlan
+
+
+class GraphValidationError(ValueError):
+    """A graph definition failed static analysis."""
+
+    def __init__(self, errors: list[str]) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            errors: Every problem found, one message each.
+        """
+        self.errors = errors
+        super().__init__("; ".join(errors))
+
+
+def _check_references(
+    definition: GraphDefinition,
+    entry_node: str,
+    agent_ids: set[int] | None,
+    tool_names: set[str] | None,
+) -> list[str]:
+    """Names, entry node, edge endpoints, agents and tools."""
+    errors: list[str] = []
+    counts = Counter(node.name for node in definition.nodes)
+    names = set(counts)
+    errors.extend(
+        f"Duplicate node {name!r}" for name, n in counts.items() if n > 1
+    )
+    if END_NODE in names:
+        errors.append(f"{END_NODE!r} is reserved and cannot name a node")
+    if entry_node not in names:
+        errors.append(f"Entry node {entry_node!r} is not a node")
+    for node in definition.nodes:
+        agent, tool = node.agent_id, node.tool
+        if (
+            agent is not None
+            and agent_ids is not None
+            and agent not in agent_ids
+        ):
+            errors.append(f"Node {node.name!r}: agent {agent!s} not found")
+        if (
+            tool is not None
+            and tool_names is not None
+            and tool not in tool_names
+        ):
+            errors.append(f"Node {node.name!r}: tool {tool!r} not found")
+    for edge in definition.edges:
+        if edge.source not in names:
+            errors.append(f"Edge source {edge.source!r} is not a node")
+        if edge.target not in names and edge.target != END_NODE:
+            errors.append(f"Edge target {edge.target!r} is not a node")
+    return errors
+
+
+def _successors(definition: GraphDefinition) -> dict[str, list[str]]:
+    """
+    Nodes each node can hand over to, END included.
+
+    A router can go to any conditional target, its unconditional targets
+    or, without those, END; other nodes go to all their targets.
+    """
+    out: dict[str, list[str]] = {n.name: [] for n in definition.nodes}
+    routers = {e.source for e in definition.edges if e.when is not None}
+    for edge in definition.edges:
+        if edge.target not in out[edge.source]:
+            out[edge.source].append(edge.target)
+    for router in routers:
+        defaults = [
+            e for e in definition.edges if e.source == router and e.when is None
+        ]
+        if not defaults and END_NODE not in out[router]:
+            out[router].append(END_NODE)
+    return out
+
+
+def _reachable(entry_node: str, successors: dict[str, list[str]]) -> set[str]:
+    """Nodes reachable from the entry node."""
+    seen = {entry_node}
+    queue = deque([entry_node])
+    while queue:
+        for target in successors.get(queue.popleft(), []):
+            if target != END_NODE and target not in seen:
+                seen.add(target)
+                queue.append(target)
+    return seen
+
+
+def _components(
+    nodes: list[str], successors: dict[str, list[str]]
+) -> list[list[str]]:
+    """Strongly connected components (Tarjan, iterative)."""
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, i = work.pop()
+            if i == 0:
+                index[node] = low[node] = len(index)
+                stack.append(node)
+                on_stack.add(node)
+            targets = [t for t in successors[node] if t in successors]
+            if i < len(targets):
+                work.append((node, i + 1))
+                target = targets[i]
+                if target not in index:
+                    work.append((target, 0))
+                elif target in on_stack:
+                    low[node] = min(low[node], index[target])
+                continue
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+    return components
+
+
+def _check_cycles(
+    definition: GraphDefinition,
+    reachable: set[str],
+    successors: dict[str, list[str]],
+) -> tuple[list[str], bool]:
+    """
+    Every cycle needs a router that can leave it.
+
+    Returns:
+        tuple[list[str], bool]: Errors, and whether the graph is cyclic.
+    """
+    order = [n.name for n in definition.nodes if n.name in reachable]
+    routers = {e.source for e in definition.edges if e.when is not None}
+    errors: list[str] = []
+    cyclic = False
+    for component in _components(order, successors):
+        members = set(component)
+        node = component[0]
+        if len(component) == 1 and node not in successors[node]:
+            continue
+        cyclic = True
+        exits = any(
+            target not in members
+            for member in members & routers
+            for target in successors[member]
+        )
+        if not exits:
+            loop = " -> ".join(n for n in order if n in members)
+            errors.append(f"Cycle {loop} has no exit condition")
+    return errors, cyclic
+
+
+def _order(
+    definition: GraphDefinition,
+    entry_node: str,
+    reachable: set[str],
+    successors: dict[str, list[str]],
+) -> list[str]:
+    """
+    Reachable nodes in dependency order (by level, then definition
+    order), back edges ignored.
+    """
+    position = {n.name: i for i, n in enumerate(definition.nodes)}
+    back: set[tuple[str, str]] = set()
+    visited: set[str] = set()
+    on_path: set[str] = set()
+    work = [(entry_node, iter(successors[entry_node]))]
+    visited.add(entry_node)
+    on_path.add(entry_node)
+    while work:
+        node, targets = work[-1]
+        target = next(targets, None)
+        if target is None:
+            on_path.discard(node)
+            work.pop()
+        elif target == END_NODE:
+            continue
+        elif target in on_path:
+            back.add((node, target))
+        elif target not in visited:
+            visited.add(target)
+            on_path.add(target)
+            work.append((target, iter(successors[target])))
+
+    indegree = dict.fromkeys(reachable, 0)
+    forward: dict[str, list[str]] = defaultdict(list)
+    for source in reachable:
+        for target in successors[source]:
+            if target in reachable and (source, target) not in back:
+                forward[source].append(target)
+                indegree[target] += 1
+    level = dict.fromkeys(reachable, 0)
+    ready = deque(n for n in reachable if indegree[n] == 0)
+    while ready:
+        node = ready.popleft()
+        for target in forward[node]:
+            level[target] = max(level[target], level[node] + 1)
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                ready.append(target)
+    return sorted(reachable, key=lambda n: (level[n], position[n]))
+
+
+def _joins(definition: GraphDefinition) -> dict[str, list[str]]:
+    """Targets of several unconditional, non-router sources."""
+    routers = {e.source for e in definition.edges if e.when is not None}
+    sources: dict[str, list[str]] = defaultdict(list)
+    for edge in definition.edges:
+        if edge.source not in routers and edge.target != END_NODE:
+            sources[edge.target].append(edge.source)
+    return {t: s for t, s in sources.items() if len(s) > 1}
+
+
+def _check_joins(
+    definition: GraphDefinition,
+    entry_node: str,
+    order: list[str],
+    joins: dict[str, list[str]],
+) -> list[str]:
+    """
+    Every join's sources must run under the same condition.
+
+    A join waits for all of its sources, so if one of them is reached
+    only through a router branch that is not taken, the join never runs.
+    Each node is labelled with the node that activates it: router targets
+    activate themselves, other nodes inherit the label of their sources,
+    which for a join must agree.
+    """
+    routers = {e.source for e in definition.edges if e.when is not None}
+    routed = {e.target for e in definition.edges if e.source in routers}
+    sources: dict[str, list[str]] = defaultdict(list)
+    for edge in definition.edges:
+        sources[edge.target].append(edge.source)
+    label: dict[str, str] = {}
+    errors: list[str] = []
+    for node in order:
+        if node == entry_node or node in routed:
+            label[node] = node
+            continue
+        found = {label.get(source) for source in sources[node]}
+        if len(found) == 1 and None not in found:
+            label[node] = found.pop()
+            continue
+        label[node] = node
+        if node in joins:
+            errors.append(
+                f"Join {node!r} waits for {', '.join(joins[node])}, which "
+                f"do not always run together (a conditional branch can "
+                f"skip one of them)"
+            )
+    return errors
+
+
+def plan_graph(
+    definition: GraphDefinition,
+    entry_node: str,
+    *,
+    agent_ids: set[int] | None = None,
+    tool_names: set[str] | None = None,
+) -> GraphPlan:
+    """
+    Validate a graph definition and compute its execution plan.
+
+    Checks node names and the entry node, edge endpoints, agent and tool
+    references (when `agent_ids` / `tool_names` are given), unreachable
+    nodes, cycles that no conditional edge can leave, and joins whose
+    sources a conditional branch can skip.
+
+    Args:
+        definition: Graph definition.
+        entry_node: Name of the entry node.
+        agent_ids: Existing agent ids (None skips the agent check).
+        tool_names: Registered tool names (None skips the tool check).
+
+    Returns:
+        GraphPlan: Routers, fan-in joins, cyclicity.
+
+    Raises:
+        GraphValidationError: With every problem found.
+    """
+    errors = _check_references(definition, entry_node, agent_ids, tool_names)
+    if errors:
+        raise GraphValidationError(errors)
+    successors = _successors(definition)
+    reachable = _reachable(entry_node, successors)
+    unreachable = [n.name for n in definition.nodes if n.name not in reachable]
+    if unreachable:
+        errors.append(f"Unreachable nodes: {', '.join(unreachable)}")
+    cycle_errors, cyclic = _check_cycles(definition, reachable, successors)
+    errors.extend(cycle_errors)
+    if errors:
+        raise GraphValidationError(errors)
+    order = _order(definition, entry_node, reachable, successors)
+    joins = _joins(definition)
+    errors = _check_joins(definition, entry_node, order, joins)
+    if errors:
+        raise GraphValidationError(errors)
+    return GraphPlan(
+        routers=sorted(
+            {e.source for e in definition.edges if e.when is not None}
+        ),
+        joins=joins,
+        cyclic=cyclic,
+    )
@@ -0,0 +1,286 @@
+"""
+File: job_queue.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 12:10:44 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.logger import get_logger
+from app.db.models.agent import Agent
+from app.db.models.job import Job, JobStatus
+from app.db.session import session_context
+from app.schemas.db.agent import AgentRead
+from app.schemas.db.base import orm_to_schema
+
+logger = get_logger(__name__)
+
+
+def retry_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Exponential backoff delay before the next attempt.
+
+    Args:
+        attempt: Number of the attempt that just failed (1-based).
+        base: Delay after the first failure, in seconds.
+        maximum: Upper bound for the delay, in seconds.
+
+    Returns:
+        float: Seconds to wait before the job may be claimed again.
+    """
+    return min(maximum, base * 2 ** max(0, attempt - 1))
+
+
+@dataclass
+class ClaimedJob:
+    """
+    Snapshot of a claimed job, detached from the session that claimed it.
+
+    Attributes:
+        id: Job primary key.
+        agent: Agent definition to run.
+        input: User message.
+        attempts: Attempt number of this run (1-based).
+        max_attempts: Attempts allowed before the job is failed.
+    """
+
+    id: int
+    agent: AgentRead
+    input: str
+    attempts: int
+    max_attempts: int
+
+
+class JobQueue:
+    """
+    Postgres-backed job queue used by worker processes.
+
+    Every operation runs in its own short transaction, so a claim is
+    committed (and visible to other workers) before the agent runs.
+    Claims use SELECT ... FOR UPDATE SKIP LOCKED: concurrent workers never
+    block on, or double-claim, the same rows.
+    """
+
+    def __init__(
+        self,
+        stale_after: float,
+        backoff_base: float,
+        backoff_max: float,
+        session_factory: Callable[
+            [], AbstractContextManager[Session]
+        ] = session_context,
+    ) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            stale_after: Heartbeat age (seconds) after which a running job
+                is considered abandoned and may be reclaimed.
+            backoff_base: First retry delay in seconds.
+            backoff_max: Cap for the retry delay in seconds.
+            session_factory: Context manager yielding a transactional
+                session (commits on success).
+        """
+        self._stale_after = stale_after
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._session_factory = session_factory
+
+    def claim(self, worker_id: str, limit: int) -> list[ClaimedJob]:
+        """
+        Claim up to `limit` runnable jobs for a worker.
+
+        Runnable jobs are queued jobs whose backoff has elapsed, plus
+        running jobs whose worker stopped heartbeating. Abandoned jobs
+        that already used all attempts are failed instead of claimed.
+
+        Args:
+            worker_id: Id of the claiming worker.
+            limit: Max jobs to claim.
+
+        Returns:
+            list[ClaimedJob]: Claimed jobs, oldest first.
+        """
+        if limit <= 0:
+            return []
+        now = datetime.now(UTC)
+        stale_before = now - timedelta(seconds=self._stale_after)
+        stmt = (
+            select(Job)
+            .where(
+                or_(
+                    and_(
+                        Job.status == JobStatus.QUEUED,
+                        Job.run_after <= now,
+                    ),
+                    and_(
+                        Job.status == JobStatus.RUNNING,
+                        Job.heartbeat_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        claimed: list[ClaimedJob] = []
+        with self._session_factory() as session:
+            for job in session.scalars(stmt).all():
+                if job.attempts >= job.max_attempts:
+                    logger.warning(f"Job {job.id!s} abandoned; failing it")
+                    self._finish(
+                        job, JobStatus.FAILED, error="Worker lost heartbeat"
+                    )
+                    continue
+                job.status = JobStatus.RUNNING
+                job.attempts += 1
+                job.locked_by = worker_id
+                job.heartbeat_at = now
+                job.started_at = now
+                agent = session.get(Agent, job.agent_id)
+                claimed.append(
+                    ClaimedJob(
+                        id=job.id,
+                        agent=orm_to_schema(agent, AgentRead),
+                        input=job.input,
+                        attempts=job.attempts,
+                        max_attempts=job.max_attempts,
+                    )
+                )
+        return claimed
+
+    def heartbeat(self, worker_id: str, job_ids: list[int]) -> None:
+        """
+        Refresh the heartbeat of jobs a worker is still running.
+
+        Args:
+            worker_id: Id of the worker.
+            job_ids: Jobs the worker holds.
+        """
+        if not job_ids:
+            return
+        with self._session_factory() as session:
+            session.execute(
+                update(Job)
+                .where(
+                    Job.id.in_(job_ids),
+                    Job.locked_by == worker_id,
+                    Job.status == JobStatus.RUNNING,
+                )
+                .values(heartbeat_at=datetime.now(UTC))
+            )
+
+    def complete(
+        self, worker_id: str, job_id: int, result: dict[str, Any]
+    ) -> bool:
+        """
+        Store the result of a job and mark it succeeded.
+
+        Args:
+            worker_id: Id of the worker that ran the job.
+            job_id: Job primary key.
+            result: Agent output to store.
+
+        Returns:
+            bool: False if the job is no longer held by this worker (it
+                was reclaimed after a missed heartbeat).
+        """
+        with self._session_factory() as session:
+            job = self._owned_job(session, worker_id, job_id)
+            if job is None:
+                return False
+            job.result = result
+            job.error = None
+            self._finish(job, JobStatus.SUCCEEDED)
+            return True
+
+    def fail(
+        self, worker_id: str, job_id: int, error: str, retry: bool = True
+    ) -> bool:
+        """
+        Record a failed attempt; requeue with backoff or fail the job.
+
+        Args:
+            worker_id: Id of the worker that ran the job.
+            job_id: Job primary key.
+            error: Error message of the attempt.
+            retry: False fails the job at once, for errors that would
+                repeat on every attempt.
+
+        Returns:
+            bool: False if the job is no longer held by this worker.
+        """
+        with self._session_factory() as session:
+            job = self._owned_job(session, worker_id, job_id)
+            if job is None:
+                return False
+            if not retry or job.attempts >= job.max_attempts:
+                self._finish(job, JobStatus.FAILED, error=error)
+                return True
+            delay = retry_delay(
+                job.attempts, self._backoff_base, self._backoff_max
+            )
+            job.status = JobStatus.QUEUED
+            job.error = error
+            job.locked_by = None
+            job.heartbeat_at = None
+            job.run_after = datetime.now(UTC) + timedelta(seconds=delay)
+            return True
+
+    def release(self, worker_id: str, job_id: int, delay: float) -> bool:
+        """
+        Put back a job that was claimed but never ran (e.g. rejected by
+        the runtime as overloaded), without using up an attempt.
+
+        Args:
+            worker_id: Id of the worker that claimed the job.
+            job_id: Job primary key.
+            delay: Seconds before the job may be claimed again.
+
+        Returns:
+            bool: False if the job is no longer held by this worker.
+        """
+        with self._session_factory() as session:
+            job = self._owned_job(session, worker_id, job_id)
+            if job is None:
+                return False
+            job.status = JobStatus.QUEUED
+            job.attempts = max(0, job.attempts - 1)
+            job.locked_by = None
+            job.heartbeat_at = None
+            job.run_after = datetime.now(UTC) + timedelta(seconds=delay)
+            return True
+
+    @staticmethod
+    def _owned_job(session: Session, worker_id: str, job_id: int) -> Job | None:
+        """Lock a running job if it is still held by the worker."""
+        stmt = (
+            select(Job)
+            .where(
+                Job.id == job_id,
+                Job.locked_by == worker_id,
+                Job.status == JobStatus.RUNNING,
+            )
+            .with_for_update()
+        )
+        return session.scalars(stmt).first()
+
+    @staticmethod
+    def _finish(job: Job, status: JobStatus, error: str | None = None) -> None:
+        """Move a job to a final state and release its lock."""
+        job.status = status
+        if error is not None:
+            job.error = error
+        job.locked_by = None
+        job.heartbeat_at = None
+        job.finished_at = datetime.now(UTC)
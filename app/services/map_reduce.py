@@ -0,0 +1,451 @@
+"""
+File: map_reduce.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 8:02:37 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import aclosing
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from app.config.settings import Settings
+from app.core.exceptions import TooManyRequestsException
+from app.runtime.cancellation import remaining
+from app.runtime.chunking import split_text
+from app.runtime.tokenizer import Tokenizer
+from app.schemas.db.agent import AgentRead
+from app.services.agent_runtime import AgentRuntime
+from app.services.job_queue import retry_delay
+
+MapReduceEvent = tuple[str, Any]
+
+
+def _text(state: dict[str, Any]) -> str:
+    """Text of the last message of an agent's final state."""
+    messages = state.get("messages") or []
+    return messages[-1].text if messages else ""
+
+
+@dataclass
+class ChunkResult:
+    """
+    How the map step of one chunk ended.
+
+    Attributes:
+        index: Position of the chunk in the input.
+        tokens: Tokens of the chunk.
+        state: Final agent state, if the run succeeded.
+        error: Raised exception, if it failed.
+        seconds: Run duration.
+    """
+
+    index: int
+    tokens: int
+    state: dict[str, Any] | None
+    error: Exception | None
+    seconds: float
+
+
+@dataclass
+class MapReduceResult:
+    """
+    Results of a map-reduce run.
+
+    Attributes:
+        chunks: One result per chunk, in input order.
+        state: Final state of the last reduce (or of the only chunk).
+        levels: Reduce levels of the tree (0 for a single chunk).
+        seconds: Wall-clock of the whole run.
+    """
+
+    chunks: list[ChunkResult]
+    state: dict[str, Any]
+    levels: int
+    seconds: float
+
+
+class MapReduceRunner:
+    """
+    Runs an agent over an input too large for one call.
+
+    The input is split into token-bounded chunks, the mapper agent runs
+    over every chunk concurrently (up to `max_concurrency` in flight),
+    and the partial results are combined by the reducer agent in a tree:
+    each level packs consecutive partials into groups within the chunk
+    budget and `fan_in`, and reduces every group concurrently, until one
+    result remains. Partials longer than half the budget are cut down
+    first, so any two fit one reduce call. Every call goes through the
+    agent runtime, so it is preflighted, rate limited, limited per model
+    and recorded like any other run; calls rejected as rate limited or
+    overloaded (429) are retried with backoff while the request deadline
+    allows. Failed chunks are reported and left out of the reduce; the
+    run fails only if every chunk or any reduce fails (or any chunk, when
+    asked to).
+    """
+
+    def __init__(
+        self,
+        agent_runtime: AgentRuntime,
+        tokenizer: Tokenizer,
+        chunk_tokens: int = 2000,
+        max_concurrency: int = 8,
+        fan_in: int = 8,
+        max_retries: int = 3,
+        retry_backoff_base: float = 1.0,
+        retry_backoff_max: float = 30.0,
+    ) -> None:
+        """
+        Initialize the MapReduceRunner.
+
+        Args:
+            agent_runtime: Runs the mapper and reducer agents.
+            tokenizer: Counts the tokens of chunks and partials.
+            chunk_tokens: Default token budget of a chunk and of a reduce
+                group.
+            max_concurrency: Default and cap of agent calls in flight.
+            fan_in: Max partial results combined by one reduce call.
+            max_retries: Retries of a call rejected with 429.
+            retry_backoff_base: First retry delay in seconds (a longer
+                Retry-After wins).
+            retry_backoff_max: Cap for the retry delay.
+        """
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        self.agent_runtime = agent_runtime
+        self.tokenizer = tokenizer
+        self.chunk_tokens = chunk_tokens
+        self.max_concurrency = max_concurrency
+        self.fan_in = fan_in
+        self.max_retries = max_retries
+        self.retry_backoff_base = retry_backoff_base
+        self.retry_backoff_max = retry_backoff_max
+        self._runs = 0
+        self._chunks = 0
+        self._reduces = 0
+        self._retries = 0
+        self._clipped = 0
+
+    @staticmethod
+    def _map_input(
+        instructions: str | None, index: int, total: int, chunk: str
+    ) -> str:
+        """Message of a map call: the instructions and one chunk."""
+        if instructions is None:
+            return chunk
+        return f"{instructions}\n\nPart {index + 1} of {total}:\n\n{chunk}"
+
+    @staticmethod
+    def _reduce_input(instructions: str | None, partials: list[str]) -> str:
+        """Message asking the reducer to combine partial results."""
+        parts = [f"Task: {instructions}", ""] if instructions else []
+        parts.append("Partial results, in document order:")
+        for index, partial in enumerate(partials, start=1):
+            parts.append(f"[{index}]\n{partial}")
+        parts.append("")
+        parts.append("Combine these partial results into one result.")
+        return "\n".join(parts)
+
+    @staticmethod
+    def groups(sizes: list[int], budget: int, fan_in: int) -> list[list[int]]:
+        """
+        Pack consecutive partials into reduce groups.
+
+        A group takes partials while their tokens fit `budget` and it has
+        fewer than `fan_in`, but always at least two, so every level
+        shrinks and the tree ends. Partials of at most `budget // 2`
+        tokens (see `_clip`) keep every group within the budget.
+
+        Args:
+            sizes: Tokens of each partial, in order.
+            budget: Token budget of a group.
+            fan_in: Max partials in a group.
+
+        Returns:
+            list[list[int]]: Indexes of the partials of each group.
+        """
+        groups: list[list[int]] = []
+        current: list[int] = []
+        tokens = 0
+        for index, size in enumerate(sizes):
+            full = len(current) == fan_in or tokens + size > budget
+            if len(current) >= 2 and full:
+                groups.append(current)
+                current, tokens = [], 0
+            current.append(index)
+            tokens += size
+        if current:
+            groups.append(current)
+        return groups
+
+    @staticmethod
+    async def _each[T, R](
+        fn: Callable[[T], Awaitable[R]], items: Sequence[T], limit: int
+    ) -> AsyncIterator[tuple[int, R | Exception]]:
+        """
+        Run `fn` over items, `limit` at a time, yielding each outcome as
+        it completes. Closing the iterator cancels the pending calls.
+        """
+        semaphore = asyncio.Semaphore(limit)
+
+        async def one(index: int, item: T) -> tuple[int, R | Exception]:
+            async with semaphore:
+                try:
+                    return index, await fn(item)
+                except Exception as err:
+                    return index, err
+
+        tasks = [
+            asyncio.create_task(one(index, item))
+            for index, item in enumerate(items)
+        ]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _clip(self, text: str, max_tokens: int) -> tuple[str, int]:
+        """
+        A partial cut to `max_tokens` at a paragraph or sentence
+        boundary, with its tokens.
+        """
+        tokens = self.tokenizer.count(text)
+        if tokens <= max_tokens:
+            return text, tokens
+        self._clipped += 1
+        text = split_text(text, self.tokenizer, max_tokens)[0]
+        return text, self.tokenizer.count(text)
+
+    async def _invoke(self, agent: AgentRead, message: str) -> Any:
+        """
+        Run an agent, retrying rejections as rate limited or overloaded.
+
+        The delay doubles per retry (at least the Retry-After of the
+        rejection); a retry that would outlive the request deadline is
+        not attempted.
+
+        Raises:
+            TooManyRequestsException: If the retries are used up or the
+                deadline is too close.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self.agent_runtime.invoke(agent, message)
+            except TooManyRequestsException as err:
+                attempt += 1
+                delay = max(
+                    err.retry_after or 0.0,
+                    retry_delay(
+                        attempt,
+                        self.retry_backoff_base,
+                        self.retry_backoff_max,
+                    ),
+                )
+                left = remaining()
+                if attempt > self.max_retries or (
+                    left is not None and delay >= left
+                ):
+                    raise
+                self._retries += 1
+                await asyncio.sleep(delay)
+
+    def _chunk(self, text: str, budget: int) -> list[tuple[str, int]]:
+        """Chunks of the input with their token counts."""
+        return [
+            (chunk, self.tokenizer.count(chunk))
+            for chunk in split_text(text, self.tokenizer, budget)
+        ]
+
+    async def run(
+        self,
+        agent: AgentRead,
+        text: str,
+        reducer: AgentRead | None = None,
+        instructions: str | None = None,
+        chunk_tokens: int | None = None,
+        max_concurrency: int | None = None,
+        fail_on_chunk_error: bool = False,
+    ) -> AsyncIterator[MapReduceEvent]:
+        """
+        Map an agent over the chunks of a text and reduce the results.
+
+        Yields `("plan", {...})` with the chunk count, `("chunk", {...})`
+        as each chunk completes, `("reduce", {...})` as each reduce call
+        of the tree completes, then `("end", MapReduceResult)`.
+
+        Args:
+            agent: Mapper agent, run once per chunk.
+            text: Input to split.
+            reducer: Agent combining partial results (defaults to the
+                mapper).
+            instructions: Task sent with every chunk and reduce (None sends
+                the bare chunks and leaves the task to the agents' system
+                prompts).
+            chunk_tokens: Token budget of a chunk (defaults to the
+                runner's).
+            max_concurrency: Calls in flight (capped at the runner's).
+            fail_on_chunk_error: Fail the run on the first failed chunk
+                instead of reducing the others.
+
+        Yields:
+            MapReduceEvent: Progress events, then the result.
+
+        Raises:
+            ValueError: If the text is blank.
+            APIException: If every chunk fails (the first chunk's error),
+                any chunk fails with `fail_on_chunk_error`, or a reduce
+                call is rejected or fails.
+        """
+        self._runs += 1
+        started = time.perf_counter()
+        budget = chunk_tokens or self.chunk_tokens
+        limit = min(
+            max_concurrency or self.max_concurrency, self.max_concurrency
+        )
+        reducer = reducer or agent
+        chunks = await asyncio.to_thread(self._chunk, text, budget)
+        total = len(chunks)
+        if total == 0:
+            raise ValueError("text is blank")
+        self._chunks += total
+        yield "plan", {"chunks": total, "chunk_tokens": budget}
+
+        async def run_chunk(index: int) -> ChunkResult:
+            chunk, tokens = chunks[index]
+            began = time.perf_counter()
+            state = await self._invoke(
+                agent, self._map_input(instructions, index, total, chunk)
+            )
+            return ChunkResult(
+                index, tokens, state, None, time.perf_counter() - began
+            )
+
+        results: list[ChunkResult] = [
+            ChunkResult(index, tokens, None, None, 0.0)
+            for index, (_, tokens) in enumerate(chunks)
+        ]
+        async with aclosing(self._each(run_chunk, range(total), limit)) as done:
+            async for completed, (index, outcome) in _numbered(done):
+                if isinstance(outcome, Exception):
+                    if fail_on_chunk_error:
+                        raise outcome
+                    results[index].error = outcome
+                    event = {"error": f"{type(outcome).__name__}: {outcome!s}"}
+                else:
+                    results[index] = outcome
+                    event = {"output": _text(outcome.state)}
+                yield (
+                    "chunk",
+                    {
+                        "index": index,
+                        "tokens": results[index].tokens,
+                        **event,
+                        "completed": completed,
+                        "total": total,
+                    },
+                )
+
+        partials = [r.state for r in results if r.state is not None]
+        if not partials:
+            raise next(r.error for r in results if r.error is not None)
+        levels = 0
+        while len(partials) > 1:
+            levels += 1
+            clipped = [
+                self._clip(_text(state), budget // 2) for state in partials
+            ]
+            texts = [text for text, _ in clipped]
+            groups = self.groups(
+                [tokens for _, tokens in clipped], budget, self.fan_in
+            )
+            calls = [group for group in groups if len(group) > 1]
+
+            async def reduce(group: list[int], texts: list[str] = texts) -> Any:
+                return await self._invoke(
+                    reducer,
+                    self._reduce_input(instructions, [texts[i] for i in group]),
+                )
+
+            merged = [partials[group[0]] for group in groups]
+            slots = [n for n, group in enumerate(groups) if len(group) > 1]
+            async with aclosing(self._each(reduce, calls, limit)) as done:
+                async for completed, (index, outcome) in _numbered(done):
+                    if isinstance(outcome, Exception):
+                        raise outcome
+                    self._reduces += 1
+                    merged[slots[index]] = outcome
+                    yield (
+                        "reduce",
+                        {
+                            "level": levels,
+                            "group": index,
+                            "inputs": len(calls[index]),
+                            "completed": completed,
+                            "total": len(calls),
+                        },
+                    )
+            partials = merged
+        yield (
+            "end",
+            MapReduceResult(
+                results, partials[0], levels, time.perf_counter() - started
+            ),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Map-reduce metrics.
+
+        Returns:
+            dict[str, Any]: Runs, chunks mapped, reduce calls, retries of
+                rejected calls and partials cut to fit a reduce.
+        """
+        return {
+            "runs": self._runs,
+            "chunks": self._chunks,
+            "reduce_calls": self._reduces,
+            "retries": self._retries,
+            "clipped_partials": self._clipped,
+        }
+
+
+async def _numbered[T](items: AsyncIterator[T]) -> AsyncIterator[tuple[int, T]]:
+    """Number the items of an async iterator from 1."""
+    completed = 0
+    async for item in items:
+        completed += 1
+        yield completed, item
+
+
+def build_map_reduce_runner(
+    settings: Settings, agent_runtime: AgentRuntime, tokenizer: Tokenizer
+) -> MapReduceRunner:
+    """
+    Build the map-reduce runner on top of the agent runtime.
+
+    Args:
+        settings: Application settings.
+        agent_runtime: Runtime that runs the mapper and reducer agents.
+        tokenizer: Counts the tokens of chunks and partials.
+
+    Returns:
+        MapReduceRunner: Runner with the configured budgets.
+    """
+    return MapReduceRunner(
+        agent_runtime,
+        tokenizer,
+        chunk_tokens=settings.MAP_REDUCE_CHUNK_TOKENS,
+        max_concurrency=settings.MAP_REDUCE_MAX_CONCURRENCY,
+        fan_in=settings.MAP_REDUCE_FAN_IN,
+        max_retries=settings.MAP_REDUCE_MAX_RETRIES,
+        retry_backoff_base=settings.MAP_REDUCE_RETRY_BACKOFF_BASE,
+        retry_backoff_max=settings.MAP_REDUCE_RETRY_BACKOFF_MAX,
+    )
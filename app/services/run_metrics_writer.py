@@ -0,0 +1,206 @@
+"""
+File: run_metrics_writer.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 6:26:40 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import contextlib
+from contextlib import AbstractContextManager
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.logger import get_logger
+from app.db.models.agent_run import AgentRun
+from app.db.session import session_context
+from app.runtime.run_metrics import RunRecord
+
+logger = get_logger(__name__)
+
+
+class RunMetricsWriter:
+    """
+    Write-behind buffer for agent run metrics.
+
+    Runs only append to an in-memory buffer; a background task inserts
+    the buffered rows into agent_runs in one executemany per batch, every
+    `flush_interval` seconds or as soon as `batch_size` rows are waiting.
+    When the database falls behind, the oldest rows are dropped once the
+    buffer holds `max_buffer` rows, so metrics never slow agent runs. A
+    batch rejected by a constraint (e.g. a run of an agent deleted since)
+    is written row by row, so only the offending rows are dropped.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval: float = 2.0,
+        max_buffer: int = 10_000,
+        close_timeout: float = 10.0,
+        session_factory: Callable[
+            [], AbstractContextManager[Session]
+        ] = session_context,
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            batch_size: Max rows per insert; a full batch flushes early.
+            flush_interval: Max seconds a row waits in the buffer.
+            max_buffer: Rows kept in memory before the oldest are dropped.
+            close_timeout: Seconds the final flush may take on shutdown.
+            session_factory: Context manager yielding a transactional
+                session (commits on success).
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.close_timeout = close_timeout
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=max_buffer)
+        self._session_factory = session_factory
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+        self._written = 0
+        self._dropped = 0
+        self._failed_batches = 0
+
+    def add(self, record: RunRecord) -> None:
+        """
+        Buffer the metrics of a finished run (never blocks).
+
+        Args:
+            record: Finished run.
+        """
+        if len(self._buffer) == self._buffer.maxlen:
+            self._dropped += 1
+        self._buffer.append(record.as_row())
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def aclose(self) -> None:
+        """
+        Stop the flush task once it has written what is still buffered.
+
+        The loop is asked to stop and given `close_timeout` seconds for
+        its final flush; it is cancelled only past that, so a normal
+        shutdown never cuts a batch off between popping and inserting it.
+        """
+        self._closing = True
+        self._wakeup.set()
+        if self._task is None:
+            await self._drain()
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._task), self.close_timeout
+            )
+        except TimeoutError:
+            logger.warning(
+                f"Final flush of agent runs timed out; dropping "
+                f"{len(self._buffer)!s} buffered rows"
+            )
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+
+    async def _drain(self) -> None:
+        """Flush until the buffer is empty or an insert fails."""
+        while self._buffer:
+            if not await self.flush():
+                break
+
+    async def flush(self) -> bool:
+        """
+        Insert one batch of buffered rows.
+
+        Returns:
+            bool: False if the insert failed (the batch is dropped).
+        """
+        batch = [
+            self._buffer.popleft()
+            for _ in range(min(self.batch_size, len(self._buffer)))
+        ]
+        if not batch:
+            return True
+        try:
+            await asyncio.to_thread(self._insert, batch)
+        except IntegrityError as err:
+            written = await asyncio.to_thread(self._insert_each, batch)
+            self._written += written
+            self._dropped += len(batch) - written
+            logger.warning(
+                f"Dropped {len(batch) - written!s} of {len(batch)!s} agent "
+                f"runs violating a constraint: {err.orig!s}"
+            )
+            return True
+        except Exception as err:
+            self._failed_batches += 1
+            self._dropped += len(batch)
+            logger.error(f"Writing {len(batch)!s} agent runs failed: {err!s}")
+            return False
+        self._written += len(batch)
+        return True
+
+    def _insert(self, rows: list[dict[str, Any]]) -> None:
+        """Insert rows in one statement (runs in a thread)."""
+        with self._session_factory() as session:
+            session.execute(insert(AgentRun), rows)
+
+    def _insert_each(self, rows: list[dict[str, Any]]) -> int:
+        """Insert rows one by one, skipping rejected ones (in a thread)."""
+        written = 0
+        for row in rows:
+            try:
+                self._insert([row])
+            except IntegrityError:
+                continue
+            written += 1
+        return written
+
+    async def _flush_loop(self) -> None:
+        """
+        Flush on interval or when a batch is full; once closing, drain
+        the buffer and return.
+        """
+        while not self._closing:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            if self._closing:
+                break
+            while self._buffer:
+                if not await self.flush():
+                    break
+                if len(self._buffer) < self.batch_size:
+                    break
+        await self._drain()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Writer metrics.
+
+        Returns:
+            dict[str, Any]: Buffered, written and dropped rows, failed
+                batches.
+        """
+        return {
+            "buffered": len(self._buffer),
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed_batches": self._failed_batches,
+        }
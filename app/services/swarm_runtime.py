@@ -0,0 +1,189 @@
+"""
+File: swarm_runtime.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 6:52:40 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from app.config.settings import Settings
+from app.runtime.work_stealing import WorkStealingScheduler
+from app.schemas.db.agent import AgentRead
+from app.services.agent_runtime import AgentRuntime
+
+
+@dataclass(frozen=True)
+class Subtask:
+    """One piece of a swarm task, assigned to one agent."""
+
+    agent: AgentRead
+    input: str | None = None
+
+
+@dataclass
+class SubtaskResult:
+    """
+    How one subtask ended.
+
+    Attributes:
+        subtask: The subtask.
+        state: Final agent state, if the run succeeded.
+        error: Raised exception, if it failed.
+        seconds: Run duration.
+    """
+
+    subtask: Subtask
+    state: dict[str, Any] | None
+    error: Exception | None
+    seconds: float
+
+
+@dataclass
+class SwarmResult:
+    """
+    Results of a swarm run.
+
+    Attributes:
+        results: One result per subtask, in request order.
+        state: Final state of the supervisor's synthesis (None without a
+            supervisor).
+        seconds: Wall-clock of the whole run.
+    """
+
+    results: list[SubtaskResult]
+    state: dict[str, Any] | None
+    seconds: float
+
+
+class SwarmRuntime:
+    """
+    Supervisor fanning the subtasks of a task out to many agents.
+
+    Subtasks run concurrently on a work-stealing scheduler (subtasks of
+    the same agent start on the same worker), each through the agent
+    runtime, so every run is preflighted, rate limited, limited per model
+    and recorded like any other, and all of them share the runtime's
+    compiled agents and model clients. Failed subtasks are reported, not
+    raised. With a supervisor agent, the collected results are handed to
+    it for one final answer.
+    """
+
+    def __init__(self, agent_runtime: AgentRuntime, max_workers: int = 64):
+        """
+        Initialize the SwarmRuntime.
+
+        Args:
+            agent_runtime: Runs the agents of the subtasks.
+            max_workers: Default and cap of subtasks in flight per swarm.
+        """
+        self.agent_runtime = agent_runtime
+        self.scheduler = WorkStealingScheduler(max_workers)
+        self._runs = 0
+
+    @staticmethod
+    def _subtask_input(task: str, subtask: Subtask) -> str:
+        """Message of a subtask: the task, and the agent's part of it."""
+        if subtask.input is None:
+            return task
+        return f"Task: {task}\n\nYour subtask: {subtask.input}"
+
+    @staticmethod
+    def _synthesis_input(task: str, results: list[SubtaskResult]) -> str:
+        """Message asking the supervisor to combine the results."""
+        parts = [f"Task: {task}", "", "Results of the subtasks:"]
+        for index, result in enumerate(results, start=1):
+            header = f"[{index}] {result.subtask.agent.name}"
+            if result.subtask.input is not None:
+                header += f" ({result.subtask.input})"
+            if result.error is not None:
+                body = f"failed: {type(result.error).__name__}: {result.error}"
+            else:
+                messages = result.state.get("messages") or []
+                body = messages[-1].text if messages else ""
+            parts.append(f"{header}:\n{body}")
+        parts.append("")
+        parts.append("Combine these results into one answer to the task.")
+        return "\n".join(parts)
+
+    async def run(
+        self,
+        task: str,
+        subtasks: list[Subtask],
+        supervisor: AgentRead | None = None,
+        max_workers: int | None = None,
+    ) -> SwarmResult:
+        """
+        Run every subtask, then the supervisor's synthesis, if any.
+
+        Args:
+            task: Overall task (sent to agents without a subtask input).
+            subtasks: Agents and their part of the task.
+            supervisor: Agent combining the results into one answer.
+            max_workers: Subtasks in flight (capped at the runtime's).
+
+        Returns:
+            SwarmResult: Per-subtask results and the synthesis.
+
+        Raises:
+            APIException: If the supervisor's run is rejected or fails
+                (subtask failures are reported in the results).
+        """
+        self._runs += 1
+        started = time.perf_counter()
+
+        async def execute(subtask: Subtask) -> SubtaskResult:
+            began = time.perf_counter()
+            try:
+                state = await self.agent_runtime.invoke(
+                    subtask.agent, self._subtask_input(task, subtask)
+                )
+            except Exception as err:
+                return SubtaskResult(
+                    subtask, None, err, time.perf_counter() - began
+                )
+            return SubtaskResult(
+                subtask, state, None, time.perf_counter() - began
+            )
+
+        results = await self.scheduler.map(
+            execute,
+            subtasks,
+            affinity=lambda subtask: subtask.agent.id,
+            workers=max_workers,
+        )
+        state = None
+        if supervisor is not None:
+            state = await self.agent_runtime.invoke(
+                supervisor, self._synthesis_input(task, results)
+            )
+        return SwarmResult(results, state, time.perf_counter() - started)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Swarm metrics.
+
+        Returns:
+            dict[str, Any]: Swarms run and scheduler counters.
+        """
+        return {"runs": self._runs, **self.scheduler.stats()}
+
+
+def build_swarm_runtime(
+    settings: Settings, agent_runtime: AgentRuntime
+) -> SwarmRuntime:
+    """
+    Build the swarm runtime on top of the agent runtime.
+
+    Args:
+        settings: Application settings.
+        agent_runtime: Runtime that runs the agents of subtasks.
+
+    Returns:
+        SwarmRuntime: Runtime with its scheduler.
+    """
+    return SwarmRuntime(agent_runtime, max_workers=settings.SWARM_MAX_WORKERS)
@@ -7,10 +7,13 @@ Author: Klaus Begnis
 Copyright (c) 2026 Swarm Nest. See LICENSE for details.
 """
 
+from typing import Any
+
 from langchain.tools import BaseTool
 
 from app.core.logger import get_logger
-from app.tools import tools as tools_list
+from app.runtime.tool_cache import ToolMemo
+from app.tools import TOOL_CACHE_POLICIES, tools as tools_list
 
 logger = get_logger(__name__)
 
@@ -20,11 +23,22 @@ class ToolProvider:
     Provider for tools.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, cache_results: bool = True) -> None:
         """
         Initialize the ToolProvider.
+
+        Args:
+            cache_results: Memoize results of tools that declare a cache
+                policy in app.tools (TOOL_CACHE_POLICIES).
         """
         self._tools = self._get_tools()
+        self._memos: dict[str, ToolMemo] = {}
+        if cache_results:
+            self._memos = {
+                name: ToolMemo(name, policy)
+                for name, policy in TOOL_CACHE_POLICIES.items()
+                if name in self._tools
+            }
 
     def _get_tools(self) -> dict[str, BaseTool]:
         """
@@ -61,3 +75,21 @@ class ToolProvider:
         if tool_name not in self._tools:
             raise KeyError(f"Tool not found: {tool_name!r}")
         return self._tools[tool_name]
+
+    def get_memo(self, tool_name: str) -> ToolMemo | None:
+        """
+        Get the result memo of a tool.
+
+        Returns:
+            ToolMemo | None: The memo, or None if the tool is not cached.
+        """
+        return self._memos.get(tool_name)
+
+    def cache_stats(self) -> dict[str, Any]:
+        """
+        Per-tool cache metrics.
+
+        Returns:
+            dict[str, Any]: Tool name -> hits, misses, coalesced calls.
+        """
+        return {name: memo.stats() for name, memo in self._memos.items()}
@@ -7,6 +7,9 @@ Author: Klaus Begnis
 Copyright (c) 2026 Swarm Nest. See LICENSE for details.
 """
 
+from app.runtime.tool_cache import ToolCachePolicy
+
+from .weather import CACHE_POLICY as weather_cache_policy
 from .weather import INVOKE_PARAMS_EXAMPLE as weather_invoke_params
 from .weather import get_weather
 
@@ -18,3 +21,8 @@ tools = [
 TOOL_INVOKE_PARAMS_EXAMPLES: dict[str, dict] = {
     get_weather.name: weather_invoke_params,
 }
+
+# Tool name -> cache policy, for tools whose results may be memoized.
+TOOL_CACHE_POLICIES: dict[str, ToolCachePolicy] = {
+    get_weather.name: weather_cache_policy,
+}
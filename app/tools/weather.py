@@ -9,9 +9,14 @@ Copyright (c) 2026 Swarm Nest. See LICENSE for details.
 
 from langchain.tools import tool
 
+from app.runtime.tool_cache import ToolCachePolicy
+
 # Example invoke params for tests (must match input schema).
 INVOKE_PARAMS_EXAMPLE: dict = {"city": "London"}
 
+# Weather changes slowly: reuse results per city for 10 minutes.
+CACHE_POLICY = ToolCachePolicy(ttl=600, key_fields=("city",), max_entries=1000)
+
 
 @tool
 def get_weather(city: str) -> str:
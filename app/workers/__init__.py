@@ -0,0 +1,12 @@
+"""
+File: __init__.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 12:40:02 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from .job_worker import JobWorker, run_worker
+
+__all__ = ["JobWorker", "run_worker"]
@@ -0,0 +1,278 @@
+"""
+File: job_worker.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 12:41:17 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+import contextlib
+from functools import partial
+import os
+import signal
+import socket
+from typing import Any
+from uuid import uuid4
+
+from app.config import settings
+from app.core.exceptions import APIException, TooManyRequestsException
+from app.core.logger import get_logger, setup_logging
+from app.db import Base, engine
+from app.db.ensure_db import ensure_database_exists
+from app.runtime.cancellation import deadline_scope
+from app.schemas.api.agent_run import AgentInvokeResponse
+from app.services.agent_runtime import AgentRuntime, build_agent_runtime
+from app.services.job_queue import ClaimedJob, JobQueue
+
+logger = get_logger(__name__)
+
+
+class JobWorker:
+    """
+    Pool of asyncio slots that claim and run background agent jobs.
+
+    Claims and status updates are sync DB calls and run in a thread; agent
+    runs use the AgentRuntime on the event loop. A heartbeat task keeps
+    claimed jobs alive; jobs of a worker that dies are reclaimed by others
+    once their heartbeat is stale. Jobs the runtime rejects as overloaded
+    or rate limited (429) never ran, so they are released back to the
+    queue without using up an attempt. Other client errors (4xx: input
+    too large, invalid config) would repeat on every attempt, so they
+    fail the job at once; a run that exceeds the job timeout is cut off
+    and retried like any other failure.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        runtime: AgentRuntime,
+        concurrency: int,
+        poll_interval: float,
+        heartbeat_interval: float,
+        shutdown_timeout: float = 30.0,
+        worker_id: str | None = None,
+        job_timeout: float | None = None,
+    ) -> None:
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Job queue to claim from.
+            runtime: Runtime used to run agents.
+            concurrency: Max jobs running at once.
+            poll_interval: Seconds between claims when the queue is empty.
+            heartbeat_interval: Seconds between heartbeats.
+            shutdown_timeout: Seconds to let running jobs finish on stop.
+            worker_id: Unique worker id (default: host, pid and a suffix).
+            job_timeout: Seconds an agent run of a job may take (None =
+                unbounded).
+        """
+        self.queue = queue
+        self.runtime = runtime
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.job_timeout = job_timeout
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        )
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+        self._wakeup = asyncio.Event()
+        self._succeeded = 0
+        self._failed = 0
+        self._released = 0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Claim and run jobs until `stop` is set, then drain.
+
+        Args:
+            stop: Event that requests a graceful shutdown.
+        """
+        logger.info(f"Worker {self.worker_id!s} started")
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        stop_relay = asyncio.create_task(self._relay(stop))
+        try:
+            while not stop.is_set():
+                free = self.concurrency - len(self._tasks)
+                claimed = await self._claim(free) if free > 0 else []
+                for job in claimed:
+                    self._start(job)
+                if free > 0 and len(claimed) == free:
+                    continue
+                await self._wait(self.poll_interval)
+            await self._drain()
+        finally:
+            heartbeat.cancel()
+            stop_relay.cancel()
+        logger.info(f"Worker {self.worker_id!s} stopped")
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Worker counters.
+
+        Returns:
+            dict[str, Any]: Running, succeeded, failed and released job
+                counts.
+        """
+        return {
+            "worker_id": self.worker_id,
+            "running": len(self._tasks),
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "released": self._released,
+        }
+
+    async def _claim(self, limit: int) -> list[ClaimedJob]:
+        """Claim up to `limit` jobs; DB errors are logged, not raised."""
+        try:
+            return await asyncio.to_thread(
+                self.queue.claim, self.worker_id, limit
+            )
+        except Exception as err:
+            logger.error(f"Job claim failed: {err!s}", exc_info=True)
+            return []
+
+    def _start(self, job: ClaimedJob) -> None:
+        """Run a claimed job in its own task."""
+        task = asyncio.create_task(self._execute(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _t, job_id=job.id: self._done(job_id))
+
+    def _done(self, job_id: int) -> None:
+        """Free the slot of a finished job and wake the claim loop."""
+        self._tasks.pop(job_id, None)
+        self._wakeup.set()
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        """
+        Run one job and store its result, record the failure, or release
+        it if the runtime rejected it before it ran.
+        """
+        logger.info(
+            f"Job {job.id!s} started (attempt {job.attempts!s}/"
+            f"{job.max_attempts!s})"
+        )
+        try:
+            with deadline_scope(self.job_timeout):
+                state = await self.runtime.invoke(job.agent, job.input)
+            result = AgentInvokeResponse.from_state(state).model_dump()
+        except TooManyRequestsException as err:
+            self._released += 1
+            delay = err.retry_after or self.poll_interval
+            logger.info(
+                f"Job {job.id!s} rejected ({err.detail!s}); "
+                f"released for {delay:.1f}s"
+            )
+            await self._update(self.queue.release, job.id, delay)
+            return
+        except Exception as err:
+            self._failed += 1
+            error = f"{type(err).__name__}: {err!s}"
+            retry = not _client_error(err)
+            logger.warning(
+                f"Job {job.id!s} failed{'' if retry else ' permanently'}: "
+                f"{error!s}"
+            )
+            await self._update(
+                partial(self.queue.fail, retry=retry), job.id, error
+            )
+            return
+        self._succeeded += 1
+        await self._update(self.queue.complete, job.id, result)
+
+    async def _update(self, method: Any, job_id: int, payload: Any) -> None:
+        """Call a queue update in a thread; warn if the job was lost."""
+        try:
+            owned = await asyncio.to_thread(
+                method, self.worker_id, job_id, payload
+            )
+        except Exception as err:
+            logger.error(f"Job {job_id!s} update failed: {err!s}")
+            return
+        if not owned:
+            logger.warning(f"Job {job_id!s} was reclaimed by another worker")
+
+    async def _heartbeat_loop(self) -> None:
+        """Refresh heartbeats of running jobs until cancelled."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            job_ids = list(self._tasks)
+            if not job_ids:
+                continue
+            try:
+                await asyncio.to_thread(
+                    self.queue.heartbeat, self.worker_id, job_ids
+                )
+            except Exception as err:
+                logger.error(f"Heartbeat failed: {err!s}")
+
+    async def _relay(self, stop: asyncio.Event) -> None:
+        """Wake the claim loop as soon as stop is requested."""
+        await stop.wait()
+        self._wakeup.set()
+
+    async def _wait(self, timeout: float) -> None:
+        """Sleep until a slot frees up, stop is requested or timeout."""
+        self._wakeup.clear()
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    async def _drain(self) -> None:
+        """Let running jobs finish; cancel what exceeds the timeout."""
+        if not self._tasks:
+            return
+        logger.info(f"Waiting for {len(self._tasks)!s} running jobs...")
+        _, pending = await asyncio.wait(
+            list(self._tasks.values()), timeout=self.shutdown_timeout
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            # Cancelled jobs keep status running and are reclaimed by
+            # another worker once their heartbeat is stale.
+            await asyncio.wait(pending)
+
+
+def _client_error(err: Exception) -> bool:
+    """
+    Whether a run failed on its request (4xx other than 408 and 429), so
+    that retrying it would fail the same way.
+    """
+    return (
+        isinstance(err, APIException)
+        and 400 <= err.status_code < 500
+        and err.status_code not in (408, 429)
+    )
+
+
+async def run_worker() -> None:
+    """Worker process entry point: build the runtime and run until signal."""
+    setup_logging()
+    ensure_database_exists(settings.DATABASE_URL)
+    Base.metadata.create_all(bind=engine)
+    runtime = build_agent_runtime(settings)
+    await runtime.start()
+    worker = JobWorker(
+        queue=JobQueue(
+            stale_after=settings.JOB_STALE_AFTER,
+            backoff_base=settings.JOB_RETRY_BACKOFF_BASE,
+            backoff_max=settings.JOB_RETRY_BACKOFF_MAX,
+        ),
+        runtime=runtime,
+        concurrency=settings.JOB_WORKER_CONCURRENCY,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+        heartbeat_interval=settings.JOB_HEARTBEAT_INTERVAL,
+        job_timeout=settings.JOB_TIMEOUT,
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await worker.run(stop)
+    finally:
+        await runtime.aclose()
@@ -0,0 +1 @@
+"""Benchmarks for the agent runtime (run with `python -m benchmarks.<name>`)."""
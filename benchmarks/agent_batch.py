@@ -0,0 +1,109 @@
+"""
+File: agent_batch.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 11:21:09 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+
+Throughput of AgentRuntime.batch against a local fake model.
+
+Compares one-by-one `invoke` calls with `batch` at several
+`max_concurrency` values. Usage:
+
+    python -m benchmarks.agent_batch --items 200 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.factories.agent_factory import AgentFactory
+from app.factories.structured_output_factory import StructuredOutputFactory
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.schemas.db.agent import AgentCreate
+from app.services.agent_runtime import AgentRuntime
+from app.services.tool_provider import ToolProvider
+
+
+def _agent(latency: float) -> AgentCreate:
+    """Unsaved echo agent on the fake model with a fixed latency."""
+    return AgentCreate(
+        name="BenchEcho",
+        config={
+            "model": "fake:echo",
+            "model_options": {"latency_ms": latency * 1000},
+            "system_prompt": "Echo the user.",
+        },
+    )
+
+
+def _runtime(cap: int) -> AgentRuntime:
+    """Runtime with limits wide enough not to throttle the benchmark."""
+    factory = AgentFactory(ToolProvider(), StructuredOutputFactory())
+    limiter = ConcurrencyLimiter(
+        max_concurrency=cap,
+        default_model_concurrency=cap,
+        max_queue_size=cap * 4,
+    )
+    return AgentRuntime(factory, limiter, batch_max_concurrency=cap)
+
+
+async def _sequential(
+    runtime: AgentRuntime, agent: AgentCreate, inputs: list[str]
+) -> float:
+    """Invoke one input at a time (compiles the agent per call)."""
+    start = time.perf_counter()
+    for user_input in inputs:
+        await runtime.invoke(agent, user_input)
+    return time.perf_counter() - start
+
+
+async def _batch(
+    runtime: AgentRuntime,
+    agent: AgentCreate,
+    inputs: list[str],
+    concurrency: int,
+) -> float:
+    """Run the whole list through one batch call (compiles it once)."""
+    start = time.perf_counter()
+    results = await runtime.batch(agent, inputs, max_concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for r in results if isinstance(r, Exception))
+    if failed:
+        raise RuntimeError(f"{failed} batch items failed")
+    return elapsed
+
+
+def _report(label: str, items: int, elapsed: float) -> None:
+    """Print one result line."""
+    print(f"{label:<28} {elapsed:8.3f}s {items / elapsed:10.1f} items/s")
+
+
+async def main(items: int, latency: float, concurrencies: list[int]) -> None:
+    """Run the benchmark and print throughput per mode."""
+    inputs = [f"input {i}" for i in range(items)]
+    agent = _agent(latency)
+    cap = max(concurrencies)
+    print(f"items={items} model_latency={latency * 1000:.0f}ms")
+
+    sequential_items = min(items, 50)
+    runtime = _runtime(cap)
+    elapsed = await _sequential(runtime, agent, inputs[:sequential_items])
+    _report("sequential invoke", sequential_items, elapsed)
+
+    for concurrency in concurrencies:
+        runtime = _runtime(cap)
+        elapsed = await _batch(runtime, agent, inputs, concurrency)
+        _report(f"batch c={concurrency}", items, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16, 64]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.latency, args.concurrency))
@@ -0,0 +1,254 @@
+"""
+File: agent_endpoints.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 1:34:52 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+
+End-to-end load test of the agent invoke and stream endpoints.
+
+Drives POST /agents/{id}/invoke and /agents/{id}/invoke/stream over real
+HTTP at a fixed number of concurrent clients and reports throughput,
+p50/p95/p99 latency and (for the stream) time-to-first-token. By default
+the app is served in-process by uvicorn with one in-memory agent on the
+`fake:` provider, so the whole runtime path (factory, registry, limiter,
+preflight, SSE) is measured without a provider or a database. Usage:
+
+    python -m benchmarks.agent_endpoints --requests 500 --concurrency 32 \
+        --model fake:echo --latency-ms 50 --jitter-ms 20 \
+        --distribution lognormal --tokens-per-second 80
+
+Pass `--url` and `--agent-id` to load an already running server instead.
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import socket
+import threading
+import time
+from typing import Any
+
+import httpx
+import uvicorn
+
+from app.config import settings
+from app.dependecies import get_database_service
+from app.main import app
+from app.runtime.stats import LatencyWindow
+from app.schemas.db.agent import AgentRead
+from app.services.agent_runtime import build_agent_runtime
+
+NOW = datetime.now(UTC)
+
+
+@dataclass
+class _Result:
+    """Samples of one endpoint run."""
+
+    latency: LatencyWindow = field(default_factory=lambda: LatencyWindow(10**6))
+    ttft: LatencyWindow = field(default_factory=lambda: LatencyWindow(10**6))
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+class _InMemoryAgents:
+    """Database service stand-in serving one agent definition."""
+
+    def __init__(self, agent: AgentRead) -> None:
+        """Serve `agent` for its id."""
+        self.agent = agent
+
+    def get_agent(self, id: int) -> AgentRead | None:
+        """The benchmark agent, or None for other ids."""
+        return self.agent if id == self.agent.id else None
+
+
+def _free_port() -> int:
+    """An unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(agent: AgentRead, concurrency: int) -> tuple[uvicorn.Server, str]:
+    """
+    Serve the app in a background thread, without the DB lifespan.
+
+    The runtime is built from settings like in production, with limits
+    wide enough for the benchmark and run metrics off (no database).
+    """
+    runtime_settings = settings.model_copy(
+        update={
+            "RUN_METRICS_ENABLED": False,
+            "RESPONSE_CACHE_PERSIST": False,
+            "AGENT_MAX_CONCURRENCY": concurrency,
+            "AGENT_DEFAULT_MODEL_CONCURRENCY": concurrency,
+            "AGENT_QUEUE_MAX_SIZE": concurrency * 4,
+        }
+    )
+    app.state.agent_runtime = build_agent_runtime(runtime_settings)
+    app.dependency_overrides[get_database_service] = lambda: _InMemoryAgents(
+        agent
+    )
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=port,
+            lifespan="off",
+            log_level="warning",
+            access_log=False,
+        )
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def _invoke(
+    client: httpx.AsyncClient, path: str, body: dict[str, Any], result: _Result
+) -> None:
+    """One /invoke request."""
+    started = time.perf_counter()
+    response = await client.post(path, json=body)
+    if response.status_code != 200:
+        result.errors += 1
+        return
+    result.latency.add(time.perf_counter() - started)
+
+
+async def _stream(
+    client: httpx.AsyncClient, path: str, body: dict[str, Any], result: _Result
+) -> None:
+    """One /invoke/stream request, timing the first token event."""
+    started = time.perf_counter()
+    first = None
+    event = None
+    async with client.stream("POST", f"{path}/stream", json=body) as response:
+        if response.status_code != 200:
+            result.errors += 1
+            return
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line.removeprefix("event: ")
+                if event == "token" and first is None:
+                    first = time.perf_counter() - started
+    if event != "end":
+        result.errors += 1
+        return
+    result.latency.add(time.perf_counter() - started)
+    if first is not None:
+        result.ttft.add(first)
+
+
+async def _drive(
+    url: str, agent_id: int, mode: str, requests: int, concurrency: int
+) -> _Result:
+    """Send `requests` requests from `concurrency` clients in a loop."""
+    result = _Result()
+    call = _stream if mode == "stream" else _invoke
+    path = f"/agents/{agent_id}/invoke"
+    remaining = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        for index in remaining:
+            try:
+                await call(client, path, {"input": f"request {index}"}, result)
+            except httpx.HTTPError:
+                result.errors += 1
+
+    async with httpx.AsyncClient(
+        base_url=url, limits=limits, timeout=120.0
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _ms(value: float | None) -> str:
+    """Seconds as right-aligned milliseconds."""
+    return f"{value * 1000:8.1f}" if value is not None else f"{'-':>8}"
+
+
+def _report(mode: str, result: _Result) -> None:
+    """Print one result line."""
+    done = result.latency.count
+    print(
+        f"{mode:<7} {done / result.elapsed:9.1f} req/s "
+        f"p50 {_ms(result.latency.percentile(50))} "
+        f"p95 {_ms(result.latency.percentile(95))} "
+        f"p99 {_ms(result.latency.percentile(99))} ms "
+        f"ttft p50 {_ms(result.ttft.percentile(50))} "
+        f"p95 {_ms(result.ttft.percentile(95))} ms "
+        f"errors {result.errors}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Run the benchmark and print a line per endpoint."""
+    server = None
+    url, agent_id = args.url, args.agent_id
+    if url is None:
+        agent = AgentRead(
+            id=agent_id,
+            name="BenchFake",
+            config={
+                "model": args.model,
+                "system_prompt": "Answer the user.",
+                "model_options": {
+                    "latency_ms": args.latency_ms,
+                    "latency_jitter_ms": args.jitter_ms,
+                    "latency_distribution": args.distribution,
+                    "tokens_per_second": args.tokens_per_second,
+                    "seed": args.seed,
+                },
+            },
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        server, url = _serve(agent, args.concurrency)
+    print(f"url={url} requests={args.requests} concurrency={args.concurrency}")
+    try:
+        for mode in args.modes:
+            result = await _drive(
+                url, agent_id, mode, args.requests, args.concurrency
+            )
+            _report(mode, result)
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--agent-id", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["invoke", "stream"],
+        default=["invoke", "stream"],
+    )
+    parser.add_argument("--model", default="fake:echo")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "uniform", "normal", "lognormal"],
+        default="fixed",
+    )
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+"""
+File: graph_fanout.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 9:31:48 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+
+Wall-clock of a fan-out/fan-in graph against a local fake model.
+
+Runs `start -> N parallel branches -> merge` with the graph's
+`max_concurrency` at 1 (branches one after another) and at the given
+caps. Usage:
+
+    python -m benchmarks.graph_fanout --branches 8 --latency 0.05
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+import time
+
+from app.factories.agent_factory import AgentFactory
+from app.factories.graph_factory import GraphFactory
+from app.factories.structured_output_factory import StructuredOutputFactory
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.schemas.db.agent import AgentRead
+from app.schemas.db.graph import GraphRead
+from app.services.agent_runtime import AgentRuntime
+from app.services.graph_runtime import GraphRuntime
+from app.services.tool_provider import ToolProvider
+
+NOW = datetime.now(UTC)
+
+
+def _runtime(cap: int) -> GraphRuntime:
+    """Graph runtime with limits wide enough not to throttle branches."""
+    factory = AgentFactory(ToolProvider(), StructuredOutputFactory())
+    limiter = ConcurrencyLimiter(
+        max_concurrency=cap,
+        default_model_concurrency=cap,
+        max_queue_size=cap * 4,
+    )
+    return GraphRuntime(GraphFactory(AgentRuntime(factory, limiter)))
+
+
+def _graph(branches: int, max_concurrency: int) -> GraphRead:
+    """`start` fanning out to `branches` nodes joined by `merge`."""
+    names = [f"branch_{i}" for i in range(branches)]
+    nodes = [
+        {"name": name, "type": "agent", "agent_id": 1}
+        for name in ["start", *names, "merge"]
+    ]
+    edges = [{"source": "start", "target": name} for name in names] + [
+        {"source": name, "target": "merge"} for name in names
+    ]
+    return GraphRead(
+        id=max_concurrency,
+        name="FanOut",
+        definition={
+            "nodes": nodes,
+            "edges": edges,
+            "max_concurrency": max_concurrency,
+        },
+        entry_node="start",
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+async def _run(
+    runtime: GraphRuntime,
+    graph: GraphRead,
+    agents: dict[int, AgentRead],
+    runs: int,
+) -> float:
+    """Run the graph `runs` times, one after another."""
+    runtime.get_compiled(graph, agents)
+    start = time.perf_counter()
+    for i in range(runs):
+        await runtime.invoke(graph, agents, f"input {i}")
+    return time.perf_counter() - start
+
+
+def _report(label: str, runs: int, elapsed: float) -> None:
+    """Print one result line."""
+    print(f"{label:<28} {elapsed:8.3f}s {elapsed / runs * 1000:10.1f} ms/run")
+
+
+async def main(
+    branches: int, runs: int, latency: float, concurrencies: list[int]
+) -> None:
+    """Run the benchmark and print the latency per cap."""
+    agents = {
+        1: AgentRead(
+            id=1,
+            name="BenchEcho",
+            config={
+                "model": "fake:echo",
+                "model_options": {"latency_ms": latency * 1000},
+                "system_prompt": "Echo.",
+            },
+            created_at=NOW,
+            updated_at=NOW,
+        )
+    }
+    print(
+        f"branches={branches} runs={runs} model_latency={latency * 1000:.0f}ms"
+    )
+    for concurrency in [1, *concurrencies]:
+        runtime = _runtime(max(branches, concurrency))
+        graph = _graph(branches, concurrency)
+        elapsed = await _run(runtime, graph, agents, runs)
+        label = "sequential (c=1)" if concurrency == 1 else f"c={concurrency}"
+        _report(label, runs, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--branches", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 8])
+    args = parser.parse_args()
+    asyncio.run(main(args.branches, args.runs, args.latency, args.concurrency))
@@ -0,0 +1,111 @@
+"""
+File: swarm_scaling.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 7:31:26 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+
+Scaling of a swarm from 1 to 64 concurrent agents against the fake model.
+
+Each level runs a swarm of N distinct agents (`fake:echo` with a fixed
+latency), `--subtasks` subtasks each, on N workers, through the full
+runtime built from settings (limits, preflight, compiled agent cache and
+shared model clients). Reports wall-clock, throughput and speedup over
+one agent; with a fixed model latency, ideal scaling doubles throughput
+per level. Usage:
+
+    python -m benchmarks.swarm_scaling --latency-ms 50 --subtasks 4
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+
+from app.config import settings
+from app.schemas.db.agent import AgentRead
+from app.services.agent_runtime import build_agent_runtime
+from app.services.swarm_runtime import Subtask, SwarmRuntime
+
+NOW = datetime.now(UTC)
+
+
+def _agents(count: int, latency_ms: float) -> list[AgentRead]:
+    """`count` saved echo agents on the fake model."""
+    return [
+        AgentRead(
+            id=i,
+            name=f"Worker {i}",
+            config={
+                "model": "fake:echo",
+                "model_options": {"latency_ms": latency_ms},
+                "system_prompt": "Echo the subtask.",
+            },
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _swarm(max_agents: int) -> SwarmRuntime:
+    """Swarm over a runtime with limits wide enough for every level."""
+    runtime = build_agent_runtime(
+        settings.model_copy(
+            update={
+                "RUN_METRICS_ENABLED": False,
+                "RESPONSE_CACHE_PERSIST": False,
+                "RATE_LIMIT_ENABLED": False,
+                "AGENT_MAX_CONCURRENCY": max_agents,
+                "AGENT_DEFAULT_MODEL_CONCURRENCY": max_agents,
+                "AGENT_QUEUE_MAX_SIZE": max_agents * 4,
+            }
+        )
+    )
+    return SwarmRuntime(runtime, max_workers=max_agents)
+
+
+async def main(levels: list[int], subtasks: int, latency_ms: float) -> None:
+    """Run one swarm per level and print its scaling."""
+    swarm = _swarm(max(levels))
+    agents = _agents(max(levels), latency_ms)
+    # Warm-up: compile every agent and build the model client once.
+    await swarm.run("warm up", [Subtask(agent) for agent in agents])
+
+    print(f"subtasks/agent={subtasks} model_latency={latency_ms:.0f}ms")
+    print(f"{'agents':>6} {'wall':>9} {'subtasks/s':>11} {'speedup':>8}")
+    base = None
+    for count in levels:
+        plan = [
+            Subtask(agent, f"part {n}")
+            for n in range(subtasks)
+            for agent in agents[:count]
+        ]
+        result = await swarm.run("benchmark", plan, max_workers=count)
+        failed = sum(1 for r in result.results if r.error is not None)
+        if failed:
+            raise RuntimeError(f"{failed} subtasks failed at {count} agents")
+        throughput = len(plan) / result.seconds
+        base = base or throughput
+        print(
+            f"{count:>6} {result.seconds:8.3f}s {throughput:11.1f} "
+            f"{throughput / base:7.1f}x"
+        )
+    stats = swarm.agent_runtime.stats()
+    print(f"compiled agents {stats['compiled_agents']}")
+    print(f"model clients {stats['models']['clients']}")
+    print(f"scheduler {swarm.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--agents", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64]
+    )
+    parser.add_argument("--subtasks", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.agents, args.subtasks, args.latency_ms))
@@ -0,0 +1,114 @@
+"""
+File: traffic_replay.py
+Project: swarm-nest
+Created: Monday, 19th October 2026 2:41:09 am
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+
+Replay of recorded production traffic against the agent runtime.
+
+Reads a file written with TRAFFIC_MODE=record and re-issues every run at
+its recorded arrival time (open loop, scaled by `--speed`) through a
+runtime in replay mode: model and tool responses come from the recording
+at their recorded latencies, so the load has production's mix without a
+provider or tool backend. Reports throughput and replayed vs recorded
+latency percentiles. Usage:
+
+    python -m benchmarks.traffic_replay traffic/agent-runs.jsonl.zst \
+        --speed 2
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from langchain_core.messages import messages_from_dict
+
+from app.config import settings
+from app.runtime.stats import LatencyWindow
+from app.runtime.traffic import Recording, read_recordings
+from app.schemas.db.agent import AgentBase
+from app.services.agent_runtime import AgentRuntime, build_agent_runtime
+
+
+def _runtime(path: str, speed: float, concurrency: int) -> AgentRuntime:
+    """Runtime replaying `path`, with limits wide enough for the load."""
+    return build_agent_runtime(
+        settings.model_copy(
+            update={
+                "TRAFFIC_MODE": "replay",
+                "TRAFFIC_PATH": path,
+                "TRAFFIC_REPLAY_SPEED": speed,
+                "RUN_METRICS_ENABLED": False,
+                "RESPONSE_CACHE_PERSIST": False,
+                "AGENT_MAX_CONCURRENCY": concurrency,
+                "AGENT_DEFAULT_MODEL_CONCURRENCY": concurrency,
+                "AGENT_QUEUE_MAX_SIZE": concurrency * 4,
+            }
+        )
+    )
+
+
+def _input(recording: Recording) -> Any:
+    """Run input of a recording (a message or a message history)."""
+    if isinstance(recording.input, str):
+        return recording.input
+    return messages_from_dict(recording.input)
+
+
+async def main(path: str, speed: float, concurrency: int) -> None:
+    """Replay the file and print replayed vs recorded latencies."""
+    recordings = sorted(read_recordings(path), key=lambda r: r.offset_ms)
+    if not recordings:
+        print(f"No recordings in {path}")
+        return
+    runtime = _runtime(path, speed, concurrency)
+    recorded = LatencyWindow(len(recordings))
+    replayed = LatencyWindow(len(recordings))
+    errors: dict[str, int] = {}
+
+    async def replay(recording: Recording, start: float) -> None:
+        delay = recording.offset_ms / 1000 / speed
+        await asyncio.sleep(max(0.0, start + delay - time.perf_counter()))
+        agent = AgentBase(name=recording.agent_name, config=recording.config)
+        began = time.perf_counter()
+        try:
+            await runtime.invoke(agent, _input(recording))
+        except Exception as err:
+            errors[type(err).__name__] = errors.get(type(err).__name__, 0) + 1
+            return
+        replayed.add(time.perf_counter() - began)
+        recorded.add(recording.duration_ms / 1000 / speed)
+
+    first = recordings[0].offset_ms
+    for recording in recordings:
+        recording.offset_ms -= first
+    start = time.perf_counter()
+    await asyncio.gather(*(replay(r, start) for r in recordings))
+    elapsed = time.perf_counter() - start
+
+    print(f"runs={len(recordings)} speed={speed} elapsed={elapsed:.2f}s")
+    print(f"throughput {replayed.count / elapsed:.1f} runs/s errors {errors}")
+    for label, window in (("recorded", recorded), ("replayed", replayed)):
+        p50, p95, p99 = (window.percentile(q) for q in (50, 95, 99))
+        if p50 is None:
+            continue
+        print(
+            f"{label:<9} p50 {p50 * 1000:8.1f} p95 {p95 * 1000:8.1f} "
+            f"p99 {p99 * 1000:8.1f} ms"
+        )
+    print(runtime.stats()["traffic"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=256)
+    args = parser.parse_args()
+    asyncio.run(main(args.path, args.speed, args.concurrency))
@@ -0,0 +1,191 @@
+"""
+File: test_agent_invoke.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import AsyncIterator, Generator
+from datetime import UTC, datetime
+import json
+from types import SimpleNamespace
+from typing import Any
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage, HumanMessage
+import pytest
+
+from app.core.exceptions import TooManyRequestsException
+from app.dependecies import get_agent_runtime, get_database_service
+from app.main import app
+
+
+class _FakeDatabaseService:
+    """Returns a single in-memory agent (id 1)."""
+
+    def get_agent(self, id: int) -> SimpleNamespace | None:
+        """Agent 1 exists; any other id does not."""
+        if id != 1:
+            return None
+        now = datetime.now(UTC)
+        return SimpleNamespace(
+            id=1,
+            name="Echo",
+            config={"model": "fake", "system_prompt": "Echo."},
+            prompt_id=None,
+            created_at=now,
+            updated_at=now,
+        )
+
+
+class _FakeRuntime:
+    """Echoes the input, or rejects every run when `full` is set."""
+
+    def __init__(self, full: bool = False) -> None:
+        """Store whether the queue is full."""
+        self.full = full
+
+    async def invoke(self, agent: Any, user_input: str) -> dict[str, Any]:
+        """Return a final state echoing the input."""
+        if self.full:
+            raise TooManyRequestsException("Queue full", retry_after=4.2)
+        return {
+            "messages": [
+                HumanMessage(content=user_input),
+                AIMessage(content=f"echo: {user_input}"),
+            ]
+        }
+
+    async def stream(
+        self, agent: Any, user_input: str
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Stream the echo word by word, then the final state."""
+        if self.full:
+            raise TooManyRequestsException("Queue full", retry_after=4.2)
+        state = await self.invoke(agent, user_input)
+        for word in state["messages"][-1].text.split(" "):
+            yield "token", word
+        yield "state", state
+
+    async def batch(
+        self,
+        agent: Any,
+        user_inputs: list[str],
+        max_concurrency: int | None = None,
+    ) -> list[dict[str, Any] | Exception]:
+        """Echo each input; inputs equal to 'boom' fail."""
+        return [
+            RuntimeError("model failed")
+            if text == "boom"
+            else await self.invoke(agent, text)
+            for text in user_inputs
+        ]
+
+
+@pytest.fixture
+def overrides() -> Generator[dict]:
+    """Install fake DB service and runtime; clear overrides afterwards."""
+    app.dependency_overrides[get_database_service] = _FakeDatabaseService
+    app.dependency_overrides[get_agent_runtime] = _FakeRuntime
+    yield app.dependency_overrides
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.integration
+def test_invoke_agent_returns_output(
+    client: TestClient, overrides: dict
+) -> None:
+    """POST /agents/{id}/invoke returns the last message text."""
+    response = client.post("/agents/1/invoke", json={"input": "hi"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["data"]["output"] == "echo: hi"
+
+
+@pytest.mark.integration
+def test_invoke_unknown_agent_returns_404(
+    client: TestClient, overrides: dict
+) -> None:
+    """Unknown agent id returns 404."""
+    response = client.post("/agents/99/invoke", json={"input": "hi"})
+    assert response.status_code == 404
+
+
+@pytest.mark.integration
+def test_invoke_queue_full_returns_429_with_retry_after(
+    client: TestClient, overrides: dict
+) -> None:
+    """A full run queue returns 429 with a Retry-After header."""
+    overrides[get_agent_runtime] = lambda: _FakeRuntime(full=True)
+    response = client.post("/agents/1/invoke", json={"input": "hi"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
+    assert response.json()["error_code"] == "TOO_MANY_REQUESTS"
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    """Parse server-sent events into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.integration
+def test_stream_agent_emits_tokens_then_end(
+    client: TestClient, overrides: dict
+) -> None:
+    """POST /agents/{id}/invoke/stream sends token events, then end."""
+    response = client.post("/agents/1/invoke/stream", json={"input": "hi"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert events == [
+        ("token", {"text": "echo:"}),
+        ("token", {"text": "hi"}),
+        ("end", {"output": "echo: hi", "structured_response": None}),
+    ]
+
+
+@pytest.mark.integration
+def test_stream_agent_reports_rejection_as_error_event(
+    client: TestClient, overrides: dict
+) -> None:
+    """A rejected run ends the stream with an error event."""
+    overrides[get_agent_runtime] = lambda: _FakeRuntime(full=True)
+    response = client.post("/agents/1/invoke/stream", json={"input": "hi"})
+    assert _events(response.text) == [("error", {"detail": "Queue full"})]
+
+
+@pytest.mark.integration
+def test_batch_agent_returns_items_in_order(
+    client: TestClient, overrides: dict
+) -> None:
+    """POST /agents/{id}/batch returns per-item results in input order."""
+    response = client.post(
+        "/agents/1/batch",
+        json={"inputs": ["a", "boom", "c"], "max_concurrency": 2},
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["succeeded"] == 2
+    assert data["failed"] == 1
+    assert [item["output"] for item in data["items"]] == [
+        "echo: a",
+        None,
+        "echo: c",
+    ]
+    assert data["items"][1]["error"] == "RuntimeError: model failed"
+
+
+@pytest.mark.integration
+def test_batch_agent_rejects_empty_inputs(
+    client: TestClient, overrides: dict
+) -> None:
+    """An empty inputs list fails validation."""
+    response = client.post("/agents/1/batch", json={"inputs": []})
+    assert response.status_code == 422
@@ -0,0 +1,86 @@
+"""
+File: test_agent_run_stats.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Generator
+from datetime import date
+from typing import Any
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app.dependecies import get_database_service
+from app.main import app
+
+_TOTALS = {
+    "runs": 4,
+    "failed": 1,
+    "p50_ms": 120.0,
+    "p95_ms": 480.5,
+    "model_p50_ms": 90.0,
+    "model_p95_ms": 300.0,
+    "prompt_tokens": 400,
+    "completion_tokens": 80,
+    "total_tokens": 480,
+    "tool_calls": 3,
+    "cache_hits": 2,
+}
+
+
+class _FakeDatabaseService:
+    """Returns canned aggregates and remembers the filters it got."""
+
+    def __init__(self) -> None:
+        """Start with no recorded calls."""
+        self.calls: list[dict[str, Any]] = []
+
+    def agent_run_stats_by_agent(self, **filters: Any) -> list[dict]:
+        """One agent's aggregates."""
+        self.calls.append(filters)
+        return [{"agent_id": 1, "agent_name": "Echo", **_TOTALS}]
+
+    def agent_run_stats_by_day(self, **filters: Any) -> list[dict]:
+        """One day's aggregates."""
+        self.calls.append(filters)
+        return [{"day": date(2026, 10, 18), **_TOTALS}]
+
+
+@pytest.fixture
+def db() -> Generator[_FakeDatabaseService]:
+    """Install the fake database service."""
+    fake = _FakeDatabaseService()
+    app.dependency_overrides[get_database_service] = lambda: fake
+    yield fake
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.integration
+def test_stats_per_agent(db: _FakeDatabaseService) -> None:
+    """GET /agent-runs/stats/agents returns percentiles and tokens."""
+    client = TestClient(app)
+    response = client.get(
+        "/agent-runs/stats/agents",
+        params={"since": "2026-10-01T00:00:00Z"},
+    )
+    assert response.status_code == 200
+    [row] = response.json()["data"]
+    assert row["agent_name"] == "Echo"
+    assert row["p95_ms"] == pytest.approx(480.5)
+    assert row["total_tokens"] == 480
+    assert db.calls[0]["since"].year == 2026
+    assert db.calls[0]["until"] is None
+
+
+@pytest.mark.integration
+def test_stats_per_day_filters_by_agent(db: _FakeDatabaseService) -> None:
+    """GET /agent-runs/stats/daily passes the agent filter through."""
+    client = TestClient(app)
+    response = client.get("/agent-runs/stats/daily", params={"agent_id": 1})
+    assert response.status_code == 200
+    assert response.json()["data"][0]["day"] == "2026-10-18"
+    assert db.calls[0]["agent_id"] == 1
@@ -0,0 +1,47 @@
+"""
+File: test_circuit_breakers.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Generator
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app.dependecies import get_agent_runtime
+from app.main import app
+from app.runtime.circuit_breaker import BreakerPolicy, CircuitBreakerRegistry
+
+
+@pytest.fixture
+def breakers() -> Generator[CircuitBreakerRegistry]:
+    """Runtime whose factory has an open model breaker."""
+    registry = CircuitBreakerRegistry(BreakerPolicy(min_calls=1))
+    registry.model("openai:gpt-4o").record(False, 0.1)
+    registry.tool("search").record(True, 0.1)
+    runtime = SimpleNamespace(agent_factory=SimpleNamespace(breakers=registry))
+    app.dependency_overrides[get_agent_runtime] = lambda: runtime
+    yield registry
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.integration
+def test_breaker_state_is_listed_and_can_be_reset(
+    client: TestClient, breakers: CircuitBreakerRegistry
+) -> None:
+    """The admin endpoints list every breaker and force one closed."""
+    response = client.get("/runtime/breakers")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["model:openai"]["state"] == "open"
+    assert data["tool:search"]["state"] == "closed"
+
+    response = client.post("/runtime/breakers/model:openai/reset")
+    assert response.status_code == 200
+    assert response.json()["data"]["state"] == "closed"
+    assert client.post("/runtime/breakers/tool:nope/reset").status_code == 404
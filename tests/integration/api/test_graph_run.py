@@ -0,0 +1,346 @@
+"""
+File: test_graph_run.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import Generator
+from datetime import UTC, datetime
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import InMemorySaver
+import pytest
+
+from app.dependecies import get_database_service, get_graph_runtime
+from app.factories.graph_factory import GraphFactory
+from app.main import app
+from app.routers.graph import stream_graph
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.schemas.api.graph_run import GraphRunRequest
+from app.schemas.db.graph import GraphRead
+from app.schemas.db.graph_run import GraphRunRead
+from app.services.agent_runtime import AgentRuntime
+from app.services.graph_runtime import GraphRuntime
+from app.services.tool_provider import ToolProvider
+
+NOW = datetime(2026, 10, 18, tzinfo=UTC)
+
+
+class _FakeDatabaseService:
+    """Graph 1 (agent node, then a tool node) and graph 2 (bad agent)."""
+
+    def get_graph(self, id: int) -> SimpleNamespace | None:
+        """Graphs 1 and 2 exist."""
+        if id not in (1, 2):
+            return None
+        nodes = [
+            {"name": "ask", "type": "agent", "agent_id": id},
+            {
+                "name": "weather",
+                "type": "tool",
+                "tool": "get_weather",
+                "input_arg": "city",
+            },
+        ]
+        return SimpleNamespace(
+            id=id,
+            name="Weather flow",
+            definition={
+                "nodes": nodes,
+                "edges": [{"source": "ask", "target": "weather"}],
+            },
+            entry_node="ask",
+            plan=None,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+
+    def create_graph(self, data: Any, plan: Any) -> SimpleNamespace:
+        """Echo the created graph with id 3."""
+        return SimpleNamespace(
+            id=3,
+            name=data.name,
+            definition=data.definition.model_dump(),
+            entry_node=data.entry_node,
+            plan=plan.model_dump(),
+            created_at=NOW,
+            updated_at=NOW,
+        )
+
+    def get_agents(self, ids: set[int]) -> dict[int, SimpleNamespace]:
+        """Only agent 1 exists."""
+        return {
+            i: SimpleNamespace(
+                id=i,
+                name="City",
+                config={"model": "fake", "system_prompt": "Name a city."},
+                prompt_id=None,
+                created_at=NOW,
+                updated_at=NOW,
+            )
+            for i in ids
+            if i == 1
+        }
+
+
+def _city_agent(agent: Any) -> RunnableLambda:
+    """Fake compiled agent that always answers 'Lisbon'."""
+    return RunnableLambda(
+        lambda state: {"messages": [AIMessage(content="Lisbon")]}
+    )
+
+
+class _FakeRunStore:
+    """In-memory GraphRunStore."""
+
+    def __init__(self) -> None:
+        """No runs yet."""
+        self.runs: dict[int, GraphRunRead] = {}
+
+    def create(self, graph: GraphRead, user_input: str) -> int:
+        """Record a running run."""
+        run_id = len(self.runs) + 1
+        self.runs[run_id] = GraphRunRead(
+            id=run_id,
+            graph_id=graph.id,
+            graph_version=graph.updated_at,
+            status="running",
+            input=user_input,
+            attempts=1,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        return run_id
+
+    def get(self, id: int) -> GraphRunRead | None:
+        """Fetch a run."""
+        return self.runs.get(id)
+
+    def _set(self, id: int, **values: Any) -> None:
+        """Update fields of a run."""
+        self.runs[id] = self.runs[id].model_copy(update=values)
+
+    def restart(self, id: int) -> bool:
+        """One more attempt, if the run failed."""
+        if self.runs[id].status != "failed":
+            return False
+        self._set(id, status="running", attempts=self.runs[id].attempts + 1)
+        return True
+
+    def succeed(self, id: int, output: dict[str, Any]) -> None:
+        """Mark succeeded."""
+        self._set(id, status="succeeded", output=output)
+
+    def fail(self, id: int, error: str) -> None:
+        """Mark failed."""
+        self._set(id, status="failed", error=error)
+
+
+def _agent_runtime(create_agent: Any) -> AgentRuntime:
+    """Agent runtime whose factory builds agents with `create_agent`."""
+    factory = MagicMock()
+    factory.create_agent.side_effect = create_agent
+    factory.tool_provider = ToolProvider(cache_results=False)
+    factory.tool_executor = None
+    return AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=4, default_model_concurrency=4),
+    )
+
+
+def _install(graph_runtime: GraphRuntime) -> Generator[dict]:
+    """Install the fake DB service and the given graph runtime."""
+    app.dependency_overrides[get_database_service] = _FakeDatabaseService
+    app.dependency_overrides[get_graph_runtime] = lambda: graph_runtime
+    yield app.dependency_overrides
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def overrides() -> Generator[dict]:
+    """Install the fake DB service and a graph runtime with fake agents."""
+    yield from _install(GraphRuntime(GraphFactory(_agent_runtime(_city_agent))))
+
+
+@pytest.fixture
+def checkpointed() -> Generator[dict]:
+    """Checkpointed runtime whose city agent fails on its first call."""
+    failures = iter([True])
+
+    def flaky_agent(agent: Any) -> RunnableLambda:
+        def run(state: dict[str, Any]) -> dict[str, Any]:
+            if next(failures, False):
+                raise RuntimeError("model unavailable")
+            return {"messages": [AIMessage(content="Lisbon")]}
+
+        return RunnableLambda(run)
+
+    graph_runtime = GraphRuntime(
+        GraphFactory(_agent_runtime(flaky_agent), checkpointer=InMemorySaver()),
+        runs=_FakeRunStore(),
+    )
+    yield from _install(graph_runtime)
+
+
+@pytest.mark.integration
+def test_run_graph_returns_node_outputs(
+    client: TestClient, overrides: dict
+) -> None:
+    """POST /graphs/{id}/run returns the last and per-node outputs."""
+    response = client.post("/graphs/1/run", json={"input": "pick a city"})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["output"] == "The weather in Lisbon is sunny."
+    assert data["outputs"]["ask"] == "Lisbon"
+
+
+@pytest.mark.integration
+def test_stream_graph_emits_node_events(
+    client: TestClient, overrides: dict
+) -> None:
+    """POST /graphs/{id}/run/stream sends one event per node, then end."""
+    with client.stream(
+        "POST", "/graphs/1/run/stream", json={"input": "pick a city"}
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+    events = [
+        (lines[0].removeprefix("event: "), json.loads(lines[1][6:]))
+        for block in body.strip().split("\n\n")
+        if (lines := block.split("\n"))
+    ]
+    assert [name for name, _ in events] == ["node", "node", "end"]
+    assert events[0][1] == {"node": "ask", "output": "Lisbon"}
+    assert events[2][1]["output"] == "The weather in Lisbon is sunny."
+
+
+@pytest.mark.integration
+def test_run_graph_errors(client: TestClient, overrides: dict) -> None:
+    """Unknown graphs are 404; graphs that do not compile are 422."""
+    assert client.post("/graphs/9/run", json={"input": "x"}).status_code == 404
+    response = client.post("/graphs/2/run/stream", json={"input": "x"})
+    assert response.status_code == 422
+    assert "agent 2 not found" in response.json()["message"]
+
+
+@pytest.mark.integration
+def test_create_graph_stores_plan(client: TestClient, overrides: dict) -> None:
+    """POST /graphs validates the definition and returns its plan."""
+    body = {
+        "name": "Weather flow",
+        "entry_node": "ask",
+        "definition": {
+            "nodes": [
+                {"name": "ask", "type": "agent", "agent_id": 1},
+                {"name": "weather", "type": "tool", "tool": "get_weather"},
+            ],
+            "edges": [{"source": "ask", "target": "weather"}],
+        },
+    }
+    response = client.post("/graphs/", json=body)
+    assert response.status_code == 201
+    assert response.json()["data"]["plan"] == {
+        "routers": [],
+        "joins": {},
+        "cyclic": False,
+    }
+
+    body["definition"]["nodes"][0]["agent_id"] = 2
+    body["definition"]["edges"] = []
+    response = client.post("/graphs/", json=body)
+    assert response.status_code == 422
+    assert response.json()["message"] == (
+        "Invalid graph: Node 'ask': agent 2 not found"
+    )
+
+
+@pytest.mark.integration
+def test_failed_run_can_be_resumed(
+    client: TestClient, checkpointed: dict
+) -> None:
+    """A failed run names its id; resuming it completes the run once."""
+    response = client.post("/graphs/1/run", json={"input": "pick a city"})
+    assert response.status_code == 500
+    assert response.json()["error_code"] == "GRAPH_RUN_FAILED"
+    assert response.headers["X-Graph-Run-Id"] == "1"
+    run = client.get("/graphs/runs/1").json()["data"]
+    assert run["status"] == "failed"
+    assert run["error"] == "RuntimeError: model unavailable"
+
+    response = client.post("/graphs/runs/1/resume")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["run_id"] == 1
+    assert data["output"] == "The weather in Lisbon is sunny."
+    run = client.get("/graphs/runs/1").json()["data"]
+    assert (run["status"], run["attempts"]) == ("succeeded", 2)
+
+    response = client.post("/graphs/runs/1/resume")
+    assert response.status_code == 409
+    assert response.json()["message"] == (
+        "Run 1 has status succeeded; only failed runs resume"
+    )
+    assert client.get("/graphs/runs/9").status_code == 404
+
+
+@pytest.mark.integration
+def test_resume_that_loses_the_race_is_a_conflict(
+    client: TestClient, checkpointed: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Of two resumes that both saw the run failed, only one restarts it."""
+    client.post("/graphs/1/run", json={"input": "pick a city"})
+    runs = checkpointed[get_graph_runtime]().runs
+    seen = runs.get(1)
+    assert runs.restart(1) is True
+    monkeypatch.setattr(runs, "get", lambda id: seen)
+
+    response = client.post("/graphs/runs/1/resume")
+    assert response.status_code == 409
+    assert response.json()["message"] == "Run 1 is already being resumed"
+    assert runs.runs[1].attempts == 2
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("disconnect", ["close", "cancel"])
+def test_disconnected_stream_marks_the_run_failed(disconnect: str) -> None:
+    """A stream whose client goes away leaves a resumable run, not a
+    running one."""
+    runs = _FakeRunStore()
+    runtime = GraphRuntime(
+        GraphFactory(_agent_runtime(_city_agent), checkpointer=InMemorySaver()),
+        runs=runs,
+    )
+
+    async def scenario() -> None:
+        response = await stream_graph(
+            1,
+            GraphRunRequest(input="pick a city"),
+            _FakeDatabaseService(),
+            runtime,
+        )
+        body = response.body_iterator
+        assert (await anext(body)).startswith("event: node")
+        if disconnect == "close":
+            await body.aclose()
+            return
+        task = asyncio.create_task(anext(body))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    run = runs.get(1)
+    assert run.status == "failed"
+    assert run.error == "Interrupted: the request was cancelled"
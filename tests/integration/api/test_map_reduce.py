@@ -0,0 +1,126 @@
+"""
+File: test_map_reduce.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import Generator
+from datetime import UTC, datetime
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+import pytest
+
+from app.dependecies import get_database_service, get_map_reduce_runner
+from app.main import app
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.runtime.tokenizer import HeuristicTokenizer
+from app.services.agent_runtime import AgentRuntime
+from app.services.map_reduce import MapReduceRunner
+
+NOW = datetime(2026, 10, 18, tzinfo=UTC)
+
+
+class _FakeDatabaseService:
+    """Agents 1 (summarizer) and 2 (editor)."""
+
+    def get_agent(self, id: int) -> SimpleNamespace | None:
+        """Agents 1 and 2 exist."""
+        names = {1: "Summarizer", 2: "Editor"}
+        if id not in names:
+            return None
+        return SimpleNamespace(
+            id=id,
+            name=names[id],
+            config={"model": "fake:echo", "system_prompt": names[id]},
+            prompt_id=None,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+
+
+async def _summarize(state: dict[str, Any]) -> dict[str, Any]:
+    """Fake agent: keeps the first word of a chunk, joins partials."""
+    text = state["messages"][-1]["content"]
+    await asyncio.sleep(0)
+    if "Combine" in text:
+        parts = [line for line in text.splitlines() if line.startswith("c")]
+        return {"messages": [AIMessage(content=" ".join(parts))]}
+    return {"messages": [AIMessage(content=text.split("\n\n")[-1].split()[0])]}
+
+
+@pytest.fixture
+def factory() -> Generator[MagicMock]:
+    """Install fake agents and a runner over a summarizing factory."""
+    factory = MagicMock()
+    factory.create_agent.return_value = RunnableLambda(_summarize)
+    limiter = ConcurrencyLimiter(
+        max_concurrency=8, default_model_concurrency=8, max_queue_size=100
+    )
+    runner = MapReduceRunner(
+        AgentRuntime(factory, limiter), HeuristicTokenizer(), fan_in=4
+    )
+    app.dependency_overrides[get_database_service] = _FakeDatabaseService
+    app.dependency_overrides[get_map_reduce_runner] = lambda: runner
+    yield factory
+    app.dependency_overrides.clear()
+
+
+def _events(body: str) -> list[tuple[str, dict[str, Any]]]:
+    """Parse a server-sent event stream."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        kind, data = block.split("\n", 1)
+        events.append((kind.removeprefix("event: "), json.loads(data[6:])))
+    return events
+
+
+@pytest.mark.integration
+def test_map_reduce_streams_progress_and_final_output(
+    client: TestClient, factory: MagicMock
+) -> None:
+    """Chunks stream as they complete, then the reducer's output."""
+    document = "\n\n".join(f"c{n} " + "filler " * 20 for n in range(6))
+    response = client.post(
+        "/agents/1/map-reduce",
+        json={
+            "input": document,
+            "instructions": "Summarize",
+            "reducer_agent_id": 2,
+            "chunk_tokens": 64,
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "plan"
+    assert events[0][1]["chunks"] == 6
+    assert kinds.count("chunk") == 6
+    assert "reduce" in kinds
+    kind, end = events[-1]
+    assert kind == "end"
+    assert end["output"] == "c0 c1 c2 c3 c4 c5"
+    assert (end["failed"], end["levels"]) == (0, 2)
+    assert [chunk["index"] for chunk in end["chunks"]] == list(range(6))
+
+
+@pytest.mark.integration
+def test_map_reduce_with_unknown_reducer_is_404(
+    client: TestClient, factory: MagicMock
+) -> None:
+    """Both agents must exist before the stream starts."""
+    response = client.post(
+        "/agents/1/map-reduce", json={"input": "text", "reducer_agent_id": 9}
+    )
+    assert response.status_code == 404
+    factory.create_agent.assert_not_called()
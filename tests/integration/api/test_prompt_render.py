@@ -0,0 +1,106 @@
+"""
+File: test_prompt_render.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Generator
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app.dependecies import get_database_service, get_prompt_templates
+from app.main import app
+from app.runtime.prompt_template import PromptTemplateCache
+
+NOW = datetime.now(UTC)
+
+
+class _FakeDatabaseService:
+    """Prompt 1 is a valid template; prompt 2 uses an undeclared variable."""
+
+    def get_prompt(self, id: int) -> SimpleNamespace | None:
+        """Prompts 1 and 2 exist."""
+        contents = {1: ("Hello {name}!", ["name"]), 2: ("Hi {who}", None)}
+        if id not in contents:
+            return None
+        content, variables = contents[id]
+        return SimpleNamespace(
+            id=id,
+            name=f"p{id}",
+            content=content,
+            variables=variables,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+
+
+@pytest.fixture
+def templates() -> Generator[PromptTemplateCache]:
+    """Install the fake DB service and a fresh template cache."""
+    cache = PromptTemplateCache()
+    app.dependency_overrides[get_database_service] = _FakeDatabaseService
+    app.dependency_overrides[get_prompt_templates] = lambda: cache
+    yield cache
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.integration
+def test_render_and_batch_share_one_compiled_template(
+    client: TestClient, templates: PromptTemplateCache
+) -> None:
+    """Single and batch renders compile the prompt once."""
+    response = client.post(
+        "/prompts/1/render", json={"variables": {"name": "Ada"}}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["content"] == "Hello Ada!"
+
+    response = client.post(
+        "/prompts/1/render/batch",
+        json={"items": [{"name": "Bob"}, {}, {"name": "Cy"}]},
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [item["content"] for item in data["items"]] == [
+        "Hello Bob!",
+        None,
+        "Hello Cy!",
+    ]
+    assert "missing variables" in data["items"][1]["error"]
+    assert (data["succeeded"], data["failed"]) == (2, 1)
+    assert (templates.hits, templates.misses) == (1, 1)
+
+
+@pytest.mark.integration
+def test_render_errors(
+    client: TestClient, templates: PromptTemplateCache
+) -> None:
+    """Unknown prompts 404; bad variables and bad templates are 422."""
+    assert client.post("/prompts/9/render", json={}).status_code == 404
+    response = client.post(
+        "/prompts/1/render", json={"variables": {"name": 1, "x": 2}}
+    )
+    assert response.status_code == 422
+    assert "unknown variables" in response.json()["message"]
+    response = client.post("/prompts/2/render", json={"variables": {}})
+    assert response.status_code == 422
+    assert "undeclared variables" in response.json()["message"]
+
+
+@pytest.mark.integration
+def test_create_prompt_rejects_mismatched_variables(
+    client: TestClient, templates: PromptTemplateCache
+) -> None:
+    """Templates are validated before they are stored."""
+    response = client.post(
+        "/prompts/",
+        json={"name": "p", "content": "Hi {name}", "variables": ["nme"]},
+    )
+    assert response.status_code == 422
+    assert "undeclared variables ['name']" in response.json()["message"]
@@ -0,0 +1,112 @@
+"""
+File: test_rate_limit.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Generator
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+import pytest
+
+from app.dependecies import get_agent_runtime, get_database_service
+from app.main import app
+from app.middleware import RateLimitMiddleware
+from app.runtime.rate_limit import (
+    MemoryBucketStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitScope,
+)
+
+
+class _FakeDatabaseService:
+    """Returns a single in-memory agent (id 1)."""
+
+    def get_agent(self, id: int) -> SimpleNamespace | None:
+        """Agent 1 exists; any other id does not."""
+        if id != 1:
+            return None
+        now = datetime.now(UTC)
+        return SimpleNamespace(
+            id=1,
+            name="Echo",
+            config={"model": "fake:echo", "system_prompt": "Echo."},
+            prompt_id=None,
+            created_at=now,
+            updated_at=now,
+        )
+
+
+class _FakeRuntime:
+    """Answers every run with a fixed reply."""
+
+    async def invoke(self, agent: Any, user_input: str) -> dict[str, Any]:
+        """Return a final state with one reply."""
+        return {"messages": [AIMessage(content="ok")]}
+
+
+@pytest.fixture
+def limited() -> Generator[None]:
+    """Install a tight limiter and fake agents; remove them afterwards."""
+    app.state.rate_limiter = RateLimiter(
+        MemoryBucketStore(),
+        defaults={
+            RateLimitScope.USER: RateLimit(rpm=3),
+            RateLimitScope.AGENT: RateLimit(rpm=2),
+        },
+    )
+    app.dependency_overrides[get_database_service] = _FakeDatabaseService
+    app.dependency_overrides[get_agent_runtime] = _FakeRuntime
+    yield
+    app.dependency_overrides.clear()
+    del app.state.rate_limiter
+
+
+@pytest.mark.integration
+def test_caller_over_limit_gets_429_with_retry_after(
+    client: TestClient, limited: None
+) -> None:
+    """The middleware rejects a client's 4th request of the minute; an
+    untrusted caller header does not open a new bucket."""
+    for user in ("alice", "bob", "carol"):
+        response = client.get("/agents/99", headers={"X-User-Id": user})
+        assert response.status_code == 404
+    response = client.get("/agents/99", headers={"X-User-Id": "dave"})
+    assert response.status_code == 429
+    # 3 rpm refills one request every 20 seconds.
+    assert response.headers["Retry-After"] == "20"
+    assert response.json()["error_code"] == "TOO_MANY_REQUESTS"
+    assert client.get("/health").status_code == 200
+
+
+@pytest.mark.integration
+def test_caller_header_is_trusted_only_when_configured() -> None:
+    """A configured header names the caller; by default it is ignored."""
+    scope = {
+        "headers": [(b"x-user-id", b"alice")],
+        "client": ("10.0.0.7", 5123),
+    }
+    assert RateLimitMiddleware(app)._caller(scope) == "10.0.0.7"
+    trusted = RateLimitMiddleware(app, header="X-User-Id")
+    assert trusted._caller(scope) == "alice"
+    assert trusted._caller({"client": ("10.0.0.7", 5123)}) == "10.0.0.7"
+
+
+@pytest.mark.integration
+def test_agent_over_limit_gets_429(client: TestClient, limited: None) -> None:
+    """The agent dependency rejects runs of a busy agent."""
+    for _ in range(2):
+        response = client.post("/agents/1/invoke", json={"input": "hi"})
+        assert response.status_code == 200
+    response = client.post("/agents/1/invoke", json={"input": "hi"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+    assert "agent:1:requests" in response.json()["message"]
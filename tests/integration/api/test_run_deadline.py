@@ -0,0 +1,104 @@
+"""
+File: test_run_deadline.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Generator
+from datetime import UTC, datetime
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+import pytest
+
+from app.dependecies import get_agent_runtime, get_database_service
+from app.main import app
+from app.runtime.cancellation import DeadlineMiddleware
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.runtime.fake_chat_model import FakeChatModel
+from app.services.agent_runtime import AgentRuntime
+
+
+class _FakeDatabaseService:
+    """Returns a single in-memory agent (id 1)."""
+
+    def get_agent(self, id: int) -> SimpleNamespace | None:
+        """Agent 1 exists; any other id does not."""
+        if id != 1:
+            return None
+        now = datetime.now(UTC)
+        return SimpleNamespace(
+            id=1,
+            name="Slow",
+            config={"model": "fake:echo", "system_prompt": "Echo."},
+            prompt_id=None,
+            created_at=now,
+            updated_at=now,
+        )
+
+
+@pytest.fixture
+def slow_agent() -> Generator[None]:
+    """Serve agent 1 on a fake model answering after 300 ms."""
+    factory = MagicMock()
+    factory.create_agent.return_value = create_agent(
+        model=FakeChatModel(latency_ms=300), middleware=[DeadlineMiddleware()]
+    )
+    runtime = AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=4, default_model_concurrency=4),
+    )
+    app.dependency_overrides[get_database_service] = _FakeDatabaseService
+    app.dependency_overrides[get_agent_runtime] = lambda: runtime
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.integration
+def test_request_timeout_cuts_off_the_run(
+    client: TestClient, slow_agent: None
+) -> None:
+    """X-Request-Timeout shorter than the run returns 504 early."""
+    started = time.perf_counter()
+    response = client.post(
+        "/agents/1/invoke",
+        json={"input": "hi"},
+        headers={"X-Request-Timeout": "0.05"},
+    )
+    assert time.perf_counter() - started < 0.25
+    assert response.status_code == 504
+    assert response.json()["error_code"] == "DEADLINE_EXCEEDED"
+
+    response = client.post(
+        "/agents/1/invoke",
+        json={"input": "hi"},
+        headers={"X-Request-Deadline": str(time.time() + 5)},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["output"] == "echo: hi"
+
+
+@pytest.mark.integration
+def test_deadline_errors(client: TestClient, slow_agent: None) -> None:
+    """A passed deadline streams an error event; a bad one is a 422."""
+    response = client.post(
+        "/agents/1/invoke/stream",
+        json={"input": "hi"},
+        headers={"X-Request-Deadline": "2020-01-01T00:00:00+00:00"},
+    )
+    assert response.status_code == 200
+    assert response.text.startswith("event: error")
+    assert "deadline exceeded" in response.text
+
+    response = client.post(
+        "/agents/1/invoke",
+        json={"input": "hi"},
+        headers={"X-Request-Deadline": "tomorrow"},
+    )
+    assert response.status_code == 422
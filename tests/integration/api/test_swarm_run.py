@@ -0,0 +1,118 @@
+"""
+File: test_swarm_run.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import Generator
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+import pytest
+
+from app.dependecies import get_database_service, get_swarm_runtime
+from app.main import app
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.services.agent_runtime import AgentRuntime
+from app.services.swarm_runtime import SwarmRuntime
+
+NOW = datetime(2026, 10, 18, tzinfo=UTC)
+
+
+class _FakeDatabaseService:
+    """Agents 1 (researcher), 2 (writer) and 3 (supervisor)."""
+
+    def get_agents(self, ids: set[int]) -> dict[int, SimpleNamespace]:
+        """Agents 1 to 3 exist."""
+        names = {1: "Researcher", 2: "Writer", 3: "Supervisor"}
+        return {
+            i: SimpleNamespace(
+                id=i,
+                name=names[i],
+                config={"model": "fake:echo", "system_prompt": "Help."},
+                prompt_id=None,
+                created_at=NOW,
+                updated_at=NOW,
+            )
+            for i in ids
+            if i in names
+        }
+
+
+async def _echo(state: dict[str, Any]) -> dict[str, Any]:
+    """Fake compiled agent: echoes its input, fails on 'boom'."""
+    text = state["messages"][-1]["content"]
+    if text.endswith("boom"):
+        raise RuntimeError("model failed")
+    await asyncio.sleep(0)
+    return {"messages": [AIMessage(content=f"echo: {text}")]}
+
+
+@pytest.fixture
+def factory() -> Generator[MagicMock]:
+    """Install fake agents and a swarm runtime over an echo factory."""
+    factory = MagicMock()
+    factory.create_agent.return_value = RunnableLambda(_echo)
+    limiter = ConcurrencyLimiter(
+        max_concurrency=8, default_model_concurrency=8, max_queue_size=100
+    )
+    runtime = SwarmRuntime(AgentRuntime(factory, limiter), max_workers=4)
+    app.dependency_overrides[get_database_service] = _FakeDatabaseService
+    app.dependency_overrides[get_swarm_runtime] = lambda: runtime
+    yield factory
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.integration
+def test_swarm_fans_out_and_supervisor_combines(
+    client: TestClient, factory: MagicMock
+) -> None:
+    """Subtasks run on their agents, failures are per subtask, and the
+    supervisor sees every result."""
+    response = client.post(
+        "/swarms/run",
+        json={
+            "task": "Write a launch post",
+            "subtasks": [
+                {"agent_id": 1, "input": "find facts"},
+                {"agent_id": 1, "input": "boom"},
+                {"agent_id": 2},
+            ],
+            "supervisor_agent_id": 3,
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert (data["succeeded"], data["failed"]) == (2, 1)
+    first, failed, writer = data["results"]
+    assert first["agent_id"] == 1
+    assert first["output"].endswith("Your subtask: find facts")
+    assert failed["error"] == "RuntimeError: model failed"
+    assert writer["output"] == "echo: Write a launch post"
+    assert "[2] Researcher (boom):\nfailed" in data["output"]
+    assert data["output"].startswith("echo: Task: Write a launch post")
+    # One compiled agent per agent row, shared by its subtasks.
+    assert factory.create_agent.call_count == 3
+
+
+@pytest.mark.integration
+def test_swarm_with_unknown_agent_is_404(
+    client: TestClient, factory: MagicMock
+) -> None:
+    """Every referenced agent must exist before anything runs."""
+    response = client.post(
+        "/swarms/run",
+        json={"task": "t", "subtasks": [{"agent_id": 1}, {"agent_id": 9}]},
+    )
+    assert response.status_code == 404
+    assert "9" in response.json()["message"]
+    factory.create_agent.assert_not_called()
@@ -0,0 +1,242 @@
+"""
+File: test_thread.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Generator
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+import pytest
+
+from app.dependecies import (
+    get_agent_runtime,
+    get_database_service,
+    get_tokenizer,
+)
+from app.main import app
+from app.runtime.tokenizer import HeuristicTokenizer
+from app.schemas.db.thread import ThreadCreate
+
+NOW = datetime.now(UTC)
+
+
+class _FakeDatabaseService:
+    """One agent (id 1) with a configurable context; threads in memory."""
+
+    def __init__(self, context: dict[str, Any] | None) -> None:
+        """Store the agent's context config and empty tables."""
+        self.context = context
+        self.threads: dict[int, SimpleNamespace] = {}
+        self.messages: list[SimpleNamespace] = []
+
+    def get_agent(self, id: int) -> SimpleNamespace | None:
+        """Agent 1 exists; any other id does not."""
+        if id != 1:
+            return None
+        config = {"model": "fake", "system_prompt": "Chat."}
+        if self.context is not None:
+            config["context"] = self.context
+        return SimpleNamespace(
+            id=1,
+            name="Chat",
+            config=config,
+            prompt_id=None,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+
+    def create_thread(self, data: ThreadCreate) -> SimpleNamespace:
+        """Open a thread."""
+        thread = SimpleNamespace(
+            id=len(self.threads) + 1,
+            agent_id=data.agent_id,
+            title=data.title,
+            summary=None,
+            summary_seq=0,
+            last_seq=0,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        self.threads[thread.id] = thread
+        return thread
+
+    def get_thread(self, id: int) -> SimpleNamespace | None:
+        """Thread by id."""
+        return self.threads.get(id)
+
+    def list_thread_messages(
+        self, thread_id: int, *, after_seq: int = 0, limit: int = 100
+    ) -> list[SimpleNamespace]:
+        """Newest `limit` messages after `after_seq`, oldest first."""
+        rows = [
+            m
+            for m in self.messages
+            if m.thread_id == thread_id and m.seq > after_seq
+        ]
+        return rows[-limit:]
+
+    def list_thread_messages_after(
+        self, thread_id: int, *, after_seq: int, before_seq: int, limit: int
+    ) -> list[SimpleNamespace]:
+        """Oldest `limit` messages between two seqs, oldest first."""
+        rows = [
+            m
+            for m in self.messages
+            if m.thread_id == thread_id and after_seq < m.seq < before_seq
+        ]
+        return rows[:limit]
+
+    def append_thread_messages(
+        self, thread_id: int, messages: list[tuple[str, str, int]]
+    ) -> list[SimpleNamespace]:
+        """Append with the next seqs."""
+        thread = self.threads[thread_id]
+        rows = []
+        for role, content, token_count in messages:
+            thread.last_seq += 1
+            rows.append(
+                SimpleNamespace(
+                    thread_id=thread_id,
+                    seq=thread.last_seq,
+                    role=role,
+                    content=content,
+                    token_count=token_count,
+                    created_at=NOW,
+                )
+            )
+        self.messages.extend(rows)
+        return rows
+
+    def update_thread_summary(
+        self, thread_id: int, summary: str, summary_seq: int
+    ) -> None:
+        """Store the rolling summary."""
+        thread = self.threads[thread_id]
+        thread.summary, thread.summary_seq = summary, summary_seq
+
+
+class _FakeRuntime:
+    """Replies with the number of messages it received; records inputs."""
+
+    def __init__(self) -> None:
+        """No calls yet."""
+        self.calls: list[tuple[str, Any]] = []
+
+    async def invoke(self, agent: Any, user_input: Any) -> dict[str, Any]:
+        """Summaries get a fixed reply; chat turns report their size."""
+        self.calls.append((agent.name, user_input))
+        if isinstance(user_input, str):
+            return {"messages": [AIMessage(content="they said hello")]}
+        return {"messages": [AIMessage(content=f"got {len(user_input)}")]}
+
+
+def _install(context: dict[str, Any] | None) -> _FakeRuntime:
+    """Install fakes sharing state across requests."""
+    db = _FakeDatabaseService(context)
+    runtime = _FakeRuntime()
+    app.dependency_overrides[get_database_service] = lambda: db
+    app.dependency_overrides[get_agent_runtime] = lambda: runtime
+    app.dependency_overrides[get_tokenizer] = HeuristicTokenizer
+    return runtime
+
+
+@pytest.fixture
+def clear_overrides() -> Generator[None]:
+    """Clear dependency overrides afterwards."""
+    yield
+    app.dependency_overrides.clear()
+
+
+def _chat(client: TestClient, turns: int) -> list[dict[str, Any]]:
+    """Open a thread and post `turns` messages."""
+    created = client.post("/threads/", json={"agent_id": 1})
+    assert created.status_code == 201
+    thread_id = created.json()["data"]["id"]
+    results = []
+    for turn in range(turns):
+        response = client.post(
+            f"/threads/{thread_id}/messages", json={"input": f"hello {turn}"}
+        )
+        assert response.status_code == 200
+        results.append(response.json()["data"])
+    return results
+
+
+@pytest.mark.integration
+def test_last_n_context_stays_bounded(
+    client: TestClient, clear_overrides: None
+) -> None:
+    """History grows by a turn each message, up to max_messages."""
+    runtime = _install({"strategy": "last_n", "max_messages": 4})
+    results = _chat(client, 5)
+    assert [r["context_messages"] for r in results] == [0, 2, 4, 4, 4]
+    assert [r["seq"] for r in results] == [2, 4, 6, 8, 10]
+    assert results[-1]["output"] == "got 5"
+    assert all(name == "Chat" for name, _ in runtime.calls)
+
+    messages = client.get("/threads/1/messages", params={"limit": 3})
+    assert [m["seq"] for m in messages.json()["data"]] == [8, 9, 10]
+
+
+@pytest.mark.integration
+def test_summary_context_folds_evicted_messages(
+    client: TestClient, clear_overrides: None
+) -> None:
+    """Messages falling out of the window are summarized once."""
+    runtime = _install({"strategy": "summary", "max_messages": 4})
+    results = _chat(client, 5)
+    assert [r["summarized"] for r in results] == [0, 0, 0, 4, 0]
+    assert [r["context_messages"] for r in results] == [0, 2, 4, 2, 4]
+    summaries = [call for call in runtime.calls if call[0] != "Chat"]
+    assert len(summaries) == 1
+    assert "user: hello 0" in summaries[0][1]
+
+    last_input = runtime.calls[-1][1]
+    assert last_input[0].content.endswith("they said hello")
+    thread = client.get("/threads/1").json()["data"]
+    assert (thread["summary_seq"], thread["last_seq"]) == (4, 10)
+
+
+@pytest.mark.integration
+def test_summary_folds_messages_older_than_the_tail(
+    client: TestClient, clear_overrides: None
+) -> None:
+    """A thread that grew past the tail before it used `summary` has its
+    older messages folded in pages, so none is skipped."""
+    runtime = _install({"strategy": "last_n", "max_messages": 4})
+    _chat(client, 10)
+    db = app.dependency_overrides[get_database_service]()
+    db.context = {"strategy": "summary", "max_messages": 4}
+
+    response = client.post("/threads/1/messages", json={"input": "recap"})
+    assert response.status_code == 200
+    assert response.json()["data"]["summarized"] == 18
+    summaries = [text for name, text in runtime.calls if name != "Chat"]
+    # Tail is seqs 13-20: 1-12 fold in pages of 8, then 13-18 evict.
+    assert len(summaries) == 3
+    assert "user: hello 0" in summaries[0]
+    assert "user: hello 4" in summaries[1]
+    assert "user: hello 6" in summaries[2]
+    thread = client.get("/threads/1").json()["data"]
+    assert thread["summary_seq"] == 18
+
+
+@pytest.mark.integration
+def test_thread_errors(client: TestClient, clear_overrides: None) -> None:
+    """Unknown agents and threads 404; a bad context config is rejected."""
+    _install({"strategy": "everything"})
+    assert client.post("/threads/", json={"agent_id": 9}).status_code == 404
+    response = client.post("/threads/7/messages", json={"input": "hi"})
+    assert response.status_code == 404
+    client.post("/threads/", json={"agent_id": 1})
+    response = client.post("/threads/1/messages", json={"input": "hi"})
+    assert response.status_code == 422
+    assert "Invalid context config" in response.json()["message"]
@@ -9,7 +9,13 @@ Copyright (c) 2025 Swarm Nest. See LICENSE for details.
 
 import pytest
 
-from app.core import NotFoundException, ValidationException
+from app.core import (
+    ConflictException,
+    NotFoundException,
+    PayloadTooLargeException,
+    TooManyRequestsException,
+    ValidationException,
+)
 
 
 @pytest.mark.unit
@@ -43,3 +49,46 @@ def test_validation_exception() -> None:
     assert exc.status_code == 422
     assert exc.error_code == "VALIDATION_ERROR"
     assert exc.detail == "Test validation failed"
+
+
+@pytest.mark.unit
+def test_too_many_requests_exception_retry_after_header() -> None:
+    """
+    Test TooManyRequestsException rounds Retry-After up to whole seconds.
+    """
+    exc = TooManyRequestsException("Queue full", retry_after=2.1)
+    assert exc.status_code == 429
+    assert exc.error_code == "TOO_MANY_REQUESTS"
+    assert exc.headers == {"Retry-After": "3"}
+
+
+@pytest.mark.unit
+def test_too_many_requests_exception_without_retry_after() -> None:
+    """
+    Test TooManyRequestsException without retry_after sends no headers.
+    """
+    exc = TooManyRequestsException()
+    assert exc.detail == "Too many requests"
+    assert exc.headers is None
+
+
+@pytest.mark.unit
+def test_conflict_exception() -> None:
+    """
+    Test ConflictException properties.
+    """
+    exc = ConflictException("Run is not resumable")
+    assert exc.status_code == 409
+    assert exc.error_code == "CONFLICT"
+    assert exc.detail == "Run is not resumable"
+
+
+@pytest.mark.unit
+def test_payload_too_large_exception() -> None:
+    """
+    Test PayloadTooLargeException properties.
+    """
+    exc = PayloadTooLargeException("Input exceeds the context window")
+    assert exc.status_code == 413
+    assert exc.error_code == "CONTEXT_WINDOW_EXCEEDED"
+    assert exc.detail == "Input exceeds the context window"
@@ -9,18 +9,32 @@ Copyright (c) 2026 Swarm Nest. See LICENSE for details.
 
 from unittest.mock import MagicMock, patch
 
+from langchain.agents.middleware import ModelCallLimitMiddleware
 from langchain.tools import BaseTool
 from pydantic import BaseModel
 import pytest
 
 from app.factories.agent_factory import AgentConfig, AgentFactory
+from app.factories.structured_output_factory import StructuredOutputFactory
+from app.runtime.cancellation import DeadlineMiddleware
+from app.runtime.circuit_breaker import (
+    CircuitBreakerRegistry,
+    ToolBreakerMiddleware,
+)
+from app.runtime.model_fallback import ModelFallbackMiddleware
+from app.runtime.response_cache import ResponseCache, ResponseCacheMiddleware
+from app.runtime.run_metrics import RunMetricsMiddleware
+from app.runtime.tool_cache import ToolCacheMiddleware
+from app.runtime.traffic import TrafficMiddleware
+from app.runtime.ttl_cache import TTLCache
 from app.schemas.db.agent import AgentCreate
+from app.services.tool_provider import ToolProvider
 
 
 @pytest.fixture
 def factory() -> AgentFactory:
     """AgentFactory instance."""
-    return AgentFactory()
+    return AgentFactory(ToolProvider(), StructuredOutputFactory())
 
 
 @pytest.fixture
@@ -151,3 +165,133 @@ def test_create_agent_calls_langchain_create_agent(
     assert call_kwargs["system_prompt"] == "You are a helpful assistant."
     assert len(call_kwargs["tools"]) == 1
     assert call_kwargs["response_format"] is None
+
+
+@pytest.mark.unit
+def test_response_cache_is_opt_in_per_agent() -> None:
+    """Only agents with config['response_cache'] get the cache middleware."""
+    cache = ResponseCache(TTLCache(10), default_ttl=60.0)
+    factory = AgentFactory(ToolProvider(), StructuredOutputFactory(), cache)
+    base = {"model": "gpt-4", "system_prompt": "Hi"}
+    plain = factory._config_to_langchain_config(
+        AgentCreate(name="Plain", config=base)
+    )
+    cached = factory._config_to_langchain_config(
+        AgentCreate(name="Cached", config={**base, "response_cache": True})
+    )
+    custom = factory._config_to_langchain_config(
+        AgentCreate(
+            name="Custom", config={**base, "response_cache": {"ttl": 5}}
+        )
+    )
+    assert not any(
+        isinstance(m, ResponseCacheMiddleware) for m in plain.middleware
+    )
+    assert isinstance(cached.middleware[0], ResponseCacheMiddleware)
+    assert cached.middleware[0].ttl == pytest.approx(60.0)
+    assert custom.middleware[0].ttl == 5
+
+
+@pytest.mark.unit
+def test_cacheable_tools_get_tool_cache_middleware(
+    factory: AgentFactory, minimal_agent_create: AgentCreate
+) -> None:
+    """Agents using a tool with a cache policy route it through its memo."""
+    config = factory._config_to_langchain_config(minimal_agent_create)
+    middleware, deadline, metrics, traffic = config.middleware
+    assert isinstance(middleware, ToolCacheMiddleware)
+    assert isinstance(deadline, DeadlineMiddleware)
+    assert isinstance(metrics, RunMetricsMiddleware)
+    assert isinstance(traffic, TrafficMiddleware)
+    assert middleware.memos["get_weather"] is factory.tool_provider.get_memo(
+        "get_weather"
+    )
+
+
+@pytest.mark.unit
+def test_max_steps_caps_model_calls_per_run() -> None:
+    """config['max_steps'] overrides the factory's default step cap."""
+    factory = AgentFactory(
+        ToolProvider(), StructuredOutputFactory(), max_steps=10
+    )
+    base = {"model": "gpt-4", "system_prompt": "Hi"}
+    default, capped, unlimited = (
+        factory._config_to_langchain_config(AgentCreate(name="A", config=c))
+        for c in (base, {**base, "max_steps": 3}, {**base, "max_steps": 0})
+    )
+    assert default.middleware[0].run_limit == 10
+    assert capped.middleware[0].run_limit == 3
+    assert not any(
+        isinstance(m, ModelCallLimitMiddleware) for m in unlimited.middleware
+    )
+
+
+@pytest.mark.unit
+def test_fallbacks_and_hedging_get_fallback_middleware() -> None:
+    """config['fallbacks'] resolves each fallback model once per agent."""
+    factory = AgentFactory(ToolProvider(), StructuredOutputFactory())
+    config = factory._config_to_langchain_config(
+        AgentCreate(
+            name="Hedged",
+            config={
+                "model": "fake:echo",
+                "system_prompt": "Hi",
+                "fallbacks": [
+                    "fake:echo",
+                    {"model": "fake:tool-caller", "model_options": {"seed": 1}},
+                ],
+                "hedge": {"percentile": 99},
+                "model_timeout": 5,
+            },
+        )
+    )
+    (fallback,) = [
+        m for m in config.middleware if isinstance(m, ModelFallbackMiddleware)
+    ]
+    assert [model_id for model_id, _ in fallback.fallbacks] == [
+        "fake:echo",
+        "fake:tool-caller",
+    ]
+    assert fallback.fallbacks[1][1].seed == 1
+    assert fallback.policy.hedge_percentile == 99
+    assert fallback.policy.timeout == 5
+    assert fallback.tracker is factory.latency_tracker
+
+
+@pytest.mark.unit
+def test_circuit_breakers_guard_model_and_tool_calls(
+    minimal_agent_create: AgentCreate,
+) -> None:
+    """With breakers, model calls go through the fallback middleware and
+    tools through the tool breakers, all sharing the factory's registry."""
+    breakers = CircuitBreakerRegistry()
+    factory = AgentFactory(
+        ToolProvider(), StructuredOutputFactory(), breakers=breakers
+    )
+    config = factory._config_to_langchain_config(minimal_agent_create)
+    _, fallback, tool_breakers, *_ = config.middleware
+    assert isinstance(fallback, ModelFallbackMiddleware)
+    assert fallback.fallbacks == []
+    assert fallback.breakers is breakers
+    assert isinstance(tool_breakers, ToolBreakerMiddleware)
+    assert tool_breakers.breakers is breakers
+
+
+@pytest.mark.unit
+def test_model_registry_shares_clients_across_agents() -> None:
+    """Agents with the same model get the registry's shared client."""
+    registry = MagicMock()
+    factory = AgentFactory(
+        ToolProvider(), StructuredOutputFactory(), model_registry=registry
+    )
+    data = AgentCreate(
+        name="X",
+        config={
+            "model": "openai:gpt-4o",
+            "system_prompt": "Hi",
+            "model_options": {"temperature": 0},
+        },
+    )
+    config = factory._config_to_langchain_config(data)
+    registry.get.assert_called_once_with("openai:gpt-4o", {"temperature": 0})
+    assert config.model is registry.get.return_value
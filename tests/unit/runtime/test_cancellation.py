@@ -0,0 +1,105 @@
+"""
+File: test_cancellation.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+from langchain.agents import create_agent
+import pytest
+
+from app.core.exceptions import GatewayTimeoutException
+from app.runtime.cancellation import (
+    ClientDisconnectedError,
+    DeadlineExceededError,
+    DeadlineMiddleware,
+    cancel_on_disconnect,
+    deadline_scope,
+    enforce_deadline,
+    remaining,
+)
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.runtime.fake_chat_model import FakeChatModel
+from app.schemas.db.agent import AgentCreate
+from app.services.agent_runtime import AgentRuntime
+
+
+@pytest.mark.unit
+def test_deadline_scopes_only_tighten() -> None:
+    """A nested scope cannot extend the deadline of its parent."""
+    assert remaining() is None
+    with deadline_scope(1.0):
+        with deadline_scope(10.0):
+            assert remaining() == pytest.approx(1.0, abs=0.05)
+        with deadline_scope(0.1):
+            assert remaining() == pytest.approx(0.1, abs=0.05)
+        with deadline_scope(None):
+            assert remaining() == pytest.approx(1.0, abs=0.05)
+    assert remaining() is None
+
+
+@pytest.mark.unit
+def test_enforce_deadline_cancels_the_block() -> None:
+    """Work still running at the deadline is cancelled."""
+
+    async def main() -> None:
+        with deadline_scope(0.02):
+            async with enforce_deadline():
+                await asyncio.sleep(1)
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceededError, match="run"):
+        asyncio.run(main())
+    assert time.perf_counter() - started < 0.5
+
+
+@pytest.mark.unit
+def test_disconnect_cancels_the_block() -> None:
+    """The block is cancelled once the client reports a disconnect."""
+    polls = 0
+
+    async def is_disconnected() -> bool:
+        nonlocal polls
+        await asyncio.sleep(0)
+        polls += 1
+        return polls >= 3
+
+    async def main() -> None:
+        async with cancel_on_disconnect(is_disconnected, interval=0.01):
+            await asyncio.sleep(1)
+
+    with pytest.raises(ClientDisconnectedError):
+        asyncio.run(main())
+    assert polls == 3
+
+
+@pytest.mark.unit
+def test_deadline_stops_a_run_mid_model_call() -> None:
+    """A run past its deadline surfaces as a 504 without finishing."""
+    factory = MagicMock()
+    factory.create_agent.return_value = create_agent(
+        model=FakeChatModel(latency_ms=1000), middleware=[DeadlineMiddleware()]
+    )
+    runtime = AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=4, default_model_concurrency=4),
+    )
+    agent = AgentCreate(
+        name="Slow", config={"model": "fake:echo", "system_prompt": "Hi."}
+    )
+
+    async def main() -> None:
+        with deadline_scope(0.05):
+            await runtime.invoke(agent, "hi")
+
+    started = time.perf_counter()
+    with pytest.raises(GatewayTimeoutException) as exc_info:
+        asyncio.run(main())
+    assert time.perf_counter() - started < 0.5
+    assert exc_info.value.status_code == 504
@@ -0,0 +1,239 @@
+"""
+File: test_checkpoint.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
+from typing import Any
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import ERROR, empty_checkpoint
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph import END, START, StateGraph
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db.models.checkpoint import (
+    CheckpointBlob,
+    CheckpointRecord,
+    CheckpointWrite,
+)
+from app.factories.graph_factory import GraphState
+from app.runtime.checkpoint import PostgresCheckpointer, ZstdSerializer
+
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+
+
+@pytest.mark.unit
+def test_zstd_serializer_round_trips_and_compresses() -> None:
+    """Messages survive msgpack + zstd and take fewer bytes than msgpack."""
+    value = {
+        "messages": [
+            HumanMessage(content="Summarize the report."),
+            AIMessage(content="The quarter was flat. " * 40, name="writer"),
+        ],
+        "outputs": {"writer": "The quarter was flat."},
+    }
+    serde = ZstdSerializer()
+    type_, data = serde.dumps_typed(value)
+    _, raw = JsonPlusSerializer().dumps_typed(value)
+    assert type_ == "msgpack+zstd"
+    assert len(data) < len(raw) / 4
+    assert serde.loads_typed((type_, data)) == value
+
+
+@pytest.mark.unit
+def test_zstd_serializer_keeps_empty_payloads() -> None:
+    """Sentinel values (None) are not wrapped in a zstd frame."""
+    serde = ZstdSerializer()
+    assert serde.dumps_typed(None) == ("null", b"")
+    assert serde.loads_typed(("null", b"")) is None
+
+
+@pytest.mark.unit
+def test_channel_versions_increase() -> None:
+    """Versions sort in write order, as LangGraph requires."""
+    saver = PostgresCheckpointer(session_factory=None)
+    first = saver.get_next_version(None, None)
+    second = saver.get_next_version(first, None)
+    assert first < second
+    assert int(second.split(".")[0]) == 2
+
+
+@pytest.fixture
+def sessions() -> Generator[SessionFactory]:
+    """
+    Transactional sessions over an in-memory database with the checkpoint
+    tables, shared by the threads the async methods run in. The saver's
+    upserts (INSERT ... ON CONFLICT) compile on SQLite as on Postgres, so
+    the real statements run.
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    for model in (CheckpointRecord, CheckpointBlob, CheckpointWrite):
+        model.__table__.create(engine)
+
+    @contextmanager
+    def session_factory() -> Generator[Session]:
+        with Session(engine) as session, session.begin():
+            yield session
+
+    yield session_factory
+    engine.dispose()
+
+
+def _checkpoint(
+    values: dict[str, Any], versions: dict[str, str]
+) -> dict[str, Any]:
+    """Checkpoint with the given channel values and versions."""
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = values
+    checkpoint["channel_versions"] = versions
+    return checkpoint
+
+
+@pytest.mark.unit
+def test_put_stores_only_changed_channels_and_get_tuple_reads_back(
+    sessions: SessionFactory,
+) -> None:
+    """A put writes the channels it changed; get_tuple returns the latest
+    checkpoint, or the one named, with every channel's value."""
+    saver = PostgresCheckpointer(sessions)
+    thread = {"configurable": {"thread_id": "7", "checkpoint_ns": ""}}
+    first = saver.put(
+        thread,
+        _checkpoint(
+            {"topic": "tides", "outputs": {}}, {"topic": "1", "outputs": "1"}
+        ),
+        {"source": "input", "step": -1},
+        {"topic": "1", "outputs": "1"},
+    )
+    second = saver.put(
+        first,
+        _checkpoint(
+            {"topic": "tides", "outputs": {"a": "low"}},
+            {"topic": "1", "outputs": "2"},
+        ),
+        {"source": "loop", "step": 0},
+        {"outputs": "2"},
+    )
+    with sessions() as session:
+        blobs = session.scalars(select(CheckpointBlob.channel)).all()
+    assert sorted(blobs) == ["outputs", "outputs", "topic"]
+
+    latest = saver.get_tuple(thread)
+    assert latest.config == second
+    assert latest.parent_config == first
+    assert latest.checkpoint["channel_values"] == {
+        "topic": "tides",
+        "outputs": {"a": "low"},
+    }
+    assert latest.metadata == {"source": "loop", "step": 0}
+
+    named = saver.get_tuple(first)
+    assert named.checkpoint["channel_values"]["outputs"] == {}
+    assert named.parent_config is None
+    assert [found.config for found in saver.list(thread)] == [second, first]
+    assert saver.get_tuple({"configurable": {"thread_id": "8"}}) is None
+
+
+@pytest.mark.unit
+def test_put_writes_is_idempotent_and_errors_replace(
+    sessions: SessionFactory,
+) -> None:
+    """Node writes come back as pending writes once, in order; a new
+    error replaces the task's earlier one."""
+    saver = PostgresCheckpointer(sessions)
+    config = saver.put(
+        {"configurable": {"thread_id": "7", "checkpoint_ns": ""}},
+        _checkpoint({}, {}),
+        {"source": "input", "step": -1},
+        {},
+    )
+    writes = [("messages", [AIMessage(content="hi")]), ("outputs", {"a": "hi"})]
+    saver.put_writes(config, writes, "task-a")
+    saver.put_writes(config, writes, "task-a")
+    saver.put_writes(config, [(ERROR, "first")], "task-b")
+    saver.put_writes(config, [(ERROR, "second")], "task-b")
+    saver.put_writes(config, [], "task-c")
+
+    pending = saver.get_tuple(config).pending_writes
+    assert pending == [
+        ("task-a", "messages", [AIMessage(content="hi")]),
+        ("task-a", "outputs", {"a": "hi"}),
+        ("task-b", ERROR, "second"),
+    ]
+
+
+@pytest.mark.unit
+def test_resume_rebuilds_delta_channels_from_writes(
+    sessions: SessionFactory,
+) -> None:
+    """Delta channels store no value; resuming a failed run rebuilds them
+    from node writes and runs only the node that failed."""
+    calls: list[str] = []
+    failures = iter([True])
+
+    def research(state: GraphState) -> dict[str, Any]:
+        calls.append("research")
+        return {
+            "messages": [AIMessage(content="tides are lunar")],
+            "outputs": {"research": "tides are lunar"},
+        }
+
+    def write(state: GraphState) -> dict[str, Any]:
+        calls.append("write")
+        if next(failures, False):
+            raise RuntimeError("model unavailable")
+        text = state["messages"][-1].text
+        return {
+            "messages": [AIMessage(content=f"draft: {text}")],
+            "outputs": {"write": f"draft: {text}"},
+        }
+
+    builder = StateGraph(GraphState)
+    builder.add_node("research", research)
+    builder.add_node("write", write)
+    builder.add_edge(START, "research")
+    builder.add_edge("research", "write")
+    builder.add_edge("write", END)
+    saver = PostgresCheckpointer(sessions)
+    graph = builder.compile(checkpointer=saver)
+    config = {"configurable": {"thread_id": "7"}}
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        asyncio.run(
+            graph.ainvoke(
+                {"messages": [HumanMessage(content="why tides?")]}, config
+            )
+        )
+    with sessions() as session:
+        types = session.scalars(
+            select(CheckpointBlob.type).where(
+                CheckpointBlob.channel == "messages"
+            )
+        ).all()
+    assert set(types) == {"empty"}
+
+    state = asyncio.run(graph.ainvoke(None, config))
+    assert calls == ["research", "write", "write"]
+    assert [message.text for message in state["messages"]] == [
+        "why tides?",
+        "tides are lunar",
+        "draft: tides are lunar",
+    ]
+    assert state["outputs"] == {
+        "research": "tides are lunar",
+        "write": "draft: tides are lunar",
+    }
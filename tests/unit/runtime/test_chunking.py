@@ -0,0 +1,44 @@
+"""
+File: test_chunking.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import pytest
+
+from app.runtime.chunking import split_text
+from app.runtime.tokenizer import HeuristicTokenizer
+
+
+@pytest.mark.unit
+def test_chunks_stay_within_budget_and_keep_text_order() -> None:
+    """Paragraphs are packed greedily, large ones split on sentences."""
+    tokenizer = HeuristicTokenizer()
+    paragraphs = [
+        "Short intro.",
+        ". ".join(f"Sentence number {n} of the long part" for n in range(40)),
+        "Closing words.",
+    ]
+    chunks = split_text("\n\n".join(paragraphs), tokenizer, max_tokens=50)
+    assert len(chunks) > 3
+    assert all(tokenizer.count(chunk) <= 50 for chunk in chunks)
+    assert chunks[0].startswith("Short intro.")
+    assert chunks[-1].endswith("Closing words.")
+    words = " ".join(chunks).replace(".", "").split()
+    assert words == " ".join(paragraphs).replace(".", "").split()
+
+
+@pytest.mark.unit
+def test_text_without_separators_is_cut_by_length() -> None:
+    """A run with no boundaries is cut into bounded slices, losslessly."""
+    tokenizer = HeuristicTokenizer()
+    text = "x" * 1000
+    chunks = split_text(text, tokenizer, max_tokens=30)
+    assert "".join(chunks) == text
+    assert all(tokenizer.count(chunk) <= 30 for chunk in chunks)
+    assert split_text("  \n\n ", tokenizer, max_tokens=30) == []
+    with pytest.raises(ValueError, match="max_tokens"):
+        split_text(text, tokenizer, max_tokens=0)
@@ -0,0 +1,246 @@
+"""
+File: test_circuit_breaker.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import BaseMessage, ToolMessage
+import pytest
+
+from app.runtime.circuit_breaker import (
+    BreakerPolicy,
+    BreakerState,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    ToolBreakerMiddleware,
+    is_transient,
+)
+from app.runtime.fake_chat_model import FakeChatModel
+from app.runtime.model_fallback import (
+    ModelFallbackMiddleware,
+    ModelLatencyTracker,
+)
+
+
+class _Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _BrokenModel(FakeChatModel):
+    """Fake model whose provider is down; counts its calls."""
+
+    calls: int = 0
+
+    async def _agenerate(
+        self, messages: list[BaseMessage], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Fail every call."""
+        self.calls += 1
+        raise ConnectionError("provider down")
+
+
+def _fail(breaker: CircuitBreaker, times: int) -> None:
+    """Record `times` failed calls through the breaker."""
+    for _ in range(times):
+        with pytest.raises(ConnectionError), breaker.guard():
+            raise ConnectionError("down")
+
+
+@pytest.mark.unit
+def test_opens_on_error_rate_and_recovers_through_half_open() -> None:
+    """Closed -> open -> half-open -> open -> half-open -> closed."""
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "model:openai",
+        BreakerPolicy(window=4, min_calls=4, error_rate=0.5, open_seconds=10),
+        clock,
+    )
+    breaker.record(True, 0.1)
+    breaker.record(True, 0.1)
+    _fail(breaker, 1)
+    assert breaker.state == BreakerState.CLOSED
+    _fail(breaker, 1)
+    assert breaker.state == BreakerState.OPEN
+
+    clock.now = 4.0
+    with pytest.raises(CircuitOpenError) as err:
+        breaker.acquire()
+    assert err.value.retry_after == pytest.approx(6.0)
+
+    clock.now = 10.0
+    assert breaker.state == BreakerState.HALF_OPEN
+    breaker.acquire()
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()  # the single trial slot is taken
+    breaker.record(False, 0.1)
+    assert breaker.state == BreakerState.OPEN
+
+    clock.now = 20.0
+    with breaker.guard():
+        pass
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == "closed"
+    assert snapshot["calls"] == 0
+    assert snapshot["opened"] == 2
+    assert snapshot["rejected"] == 2
+
+
+@pytest.mark.unit
+def test_slow_calls_open_the_breaker_and_cancellations_do_not() -> None:
+    """Slow calls count against the latency threshold; cancellations free
+    the trial slot without an outcome."""
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "tool:search",
+        BreakerPolicy(min_calls=2, slow_call=1.0, slow_rate=1.0),
+        clock,
+    )
+    breaker.record(True, 2.0)
+    breaker.record(True, 2.0)
+    assert breaker.state == BreakerState.OPEN
+
+    clock.now = 30.0
+    with pytest.raises(asyncio.CancelledError), breaker.guard():
+        raise asyncio.CancelledError
+    assert breaker.state == BreakerState.HALF_OPEN
+    breaker.acquire()  # the cancelled trial gave its slot back
+
+
+class _HTTPError(Exception):
+    """Provider client error carrying an HTTP status."""
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.mark.unit
+def test_client_errors_do_not_trip_the_breaker() -> None:
+    """4xx answers count as calls the backend served; 429 and 5xx are
+    failures."""
+    breaker = CircuitBreaker("model:openai", BreakerPolicy(min_calls=2))
+    for status in (400, 401, 404, 422):
+        with pytest.raises(_HTTPError, match=str(status)), breaker.guard():
+            raise _HTTPError(status)
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.snapshot()["failures"] == 0
+
+    for status in (429, 503, 500, 502):
+        with pytest.raises(_HTTPError, match=str(status)), breaker.guard():
+            raise _HTTPError(status)
+    assert breaker.state == BreakerState.OPEN
+    assert is_transient(TimeoutError())
+    assert not is_transient(ValueError("bad tool arguments"))
+
+
+@pytest.mark.unit
+def test_open_provider_is_skipped_and_a_closed_chain_fails_fast() -> None:
+    """An open provider fails over at once; with every provider open the
+    call raises CircuitOpenError without reaching a model."""
+    breakers = CircuitBreakerRegistry(BreakerPolicy(min_calls=2))
+    broken = _BrokenModel()
+    agent = create_agent(
+        model=broken,
+        middleware=[
+            ModelFallbackMiddleware(
+                "openai:gpt-4o",
+                [("anthropic:claude", FakeChatModel(response="backup"))],
+                ModelLatencyTracker(),
+                breakers=breakers,
+            )
+        ],
+    )
+
+    def run() -> str:
+        state = asyncio.run(
+            agent.ainvoke({"messages": [{"role": "user", "content": "hi"}]})
+        )
+        return state["messages"][-1].text
+
+    assert [run(), run(), run()] == ["backup"] * 3
+    assert broken.calls == 2
+    snapshot = breakers.snapshot()
+    assert snapshot["model:openai"]["state"] == "open"
+    assert snapshot["model:anthropic"]["state"] == "closed"
+
+    breakers.model("anthropic:claude").reset()
+    for _ in range(2):
+        breakers.model("anthropic:claude").record(False, 0.1)
+    with pytest.raises(CircuitOpenError):
+        run()
+    assert broken.calls == 2
+    assert breakers.stats()["tripped"] == ["model:anthropic", "model:openai"]
+
+
+@pytest.mark.unit
+def test_tool_breaker_answers_with_an_error_while_open() -> None:
+    """Error tool messages trip the tool's breaker; the next call gets an
+    error message without running the tool."""
+    breakers = CircuitBreakerRegistry(
+        overrides={"tool": BreakerPolicy(min_calls=1)}
+    )
+    middleware = ToolBreakerMiddleware(breakers)
+    request = SimpleNamespace(
+        tool_call={"name": "search", "args": {}, "id": "call-1"}
+    )
+    calls = 0
+
+    def handler(request: Any) -> ToolMessage:
+        nonlocal calls
+        calls += 1
+        return ToolMessage(
+            content="boom", tool_call_id="call-1", status="error"
+        )
+
+    assert middleware.wrap_tool_call(request, handler).content == "boom"
+    refused = middleware.wrap_tool_call(request, handler)
+    assert refused.status == "error"
+    assert "unavailable" in refused.content
+    assert calls == 1
+    assert breakers.snapshot()["tool:search"]["state"] == "open"
+
+
+@tool
+def add(a: int, b: int) -> int:
+    """Add two integers."""
+    return a + b
+
+
+@pytest.mark.unit
+def test_invalid_tool_arguments_do_not_trip_the_breaker() -> None:
+    """Calls rejected for invalid model arguments count as served."""
+    breakers = CircuitBreakerRegistry(
+        overrides={"tool": BreakerPolicy(min_calls=2)}
+    )
+    agent = create_agent(
+        model=FakeChatModel(
+            mode="tool-caller",
+            latency_ms=0,
+            tool_calls=[{"name": "add", "args": {"a": "x"}}],
+        ),
+        tools=[add],
+        middleware=[ToolBreakerMiddleware(breakers)],
+    )
+    for _ in range(2):
+        state = agent.invoke({"messages": [{"role": "user", "content": "hi"}]})
+        assert state["messages"][2].status == "error"
+    snapshot = breakers.snapshot()["tool:add"]
+    assert snapshot["state"] == "closed"
+    assert snapshot["calls"] == 2
+    assert snapshot["failures"] == 0
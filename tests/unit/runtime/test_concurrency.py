@@ -0,0 +1,133 @@
+"""
+File: test_concurrency.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+
+import pytest
+
+from app.runtime.concurrency import ConcurrencyLimiter, QueueFullError
+from app.runtime.stats import LatencyWindow
+
+
+def _limiter(**overrides: object) -> ConcurrencyLimiter:
+    """Limiter with small limits for tests."""
+    params: dict = {
+        "max_concurrency": 2,
+        "default_model_concurrency": 1,
+        "max_queue_size": 10,
+        "queue_timeout": 1.0,
+    }
+    params.update(overrides)
+    return ConcurrencyLimiter(**params)
+
+
+@pytest.mark.unit
+def test_per_model_limit_serializes_runs() -> None:
+    """Runs of the same model never exceed the per-model limit."""
+    limiter = _limiter()
+    active = 0
+    peak = 0
+
+    async def run() -> None:
+        nonlocal active, peak
+        async with limiter.acquire("m"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def main() -> None:
+        await asyncio.gather(*(run() for _ in range(4)))
+
+    asyncio.run(main())
+    assert peak == 1
+    assert limiter.stats()["wait_time"]["count"] == 4
+
+
+@pytest.mark.unit
+def test_global_limit_caps_all_models() -> None:
+    """Different models share the global limit."""
+    limiter = _limiter(default_model_concurrency=5)
+    active = 0
+    peak = 0
+
+    async def run(model: str) -> None:
+        nonlocal active, peak
+        async with limiter.acquire(model):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def main() -> None:
+        await asyncio.gather(*(run(f"m{i}") for i in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+
+
+@pytest.mark.unit
+def test_full_queue_rejects_with_retry_after() -> None:
+    """When max_queue_size runs are waiting, new runs are rejected."""
+    limiter = _limiter(max_queue_size=1)
+
+    async def hold(release: asyncio.Event) -> None:
+        async with limiter.acquire("m"):
+            await release.wait()
+
+    async def main() -> QueueFullError:
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(release))
+        waiter = asyncio.create_task(hold(release))
+        await asyncio.sleep(0.01)
+        assert limiter.stats()["queue_depth"] == 1
+        with pytest.raises(QueueFullError) as exc_info:
+            async with limiter.acquire("m"):
+                pass
+        release.set()
+        await asyncio.gather(holder, waiter)
+        return exc_info.value
+
+    err = asyncio.run(main())
+    assert err.retry_after >= 1
+    assert limiter.stats()["rejected"] == 1
+    assert limiter.stats()["queue_depth"] == 0
+
+
+@pytest.mark.unit
+def test_queue_timeout_raises_and_releases() -> None:
+    """A run waiting longer than queue_timeout fails and leaves the queue."""
+    limiter = _limiter(queue_timeout=0.02)
+
+    async def main() -> None:
+        async with limiter.acquire("m"):
+            with pytest.raises(QueueFullError, match="Timed out"):
+                async with limiter.acquire("m"):
+                    pass
+        # The slot is free again after the holder exits.
+        async with limiter.acquire("m"):
+            pass
+
+    asyncio.run(main())
+    stats = limiter.stats()
+    assert stats["timed_out"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["models"]["m"]["limit"] == 1
+
+
+@pytest.mark.unit
+def test_latency_window_percentiles() -> None:
+    """LatencyWindow reports nearest-rank percentiles over the window."""
+    window = LatencyWindow(size=100)
+    assert window.percentile(50) is None
+    for value in range(1, 101):
+        window.add(float(value))
+    assert window.percentile(50) == pytest.approx(50)
+    assert window.percentile(95) == pytest.approx(95)
+    assert window.snapshot()["max"] == pytest.approx(100)
@@ -0,0 +1,95 @@
+"""
+File: test_context_window.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage, HumanMessage
+import pytest
+
+from app.runtime.context_window import (
+    ContextPolicy,
+    ContextStrategy,
+    clip_summary,
+    estimate_tokens,
+    to_chat_messages,
+)
+
+
+def _history(turns: int, tokens: int = 10) -> list[SimpleNamespace]:
+    """`turns` user/assistant pairs of `tokens` tokens each."""
+    return [
+        SimpleNamespace(
+            seq=seq,
+            role="user" if seq % 2 else "assistant",
+            content=f"m{seq}",
+            token_count=tokens,
+        )
+        for seq in range(1, turns * 2 + 1)
+    ]
+
+
+@pytest.mark.unit
+def test_last_n_keeps_newest_and_starts_with_user() -> None:
+    """Odd limits drop the leading assistant message."""
+    policy = ContextPolicy(strategy=ContextStrategy.LAST_N, max_messages=5)
+    window = policy.select(_history(10), input_tokens=5)
+    assert [m.seq for m in window.messages] == [17, 18, 19, 20]
+    assert window.evicted[-1].seq == 16
+    assert window.tokens == 45
+
+
+@pytest.mark.unit
+def test_token_budget_bounds_input_however_long_the_history() -> None:
+    """Kept history plus input never exceeds max_tokens."""
+    policy = ContextPolicy(max_messages=1000, max_tokens=100)
+    for turns in (1, 10, 500):
+        window = policy.select(_history(turns), input_tokens=25)
+        assert window.tokens <= 100
+        assert len(window.messages) == min(turns * 2, 6)
+
+
+@pytest.mark.unit
+def test_summary_strategy_evicts_down_to_half_the_window() -> None:
+    """Eviction leaves room for several turns before the next summary."""
+    policy = ContextPolicy(
+        strategy=ContextStrategy.SUMMARY, max_messages=8, max_tokens=1000
+    )
+    assert policy.select(_history(4), input_tokens=5).evicted == []
+    window = policy.select(_history(5), input_tokens=5, summary_tokens=50)
+    assert [m.seq for m in window.messages] == [7, 8, 9, 10]
+    assert [m.seq for m in window.evicted] == [1, 2, 3, 4, 5, 6]
+    assert window.tokens == 95
+
+
+@pytest.mark.unit
+def test_from_config_overrides_defaults_and_rejects_bad_values() -> None:
+    """A strategy name or a dict overrides the defaults."""
+    defaults = ContextPolicy()
+    assert ContextPolicy.from_config(None, defaults) is defaults
+    policy = ContextPolicy.from_config("last_n", defaults)
+    assert policy.strategy == ContextStrategy.LAST_N
+    assert policy.max_tokens == defaults.max_tokens
+    policy = ContextPolicy.from_config(
+        {"strategy": "summary", "max_messages": 6}, defaults
+    )
+    assert (policy.strategy, policy.max_messages) == ("summary", 6)
+    with pytest.raises(ValueError, match="not a valid"):
+        ContextPolicy.from_config("everything", defaults)
+    with pytest.raises(ValueError, match="positive"):
+        ContextPolicy.from_config({"max_tokens": 0}, defaults)
+
+
+@pytest.mark.unit
+def test_chat_messages_and_summary_clipping() -> None:
+    """The summary opens the history; clipping respects the token cap."""
+    chat = to_chat_messages(_history(1), summary="earlier")
+    assert isinstance(chat[0], HumanMessage)
+    assert chat[0].content.endswith("earlier")
+    assert [type(m) for m in chat[1:]] == [HumanMessage, AIMessage]
+    assert estimate_tokens(clip_summary("word " * 1000, 50)) <= 50
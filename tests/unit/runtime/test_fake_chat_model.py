@@ -0,0 +1,84 @@
+"""
+File: test_fake_chat_model.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import ToolMessage
+import pytest
+
+from app.runtime.fake_chat_model import FakeChatModel, build_chat_model
+
+
+@tool
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+@pytest.mark.unit
+def test_seeded_latency_is_reproducible() -> None:
+    """Same seed, same draws; draws stay in the uniform range."""
+    options = {
+        "latency_ms": 50,
+        "latency_jitter_ms": 20,
+        "latency_distribution": "uniform",
+        "seed": 7,
+    }
+    first = FakeChatModel(**options)
+    second = FakeChatModel(**options)
+    draws = [first.first_token_delay() for _ in range(20)]
+    assert draws == [second.first_token_delay() for _ in range(20)]
+    assert all(0.03 <= delay <= 0.07 for delay in draws)
+    assert len(set(draws)) > 1
+
+
+@pytest.mark.unit
+def test_echo_replies_with_usage() -> None:
+    """fake:echo echoes the user message and reports token usage."""
+    model = build_chat_model("fake:echo", latency_ms=0)
+    reply = asyncio.run(model.ainvoke("hello there"))
+    assert reply.text == "echo: hello there"
+    assert reply.usage_metadata["output_tokens"] == 5
+
+
+@pytest.mark.unit
+def test_echo_streams_word_chunks() -> None:
+    """Streaming yields one chunk per word that join to the reply."""
+    model = build_chat_model("fake:echo", latency_ms=0)
+
+    async def collect() -> list[str]:
+        return [chunk.text async for chunk in model.astream("a b c")]
+
+    assert asyncio.run(collect()) == ["echo:", " a", " b", " c"]
+
+
+@pytest.mark.unit
+def test_tool_caller_runs_scripted_tools() -> None:
+    """fake:tool-caller calls its scripted tools, then answers."""
+    model = build_chat_model(
+        "fake:tool-caller",
+        latency_ms=0,
+        tool_calls=[{"name": "add", "args": {"a": 2, "b": 3}}],
+    )
+    agent = create_agent(model=model, tools=[add], system_prompt="Add.")
+    state = asyncio.run(
+        agent.ainvoke({"messages": [{"role": "user", "content": "sum"}]})
+    )
+    tool_messages = [m for m in state["messages"] if isinstance(m, ToolMessage)]
+    assert [m.text for m in tool_messages] == ["5"]
+    assert state["messages"][-1].text == "tool results: 5"
+
+
+@pytest.mark.unit
+def test_build_chat_model_rejects_fake_without_mode() -> None:
+    """A bare `fake:` id is an error, not a provider lookup."""
+    with pytest.raises(ValueError, match="fake:<mode>"):
+        build_chat_model("fake:")
@@ -0,0 +1,108 @@
+"""
+File: test_model_fallback.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+from langchain.agents import create_agent
+from langchain_core.messages import BaseMessage
+import pytest
+
+from app.runtime.fake_chat_model import FakeChatModel
+from app.runtime.model_fallback import (
+    FallbackPolicy,
+    ModelFallbackMiddleware,
+    ModelLatencyTracker,
+)
+
+
+class _BrokenModel(FakeChatModel):
+    """Fake model whose provider is down."""
+
+    async def _agenerate(
+        self, messages: list[BaseMessage], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Fail every call."""
+        raise ConnectionError("provider down")
+
+
+def _answer(
+    primary: FakeChatModel,
+    fallbacks: list[tuple[str, FakeChatModel]],
+    tracker: ModelLatencyTracker,
+    policy: FallbackPolicy | None = None,
+) -> tuple[str, float]:
+    """Reply text of one run and how long it took."""
+    agent = create_agent(
+        model=primary,
+        middleware=[
+            ModelFallbackMiddleware("fake:primary", fallbacks, tracker, policy)
+        ],
+    )
+    started = time.perf_counter()
+    state = asyncio.run(
+        agent.ainvoke({"messages": [{"role": "user", "content": "hi"}]})
+    )
+    return state["messages"][-1].text, time.perf_counter() - started
+
+
+@pytest.mark.unit
+def test_fails_over_on_errors_and_timeouts() -> None:
+    """An error or an attempt timeout moves on to the next model."""
+    tracker = ModelLatencyTracker()
+    backup = ("fake:backup", FakeChatModel(latency_ms=0, response="backup"))
+
+    text, _ = _answer(_BrokenModel(), [backup], tracker)
+    assert text == "backup"
+
+    slow = FakeChatModel(latency_ms=1000, response="primary")
+    text, elapsed = _answer(
+        slow, [backup], tracker, FallbackPolicy(timeout=0.05)
+    )
+    assert text == "backup"
+    assert elapsed < 0.5
+    stats = tracker.stats()
+    assert stats["fallbacks"] == 2
+    assert stats["models"]["fake:backup"]["count"] == 2
+
+    with pytest.raises(ConnectionError):
+        _answer(_BrokenModel(), [("fake:b", _BrokenModel())], tracker)
+
+
+@pytest.mark.unit
+def test_hedges_calls_slower_than_the_rolling_p95() -> None:
+    """A call past its model's p95 races a second request, which wins."""
+    tracker = ModelLatencyTracker(min_samples=20)
+    for _ in range(20):
+        tracker.record("fake:primary", 0.02)
+    slow = FakeChatModel(latency_ms=1000, response="primary")
+    backup = ("fake:backup", FakeChatModel(latency_ms=10, response="backup"))
+
+    text, elapsed = _answer(slow, [backup], tracker, FallbackPolicy(hedge=True))
+    assert text == "backup"
+    assert elapsed < 0.5
+    stats = tracker.stats()
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+    # The cancelled loser still counts towards the primary's tail.
+    assert stats["models"]["fake:primary"]["count"] == 21
+    assert stats["models"]["fake:primary"]["max"] >= 0.02
+
+
+@pytest.mark.unit
+def test_no_hedge_without_enough_samples() -> None:
+    """A model with too few samples has no known tail and is not hedged."""
+    tracker = ModelLatencyTracker(min_samples=20)
+    primary = FakeChatModel(latency_ms=50, response="primary")
+    backup = ("fake:backup", FakeChatModel(latency_ms=0, response="backup"))
+    text, _ = _answer(primary, [backup], tracker, FallbackPolicy(hedge=True))
+    assert text == "primary"
+    assert tracker.stats()["hedges"] == 0
+    assert tracker.hedge_delay("fake:primary", 95) is None
@@ -0,0 +1,135 @@
+"""
+File: test_model_registry.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from typing import Any
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+import pytest
+
+from app.runtime.model_registry import ModelRegistry, parse_model
+
+
+class _Builder:
+    """Records init_chat_model calls and returns fake models."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    def __call__(self, model: str, **kwargs: Any) -> FakeListChatModel:
+        self.calls.append((model, kwargs))
+        return FakeListChatModel(responses=["ok"])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 handler answering 200."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    """Local HTTP server URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+def test_parse_model() -> None:
+    """Provider prefix is split off; bare names have no provider."""
+    assert parse_model("openai:gpt-4o") == ("openai", "gpt-4o")
+    assert parse_model("gpt-4o") == ("", "gpt-4o")
+
+
+@pytest.mark.unit
+def test_same_model_and_options_share_one_client() -> None:
+    """Clients are keyed by provider, model and options."""
+    builder = _Builder()
+    registry = ModelRegistry(builder=builder)
+    first = registry.get("anthropic:claude", {"temperature": 0})
+    assert registry.get("anthropic:claude", {"temperature": 0}) is first
+    assert registry.get("anthropic:claude", {"temperature": 1}) is not first
+    assert registry.get("anthropic:claude", {"api_key": "k2"}) is not first
+    stats = registry.stats()
+    assert stats["created"] == 3
+    assert stats["reused"] == 1
+    assert stats["pools"] == {}
+
+
+@pytest.mark.unit
+def test_httpx_providers_share_one_pool() -> None:
+    """OpenAI models get the provider's shared httpx clients injected."""
+    builder = _Builder()
+    registry = ModelRegistry(builder=builder)
+    registry.get("openai:gpt-4o")
+    registry.get("openai:gpt-4o-mini")
+    (_, first), (_, second) = builder.calls
+    assert first["http_client"] is second["http_client"]
+    assert first["http_async_client"] is second["http_async_client"]
+    asyncio.run(registry.aclose())
+    assert first["http_client"].is_closed
+    assert first["http_async_client"].is_closed
+    assert registry.stats()["clients"] == 0
+
+
+@pytest.mark.unit
+def test_pool_reports_connection_reuse(server_url: str) -> None:
+    """Requests on a kept-alive connection are counted as reused."""
+    builder = _Builder()
+    registry = ModelRegistry(builder=builder)
+    registry.get("openai:gpt-4o")
+    client = builder.calls[0][1]["http_client"]
+    for _ in range(3):
+        assert client.get(server_url).status_code == 200
+    assert registry.stats()["pools"]["openai"] == {
+        "requests": 3,
+        "connections_opened": 1,
+        "connections_reused": 2,
+    }
+    asyncio.run(registry.aclose())
+
+
+@pytest.mark.unit
+def test_context_limit_is_resolved_once_per_model() -> None:
+    """Overrides win, then the profile, then the default; all cached."""
+
+    def build(model: str, **kwargs: Any) -> FakeListChatModel:
+        chat = FakeListChatModel(responses=["ok"])
+        if model == "p:profiled":
+            chat.profile = {"max_input_tokens": 32000}
+        return chat
+
+    registry = ModelRegistry(
+        builder=build,
+        context_limits={"p:override": 1000},
+        default_context_limit=8000,
+    )
+    assert registry.context_limit("p:override") == 1000
+    assert registry.context_limit("p:profiled") == 32000
+    assert registry.context_limit("p:plain") == 8000
+    assert registry.stats()["clients"] == 2
+    registry.context_limit("p:profiled")
+    assert registry.stats()["reused"] == 0
+    assert registry.stats()["context_limits"]["p:plain"] == 8000
@@ -0,0 +1,105 @@
+"""
+File: test_preflight.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage, HumanMessage
+import pytest
+
+from app.runtime.preflight import (
+    ContextWindowExceededError,
+    Preflight,
+    PreflightMode,
+)
+from app.runtime.tokenizer import (
+    HeuristicTokenizer,
+    TiktokenTokenizer,
+    build_tokenizer,
+)
+
+# 100 tokens of context: 4 for the system prompt ("Echo."), 4 overhead
+# and 12 reserved for the reply leave 80 for the input.
+CONFIG = {
+    "model": "fake",
+    "system_prompt": "Echo.",
+    "model_options": {"max_tokens": 12},
+}
+
+
+def _preflight(mode: PreflightMode = PreflightMode.REJECT) -> Preflight:
+    """Preflight over a 100-token model."""
+    return Preflight(HeuristicTokenizer(), lambda model, options: 100, mode)
+
+
+@pytest.mark.unit
+def test_budget_counts_each_system_prompt_once() -> None:
+    """The system prompt is counted on first use, then read from memory."""
+    tokenizer = MagicMock(wraps=HeuristicTokenizer())
+    preflight = Preflight(tokenizer, lambda model, options: 100)
+    assert preflight.budget(CONFIG) == 82
+    assert preflight.budget(CONFIG) == 82
+    tokenizer.count.assert_called_once_with("Echo.")
+    assert preflight.budget({"model": "fake"}) == 100 - 4 - 1024
+
+
+@pytest.mark.unit
+def test_oversized_input_is_rejected_before_the_call() -> None:
+    """Rejection names the size and the budget; fitting input passes."""
+    preflight = _preflight()
+    assert preflight.check(CONFIG, "short") == "short"
+    with pytest.raises(ContextWindowExceededError, match="82 tokens"):
+        preflight.check(CONFIG, "x" * 400)
+    assert preflight.stats()["rejected"] == 1
+
+
+@pytest.mark.unit
+def test_truncate_cuts_text_and_drops_oldest_messages() -> None:
+    """Strings keep their start; histories lose their oldest messages."""
+    preflight = _preflight()
+    config: dict[str, Any] = {**CONFIG, "preflight": "truncate"}
+    text = preflight.check(config, "y" * 400)
+    assert isinstance(text, str)
+    assert text == "y" * len(text)
+    assert preflight.tokenizer.count(text) <= 78
+
+    history = [
+        HumanMessage(content="a" * 200),
+        AIMessage(content="b" * 120),
+        HumanMessage(content="c" * 100),
+    ]
+    kept = preflight.check(config, history)
+    assert [m.content[0] for m in kept] == ["b", "c"]
+    kept = preflight.check(config, [HumanMessage(content="d" * 1000)])
+    assert preflight.tokenizer.count(kept[0].content) <= 78
+    assert preflight.stats()["truncated"] == 3
+
+
+@pytest.mark.unit
+def test_mode_off_and_unknown_modes() -> None:
+    """Agents can opt out; unknown modes are config errors."""
+    preflight = _preflight()
+    off = {**CONFIG, "preflight": "off"}
+    assert preflight.check(off, "z" * 4000) == "z" * 4000
+    with pytest.raises(ValueError, match="not a valid"):
+        preflight.check({**CONFIG, "preflight": "maybe"}, "hi")
+
+
+@pytest.mark.unit
+def test_exact_tokenizer_falls_back_to_heuristic() -> None:
+    """A missing tokenizer package never breaks startup."""
+    tokenizer = build_tokenizer("tiktoken:o200k_base")
+    try:
+        TiktokenTokenizer("o200k_base")
+    except ImportError:
+        assert isinstance(tokenizer, HeuristicTokenizer)
+    else:
+        assert tokenizer.name == "tiktoken:o200k_base"
+    assert isinstance(build_tokenizer("nope"), HeuristicTokenizer)
+    assert HeuristicTokenizer().count("abcdefgh") == 2
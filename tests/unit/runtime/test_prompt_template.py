@@ -0,0 +1,83 @@
+"""
+File: test_prompt_template.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.runtime.prompt_template import (
+    PromptTemplate,
+    PromptTemplateCache,
+    TemplateError,
+)
+
+NOW = datetime.now(UTC)
+
+
+@pytest.mark.unit
+def test_compile_and_render() -> None:
+    """Placeholders are filled; doubled braces stay literal."""
+    template = PromptTemplate.compile(
+        "Hi {name}, {{json}} about {topic} for {name}.", ["name", "topic"]
+    )
+    assert template.variables == {"name", "topic"}
+    assert (
+        template.render({"name": "Ada", "topic": 42})
+        == "Hi Ada, {json} about 42 for Ada."
+    )
+    assert PromptTemplate.compile("static", None).render({}) == "static"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("content", "variables", "match"),
+    [
+        ("Hi {name}", [], "undeclared variables \\['name'\\]"),
+        ("Hi", ["name"], "unused variables \\['name'\\]"),
+        ("Hi {user.name}", ["user"], "Invalid placeholder"),
+        ("Hi {name!r}", ["name"], "Invalid placeholder"),
+        ("Hi {name", ["name"], "Invalid template"),
+    ],
+)
+def test_compile_rejects_mismatched_templates(
+    content: str, variables: list[str], match: str
+) -> None:
+    """Content must use exactly the declared, plain variables."""
+    with pytest.raises(TemplateError, match=match):
+        PromptTemplate.compile(content, variables)
+
+
+@pytest.mark.unit
+def test_render_requires_exactly_the_variables() -> None:
+    """Missing and unknown variables are both errors."""
+    template = PromptTemplate.compile("{a} {b}", ["a", "b"])
+    with pytest.raises(TemplateError, match="missing variables \\['b'\\]"):
+        template.render({"a": 1})
+    with pytest.raises(TemplateError, match="unknown variables \\['c'\\]"):
+        template.render({"a": 1, "b": 2, "c": 3})
+
+
+@pytest.mark.unit
+def test_cache_keys_by_id_and_updated_at() -> None:
+    """The same version is compiled once; an update recompiles."""
+    cache = PromptTemplateCache(max_entries=8)
+    prompt = SimpleNamespace(
+        id=1, content="Hi {name}", variables=["name"], updated_at=NOW
+    )
+    first = cache.get(prompt)
+    assert cache.get(prompt) is first
+    prompt.content, prompt.updated_at = "Bye {name}", NOW + timedelta(1)
+    assert cache.get(prompt).render({"name": "Ada"}) == "Bye Ada"
+    assert cache.stats() == {
+        "compiled": 2,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+    }
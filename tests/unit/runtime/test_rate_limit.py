@@ -0,0 +1,115 @@
+"""
+File: test_rate_limit.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+
+import pytest
+
+from app.runtime.rate_limit import (
+    MemoryBucketStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceededError,
+    RateLimitScope,
+)
+
+
+class _Clock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start at t=1000."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Current time."""
+        return self.now
+
+
+def _limiter(
+    clock: _Clock, overrides: dict[str, RateLimit] | None = None
+) -> RateLimiter:
+    """Limiter with small per-minute limits for tests."""
+    return RateLimiter(
+        MemoryBucketStore(),
+        defaults={
+            RateLimitScope.USER: RateLimit(rpm=2, tpm=600),
+            RateLimitScope.AGENT: RateLimit(rpm=10, tpm=6000),
+            RateLimitScope.MODEL: RateLimit(rpm=10, tpm=6000),
+        },
+        overrides=overrides,
+        clock=clock,
+    )
+
+
+@pytest.mark.unit
+def test_bucket_refills_and_reports_retry_after() -> None:
+    """A drained bucket rejects with the exact time to refill one request."""
+    clock = _Clock()
+    limiter = _limiter(clock)
+
+    async def main() -> None:
+        await limiter.check_caller("alice")
+        await limiter.check_caller("alice")
+        with pytest.raises(RateLimitExceededError) as exc:
+            await limiter.check_caller("alice")
+        # 2 rpm refills one request every 30 seconds.
+        assert exc.value.key == "user:alice:requests"
+        assert exc.value.retry_after == pytest.approx(30.0)
+        clock.now += 20
+        with pytest.raises(RateLimitExceededError) as exc:
+            await limiter.check_caller("alice")
+        assert exc.value.retry_after == pytest.approx(10.0)
+        clock.now += 10
+        await limiter.check_caller("alice")
+        await limiter.check_caller("bob")
+
+    asyncio.run(main())
+    assert limiter.stats()["rejected"] == {"user": 2}
+
+
+@pytest.mark.unit
+def test_rejected_run_refunds_other_buckets() -> None:
+    """A run rejected by one bucket takes nothing from the others."""
+    clock = _Clock()
+    limiter = _limiter(clock)
+
+    async def main() -> None:
+        await limiter.check_run("alice", 1, "fake:echo", 500)
+        with pytest.raises(RateLimitExceededError) as exc:
+            await limiter.check_run("alice", 1, "fake:echo", 500)
+        # 600 tpm: 100 left, 400 more refill at 10 tokens a second.
+        assert exc.value.key == "user:alice:tokens"
+        assert exc.value.retry_after == pytest.approx(40.0)
+        # The agent and model buckets were refunded: 5500 tokens left.
+        await limiter.check_run("bob", 1, "fake:echo", 5500)
+
+    asyncio.run(main())
+
+
+@pytest.mark.unit
+def test_overrides_and_oversized_costs() -> None:
+    """Overrides replace scope defaults; costs are capped at capacity."""
+    clock = _Clock()
+    limiter = _limiter(clock, {"user:vip": RateLimit(rpm=0, tpm=0)})
+
+    async def main() -> None:
+        for _ in range(5):
+            await limiter.check_caller("vip")
+        # A run larger than the whole bucket is admitted once it is full.
+        await limiter.check_run("alice", 2, "fake:other", 10**6)
+        with pytest.raises(RateLimitExceededError) as exc:
+            await limiter.check_run("alice", 2, "fake:other", 1)
+        # Every token bucket was drained; the 600 tpm user refills slowest.
+        assert exc.value.key == "user:alice:tokens"
+        assert exc.value.retry_after == pytest.approx(0.1)
+
+    asyncio.run(main())
+    assert limiter.limit(RateLimitScope.USER, "vip") == RateLimit(0, 0)
+    assert limiter.limit(RateLimitScope.USER, "alice").rpm == 2
@@ -0,0 +1,160 @@
+"""
+File: test_response_cache.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+from langchain.agents import create_agent
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+import pytest
+
+from app.runtime.response_cache import (
+    ResponseCache,
+    ResponseCacheMiddleware,
+)
+from app.runtime.ttl_cache import TTLCache
+
+
+class _CountingModel(BaseChatModel):
+    """Echoes the last message and counts calls."""
+
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+    def _generate(
+        self, messages: list[BaseMessage], *args: Any, **kwargs: Any
+    ) -> ChatResult:
+        self.calls += 1
+        reply = AIMessage(content=f"echo: {messages[-1].text}")
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+
+class _FakeStore:
+    """Dict-backed stand-in for the Postgres tier."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.purges = 0
+
+    def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    def set(self, key: str, value: Any, ttl: float | None) -> None:
+        self.data[key] = (value, ttl)
+
+    def purge_expired(self) -> int:
+        self.purges += 1
+        return 1
+
+
+def _agent(model: _CountingModel, cache: ResponseCache, prompt: str) -> Any:
+    """Agent with the cache middleware."""
+    return create_agent(
+        model=model,
+        system_prompt=prompt,
+        middleware=[ResponseCacheMiddleware(cache, "Echo", "counting")],
+    )
+
+
+def _input(text: str) -> dict[str, Any]:
+    return {"messages": [{"role": "user", "content": text}]}
+
+
+@pytest.mark.unit
+def test_ttl_cache_evicts_lru_and_expires() -> None:
+    """Least recently used entries are evicted; expired entries vanish."""
+    cache: TTLCache[int] = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+    cache.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+
+
+@pytest.mark.unit
+def test_repeated_request_skips_model() -> None:
+    """The second identical request is served from the cache."""
+    model = _CountingModel()
+    cache = ResponseCache(TTLCache(10))
+    agent = _agent(model, cache, "Echo.")
+    first = agent.invoke(_input("hi"))
+    second = asyncio.run(agent.ainvoke(_input("hi")))
+    assert model.calls == 1
+    assert second["messages"][-1].text == first["messages"][-1].text
+    stats = cache.stats()
+    assert stats["hits"]["memory"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.5)
+    assert stats["agents"]["Echo"] == {"miss": 1, "memory": 1}
+
+
+@pytest.mark.unit
+def test_key_covers_prompt_and_input() -> None:
+    """Different inputs or system prompts miss the cache."""
+    model = _CountingModel()
+    cache = ResponseCache(TTLCache(10))
+    _agent(model, cache, "Echo.").invoke(_input("hi"))
+    _agent(model, cache, "Echo.").invoke(_input("bye"))
+    _agent(model, cache, "Shout.").invoke(_input("hi"))
+    assert model.calls == 3
+
+
+@pytest.mark.unit
+def test_store_tier_serves_other_processes() -> None:
+    """A miss in memory falls back to the shared store."""
+    model = _CountingModel()
+    store = _FakeStore()
+    _agent(model, ResponseCache(TTLCache(10), store), "Echo.").invoke(
+        _input("hi")
+    )
+    other = ResponseCache(TTLCache(10), store)
+    _agent(model, other, "Echo.").invoke(_input("hi"))
+    assert model.calls == 1
+    assert other.stats()["hits"]["db"] == 1
+
+
+@pytest.mark.unit
+def test_store_hit_expires_from_memory_with_the_row() -> None:
+    """A value copied from the store keeps the row's remaining TTL."""
+    store = _FakeStore()
+    store.set("k", {"messages": []}, ttl=0.01)
+    cache = ResponseCache(TTLCache(10), store)
+    assert cache.lookup("k", "Echo") == {"messages": []}
+    assert cache.memory.get("k") == {"messages": []}
+    store.data.clear()
+    time.sleep(0.02)
+    assert cache.memory.get("k") is None
+    assert cache.lookup("k", "Echo") is None
+
+
+@pytest.mark.unit
+def test_expired_rows_are_purged_on_interval() -> None:
+    """Once started, the cache purges the store until closed."""
+    store = _FakeStore()
+    cache = ResponseCache(TTLCache(10), store, purge_interval=0.005)
+
+    async def run() -> None:
+        await cache.start()
+        await asyncio.sleep(0.03)
+        await cache.aclose()
+
+    asyncio.run(run())
+    assert store.purges >= 2
+    assert cache.stats()["purged"] == store.purges
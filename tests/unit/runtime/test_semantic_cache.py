@@ -0,0 +1,104 @@
+"""
+File: test_semantic_cache.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage
+import numpy as np
+import pytest
+
+from app.runtime.embeddings import HashingEmbedder
+from app.runtime.semantic_cache import SemanticCache, SemanticIndex
+
+
+def _unit(*values: float) -> np.ndarray:
+    """Unit vector from components."""
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.mark.unit
+def test_hashing_embedder_separates_paraphrases_from_new_topics() -> None:
+    """Paraphrases score higher than questions about something else."""
+    embedder = HashingEmbedder()
+    question = embedder.embed("How do I reset my password?")
+    paraphrase = embedder.embed("how can I reset my password")
+    other = embedder.embed("How do I delete my account?")
+    assert float(np.linalg.norm(question)) == pytest.approx(1.0)
+    assert float(question @ paraphrase) > 0.9
+    assert float(question @ other) < 0.5
+
+
+@pytest.mark.unit
+def test_index_matches_within_scope_and_threshold() -> None:
+    """Search returns the closest entry of the scope above threshold."""
+    index = SemanticIndex(max_entries=4)
+    index.add("a", _unit(1, 0), "x", ttl=None)
+    index.add("a", _unit(0, 1), "y", ttl=None)
+    index.add("b", _unit(1, 0.1), "z", ttl=None)
+    assert index.search("a", _unit(1, 0.1), threshold=0.9)[0] == "x"
+    assert index.search("a", _unit(1, 1), threshold=0.9) is None
+    assert index.search("c", _unit(1, 0), threshold=0.0) is None
+
+
+@pytest.mark.unit
+def test_index_evicts_by_age_and_size() -> None:
+    """Expired slots are reused first; when full the oldest goes."""
+    index = SemanticIndex(max_entries=2)
+    index.add("a", _unit(1, 0), "old", ttl=0.01)
+    index.add("a", _unit(0, 1), "y", ttl=None)
+    time.sleep(0.02)
+    assert len(index) == 1
+    index.add("a", _unit(1, 1), "z", ttl=None)
+    assert index.evictions["age"] == 1
+    index.add("a", _unit(1, 0), "w", ttl=None)
+    assert index.evictions["size"] == 1
+    assert index.search("a", _unit(0, 1), threshold=0.99) is None
+
+
+@pytest.mark.unit
+def test_index_forgets_scopes_whose_entries_are_evicted() -> None:
+    """Scopes are bounded by the slots, however many have been seen."""
+    index = SemanticIndex(max_entries=2)
+    for n in range(10):
+        index.add(f"scope-{n}", _unit(1, n), n, ttl=None)
+    assert index.scopes == 2
+    assert index.search("scope-0", _unit(1, 0), threshold=0.0) is None
+    assert index.search("scope-9", _unit(1, 9), threshold=0.99)[0] == 9
+    index.add("scope-9", _unit(0, 1), "again", ttl=None)
+    assert index.scopes == 1
+
+
+@pytest.mark.unit
+def test_cache_reports_hits_and_latency_saved() -> None:
+    """A similar input hits and counts the stored run time as saved."""
+    cache = SemanticCache(
+        HashingEmbedder(), SemanticIndex(max_entries=10), threshold=0.8
+    )
+
+    async def scenario() -> None:
+        miss = await cache.lookup("s", "Faq", "How do I reset my password?")
+        assert miss.state is None
+        cache.store(
+            "s",
+            miss.vector,
+            {"messages": [AIMessage(content="Use the reset link.")]},
+            duration=2.0,
+        )
+        hit = await cache.lookup("s", "Faq", "how can I reset my password")
+        assert hit.state["messages"][-1].text == "Use the reset link."
+
+    asyncio.run(scenario())
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.5)
+    assert 1.9 < stats["latency_saved_seconds"] <= 2.0
+    assert stats["agents"]["Faq"] == {"miss": 1, "hit": 1}
@@ -0,0 +1,98 @@
+"""
+File: test_single_flight.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.runtime.single_flight import SingleFlight
+
+
+@pytest.mark.unit
+def test_do_shares_one_call_and_its_error() -> None:
+    """Concurrent callers of a key share one call, result or error."""
+    flights = SingleFlight()
+    calls = 0
+
+    async def call(fail: bool) -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if fail:
+            raise RuntimeError("boom")
+        return "done"
+
+    async def main() -> list[str | BaseException]:
+        ok = [flights.do("a", lambda: call(False)) for _ in range(3)]
+        bad = [flights.do("b", lambda: call(True)) for _ in range(2)]
+        results = await asyncio.gather(*ok, *bad, return_exceptions=True)
+        # Keys are forgotten once the call ends.
+        results.append(await flights.do("a", lambda: call(False)))
+        return results
+
+    results = asyncio.run(main())
+    assert results[:3] == ["done"] * 3
+    assert all(isinstance(r, RuntimeError) for r in results[3:5])
+    assert results[5] == "done"
+    assert calls == 3
+    assert flights.stats() == {"in_flight": 0, "executions": 3, "coalesced": 3}
+
+
+@pytest.mark.unit
+def test_stream_replays_to_late_subscribers() -> None:
+    """A subscriber joining mid-stream still receives every item."""
+    flights = SingleFlight()
+
+    async def numbers() -> AsyncIterator[int]:
+        for i in range(4):
+            await asyncio.sleep(0.005)
+            yield i
+
+    async def collect(delay: float) -> list[int]:
+        await asyncio.sleep(delay)
+        return [i async for i in flights.stream("n", numbers)]
+
+    async def main() -> list[list[int]]:
+        return await asyncio.gather(collect(0), collect(0.012))
+
+    assert asyncio.run(main()) == [[0, 1, 2, 3], [0, 1, 2, 3]]
+    assert flights.stats()["coalesced"] == 1
+
+
+@pytest.mark.unit
+def test_call_is_cancelled_only_when_every_caller_left() -> None:
+    """One caller giving up keeps the call; the last one cancels it."""
+    flights = SingleFlight()
+
+    async def main() -> tuple[str, bool]:
+        stopped = asyncio.Event()
+
+        async def slow() -> str:
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+            return "done"
+
+        first = asyncio.create_task(flights.do("k", slow))
+        second = asyncio.create_task(flights.do("k", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+
+        third = asyncio.create_task(flights.do("k", slow))
+        await asyncio.sleep(0.01)
+        third.cancel()
+        await asyncio.sleep(0.01)
+        return result, stopped.is_set()
+
+    assert asyncio.run(main()) == ("done", True)
+    assert flights.stats()["in_flight"] == 0
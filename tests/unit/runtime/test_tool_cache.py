@@ -0,0 +1,202 @@
+"""
+File: test_tool_cache.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from langchain_core.messages import ToolMessage
+import pytest
+
+from app.runtime.cancellation import DeadlineExceededError
+from app.runtime.tool_cache import (
+    ToolCacheMiddleware,
+    ToolCachePolicy,
+    ToolMemo,
+)
+
+
+def _request(args: dict[str, Any], call_id: str) -> Any:
+    """Minimal stand-in for a ToolCallRequest."""
+    return SimpleNamespace(
+        tool_call={"name": "get_weather", "args": args, "id": call_id}
+    )
+
+
+class _Tool:
+    """Counts executions and returns a tool message."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    def _result(self, request: Any) -> ToolMessage:
+        if self.fail:
+            raise RuntimeError("tool failed")
+        city = request.tool_call["args"]["city"]
+        return ToolMessage(
+            content=f"sunny in {city}",
+            tool_call_id=request.tool_call["id"],
+        )
+
+    def run(self, request: Any) -> ToolMessage:
+        self.calls += 1
+        time.sleep(self.delay)
+        return self._result(request)
+
+    async def arun(self, request: Any) -> ToolMessage:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self._result(request)
+
+
+def _middleware(**policy: Any) -> tuple[ToolCacheMiddleware, ToolMemo]:
+    """Middleware with one memoized tool."""
+    params: dict[str, Any] = {"ttl": 60, "key_fields": ("city",)}
+    params.update(policy)
+    memo = ToolMemo("get_weather", ToolCachePolicy(**params))
+    return ToolCacheMiddleware({"get_weather": memo}), memo
+
+
+@pytest.mark.unit
+def test_key_fields_select_identifying_arguments() -> None:
+    """Arguments outside key_fields do not change the key."""
+    memo = ToolMemo("t", ToolCachePolicy(ttl=None, key_fields=("city",)))
+    assert memo.key({"city": "Rome", "trace": 1}) == memo.key({"city": "Rome"})
+    assert memo.key({"city": "Rome"}) != memo.key({"city": "Oslo"})
+
+
+@pytest.mark.unit
+def test_repeated_call_is_served_from_memo() -> None:
+    """The second call hits and gets its own tool_call_id."""
+    middleware, memo = _middleware()
+    tool = _Tool()
+    first = middleware.wrap_tool_call(_request({"city": "Rome"}, "a"), tool.run)
+    second = middleware.wrap_tool_call(
+        _request({"city": "Rome"}, "b"), tool.run
+    )
+    assert tool.calls == 1
+    assert first.tool_call_id == "a"
+    assert second.tool_call_id == "b"
+    assert second.content == "sunny in Rome"
+    assert memo.stats()["hits"] == 1
+    assert memo.stats()["misses"] == 1
+
+
+@pytest.mark.unit
+def test_results_expire_after_ttl() -> None:
+    """Results older than the TTL are recomputed."""
+    middleware, _ = _middleware(ttl=0.01)
+    tool = _Tool()
+    middleware.wrap_tool_call(_request({"city": "Rome"}, "a"), tool.run)
+    time.sleep(0.02)
+    middleware.wrap_tool_call(_request({"city": "Rome"}, "b"), tool.run)
+    assert tool.calls == 2
+
+
+@pytest.mark.unit
+def test_errors_are_not_cached() -> None:
+    """A failing call is retried on the next request."""
+    middleware, memo = _middleware()
+    tool = _Tool(fail=True)
+    for call_id in ("a", "b"):
+        with pytest.raises(RuntimeError):
+            middleware.wrap_tool_call(
+                _request({"city": "Rome"}, call_id), tool.run
+            )
+    assert tool.calls == 2
+    assert memo.stats()["entries"] == 0
+
+
+@pytest.mark.unit
+def test_concurrent_async_calls_run_once() -> None:
+    """Identical concurrent calls on the event loop share one execution."""
+    middleware, memo = _middleware()
+    tool = _Tool(delay=0.02)
+
+    async def scenario() -> list[ToolMessage]:
+        return await asyncio.gather(
+            *[
+                middleware.awrap_tool_call(
+                    _request({"city": "Rome"}, str(i)), tool.arun
+                )
+                for i in range(5)
+            ]
+        )
+
+    results = asyncio.run(scenario())
+    assert tool.calls == 1
+    assert [r.tool_call_id for r in results] == ["0", "1", "2", "3", "4"]
+    assert memo.stats()["coalesced"] == 4
+
+
+@pytest.mark.unit
+def test_concurrent_thread_calls_run_once() -> None:
+    """Identical concurrent calls from threads share one execution."""
+    middleware, memo = _middleware()
+    tool = _Tool(delay=0.05)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(
+            pool.map(
+                lambda i: middleware.wrap_tool_call(
+                    _request({"city": "Rome"}, str(i)), tool.run
+                ),
+                range(4),
+            )
+        )
+    assert tool.calls == 1
+    assert {r.content for r in results} == {"sunny in Rome"}
+    assert memo.stats()["coalesced"] == 3
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("abort", ["cancel", "deadline"])
+def test_waiter_takes_over_when_the_leader_gives_up(abort: str) -> None:
+    """A leader cancelled or out of time does not fail its waiters: one
+    of them runs the tool instead."""
+    middleware, memo = _middleware()
+    tool = _Tool(delay=0.05)
+
+    async def leader_run(request: Any) -> ToolMessage:
+        if abort == "deadline":
+            tool.calls += 1
+            await asyncio.sleep(0.01)
+            raise DeadlineExceededError("tool call")
+        return await tool.arun(request)
+
+    async def scenario() -> tuple[BaseException | None, ToolMessage]:
+        leader = asyncio.create_task(
+            middleware.awrap_tool_call(
+                _request({"city": "Rome"}, "a"), leader_run
+            )
+        )
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(
+            middleware.awrap_tool_call(
+                _request({"city": "Rome"}, "b"), tool.arun
+            )
+        )
+        await asyncio.sleep(0.01)
+        if abort == "cancel":
+            leader.cancel()
+        error = (await asyncio.gather(leader, return_exceptions=True))[0]
+        return error, await waiter
+
+    error, result = asyncio.run(scenario())
+    expected = (
+        asyncio.CancelledError if abort == "cancel" else DeadlineExceededError
+    )
+    assert isinstance(error, expected)
+    assert result.content == "sunny in Rome"
+    assert result.tool_call_id == "b"
+    assert tool.calls == 2
+    assert memo.stats()["entries"] == 1
@@ -0,0 +1,51 @@
+"""
+File: test_tool_executor.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+import threading
+
+from langchain.tools import tool
+import pytest
+
+from app.runtime.tool_executor import ToolExecutor
+
+
+@tool
+def whoami(label: str) -> str:
+    """Return the label and the name of the running thread."""
+    return f"{label}@{threading.current_thread().name}"
+
+
+@tool
+async def awhoami(label: str) -> str:
+    """Async tool: runs on the event loop."""
+    await asyncio.sleep(0)
+    return label
+
+
+@pytest.mark.unit
+def test_bind_runs_sync_tools_in_pool() -> None:
+    """Bound sync tools run in the pool on the async path."""
+    executor = ToolExecutor(max_workers=2)
+    bound = executor.bind(whoami)
+    assert bound is not whoami
+    assert bound.name == "whoami"
+    result = asyncio.run(bound.ainvoke({"label": "x"}))
+    assert result.startswith("x@tool")
+    assert whoami.invoke({"label": "y"}).startswith("y@")
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.unit
+def test_bind_keeps_async_tools() -> None:
+    """Tools that already have a coroutine are returned unchanged."""
+    executor = ToolExecutor(max_workers=1)
+    assert executor.bind(awhoami) is awhoami
+    executor.shutdown()
@@ -0,0 +1,143 @@
+"""
+File: test_traffic.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.messages import ToolMessage
+import pytest
+
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.runtime.fake_chat_model import FakeChatModel
+from app.runtime.run_metrics import RunMetricsMiddleware
+from app.runtime.traffic import (
+    MASK,
+    PIIMasker,
+    ReplayMissError,
+    TrafficMiddleware,
+    TrafficRecorder,
+    TrafficReplay,
+    read_recordings,
+)
+from app.schemas.db.agent import AgentCreate
+from app.services.agent_runtime import AgentRuntime
+
+CALLS: list[str] = []
+
+AGENT = AgentCreate(
+    name="Lookup",
+    config={
+        "model": "fake:tool-caller",
+        "system_prompt": "Look people up.",
+        "model_options": {"api_key": "secret"},
+    },
+)
+
+
+@tool
+def find_user(name: str) -> str:
+    """Find a user's contact details."""
+    CALLS.append(name)
+    return f'{{"name": "{name}", "email": "ada@example.com"}}'
+
+
+def _runtime(model: FakeChatModel, traffic: object) -> AgentRuntime:
+    """Runtime whose agent uses `model` and the traffic middleware."""
+    factory = MagicMock()
+    factory.create_agent.return_value = create_agent(
+        model=model,
+        tools=[find_user],
+        middleware=[RunMetricsMiddleware(), TrafficMiddleware()],
+    )
+    return AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=4, default_model_concurrency=4),
+        traffic=traffic,
+    )
+
+
+@pytest.mark.unit
+def test_masker_masks_fields_patterns_and_json_text() -> None:
+    """Fields, patterns and JSON strings are masked, idempotently."""
+    masker = PIIMasker(["email"], [r"\d{3}-\d{4}"])
+    value = {
+        "args": {"Email": "a@b.c", "city": "Rome"},
+        "content": '{"email": "a@b.c", "n": 1}',
+        "text": "call 555-1234 now",
+    }
+    masked = masker.mask(value)
+    assert masked["args"] == {"Email": MASK, "city": "Rome"}
+    assert masked["content"] == f'{{"email": "{MASK}", "n": 1}}'
+    assert masked["text"] == f"call {MASK} now"
+    assert masker.mask(masked) == masked
+
+
+@pytest.mark.unit
+def test_record_then_replay_serves_recorded_steps(tmp_path: Path) -> None:
+    """A recorded run replays without calling the model or its tools."""
+    path = tmp_path / "traffic.jsonl.zst"
+    recorder = TrafficRecorder(path, masker=PIIMasker(["email", "api_key"], []))
+    model = FakeChatModel(
+        mode="tool-caller",
+        latency_ms=20,
+        tool_calls=[{"name": "find_user", "args": {"name": "Ada"}}],
+    )
+    live = _runtime(model, recorder)
+    CALLS.clear()
+    state = asyncio.run(live.invoke(AGENT, "who is Ada?"))
+    asyncio.run(recorder.flush())
+    assert CALLS == ["Ada"]
+
+    [recording] = list(read_recordings(path))
+    assert recording.input == "who is Ada?"
+    assert "model_options" not in recording.config
+    assert [step["kind"] for step in recording.steps] == [
+        "model",
+        "tool",
+        "model",
+    ]
+    assert MASK in recording.steps[1]["content"]
+    assert recording.steps[0]["latency_ms"] >= 20
+
+    broken = FakeChatModel(mode="echo", response="not recorded")
+    replay = TrafficReplay([recording], masker=PIIMasker(["email"], []))
+    replayed = asyncio.run(
+        _runtime(broken, replay).invoke(AGENT, "who is Ada?")
+    )
+    assert CALLS == ["Ada"]
+    assert replayed["messages"][-1].text == state["messages"][-1].text
+    tool_messages = [
+        m for m in replayed["messages"] if isinstance(m, ToolMessage)
+    ]
+    assert [m.text for m in tool_messages] == [
+        f'{{"name": "Ada", "email": "{MASK}"}}'
+    ]
+    assert replay.stats()["served"] == 1
+
+
+@pytest.mark.unit
+def test_sampling_and_replay_misses(tmp_path: Path) -> None:
+    """Unsampled runs are not written; unknown inputs do not replay."""
+    path = tmp_path / "traffic.jsonl.zst"
+    recorder = TrafficRecorder(path, sample_rate=0.0)
+    runtime = _runtime(FakeChatModel(latency_ms=0), recorder)
+    asyncio.run(runtime.invoke(AGENT, "hello"))
+    asyncio.run(recorder.flush())
+    assert not path.exists()
+    assert recorder.stats()["skipped"] == 1
+
+    replay = TrafficReplay([])
+    with pytest.raises(ReplayMissError):
+        asyncio.run(
+            _runtime(FakeChatModel(latency_ms=0), replay).invoke(AGENT, "hello")
+        )
+    assert replay.stats()["misses"] == 1
@@ -0,0 +1,66 @@
+"""
+File: test_work_stealing.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.runtime.work_stealing import WorkStealingScheduler
+
+
+@pytest.mark.unit
+def test_map_keeps_item_order_and_reports_errors() -> None:
+    """Results come back in item order, with exceptions in place."""
+
+    async def square(n: int) -> int:
+        await asyncio.sleep(0.001 * (5 - n % 5))
+        if n == 3:
+            raise ValueError("three")
+        return n * n
+
+    scheduler = WorkStealingScheduler(workers=4)
+    results = asyncio.run(scheduler.map(square, list(range(10))))
+    assert results[:3] == [0, 1, 4]
+    assert isinstance(results[3], ValueError)
+    assert results[4:] == [n * n for n in range(4, 10)]
+    assert scheduler.stats()["executed"] == 10
+
+
+@pytest.mark.unit
+def test_idle_workers_steal_from_a_busy_worker() -> None:
+    """Items dealt to one worker by affinity are spread by stealing,
+    never exceeding the worker bound."""
+    in_flight = peak = 0
+
+    async def work(item: tuple[str, int]) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return item[0]
+
+    # 16 items of agent "a" all start on one worker; 1 item of "b".
+    items = [("a", i) for i in range(16)] + [("b", 0)]
+    scheduler = WorkStealingScheduler(workers=8)
+    started = time.perf_counter()
+    results = asyncio.run(
+        scheduler.map(work, items, affinity=lambda item: item[0])
+    )
+    elapsed = time.perf_counter() - started
+    assert results == ["a"] * 16 + ["b"]
+    assert peak == 8
+    assert scheduler.stats()["steals"] > 0
+    # 17 items on 8 workers take 3 rounds, not the 16 of one worker.
+    assert elapsed < 0.2
+
+    peak = 0
+    asyncio.run(scheduler.map(work, items, workers=2))
+    assert peak == 2
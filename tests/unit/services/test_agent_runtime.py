@@ -0,0 +1,448 @@
+"""
+File: test_agent_runtime.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+from langchain.agents import create_agent
+from langchain.tools import tool
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+import pytest
+
+from app.core.exceptions import (
+    GatewayTimeoutException,
+    PayloadTooLargeException,
+    TooManyRequestsException,
+)
+from app.runtime.cancellation import deadline_scope
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.runtime.embeddings import HashingEmbedder
+from app.runtime.fake_chat_model import FakeChatModel
+from app.runtime.preflight import Preflight
+from app.runtime.run_metrics import RunMetricsMiddleware, RunRecord
+from app.runtime.semantic_cache import SemanticCache, SemanticIndex
+from app.runtime.tokenizer import HeuristicTokenizer
+from app.runtime.tool_executor import ToolExecutor
+from app.schemas.api.agent_run import AgentBatchResponse
+from app.schemas.db.agent import AgentCreate, AgentRead
+from app.services.agent_runtime import AgentRuntime
+
+
+async def _echo(state: dict[str, Any]) -> dict[str, Any]:
+    """Fake compiled agent: echoes the user message, fails on 'boom'."""
+    text = state["messages"][-1]["content"]
+    if text == "boom":
+        raise RuntimeError("model failed")
+    await asyncio.sleep(0.001)
+    return {"messages": [AIMessage(content=f"echo: {text}")]}
+
+
+@pytest.fixture
+def agent() -> AgentCreate:
+    """Minimal agent definition."""
+    return AgentCreate(
+        name="Echo",
+        config={"model": "fake", "system_prompt": "Echo."},
+    )
+
+
+@pytest.fixture
+def factory() -> MagicMock:
+    """AgentFactory mock returning the echo runnable."""
+    mock = MagicMock()
+    mock.create_agent.return_value = RunnableLambda(_echo)
+    return mock
+
+
+def _runtime(factory: MagicMock, **limits: Any) -> AgentRuntime:
+    """Runtime with a real limiter."""
+    params: dict[str, Any] = {
+        "max_concurrency": 4,
+        "default_model_concurrency": 4,
+        "max_queue_size": 100,
+    }
+    params.update(limits)
+    return AgentRuntime(factory, ConcurrencyLimiter(**params))
+
+
+@pytest.mark.unit
+def test_invoke_returns_final_state(
+    factory: MagicMock, agent: AgentCreate
+) -> None:
+    """invoke runs the compiled agent and returns its state."""
+    runtime = _runtime(factory)
+    state = asyncio.run(runtime.invoke(agent, "hi"))
+    assert state["messages"][-1].text == "echo: hi"
+    assert runtime.stats()["concurrency"]["run_time"]["count"] == 1
+
+
+@pytest.mark.unit
+def test_invoke_queue_full_raises_too_many_requests(
+    factory: MagicMock, agent: AgentCreate
+) -> None:
+    """A full limiter queue surfaces as TooManyRequestsException."""
+    runtime = _runtime(factory, max_queue_size=0)
+    with pytest.raises(TooManyRequestsException) as exc_info:
+        asyncio.run(runtime.invoke(agent, "hi"))
+    assert "Retry-After" in exc_info.value.headers
+
+
+@pytest.mark.unit
+def test_preflight_rejects_oversized_input_without_a_model_call(
+    factory: MagicMock, agent: AgentCreate
+) -> None:
+    """An input over the context window is a 413 and never runs."""
+    calls: list[str] = []
+
+    async def echo(state: dict[str, Any]) -> dict[str, Any]:
+        calls.append(state["messages"][-1]["content"])
+        return await _echo(state)
+
+    factory.create_agent.return_value = RunnableLambda(echo)
+    runtime = _runtime(factory)
+    runtime.preflight = Preflight(
+        HeuristicTokenizer(), lambda model, options: 2000, output_reserve=0
+    )
+    with pytest.raises(PayloadTooLargeException, match="exceeds"):
+        asyncio.run(runtime.invoke(agent, "x" * 10000))
+    assert calls == []
+
+    agent.config["preflight"] = "truncate"
+    asyncio.run(runtime.invoke(agent, "x" * 10000))
+    assert 7000 < len(calls[0]) < 8000
+    assert runtime.stats()["preflight"]["truncated"] == 1
+
+
+@pytest.mark.unit
+def test_batch_keeps_order_and_reports_item_errors(
+    factory: MagicMock, agent: AgentCreate
+) -> None:
+    """batch compiles once, keeps input order and isolates failures."""
+    runtime = _runtime(factory)
+    inputs = [f"msg-{i}" for i in range(10)]
+    inputs[3] = "boom"
+    results = asyncio.run(runtime.batch(agent, inputs, max_concurrency=3))
+    factory.create_agent.assert_called_once()
+    response = AgentBatchResponse.from_results(results)
+    assert response.succeeded == 9
+    assert response.failed == 1
+    assert [item.index for item in response.items] == list(range(10))
+    assert response.items[0].output == "echo: msg-0"
+    assert response.items[3].error == "RuntimeError: model failed"
+
+
+@pytest.mark.unit
+def test_semantic_cache_is_opt_in(factory: MagicMock) -> None:
+    """Only agents with config['semantic_cache'] reuse similar outputs."""
+    cache = SemanticCache(
+        HashingEmbedder(), SemanticIndex(max_entries=10), threshold=0.8
+    )
+    runtime = AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=4, default_model_concurrency=4),
+        semantic_cache=cache,
+    )
+    config = {"model": "fake", "system_prompt": "Echo."}
+    cached = AgentCreate(name="Faq", config={**config, "semantic_cache": True})
+    plain = AgentCreate(name="Echo", config=config)
+
+    async def scenario() -> list[str]:
+        outputs = []
+        for agent in (cached, cached, plain, plain):
+            question = "How do I reset my password?"
+            if outputs:
+                question = "how can I reset my password"
+            state = await runtime.invoke(agent, question)
+            outputs.append(state["messages"][-1].text)
+        return outputs
+
+    outputs = asyncio.run(scenario())
+    assert outputs[1] == "echo: How do I reset my password?"
+    assert outputs[3] == "echo: how can I reset my password"
+    assert runtime.stats()["semantic_cache"]["hits"] == 1
+    assert runtime.stats()["concurrency"]["run_time"]["count"] == 3
+
+
+class _ToolCallingModel(BaseChatModel):
+    """Calls every tool once in the first turn, then answers."""
+
+    tool_calls: list[dict[str, Any]]
+
+    @property
+    def _llm_type(self) -> str:
+        return "tool-calling"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "_ToolCallingModel":
+        return self
+
+    def _generate(
+        self, messages: list[BaseMessage], *args: Any, **kwargs: Any
+    ) -> ChatResult:
+        usage = {"input_tokens": 10, "output_tokens": 2, "total_tokens": 12}
+        if isinstance(messages[-1], ToolMessage):
+            reply = AIMessage(content="done", usage_metadata=usage)
+        else:
+            reply = AIMessage(
+                content="", tool_calls=self.tool_calls, usage_metadata=usage
+            )
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+
+@tool
+def slow_lookup(seconds: float) -> str:
+    """Sleep, then report how long."""
+    time.sleep(seconds)
+    return f"slept {seconds}"
+
+
+def _parallel_run(max_parallel_tools: int) -> tuple[list[str], float]:
+    """Run one turn with three tool calls; return results and duration."""
+    calls = [
+        {"name": "slow_lookup", "args": {"seconds": s}, "id": f"call-{i}"}
+        for i, s in enumerate([0.15, 0.05, 0.1])
+    ]
+    executor = ToolExecutor(max_workers=4)
+    graph = create_agent(
+        model=_ToolCallingModel(tool_calls=calls),
+        tools=[executor.bind(slow_lookup)],
+    )
+    factory = MagicMock()
+    factory.create_agent.return_value = graph
+    runtime = _runtime(factory)
+    agent = AgentCreate(
+        name="Tools",
+        config={
+            "model": "fake",
+            "system_prompt": "Use tools.",
+            "max_parallel_tools": max_parallel_tools,
+        },
+    )
+    started = time.perf_counter()
+    state = asyncio.run(runtime.invoke(agent, "go"))
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+    results = [
+        m.tool_call_id for m in state["messages"] if isinstance(m, ToolMessage)
+    ]
+    return results, elapsed
+
+
+@pytest.mark.unit
+def test_tool_calls_run_in_parallel_in_call_order() -> None:
+    """A turn takes as long as its slowest tool; results keep call order."""
+    results, elapsed = _parallel_run(max_parallel_tools=8)
+    assert results == ["call-0", "call-1", "call-2"]
+    assert elapsed < 0.28
+
+
+@pytest.mark.unit
+def test_max_parallel_tools_limits_concurrency() -> None:
+    """max_parallel_tools=1 runs the tool calls one after another."""
+    results, elapsed = _parallel_run(max_parallel_tools=1)
+    assert results == ["call-0", "call-1", "call-2"]
+    assert elapsed >= 0.3
+
+
+@pytest.mark.unit
+def test_run_records_tokens_latency_and_tool_calls() -> None:
+    """Every run hands its metrics to the writer, failed runs included."""
+    calls = [
+        {"name": "slow_lookup", "args": {"seconds": 0.01}, "id": f"call-{i}"}
+        for i in range(2)
+    ]
+    graph = create_agent(
+        model=_ToolCallingModel(tool_calls=calls),
+        tools=[slow_lookup],
+        middleware=[RunMetricsMiddleware()],
+    )
+    factory = MagicMock()
+    factory.create_agent.return_value = graph
+    writer = MagicMock()
+    runtime = AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=4, default_model_concurrency=4),
+        run_metrics=writer,
+    )
+    agent = AgentCreate(
+        name="Tools", config={"model": "fake", "system_prompt": "Use tools."}
+    )
+    asyncio.run(runtime.invoke(agent, "go"))
+    record: RunRecord = writer.add.call_args.args[0]
+    row = record.as_row()
+    assert row["status"] == "succeeded"
+    assert row["model_calls"] == row["steps"] == 2
+    assert row["prompt_tokens"] == 20
+    assert row["completion_tokens"] == 4
+    assert row["tool_calls"] == 2
+    assert row["tool_latency"]["slow_lookup"]["calls"] == 2
+    assert row["tool_latency_ms"] >= 20
+    assert row["duration_ms"] >= row["model_latency_ms"]
+
+    factory.create_agent.return_value = RunnableLambda(_echo)
+    with pytest.raises(RuntimeError):
+        asyncio.run(runtime.invoke(agent, "boom"))
+    failed: RunRecord = writer.add.call_args.args[0]
+    assert failed.status == "failed"
+    assert failed.error == "RuntimeError: model failed"
+
+
+@pytest.mark.unit
+def test_stream_yields_tokens_then_final_state() -> None:
+    """stream yields the model's text chunks, then the final state."""
+    factory = MagicMock()
+    factory.create_agent.return_value = create_agent(
+        model=FakeChatModel(latency_ms=0), middleware=[RunMetricsMiddleware()]
+    )
+    writer = MagicMock()
+    runtime = AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=4, default_model_concurrency=4),
+        run_metrics=writer,
+    )
+    agent = AgentCreate(
+        name="Echo", config={"model": "fake:echo", "system_prompt": "Echo."}
+    )
+
+    async def collect() -> list[tuple[str, Any]]:
+        return [event async for event in runtime.stream(agent, "hi there")]
+
+    events = asyncio.run(collect())
+    tokens = [payload for kind, payload in events if kind == "token"]
+    assert "".join(tokens) == "echo: hi there"
+    kind, state = events[-1]
+    assert kind == "state"
+    assert state["messages"][-1].text == "echo: hi there"
+    record: RunRecord = writer.add.call_args.args[0]
+    assert record.status == "succeeded"
+    assert record.model_calls == 1
+
+
+@pytest.mark.unit
+def test_coalescing_agents_share_identical_concurrent_runs() -> None:
+    """Identical concurrent runs of an opted-in agent run only once."""
+    factory = MagicMock()
+    factory.create_agent.return_value = create_agent(
+        model=FakeChatModel(latency_ms=20), middleware=[RunMetricsMiddleware()]
+    )
+    writer = MagicMock()
+    runtime = AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=8, default_model_concurrency=8),
+        run_metrics=writer,
+    )
+    config = {"model": "fake:echo", "system_prompt": "Echo."}
+    coalesced = AgentCreate(name="Faq", config={**config, "coalesce": True})
+    plain = AgentCreate(name="Echo", config=config)
+
+    async def stream(agent: AgentCreate) -> str:
+        return "".join(
+            [
+                payload
+                async for kind, payload in runtime.stream(agent, "same")
+                if kind == "token"
+            ]
+        )
+
+    async def scenario() -> tuple[list[Any], list[str]]:
+        states = await asyncio.gather(
+            *(runtime.invoke(coalesced, "same") for _ in range(4)),
+            runtime.invoke(coalesced, "other"),
+            *(runtime.invoke(plain, "same") for _ in range(2)),
+        )
+        texts = await asyncio.gather(*(stream(coalesced) for _ in range(3)))
+        return states, texts
+
+    states, texts = asyncio.run(scenario())
+    assert [s["messages"][-1].text for s in states[:4]] == ["echo: same"] * 4
+    assert states[4]["messages"][-1].text == "echo: other"
+    assert texts == ["echo: same"] * 3
+    # 1 shared + 1 other + 2 plain invokes, 1 shared stream.
+    assert writer.add.call_count == 5
+    assert runtime.stats()["single_flight"] == {
+        "in_flight": 0,
+        "executions": 3,
+        "coalesced": 5,
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("short", [0, 1])
+def test_coalesced_callers_keep_their_own_deadlines(short: int) -> None:
+    """A shared run is bound by no single caller's deadline: the caller
+    with the short deadline times out, the other still gets the result,
+    whichever of them started the run."""
+
+    async def slow(state: dict[str, Any]) -> dict[str, Any]:
+        await asyncio.sleep(0.3)
+        return {"messages": [AIMessage(content="done")]}
+
+    factory = MagicMock()
+    factory.create_agent.return_value = RunnableLambda(slow)
+    runtime = _runtime(factory)
+    agent = AgentCreate(
+        name="Faq",
+        config={"model": "fake", "system_prompt": "Faq.", "coalesce": True},
+    )
+
+    async def call(timeout: float) -> Any:
+        with deadline_scope(timeout):
+            started = time.monotonic()
+            try:
+                return await runtime.invoke(agent, "same")
+            except GatewayTimeoutException as err:
+                return err, time.monotonic() - started
+
+    async def scenario() -> list[Any]:
+        timeouts = [5.0, 5.0]
+        timeouts[short] = 0.05
+        return await asyncio.gather(*(call(t) for t in timeouts))
+
+    results = asyncio.run(scenario())
+    error, elapsed = results[short]
+    assert isinstance(error, GatewayTimeoutException)
+    assert elapsed < 0.2
+    assert results[1 - short]["messages"][-1].text == "done"
+    assert runtime.stats()["single_flight"]["executions"] == 1
+
+
+@pytest.mark.unit
+def test_saved_agents_compile_once_per_version(factory: MagicMock) -> None:
+    """Runs of a saved agent share its compiled graph until it is edited;
+    unsaved definitions compile per run."""
+    runtime = _runtime(factory)
+    created = datetime(2026, 10, 18, tzinfo=UTC)
+    saved = AgentRead(
+        id=1,
+        name="Echo",
+        config={"model": "fake", "system_prompt": "Echo."},
+        created_at=created,
+        updated_at=created,
+    )
+    for _ in range(3):
+        asyncio.run(runtime.invoke(saved, "hi"))
+    assert factory.create_agent.call_count == 1
+    edited = saved.model_copy(update={"updated_at": datetime.now(UTC)})
+    asyncio.run(runtime.invoke(edited, "hi"))
+    assert factory.create_agent.call_count == 2
+    unsaved = AgentCreate(name="Echo", config=saved.config)
+    asyncio.run(runtime.invoke(unsaved, "hi"))
+    asyncio.run(runtime.invoke(unsaved, "hi"))
+    assert factory.create_agent.call_count == 4
+    assert runtime.stats()["compiled_agents"] == {
+        "compiled": 2,
+        "hits": 2,
+        "misses": 2,
+        "evictions": 0,
+    }
@@ -0,0 +1,37 @@
+"""
+File: test_graph_run_store.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.graph_run_store import GraphRunStore
+
+
+@pytest.mark.unit
+def test_restart_only_updates_a_failed_run() -> None:
+    """restart checks the status in the UPDATE and reports if it won."""
+    session = MagicMock()
+    session.execute.return_value.rowcount = 1
+
+    @contextmanager
+    def session_factory() -> Generator[MagicMock]:
+        yield session
+
+    store = GraphRunStore(session_factory)
+    assert store.restart(7) is True
+    stmt = session.execute.call_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "WHERE graph_runs.id = " in sql
+    assert "graph_runs.status = " in sql
+    session.execute.return_value.rowcount = 0
+    assert store.restart(7) is False
@@ -0,0 +1,303 @@
+"""
+File: test_graph_runtime.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph.state import CompiledStateGraph
+import pytest
+
+from app.core.exceptions import ConflictException, ValidationException
+from app.factories.graph_factory import GraphFactory
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.schemas.db.agent import AgentBase, AgentRead
+from app.schemas.db.graph import GraphRead
+from app.services.agent_runtime import AgentRuntime
+from app.services.graph_runtime import GraphRuntime
+from app.services.tool_provider import ToolProvider
+
+NOW = datetime(2026, 10, 18, tzinfo=UTC)
+
+
+def _echo_agent(agent: AgentBase) -> RunnableLambda:
+    """Fake compiled agent answering '<name>: <last message>'."""
+
+    def run(state: dict[str, Any]) -> dict[str, Any]:
+        text = state["messages"][-1].text
+        return {"messages": [AIMessage(content=f"{agent.name}: {text}")]}
+
+    return RunnableLambda(run)
+
+
+@pytest.fixture
+def factory() -> MagicMock:
+    """AgentFactory mock with echo agents and the real tools."""
+    mock = MagicMock()
+    mock.create_agent.side_effect = _echo_agent
+    mock.tool_provider = ToolProvider(cache_results=False)
+    mock.tool_executor = None
+    return mock
+
+
+def _agent_runtime(factory: MagicMock) -> AgentRuntime:
+    """Agent runtime over the mocked factory."""
+    return AgentRuntime(
+        factory,
+        ConcurrencyLimiter(max_concurrency=4, default_model_concurrency=4),
+    )
+
+
+@pytest.fixture
+def runtime(factory: MagicMock) -> GraphRuntime:
+    """Graph runtime over a real agent runtime."""
+    return GraphRuntime(GraphFactory(_agent_runtime(factory)))
+
+
+def _agents(*names: str) -> dict[int, AgentRead]:
+    """Agents with ids 1..n."""
+    return {
+        i: AgentRead(
+            id=i,
+            name=name,
+            config={"model": "fake", "system_prompt": "Echo."},
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        for i, name in enumerate(names, start=1)
+    }
+
+
+def _graph(
+    nodes: list[dict[str, Any]],
+    edges: list[dict[str, Any]],
+    entry: str,
+    updated_at: datetime = NOW,
+) -> GraphRead:
+    """Graph 1 with the given definition."""
+    return GraphRead(
+        id=1,
+        name="Flow",
+        definition={"nodes": nodes, "edges": edges},
+        entry_node=entry,
+        created_at=NOW,
+        updated_at=updated_at,
+    )
+
+
+def _agent_node(name: str, agent_id: int) -> dict[str, Any]:
+    """Agent node definition."""
+    return {"name": name, "type": "agent", "agent_id": agent_id}
+
+
+@pytest.mark.unit
+def test_pipeline_runs_agents_and_tools(
+    runtime: GraphRuntime, factory: MagicMock
+) -> None:
+    """Nodes run in edge order; each adds a named message and output."""
+    graph = _graph(
+        [
+            _agent_node("research", 1),
+            {
+                "name": "weather",
+                "type": "tool",
+                "tool": "get_weather",
+                "args": {"city": "Paris"},
+            },
+            _agent_node("write", 2),
+        ],
+        [
+            {"source": "research", "target": "weather"},
+            {"source": "weather", "target": "write"},
+        ],
+        entry="research",
+    )
+    agents = _agents("Researcher", "Writer")
+    state = asyncio.run(runtime.invoke(graph, agents, "hi"))
+    assert state["outputs"] == {
+        "research": "Researcher: hi",
+        "weather": "The weather in Paris is sunny.",
+        "write": "Writer: The weather in Paris is sunny.",
+    }
+    assert [m.name for m in state["messages"][1:]] == [
+        "research",
+        "weather",
+        "write",
+    ]
+
+    asyncio.run(runtime.invoke(graph, agents, "again"))
+    assert factory.create_agent.call_count == 2
+    assert runtime.stats()["hits"] == 1
+
+    edited = graph.model_copy(update={"updated_at": NOW + timedelta(1)})
+    asyncio.run(runtime.invoke(edited, agents, "edited"))
+    assert factory.create_agent.call_count == 4
+    assert runtime.stats()["misses"] == 2
+
+
+@pytest.mark.unit
+def test_conditional_edges_route_on_output(runtime: GraphRuntime) -> None:
+    """The first edge whose `when` matches wins, else the default."""
+    graph = _graph(
+        [
+            _agent_node("triage", 1),
+            _agent_node("urgent", 2),
+            _agent_node("normal", 3),
+        ],
+        [
+            {"source": "triage", "target": "urgent", "when": "outage"},
+            {"source": "triage", "target": "normal"},
+        ],
+        entry="triage",
+    )
+    agents = _agents("Triage", "Pager", "Queue")
+    urgent = asyncio.run(runtime.invoke(graph, agents, "Outage in eu-1"))
+    normal = asyncio.run(runtime.invoke(graph, agents, "Reset password"))
+    assert set(urgent["outputs"]) == {"triage", "urgent"}
+    assert set(normal["outputs"]) == {"triage", "normal"}
+
+
+@pytest.mark.unit
+def test_fan_in_waits_for_all_branches(runtime: GraphRuntime) -> None:
+    """A node with several sources runs once, after all of them."""
+    graph = _graph(
+        [
+            _agent_node("plan", 1),
+            _agent_node("left", 2),
+            _agent_node("right", 3),
+            _agent_node("merge", 4),
+        ],
+        [
+            {"source": "plan", "target": "left"},
+            {"source": "plan", "target": "right"},
+            {"source": "left", "target": "merge"},
+            {"source": "right", "target": "merge"},
+        ],
+        entry="plan",
+    )
+    agents = _agents("Plan", "Left", "Right", "Merge")
+
+    async def collect() -> list[dict[str, Any]]:
+        return [e async for e in runtime.stream(graph, agents, "go")]
+
+    events = asyncio.run(collect())
+    nodes = [e["node"] for e in events]
+    assert nodes[0] == "plan"
+    assert sorted(nodes[1:3]) == ["left", "right"]
+    assert nodes[3:] == ["merge"]
+    assert events[0]["output"] == "Plan: go"
+
+
+@pytest.mark.unit
+def test_missing_agent_is_a_validation_error(runtime: GraphRuntime) -> None:
+    """Nodes referencing unknown agents or tools fail to compile."""
+    graph = _graph([_agent_node("solo", 7)], [], entry="solo")
+    with pytest.raises(ValidationException, match="agent 7 not found"):
+        runtime.get_compiled(graph, {})
+    tool_graph = _graph(
+        [{"name": "t", "type": "tool", "tool": "nope"}], [], entry="t"
+    )
+    with pytest.raises(ValidationException, match="nope"):
+        runtime.get_compiled(tool_graph, {})
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(("cap", "peak"), [(None, 4), (2, 2)])
+def test_fan_out_branches_run_concurrently_up_to_the_cap(
+    factory: MagicMock, cap: int | None, peak: int
+) -> None:
+    """Branches of one step run at once, bounded by max_concurrency."""
+    in_flight = highest = 0
+
+    def slow_agent(agent: AgentBase) -> RunnableLambda:
+        async def run(state: dict[str, Any]) -> dict[str, Any]:
+            nonlocal in_flight, highest
+            in_flight += 1
+            highest = max(highest, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return {"messages": [AIMessage(content=agent.name)]}
+
+        return RunnableLambda(run)
+
+    factory.create_agent.side_effect = slow_agent
+    runtime = GraphRuntime(GraphFactory(_agent_runtime(factory)))
+    branches = [f"b{i}" for i in range(4)]
+    graph = GraphRead(
+        id=1,
+        name="FanOut",
+        definition={
+            "nodes": [
+                _agent_node(name, 1) for name in ["start", *branches, "merge"]
+            ],
+            "edges": [{"source": "start", "target": b} for b in branches]
+            + [{"source": b, "target": "merge"} for b in branches],
+            "max_concurrency": cap,
+        },
+        entry_node="start",
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    compiled = runtime.get_compiled(graph, _agents("Echo"))
+    assert isinstance(compiled, CompiledStateGraph)
+    state = asyncio.run(runtime.invoke(graph, _agents("Echo"), "go"))
+    assert sorted(state["outputs"]) == sorted(["start", *branches, "merge"])
+    assert highest == peak
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("when", [None, "researcher"])
+def test_failed_run_resumes_from_checkpoint(
+    factory: MagicMock, when: str | None
+) -> None:
+    """Finished nodes are not run again; checkpoints go once it succeeds."""
+    calls: list[str] = []
+    failures = {"Writer": 1}
+
+    def flaky_agent(agent: AgentBase) -> RunnableLambda:
+        echo = _echo_agent(agent)
+
+        def run(state: dict[str, Any]) -> dict[str, Any]:
+            calls.append(agent.name)
+            if failures.get(agent.name):
+                failures[agent.name] -= 1
+                raise RuntimeError("model unavailable")
+            return echo.invoke(state)
+
+        return RunnableLambda(run)
+
+    factory.create_agent.side_effect = flaky_agent
+    saver = InMemorySaver()
+    runtime = GraphRuntime(
+        GraphFactory(_agent_runtime(factory), checkpointer=saver)
+    )
+    graph = _graph(
+        [_agent_node("research", 1), _agent_node("write", 2)],
+        [{"source": "research", "target": "write", "when": when}],
+        entry="research",
+    )
+    agents = _agents("Researcher", "Writer")
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        asyncio.run(runtime.invoke(graph, agents, "hi", run_id=7))
+    assert calls == ["Researcher", "Writer"]
+
+    state = asyncio.run(runtime.resume(graph, agents, 7))
+    assert calls == ["Researcher", "Writer", "Writer"]
+    assert state["outputs"] == {
+        "research": "Researcher: hi",
+        "write": "Writer: Researcher: hi",
+    }
+    assert "7" not in saver.storage
+    with pytest.raises(ConflictException, match="no checkpoint"):
+        asyncio.run(runtime.resume(graph, agents, 7))
@@ -0,0 +1,163 @@
+"""
+File: test_graph_validator.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from typing import Any
+
+import pytest
+
+from app.schemas.db.graph import GraphDefinition
+from app.services.graph_validator import GraphValidationError, plan_graph
+
+
+def _definition(
+    nodes: list[str], edges: list[tuple[str, str] | tuple[str, str, str]]
+) -> GraphDefinition:
+    """Agent nodes (agent 1) and (source, target[, when]) edges."""
+    edge_dicts: list[dict[str, Any]] = [
+        {"source": e[0], "target": e[1], "when": e[2] if len(e) > 2 else None}
+        for e in edges
+    ]
+    return GraphDefinition.model_validate(
+        {
+            "nodes": [
+                {"name": n, "type": "agent", "agent_id": 1} for n in nodes
+            ],
+            "edges": edge_dicts,
+        }
+    )
+
+
+@pytest.mark.unit
+def test_plan_records_fan_in_joins() -> None:
+    """The merge of fan-out branches is a join waiting for all."""
+    definition = _definition(
+        ["retrieve", "classify", "summarize", "merge", "start"],
+        [
+            ("start", "retrieve"),
+            ("start", "classify"),
+            ("start", "summarize"),
+            ("retrieve", "merge"),
+            ("classify", "merge"),
+            ("summarize", "merge"),
+        ],
+    )
+    plan = plan_graph(definition, "start")
+    assert plan.joins == {"merge": ["retrieve", "classify", "summarize"]}
+    assert plan.routers == []
+    assert plan.cyclic is False
+
+
+@pytest.mark.unit
+def test_cycle_with_exit_condition_is_valid() -> None:
+    """A loop is fine when a router inside it can leave it."""
+    definition = _definition(
+        ["draft", "review", "publish"],
+        [
+            ("draft", "review"),
+            ("review", "publish", "approved"),
+            ("review", "draft"),
+        ],
+    )
+    plan = plan_graph(definition, "draft")
+    assert plan.cyclic is True
+    assert plan.routers == ["review"]
+    assert plan.joins == {}
+
+
+@pytest.mark.unit
+def test_reports_every_structural_problem() -> None:
+    """Unreachable nodes and inescapable cycles are reported together."""
+    definition = _definition(
+        ["a", "b", "c", "orphan"],
+        [("a", "b"), ("b", "c"), ("c", "b")],
+    )
+    with pytest.raises(GraphValidationError) as exc_info:
+        plan_graph(definition, "a")
+    assert exc_info.value.errors == [
+        "Unreachable nodes: orphan",
+        "Cycle b -> c has no exit condition",
+    ]
+
+
+@pytest.mark.unit
+def test_router_without_way_out_of_its_cycle_is_invalid() -> None:
+    """Conditional edges that all stay inside the loop do not count."""
+    definition = _definition(
+        ["a", "b"],
+        [("a", "b"), ("b", "a", "again"), ("b", "b")],
+    )
+    with pytest.raises(GraphValidationError, match="no exit condition"):
+        plan_graph(definition, "a")
+
+
+@pytest.mark.unit
+def test_checks_references_entry_node_and_edges() -> None:
+    """Unknown agents, tools, entry node and edge endpoints are errors."""
+    definition = GraphDefinition.model_validate(
+        {
+            "nodes": [
+                {"name": "ask", "type": "agent", "agent_id": 3},
+                {"name": "look", "type": "tool", "tool": "nope"},
+            ],
+            "edges": [{"source": "ask", "target": "missing"}],
+        }
+    )
+    with pytest.raises(GraphValidationError) as exc_info:
+        plan_graph(
+            definition,
+            "start",
+            agent_ids={1},
+            tool_names={"get_weather"},
+        )
+    assert exc_info.value.errors == [
+        "Entry node 'start' is not a node",
+        "Node 'ask': agent 3 not found",
+        "Node 'look': tool 'nope' not found",
+        "Edge target 'missing' is not a node",
+    ]
+
+
+@pytest.mark.unit
+def test_join_over_a_conditional_branch_is_invalid() -> None:
+    """A join would wait forever for a source whose branch is skipped."""
+    definition = _definition(
+        ["start", "route", "search", "answer", "fetch", "merge"],
+        [
+            ("start", "route"),
+            ("start", "fetch"),
+            ("route", "search", "lookup"),
+            ("route", "answer"),
+            ("search", "merge"),
+            ("fetch", "merge"),
+        ],
+    )
+    with pytest.raises(GraphValidationError) as info:
+        plan_graph(definition, "start")
+    assert info.value.errors == [
+        "Join 'merge' waits for search, fetch, which do not always run "
+        "together (a conditional branch can skip one of them)"
+    ]
+
+
+@pytest.mark.unit
+def test_join_inside_one_conditional_branch_is_valid() -> None:
+    """Sources activated by the same branch always run together."""
+    definition = _definition(
+        ["route", "research", "pros", "cons", "merge", "skip"],
+        [
+            ("route", "research", "deep"),
+            ("route", "skip"),
+            ("research", "pros"),
+            ("research", "cons"),
+            ("pros", "merge"),
+            ("cons", "merge"),
+        ],
+    )
+    plan = plan_graph(definition, "route")
+    assert plan.joins == {"merge": ["pros", "cons"]}
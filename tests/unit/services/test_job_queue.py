@@ -0,0 +1,110 @@
+"""
+File: test_job_queue.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.job_queue import JobQueue, retry_delay
+
+
+@pytest.mark.unit
+def test_retry_delay_grows_exponentially_and_caps() -> None:
+    """Delay doubles per attempt and never exceeds the maximum."""
+    assert retry_delay(1, base=2.0, maximum=60.0) == pytest.approx(2.0)
+    assert retry_delay(2, base=2.0, maximum=60.0) == pytest.approx(4.0)
+    assert retry_delay(4, base=2.0, maximum=60.0) == pytest.approx(16.0)
+    assert retry_delay(10, base=2.0, maximum=60.0) == pytest.approx(60.0)
+
+
+@pytest.mark.unit
+def test_claim_uses_skip_locked() -> None:
+    """claim selects with FOR UPDATE SKIP LOCKED and respects the limit."""
+    session = MagicMock()
+    session.scalars.return_value.all.return_value = []
+
+    @contextmanager
+    def session_factory() -> Generator[MagicMock]:
+        yield session
+
+    queue = JobQueue(
+        stale_after=60,
+        backoff_base=2,
+        backoff_max=60,
+        session_factory=session_factory,
+    )
+    assert queue.claim("w1", 5) == []
+    stmt = session.scalars.call_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "LIMIT" in sql
+
+
+@pytest.mark.unit
+def test_claim_with_no_free_slots_skips_db() -> None:
+    """claim(limit=0) does not open a session."""
+    session_factory = MagicMock()
+    queue = JobQueue(
+        stale_after=60,
+        backoff_base=2,
+        backoff_max=60,
+        session_factory=session_factory,
+    )
+    assert queue.claim("w1", 0) == []
+    session_factory.assert_not_called()
+
+
+@pytest.mark.unit
+def test_release_requeues_without_using_an_attempt() -> None:
+    """release puts a held job back and gives its attempt back."""
+    job = MagicMock(attempts=2)
+    session = MagicMock()
+    session.scalars.return_value.first.return_value = job
+
+    @contextmanager
+    def session_factory() -> Generator[MagicMock]:
+        yield session
+
+    queue = JobQueue(
+        stale_after=60,
+        backoff_base=2,
+        backoff_max=60,
+        session_factory=session_factory,
+    )
+    assert queue.release("w1", 7, delay=5.0) is True
+    assert job.attempts == 1
+    assert job.status == "queued"
+    assert job.locked_by is None
+    session.scalars.return_value.first.return_value = None
+    assert queue.release("w1", 7, delay=5.0) is False
+
+
+@pytest.mark.unit
+def test_fail_without_retry_ends_the_job_before_max_attempts() -> None:
+    """A failure marked not retryable fails the job on its first attempt."""
+    job = MagicMock(attempts=1, max_attempts=3)
+    session = MagicMock()
+    session.scalars.return_value.first.return_value = job
+
+    @contextmanager
+    def session_factory() -> Generator[MagicMock]:
+        yield session
+
+    queue = JobQueue(
+        stale_after=60,
+        backoff_base=2,
+        backoff_max=60,
+        session_factory=session_factory,
+    )
+    assert queue.fail("w1", 7, "PayloadTooLargeException: big", retry=False)
+    assert job.status == "failed"
+    assert job.error == "PayloadTooLargeException: big"
@@ -0,0 +1,213 @@
+"""
+File: test_map_reduce.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+import pytest
+
+from app.core.exceptions import TooManyRequestsException
+from app.runtime.cancellation import deadline_scope
+from app.runtime.concurrency import ConcurrencyLimiter
+from app.runtime.tokenizer import HeuristicTokenizer
+from app.schemas.db.agent import AgentRead
+from app.services.agent_runtime import AgentRuntime
+from app.services.map_reduce import MapReduceRunner
+
+NOW = datetime(2026, 10, 18, tzinfo=UTC)
+
+
+def _agent(agent_id: int, name: str) -> AgentRead:
+    """Saved agent on the fake model."""
+    return AgentRead(
+        id=agent_id,
+        name=name,
+        config={"model": "fake:echo", "system_prompt": name},
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+async def _worker(state: dict[str, Any]) -> dict[str, Any]:
+    """Fake agent: maps a chunk to its first word, or counts partials."""
+    text = state["messages"][-1]["content"]
+    await asyncio.sleep(0)
+    if "Combine" in text:
+        count = text.count("\n[")
+        return {"messages": [AIMessage(content=f"sum of {count}")]}
+    if text.startswith("bad"):
+        raise RuntimeError("chunk failed")
+    return {"messages": [AIMessage(content=text.split()[0])]}
+
+
+def _runner(**kwargs: Any) -> MapReduceRunner:
+    """Runner over an agent runtime whose agents are `_worker`."""
+    factory = MagicMock()
+    factory.create_agent.return_value = RunnableLambda(_worker)
+    limiter = ConcurrencyLimiter(
+        max_concurrency=8, default_model_concurrency=8, max_queue_size=100
+    )
+    return MapReduceRunner(
+        AgentRuntime(factory, limiter), HeuristicTokenizer(), **kwargs
+    )
+
+
+async def _collect(runner: MapReduceRunner, text: str) -> list[Any]:
+    """Every event of a run."""
+    mapper, reducer = _agent(1, "Mapper"), _agent(2, "Reducer")
+    return [event async for event in runner.run(mapper, text, reducer)]
+
+
+def _state(text: str) -> dict[str, Any]:
+    """Agent state whose last message is `text`."""
+    return {"messages": [AIMessage(content=text)]}
+
+
+@pytest.mark.unit
+def test_groups_fit_budget_and_always_shrink() -> None:
+    """Groups respect budget and fan-in, but take at least two partials."""
+    assert MapReduceRunner.groups([10] * 5, budget=100, fan_in=2) == [
+        [0, 1],
+        [2, 3],
+        [4],
+    ]
+    assert MapReduceRunner.groups([40, 40, 40], budget=100, fan_in=8) == [
+        [0, 1],
+        [2],
+    ]
+    assert MapReduceRunner.groups([50, 50, 50], budget=100, fan_in=8) == [
+        [0, 1],
+        [2],
+    ]
+
+
+@pytest.mark.unit
+def test_oversized_partials_are_cut_so_every_reduce_fits() -> None:
+    """Partials over half the budget are cut, so no reduce call exceeds
+    the budget by more than its instructions."""
+    tokenizer = HeuristicTokenizer()
+    reduce_inputs: list[str] = []
+
+    async def invoke(agent: AgentRead, message: str) -> dict[str, Any]:
+        await asyncio.sleep(0)
+        if "Combine" in message:
+            reduce_inputs.append(message)
+            return _state("combined")
+        return _state(". ".join(f"Finding {n} of the chunk" for n in range(60)))
+
+    runtime = MagicMock()
+    runtime.invoke = invoke
+    runner = MapReduceRunner(runtime, tokenizer, chunk_tokens=100)
+    text = "\n\n".join(f"part{n} " + "word " * 60 for n in range(4))
+    events = asyncio.run(_collect(runner, text))
+
+    assert events[-1][0] == "end"
+    assert reduce_inputs
+    assert max(tokenizer.count(m) for m in reduce_inputs) <= 100 + 20
+    assert runner.stats()["clipped_partials"] == 4
+
+
+@pytest.mark.unit
+def test_chunks_map_in_parallel_and_reduce_in_a_tree() -> None:
+    """Nine chunks reduce by fan-in 3 in two levels; a failed chunk is
+    reported and left out of the reduce."""
+    paragraphs = [f"part{n} " + "word " * 20 for n in range(9)]
+    paragraphs[4] = "bad " + "word " * 20
+    runner = _runner(chunk_tokens=40, fan_in=3)
+    events = asyncio.run(_collect(runner, "\n\n".join(paragraphs)))
+
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "plan"
+    assert events[0][1]["chunks"] == 9
+    assert kinds.count("chunk") == 9
+    chunks = {e["index"]: e for kind, e in events if kind == "chunk"}
+    assert chunks[0]["output"] == "part0"
+    assert chunks[4]["error"] == "RuntimeError: chunk failed"
+    assert sorted(e["completed"] for k, e in events if k == "chunk") == list(
+        range(1, 10)
+    )
+    # 8 partials -> 3 groups (3, 3, 2) -> 1 group of 3.
+    reduces = [e for kind, e in events if kind == "reduce"]
+    assert [(e["level"], e["inputs"]) for e in reduces].count((1, 3)) == 2
+    assert reduces[-1]["level"] == 2
+    kind, result = events[-1]
+    assert kind == "end"
+    assert result.levels == 2
+    assert result.state["messages"][-1].text == "sum of 3"
+    assert result.chunks[4].error is not None
+    assert runner.stats() == {
+        "runs": 1,
+        "chunks": 9,
+        "reduce_calls": 4,
+        "retries": 0,
+        "clipped_partials": 0,
+    }
+
+
+@pytest.mark.unit
+def test_single_chunk_skips_reduce_and_all_failed_raises() -> None:
+    """One chunk is its own result; a run whose chunks all fail raises."""
+    runner = _runner()
+    events = asyncio.run(_collect(runner, "only chunk"))
+    assert [kind for kind, _ in events] == ["plan", "chunk", "end"]
+    assert events[-1][1].levels == 0
+
+    with pytest.raises(RuntimeError, match="chunk failed"):
+        asyncio.run(_collect(runner, "bad input"))
+
+
+@pytest.mark.unit
+def test_rejected_calls_are_retried_within_the_deadline() -> None:
+    """A 429 is retried with backoff; past the deadline it fails the
+    chunk."""
+    runtime = MagicMock()
+    runtime.invoke = AsyncMock(
+        side_effect=[TooManyRequestsException("busy"), _state("done")]
+    )
+    runner = MapReduceRunner(
+        runtime, HeuristicTokenizer(), retry_backoff_base=0
+    )
+    events = asyncio.run(_collect(runner, "only chunk"))
+    assert events[-1][0] == "end"
+    assert runner.stats()["retries"] == 1
+
+    runtime.invoke = AsyncMock(
+        side_effect=TooManyRequestsException("busy", retry_after=60)
+    )
+
+    async def within_deadline() -> list[Any]:
+        with deadline_scope(5):
+            return await _collect(runner, "only chunk")
+
+    with pytest.raises(TooManyRequestsException, match="busy"):
+        asyncio.run(within_deadline())
+    assert runtime.invoke.await_count == 1
+
+
+@pytest.mark.unit
+def test_fail_on_chunk_error_fails_the_run() -> None:
+    """With `fail_on_chunk_error`, one failed chunk fails the run."""
+    runner = _runner(chunk_tokens=40)
+    text = "\n\n".join(["good " + "word " * 20, "bad " + "word " * 20])
+
+    async def run() -> list[Any]:
+        mapper = _agent(1, "Mapper")
+        return [
+            event
+            async for event in runner.run(
+                mapper, text, fail_on_chunk_error=True
+            )
+        ]
+
+    with pytest.raises(RuntimeError, match="chunk failed"):
+        asyncio.run(run())
@@ -0,0 +1,134 @@
+"""
+File: test_run_metrics_writer.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from collections.abc import Generator
+from contextlib import contextmanager
+import time
+from typing import Any
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.runtime.run_metrics import RunRecord
+from app.services.run_metrics_writer import RunMetricsWriter
+
+
+class _RecordingSession:
+    """Session stand-in collecting executed row batches."""
+
+    def __init__(
+        self,
+        batches: list[list[dict[str, Any]]],
+        fail: bool,
+        delay: float = 0.0,
+    ):
+        """Append batches to `batches`; raise instead when `fail` is set."""
+        self.batches = batches
+        self.fail = fail
+        self.delay = delay
+
+    def execute(self, stmt: Any, rows: list[dict[str, Any]]) -> None:
+        """Record one executemany; agent 13 violates a foreign key."""
+        if self.fail:
+            raise RuntimeError("db down")
+        time.sleep(self.delay)
+        if any(row["agent_id"] == 13 for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("fk violation"))
+        self.batches.append(rows)
+
+
+def _writer(
+    batches: list[list[dict[str, Any]]],
+    fail: bool = False,
+    delay: float = 0.0,
+    **kwargs: Any,
+) -> RunMetricsWriter:
+    """Writer whose sessions record batches instead of hitting Postgres."""
+
+    @contextmanager
+    def session_factory() -> Generator[_RecordingSession]:
+        yield _RecordingSession(batches, fail, delay)
+
+    return RunMetricsWriter(session_factory=session_factory, **kwargs)
+
+
+def _record(i: int) -> RunRecord:
+    """Finished run of agent i."""
+    return RunRecord(agent_id=i, agent_name=f"agent-{i}", model="fake")
+
+
+@pytest.mark.unit
+def test_full_batch_is_flushed_without_waiting_for_interval() -> None:
+    """Reaching batch_size wakes the loop; aclose writes the remainder."""
+    batches: list[list[dict[str, Any]]] = []
+    writer = _writer(batches, batch_size=3, flush_interval=60)
+
+    async def scenario() -> None:
+        await writer.start()
+        for i in range(7):
+            writer.add(_record(i))
+        await asyncio.sleep(0.05)
+        assert [len(b) for b in batches] == [3, 3]
+        await writer.aclose()
+
+    asyncio.run(scenario())
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert [row["agent_id"] for b in batches for row in b] == list(range(7))
+    assert writer.stats()["written"] == 7
+
+
+@pytest.mark.unit
+def test_bounded_buffer_and_failed_inserts_drop_rows() -> None:
+    """Overflow drops the oldest rows; a failed insert drops its batch."""
+    batches: list[list[dict[str, Any]]] = []
+    writer = _writer(batches, fail=True, batch_size=10, max_buffer=2)
+    for i in range(3):
+        writer.add(_record(i))
+    assert writer.stats()["buffered"] == 2
+    assert asyncio.run(writer.flush()) is False
+    assert writer.stats() == {
+        "buffered": 0,
+        "written": 0,
+        "dropped": 3,
+        "failed_batches": 1,
+    }
+
+
+@pytest.mark.unit
+def test_aclose_waits_for_an_insert_in_flight() -> None:
+    """Shutdown during a slow insert still writes every buffered row."""
+    batches: list[list[dict[str, Any]]] = []
+    writer = _writer(batches, delay=0.05, batch_size=2, flush_interval=60)
+
+    async def scenario() -> None:
+        await writer.start()
+        for i in range(5):
+            writer.add(_record(i))
+        await asyncio.sleep(0.01)
+        await writer.aclose()
+
+    asyncio.run(scenario())
+    assert sorted(row["agent_id"] for b in batches for row in b) == list(
+        range(5)
+    )
+    assert writer.stats()["dropped"] == 0
+
+
+@pytest.mark.unit
+def test_constraint_violation_drops_only_the_bad_rows() -> None:
+    """A batch rejected by a foreign key is written row by row."""
+    batches: list[list[dict[str, Any]]] = []
+    writer = _writer(batches, batch_size=10)
+    for i in (11, 12, 13, 14):
+        writer.add(_record(i))
+    assert asyncio.run(writer.flush()) is True
+    assert [row["agent_id"] for b in batches for row in b] == [11, 12, 14]
+    stats = writer.stats()
+    assert (stats["written"], stats["dropped"]) == (3, 1)
@@ -49,3 +49,15 @@ def test_tools_contains_registered_tools(provider: ToolProvider) -> None:
     """Provider contains all tools from app.tools (by name)."""
     assert "get_weather" in provider.tools
     assert provider.tools["get_weather"] is get_weather
+
+
+@pytest.mark.unit
+def test_cache_policies_from_registry_build_memos() -> None:
+    """Tools with a policy in TOOL_CACHE_POLICIES get a shared memo."""
+    provider = ToolProvider()
+    memo = provider.get_memo("get_weather")
+    assert memo is not None
+    assert memo.policy.key_fields == ("city",)
+    assert provider.get_memo("get_weather") is memo
+    assert provider.cache_stats()["get_weather"]["hits"] == 0
+    assert ToolProvider(cache_results=False).get_memo("get_weather") is None
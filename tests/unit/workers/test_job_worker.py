@@ -0,0 +1,229 @@
+"""
+File: test_job_worker.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+
+from langchain_core.messages import AIMessage
+import pytest
+
+from app.core.exceptions import (
+    PayloadTooLargeException,
+    TooManyRequestsException,
+)
+from app.runtime.cancellation import DeadlineExceededError, enforce_deadline
+from app.schemas.db.agent import AgentRead
+from app.services.job_queue import ClaimedJob
+from app.workers.job_worker import JobWorker
+
+
+def _job(id: int, text: str) -> ClaimedJob:
+    """Claimed job for agent 1."""
+    now = datetime.now(UTC)
+    agent = AgentRead(
+        id=1,
+        name="Echo",
+        config={"model": "fake", "system_prompt": "Echo."},
+        created_at=now,
+        updated_at=now,
+    )
+    return ClaimedJob(
+        id=id, agent=agent, input=text, attempts=1, max_attempts=3
+    )
+
+
+class _FakeQueue:
+    """In-memory queue recording claims and outcomes."""
+
+    def __init__(self, jobs: list[ClaimedJob]) -> None:
+        """Store pending jobs."""
+        self.pending = list(jobs)
+        self.claim_limits: list[int] = []
+        self.completed: dict[int, dict[str, Any]] = {}
+        self.failed: dict[int, str] = {}
+        self.retried: dict[int, bool] = {}
+        self.released: list[tuple[int, float]] = []
+        self.heartbeats: list[list[int]] = []
+
+    def claim(self, worker_id: str, limit: int) -> list[ClaimedJob]:
+        """Pop up to limit jobs."""
+        self.claim_limits.append(limit)
+        claimed, self.pending = self.pending[:limit], self.pending[limit:]
+        return claimed
+
+    def heartbeat(self, worker_id: str, job_ids: list[int]) -> None:
+        """Record heartbeats."""
+        self.heartbeats.append(job_ids)
+
+    def complete(self, worker_id: str, job_id: int, result: dict) -> bool:
+        """Record a result."""
+        self.completed[job_id] = result
+        return True
+
+    def fail(
+        self, worker_id: str, job_id: int, error: str, retry: bool = True
+    ) -> bool:
+        """Record a failure and whether it may be retried."""
+        self.failed[job_id] = error
+        self.retried[job_id] = retry
+        return True
+
+    def release(self, worker_id: str, job_id: int, delay: float) -> bool:
+        """Record a release and requeue the job."""
+        self.released.append((job_id, delay))
+        self.pending.append(_job(job_id, "released"))
+        return True
+
+
+class _FakeRuntime:
+    """Echoes the input after a short delay; fails on 'boom'."""
+
+    def __init__(self) -> None:
+        """Track concurrent runs."""
+        self.active = 0
+        self.peak = 0
+
+    async def invoke(self, agent: Any, user_input: str) -> dict[str, Any]:
+        """Echo the input."""
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if user_input == "boom":
+                raise RuntimeError("model failed")
+            return {"messages": [AIMessage(content=f"echo: {user_input}")]}
+        finally:
+            self.active -= 1
+
+
+async def _run_until_drained(worker: JobWorker, queue: _FakeQueue) -> None:
+    """Run the worker until every job has an outcome."""
+    stop = asyncio.Event()
+    total = len(queue.pending)
+    task = asyncio.create_task(worker.run(stop))
+    while len(queue.completed) + len(queue.failed) < total:
+        await asyncio.sleep(0.005)
+    stop.set()
+    await task
+
+
+@pytest.mark.unit
+def test_worker_completes_and_fails_jobs() -> None:
+    """Successful runs store results; failing runs are reported to fail."""
+    queue = _FakeQueue([_job(1, "a"), _job(2, "boom"), _job(3, "c")])
+    worker = JobWorker(
+        queue,
+        _FakeRuntime(),
+        concurrency=4,
+        poll_interval=0.01,
+        heartbeat_interval=0.005,
+    )
+    asyncio.run(_run_until_drained(worker, queue))
+    assert queue.completed[1]["output"] == "echo: a"
+    assert queue.completed[3]["output"] == "echo: c"
+    assert queue.failed[2] == "RuntimeError: model failed"
+    assert queue.retried[2] is True
+    assert worker.stats()["succeeded"] == 2
+    assert worker.stats()["running"] == 0
+
+
+@pytest.mark.unit
+def test_worker_respects_concurrency() -> None:
+    """The worker never claims more jobs than it has free slots."""
+    queue = _FakeQueue([_job(i, f"m{i}") for i in range(7)])
+    runtime = _FakeRuntime()
+    worker = JobWorker(
+        queue,
+        runtime,
+        concurrency=2,
+        poll_interval=0.01,
+        heartbeat_interval=1.0,
+    )
+    asyncio.run(_run_until_drained(worker, queue))
+    assert len(queue.completed) == 7
+    assert runtime.peak <= 2
+    assert max(queue.claim_limits) == 2
+
+
+@pytest.mark.unit
+def test_worker_sends_heartbeats_for_running_jobs() -> None:
+    """Running jobs are heartbeated while they run."""
+
+    class _SlowRuntime(_FakeRuntime):
+        async def invoke(self, agent: Any, user_input: str) -> dict:
+            await asyncio.sleep(0.05)
+            return {"messages": [AIMessage(content="done")]}
+
+    queue = _FakeQueue([_job(1, "slow")])
+    worker = JobWorker(
+        queue,
+        _SlowRuntime(),
+        concurrency=1,
+        poll_interval=0.01,
+        heartbeat_interval=0.01,
+    )
+    asyncio.run(_run_until_drained(worker, queue))
+    assert [1] in queue.heartbeats
+
+
+@pytest.mark.unit
+def test_worker_releases_jobs_rejected_as_overloaded() -> None:
+    """A 429 from the runtime releases the job instead of failing it."""
+
+    class _BusyOnceRuntime(_FakeRuntime):
+        async def invoke(self, agent: Any, user_input: str) -> dict:
+            if user_input == "busy":
+                await asyncio.sleep(0)
+                raise TooManyRequestsException("Queue full", retry_after=2.0)
+            return await super().invoke(agent, user_input)
+
+    queue = _FakeQueue([_job(1, "busy")])
+    worker = JobWorker(
+        queue,
+        _BusyOnceRuntime(),
+        concurrency=1,
+        poll_interval=0.01,
+        heartbeat_interval=1.0,
+    )
+    asyncio.run(_run_until_drained(worker, queue))
+    assert queue.released == [(1, 2.0)]
+    assert queue.failed == {}
+    assert queue.completed[1]["output"] == "echo: released"
+    assert worker.stats()["released"] == 1
+
+
+@pytest.mark.unit
+def test_worker_fails_client_errors_at_once_and_times_out_hung_runs() -> None:
+    """A 4xx would fail again, so it is not retried; a run stuck past the
+    job timeout is cut off and left to the retry policy."""
+
+    class _Runtime(_FakeRuntime):
+        async def invoke(self, agent: Any, user_input: str) -> dict:
+            if user_input == "huge":
+                await asyncio.sleep(0)
+                raise PayloadTooLargeException("Input too large")
+            async with enforce_deadline():
+                await asyncio.sleep(10)
+            return {"messages": [AIMessage(content="done")]}
+
+    queue = _FakeQueue([_job(1, "huge"), _job(2, "hang")])
+    worker = JobWorker(
+        queue,
+        _Runtime(),
+        concurrency=2,
+        poll_interval=0.01,
+        heartbeat_interval=1.0,
+        job_timeout=0.05,
+    )
+    asyncio.run(_run_until_drained(worker, queue))
+    assert queue.failed[1] == "PayloadTooLargeException: Input too large"
+    assert queue.retried[1] is False
+    assert queue.failed[2].startswith(DeadlineExceededError.__name__)
+    assert queue.retried[2] is True
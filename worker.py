@@ -0,0 +1,15 @@
+"""
+File: worker.py
+Project: swarm-nest
+Created: Sunday, 18th October 2026 12:58:36 pm
+Author: Klaus Begnis
+
+Copyright (c) 2026 Swarm Nest. See LICENSE for details.
+"""
+
+if __name__ == "__main__":
+    import asyncio
+
+    from app.workers import run_worker
+
+    asyncio.run(run_worker())